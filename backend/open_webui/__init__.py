@@ -99,5 +99,15 @@ def dev(
     )
 
 
+@app.command()
+def rebuild_chat_search_index():
+    """Rebuild the full-text chat search index from the stored chats."""
+    import open_webui.config  # applies pending migrations, e.g. after an upgrade
+    from open_webui.models.chat_search import ChatSearches
+
+    count = ChatSearches.rebuild_index()
+    typer.echo(f"Indexed {count} chats for search")
+
+
 if __name__ == "__main__":
     app()
@@ -3,6 +3,8 @@ import logging
 import os
 import shutil
 import base64
+import threading
+import time
 import redis
 
 from datetime import datetime
@@ -24,6 +26,7 @@ from open_webui.env import (
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
+    REDIS_CONFIG_SYNC_INTERVAL,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
@@ -34,6 +37,7 @@ from open_webui.env import (
 )
 from open_webui.internal.db import Base, get_db
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.cache import start_invalidation_listener
 
 
 class EndpointFilter(logging.Filter):
@@ -222,6 +226,17 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Registry of PersistentConfig values exposed as attributes.
+
+    With Redis, values are shared across replicas through a versioned snapshot:
+    writers store the value, bump `{prefix}:config:version` and publish the new
+    version on `{prefix}:config:invalidate`. Readers serve attributes from
+    memory and only reload the snapshot when the version changes, which is
+    checked after an invalidation message or at most every
+    REDIS_CONFIG_SYNC_INTERVAL seconds.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
@@ -247,6 +262,14 @@ class AppConfig:
             )
 
         super().__setattr__("_state", {})
+        super().__setattr__("_version", None)
+        super().__setattr__("_checked_at", 0.0)
+        super().__setattr__("_invalidated", threading.Event())
+        super().__setattr__("_sync_lock", threading.Lock())
+        super().__setattr__("_listener", None)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -256,29 +279,81 @@ class AppConfig:
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                try:
+                    pipe = self._redis.pipeline()
+                    pipe.set(self._redis_key(key), json.dumps(self._state[key].value))
+                    pipe.incr(self._redis_key("version"))
+                    version = pipe.execute()[-1]
+                    # Our snapshot is current unless another replica wrote in
+                    # between, in which case the next read reloads it
+                    if self._version is not None and version == self._version + 1:
+                        super().__setattr__("_version", version)
+                    self._redis.publish(self._redis_key("invalidate"), version)
+                except Exception as e:
+                    log.error(f"Failed to publish config update for {key}: {e}")
+
+    def _start_listener(self):
+        # Missed messages (e.g. while reconnecting) invalidate the snapshot too
+        listener = start_invalidation_listener(
+            self._redis,
+            self._redis_key("invalidate"),
+            lambda data: self._invalidated.set(),
+            name="config-invalidation-listener",
+        )
+        super().__setattr__("_listener", listener)
+
+    def _load_snapshot(self):
+        keys = list(self._state.keys())
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(self._redis_key(key))
+        values = pipe.execute()
+
+        for key, redis_value in zip(keys, values):
+            if redis_value is None:
+                continue
+            try:
+                decoded_value = json.loads(redis_value)
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+                continue
+
+            # Update the in-memory value if different
+            if self._state[key].value != decoded_value:
+                self._state[key].value = decoded_value
+                log.info(f"Updated {key} from Redis: {decoded_value}")
+
+    def _sync(self):
+        now = time.monotonic()
+        if (
+            not self._invalidated.is_set()
+            and self._version is not None
+            and now - self._checked_at < REDIS_CONFIG_SYNC_INTERVAL
+        ):
+            return
+
+        with self._sync_lock:
+            if self._listener is None:
+                self._start_listener()
+
+            self._invalidated.clear()
+            super().__setattr__("_checked_at", now)
+            try:
+                version = self._redis.get(self._redis_key("version"))
+                version = int(version) if version is not None else 0
+                if version != self._version:
+                    self._load_snapshot()
+                    super().__setattr__("_version", version)
+            except Exception as e:
+                log.error(f"Failed to sync config from Redis: {e}")
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
+        # If Redis is available, pick up changes made by other replicas
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
-
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+            self._sync()
 
         return self._state[key].value
 
@@ -908,6 +983,27 @@ AZURE_STORAGE_ENDPOINT = os.environ.get("AZURE_STORAGE_ENDPOINT", None)
 AZURE_STORAGE_CONTAINER_NAME = os.environ.get("AZURE_STORAGE_CONTAINER_NAME", None)
 AZURE_STORAGE_KEY = os.environ.get("AZURE_STORAGE_KEY", None)
 
+# Uploads are streamed to the storage backend in chunks of this size (bytes).
+# S3 requires multipart parts of at least 5 MiB, so smaller values are raised.
+try:
+    STORAGE_UPLOAD_CHUNK_SIZE = int(
+        os.environ.get("STORAGE_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024))
+    )
+except ValueError:
+    STORAGE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+if STORAGE_UPLOAD_CHUNK_SIZE <= 0:
+    STORAGE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Maximum number of chunks uploaded in parallel per file. Together with the
+# chunk size this bounds the memory used by a single upload.
+try:
+    STORAGE_UPLOAD_MAX_CONCURRENCY = max(
+        1, int(os.environ.get("STORAGE_UPLOAD_MAX_CONCURRENCY", "4"))
+    )
+except ValueError:
+    STORAGE_UPLOAD_MAX_CONCURRENCY = 4
+
 ####################################
 # File Upload DIR
 ####################################
@@ -1848,6 +1944,48 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+# Generate the title, tags and follow-ups of a chat turn with a single task
+# model call; disable to use one call per task instead.
+ENABLE_CHAT_METADATA_GENERATION = PersistentConfig(
+    "ENABLE_CHAT_METADATA_GENERATION",
+    "task.metadata.enable",
+    os.environ.get("ENABLE_CHAT_METADATA_GENERATION", "True").lower() == "true",
+)
+
+CHAT_METADATA_GENERATION_PROMPT_TEMPLATE = PersistentConfig(
+    "CHAT_METADATA_GENERATION_PROMPT_TEMPLATE",
+    "task.metadata.prompt_template",
+    os.environ.get("CHAT_METADATA_GENERATION_PROMPT_TEMPLATE", ""),
+)
+
+# Token budget for the chat history sent with the chat metadata task
+try:
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS = int(
+        os.environ.get("CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS", "2000")
+    )
+except ValueError:
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS = 2000
+
+CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS = PersistentConfig(
+    "CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS",
+    "task.metadata.max_context_tokens",
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS,
+)
+
+DEFAULT_CHAT_METADATA_GENERATION_PROMPT_TEMPLATE = """### Task:
+Generate the following metadata for the chat history:
+{{METADATA_FIELDS}}
+### Guidelines:
+- Use the chat's primary language; default to English if multilingual.
+- Prioritize accuracy over excessive creativity; keep it clear and simple.
+- Your entire response must consist solely of a single, raw JSON object with exactly the keys above, without markdown code fences or any other text.
+### Output:
+JSON format: {{METADATA_FORMAT}}
+### Chat History:
+<chat_history>
+{{MESSAGES}}
+</chat_history>"""
+
 
 ENABLE_SEARCH_QUERY_GENERATION = PersistentConfig(
     "ENABLE_SEARCH_QUERY_GENERATION",
@@ -2680,6 +2818,39 @@ PDF_EXTRACT_IMAGES = PersistentConfig(
     os.environ.get("PDF_EXTRACT_IMAGES", "False").lower() == "true",
 )
 
+# Worker processes extracting the pages of large PDFs with the default loader.
+# Opt-in: 1 (the default) extracts in the request thread as before
+try:
+    PDF_LOADER_WORKERS = max(1, int(os.environ.get("PDF_LOADER_WORKERS", "1")))
+except ValueError:
+    PDF_LOADER_WORKERS = 1
+
+# Pages per extraction task; PDFs up to this size are extracted in one go
+try:
+    PDF_LOADER_PAGES_PER_SHARD = max(
+        1, int(os.environ.get("PDF_LOADER_PAGES_PER_SHARD", "50"))
+    )
+except ValueError:
+    PDF_LOADER_PAGES_PER_SHARD = 50
+
+# Extracted documents are kept per (file hash, engine, engine settings), so
+# reprocessing an unchanged file skips the extraction (and paid OCR calls)
+ENABLE_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_EXTRACTION_CACHE", "True").lower() == "true"
+)
+EXTRACTION_CACHE_DIR = Path(
+    os.environ.get("EXTRACTION_CACHE_DIR", DATA_DIR / "extraction_cache")
+)
+
+# Size of the extraction cache in MB; the least recently used entries are
+# removed beyond it, 0 keeps every entry
+try:
+    EXTRACTION_CACHE_MAX_SIZE = max(
+        0, int(os.environ.get("EXTRACTION_CACHE_MAX_SIZE", "1024"))
+    )
+except ValueError:
+    EXTRACTION_CACHE_MAX_SIZE = 1024
+
 RAG_EMBEDDING_MODEL = PersistentConfig(
     "RAG_EMBEDDING_MODEL",
     "rag.embedding_model",
@@ -2935,6 +3106,37 @@ WEB_LOADER_CONCURRENT_REQUESTS = PersistentConfig(
     int(os.getenv("WEB_LOADER_CONCURRENT_REQUESTS", "10")),
 )
 
+# Pages fetched at once from a single domain, within WEB_LOADER_CONCURRENT_REQUESTS
+try:
+    WEB_LOADER_CONCURRENT_REQUESTS_PER_DOMAIN = max(
+        1, int(os.environ.get("WEB_LOADER_CONCURRENT_REQUESTS_PER_DOMAIN", "2"))
+    )
+except ValueError:
+    WEB_LOADER_CONCURRENT_REQUESTS_PER_DOMAIN = 2
+
+# Fetched pages are reused for WEB_FETCH_CACHE_TTL seconds, or their max-age if
+# shorter, then revalidated with their ETag / Last-Modified. Page embeddings are
+# kept by page content.
+ENABLE_WEB_FETCH_CACHE = (
+    os.environ.get("ENABLE_WEB_FETCH_CACHE", "True").lower() == "true"
+)
+WEB_FETCH_CACHE_DIR = Path(
+    os.environ.get("WEB_FETCH_CACHE_DIR", DATA_DIR / "web_cache")
+)
+try:
+    WEB_FETCH_CACHE_TTL = int(os.environ.get("WEB_FETCH_CACHE_TTL", "3600"))
+except ValueError:
+    WEB_FETCH_CACHE_TTL = 3600
+
+# Size of each of the page and embedding caches in MB; the least recently used
+# entries are removed beyond it, 0 keeps every entry
+try:
+    WEB_FETCH_CACHE_MAX_SIZE = max(
+        0, int(os.environ.get("WEB_FETCH_CACHE_MAX_SIZE", "1024"))
+    )
+except ValueError:
+    WEB_FETCH_CACHE_MAX_SIZE = 1024
+
 
 ENABLE_WEB_LOADER_SSL_VERIFICATION = PersistentConfig(
     "ENABLE_WEB_LOADER_SSL_VERIFICATION",
@@ -3445,6 +3647,23 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Recordings longer than this many seconds are cut at pauses into chunks that
+# are transcribed concurrently
+try:
+    AUDIO_STT_CHUNK_DURATION = max(
+        30, int(os.environ.get("AUDIO_STT_CHUNK_DURATION", "300"))
+    )
+except ValueError:
+    AUDIO_STT_CHUNK_DURATION = 300
+
+# Chunks transcribed at once: worker processes for the local whisper model,
+# requests in flight for the external engines. Each local worker loads its own
+# copy of the model, so more than 1 multiplies its memory use.
+try:
+    AUDIO_STT_WORKERS = max(1, int(os.environ.get("AUDIO_STT_WORKERS", "1")))
+except ValueError:
+    AUDIO_STT_WORKERS = 1
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
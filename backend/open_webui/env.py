@@ -348,6 +348,8 @@ DATABASE_ENABLE_SQLITE_WAL = (
     os.environ.get("DATABASE_ENABLE_SQLITE_WAL", "False").lower() == "true"
 )
 
+# Minimum number of seconds between two `last_active_at` updates of the same
+# user. Unset, every request records activity (still written in batches).
 DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = os.environ.get(
     "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", None
 )
@@ -359,6 +361,34 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Pending `last_active_at` updates are written in one batch at this interval (seconds)
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "10"
+)
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = float(
+        DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+    )
+except Exception:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 10.0
+
+# Seconds an authenticated user is served from cache instead of the database.
+# Updates on this replica invalidate immediately; other replicas see them after
+# at most this long. Set to 0 to disable.
+USER_CACHE_TTL = os.environ.get("USER_CACHE_TTL", "10")
+try:
+    USER_CACHE_TTL = float(USER_CACHE_TTL)
+except Exception:
+    USER_CACHE_TTL = 10.0
+
+# Seconds a task model response (autocomplete, query and emoji generation) is
+# reused for an identical prompt from the same user. Set to 0 to disable.
+TASK_RESPONSE_CACHE_TTL = os.environ.get("TASK_RESPONSE_CACHE_TTL", "60")
+try:
+    TASK_RESPONSE_CACHE_TTL = float(TASK_RESPONSE_CACHE_TTL)
+except Exception:
+    TASK_RESPONSE_CACHE_TTL = 60.0
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -390,6 +420,14 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Upper bound (seconds) for a config change made on another replica to become
+# visible when its pub/sub invalidation was missed
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "5")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(REDIS_CONFIG_SYNC_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 5.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -536,6 +574,70 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# Seconds between background refreshes of the base model catalog. Requests are
+# served from the last catalog while it is refreshed. Set to 0 to discover
+# models on every request instead.
+try:
+    MODELS_CATALOG_REFRESH_INTERVAL = int(
+        os.environ.get("MODELS_CATALOG_REFRESH_INTERVAL", "60")
+    )
+except ValueError:
+    MODELS_CATALOG_REFRESH_INTERVAL = 60
+
+# Seconds a request waits for the first model discovery after startup; past
+# that it is served without base models while discovery goes on
+try:
+    MODELS_CATALOG_COLD_START_TIMEOUT = float(
+        os.environ.get("MODELS_CATALOG_COLD_START_TIMEOUT", "5")
+    )
+except ValueError:
+    MODELS_CATALOG_COLD_START_TIMEOUT = 5.0
+
+# Seconds the last successful model list of an upstream is reused while it fails
+try:
+    MODELS_LAST_GOOD_TTL = int(os.environ.get("MODELS_LAST_GOOD_TTL", "3600"))
+except ValueError:
+    MODELS_LAST_GOOD_TTL = 3600
+
+# How requests are spread across Ollama backends serving the same model:
+# "least_outstanding" (load aware) or "random"
+OLLAMA_LOAD_BALANCING_STRATEGY = os.environ.get(
+    "OLLAMA_LOAD_BALANCING_STRATEGY", "least_outstanding"
+).lower()
+
+# Route requests of the same chat to the same backend to reuse its KV cache
+ENABLE_OLLAMA_CHAT_AFFINITY = (
+    os.environ.get("ENABLE_OLLAMA_CHAT_AFFINITY", "True").lower() == "true"
+)
+
+# Consecutive failures before a backend is ejected, and for how many seconds
+try:
+    OLLAMA_EJECTION_FAILURES = int(os.environ.get("OLLAMA_EJECTION_FAILURES", "3"))
+except ValueError:
+    OLLAMA_EJECTION_FAILURES = 3
+
+try:
+    OLLAMA_EJECTION_TIME = float(os.environ.get("OLLAMA_EJECTION_TIME", "30"))
+except ValueError:
+    OLLAMA_EJECTION_TIME = 30.0
+
+
+####################################
+# ACCESS CONTROL
+####################################
+
+# Seconds a user's groups and resolved permissions are reused across requests.
+# Group changes invalidate the cache immediately, and on other replicas through
+# Redis when it is configured. Set to 0 to only cache per request.
+PRINCIPAL_CACHE_TTL = os.environ.get("PRINCIPAL_CACHE_TTL", "10")
+if PRINCIPAL_CACHE_TTL == "":
+    PRINCIPAL_CACHE_TTL = 0
+else:
+    try:
+        PRINCIPAL_CACHE_TTL = int(PRINCIPAL_CACHE_TTL)
+    except Exception:
+        PRINCIPAL_CACHE_TTL = 10
+
 
 ####################################
 # CHAT
@@ -611,6 +713,53 @@ AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
 
+# Connection pools shared by all requests to the same upstream (base URL)
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "100"))
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 100
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
+try:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = int(
+        os.environ.get("AIOHTTP_CLIENT_DNS_CACHE_TTL", "300")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = 300
+
+# Requests in flight per external document loader engine (Tika, Docling, ...)
+try:
+    DOCUMENT_LOADER_MAX_CONCURRENCY = max(
+        1, int(os.environ.get("DOCUMENT_LOADER_MAX_CONCURRENCY", "4"))
+    )
+except ValueError:
+    DOCUMENT_LOADER_MAX_CONCURRENCY = 4
+
+# Seconds a document waits for an external loader (upload, polling and all),
+# empty to wait indefinitely
+DOCUMENT_LOADER_TIMEOUT = os.environ.get("DOCUMENT_LOADER_TIMEOUT", "600")
+
+if DOCUMENT_LOADER_TIMEOUT == "":
+    DOCUMENT_LOADER_TIMEOUT = None
+else:
+    try:
+        DOCUMENT_LOADER_TIMEOUT = int(DOCUMENT_LOADER_TIMEOUT)
+    except Exception:
+        DOCUMENT_LOADER_TIMEOUT = 600
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -644,6 +793,24 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds a downloaded OpenAPI tool server spec is used before it is revalidated
+# (with ETag / Last-Modified, so unchanged specs are not downloaded again)
+try:
+    TOOL_SERVER_SPEC_CACHE_TTL = int(
+        os.environ.get("TOOL_SERVER_SPEC_CACHE_TTL", "300")
+    )
+except ValueError:
+    TOOL_SERVER_SPEC_CACHE_TTL = 300
+
+# Seconds between background refreshes of the tool server specs. Set to 0 to
+# refresh them on demand instead.
+try:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = int(
+        os.environ.get("TOOL_SERVER_SPEC_REFRESH_INTERVAL", "300")
+    )
+except ValueError:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = 300
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -807,6 +974,48 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
 PIP_OPTIONS = os.getenv("PIP_OPTIONS", "").split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv("PIP_PACKAGE_INDEX_OPTIONS", "").split()
 
+# Seconds a loaded tool/function module is reused before checking whether its
+# source changed (on another replica). Set to 0 to check on every use.
+try:
+    PLUGIN_MODULE_CACHE_CHECK_INTERVAL = float(
+        os.environ.get("PLUGIN_MODULE_CACHE_CHECK_INTERVAL", "5")
+    )
+except ValueError:
+    PLUGIN_MODULE_CACHE_CHECK_INTERVAL = 5.0
+
+
+####################################
+# CODE INTERPRETER (JUPYTER) KERNEL POOL
+####################################
+
+# Reuse kernels across executions: one kernel per chat (so state persists
+# between turns) plus a few pre-started spares per Jupyter server.
+ENABLE_JUPYTER_KERNEL_POOL = (
+    os.environ.get("ENABLE_JUPYTER_KERNEL_POOL", "True").lower() == "true"
+)
+
+# Idle kernels kept started ahead of time, per Jupyter server
+try:
+    JUPYTER_KERNEL_POOL_SIZE = int(os.environ.get("JUPYTER_KERNEL_POOL_SIZE", "1"))
+except ValueError:
+    JUPYTER_KERNEL_POOL_SIZE = 1
+
+# Chat kernels a single user may hold; the least recently used is shut down
+try:
+    JUPYTER_KERNEL_MAX_PER_USER = int(
+        os.environ.get("JUPYTER_KERNEL_MAX_PER_USER", "3")
+    )
+except ValueError:
+    JUPYTER_KERNEL_MAX_PER_USER = 3
+
+# Seconds a chat kernel may stay unused before it is shut down
+try:
+    JUPYTER_KERNEL_IDLE_TIMEOUT = int(
+        os.environ.get("JUPYTER_KERNEL_IDLE_TIMEOUT", "900")
+    )
+except ValueError:
+    JUPYTER_KERNEL_IDLE_TIMEOUT = 900
+
 
 ####################################
 # PROGRESSIVE WEB APP OPTIONS
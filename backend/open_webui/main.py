@@ -403,12 +403,15 @@ from open_webui.config import (
     ENABLE_TAGS_GENERATION,
     ENABLE_TITLE_GENERATION,
     ENABLE_FOLLOW_UP_GENERATION,
+    ENABLE_CHAT_METADATA_GENERATION,
     ENABLE_SEARCH_QUERY_GENERATION,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
     ENABLE_AUTOCOMPLETE_GENERATION,
     TITLE_GENERATION_PROMPT_TEMPLATE,
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     TAGS_GENERATION_PROMPT_TEMPLATE,
+    CHAT_METADATA_GENERATION_PROMPT_TEMPLATE,
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS,
     IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
     QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -453,11 +456,14 @@ from open_webui.env import (
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
+    MODELS_CATALOG_REFRESH_INTERVAL,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
 )
 
 
 from open_webui.utils.models import (
     get_all_models,
+    periodic_model_catalog_sync,
     get_all_base_models,
     check_model_access,
     get_filtered_models,
@@ -469,7 +475,11 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import (
+    has_access,
+    start_principal_scope,
+    end_principal_scope,
+)
 
 from open_webui.utils.auth import (
     get_license_data,
@@ -477,6 +487,7 @@ from open_webui.utils.auth import (
     decode_token,
     get_admin_user,
     get_verified_user,
+    periodic_user_last_active_flush,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
 from open_webui.utils.oauth import (
@@ -487,6 +498,10 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.upstream import Upstreams
+from open_webui.utils.loader_client import ExternalLoaders
+from open_webui.utils.tools import periodic_tool_servers_refresh
+from open_webui.utils.code_interpreter import KernelPools, periodic_kernel_pool_reaper
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -578,33 +593,74 @@ async def lifespan(app: FastAPI):
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    app.state.user_last_active_flush = asyncio.create_task(
+        periodic_user_last_active_flush()
+    )
 
-    if app.state.config.ENABLE_BASE_MODELS_CACHE:
-        await get_all_models(
-            Request(
-                # Creating a mock request object to pass to get_all_models
-                {
-                    "type": "http",
-                    "asgi.version": "3.0",
-                    "asgi.spec_version": "2.0",
-                    "method": "GET",
-                    "path": "/internal",
-                    "query_string": b"",
-                    "headers": Headers({}).raw,
-                    "client": ("127.0.0.1", 12345),
-                    "server": ("127.0.0.1", 80),
-                    "scheme": "http",
-                    "app": app,
-                }
-            ),
-            None,
+    # Shared connection pools for Ollama / OpenAI upstreams, opened lazily
+    app.state.upstreams = Upstreams
+
+    # Jupyter kernels kept per chat for the code interpreter, started lazily
+    app.state.kernel_pools = KernelPools
+    app.state.kernel_pool_reaper = asyncio.create_task(periodic_kernel_pool_reaper())
+
+    # Creating a mock request object to pass to get_all_models
+    internal_request = Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "GET",
+            "path": "/internal",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+    if MODELS_CATALOG_REFRESH_INTERVAL > 0:
+        # Discover models in the background so slow upstreams never hold up
+        # startup or requests
+        app.state.model_catalog_sync = asyncio.create_task(
+            periodic_model_catalog_sync(internal_request)
+        )
+    elif app.state.config.ENABLE_BASE_MODELS_CACHE:
+        await get_all_models(internal_request, None)
+
+    if TOOL_SERVER_SPEC_REFRESH_INTERVAL > 0:
+        app.state.tool_servers_refresh = asyncio.create_task(
+            periodic_tool_servers_refresh(internal_request)
         )
 
     yield
 
+    if hasattr(app.state, "model_catalog_sync"):
+        app.state.model_catalog_sync.cancel()
+
+    if hasattr(app.state, "tool_servers_refresh"):
+        app.state.tool_servers_refresh.cancel()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    app.state.user_last_active_flush.cancel()
+    try:
+        await app.state.user_last_active_flush
+    except asyncio.CancelledError:
+        pass
+
+    app.state.kernel_pool_reaper.cancel()
+    await app.state.kernel_pools.close()
+
+    await app.state.upstreams.close()
+
+    # Pooled sessions and loops of the external document loaders and STT engines
+    await asyncio.to_thread(ExternalLoaders.close)
+    await asyncio.to_thread(audio.SpeechToTextClient.close)
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -681,6 +737,7 @@ app.state.OPENAI_MODELS = {}
 
 app.state.config.TOOL_SERVER_CONNECTIONS = TOOL_SERVER_CONNECTIONS
 app.state.TOOL_SERVERS = []
+app.state.TOOL_SERVERS_UPDATED_AT = None
 
 ########################################
 #
@@ -794,10 +851,10 @@ app.state.EXTERNAL_PWA_MANIFEST_URL = EXTERNAL_PWA_MANIFEST_URL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
+app.state.TOOL_VERSIONS = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
 
 ########################################
 #
@@ -1144,6 +1201,7 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_CHAT_METADATA_GENERATION = ENABLE_CHAT_METADATA_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
@@ -1154,6 +1212,12 @@ app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
 app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
 )
+app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE = (
+    CHAT_METADATA_GENERATION_PROMPT_TEMPLATE
+)
+app.state.config.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS = (
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS
+)
 
 app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
@@ -1232,6 +1296,16 @@ async def commit_session_after_request(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def principal_scope(request: Request, call_next):
+    # Resolve each user's groups and permissions at most once per request
+    token = start_principal_scope()
+    try:
+        return await call_next(request)
+    finally:
+        end_principal_scope(token)
+
+
 @app.middleware("http")
 async def check_url(request: Request, call_next):
     start_time = int(time.time())
@@ -1906,6 +1980,12 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
         return {"current": VERSION, "latest": VERSION}
 
 
+@app.get("/api/connections/metrics")
+async def get_connection_metrics(user=Depends(get_admin_user)):
+    """Per-upstream connection pool statistics for Ollama / OpenAI backends."""
+    return app.state.upstreams.get_metrics()
+
+
 @app.get("/api/changelog")
 async def get_app_changelog():
     return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
@@ -0,0 +1,128 @@
+"""Add file_content table and file processing column
+
+Revision ID: a7c4e9d1f3b8
+Revises: f6a3c8d2b5e7
+Create Date: 2025-10-13 10:18:44.902571
+
+"""
+
+import json
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c4e9d1f3b8"
+down_revision: Union[str, None] = "f6a3c8d2b5e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Frozen copy of the app's file data split at this revision
+FILE_PROCESSING_KEYS = ("status", "progress", "error", "processing_details")
+FILE_CONTENT_KEYS = ("content", "chunks")
+
+
+def split_file_data(data):
+    data, processing, content = dict(data or {}), {}, {}
+    for keys, target in (
+        (FILE_PROCESSING_KEYS, processing),
+        (FILE_CONTENT_KEYS, content),
+    ):
+        for key in keys:
+            if key in data:
+                target[key] = data.pop(key)
+    return data, processing, content
+
+
+def get_file_table():
+    return table(
+        "file",
+        column("id", sa.String()),
+        column("data", sa.JSON()),
+        column("processing", sa.JSON()),
+    )
+
+
+def load_json(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def upgrade() -> None:
+    op.add_column("file", sa.Column("processing", sa.JSON(), nullable=True))
+    file_content = op.create_table(
+        "file_content",
+        sa.Column("file_id", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("chunks", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("file_id"),
+    )
+
+    # Move the extracted content and progress out of `data`
+    conn = op.get_bind()
+    file = get_file_table()
+    now = int(time.time())
+    last_id = None
+
+    while True:
+        query = sa.select(file.c.id, file.c.data)
+        if last_id is not None:
+            query = query.where(file.c.id > last_id)
+        files = conn.execute(query.order_by(file.c.id).limit(BATCH_SIZE)).all()
+        if not files:
+            break
+
+        rows = []
+        for file_id, data in files:
+            data, processing, content = split_file_data(load_json(data))
+            if processing or content:
+                conn.execute(
+                    file.update()
+                    .where(file.c.id == file_id)
+                    .values(data=data, processing=processing or None)
+                )
+            if content:
+                rows.append({"file_id": file_id, "updated_at": now, **content})
+
+        if rows:
+            op.bulk_insert(file_content, rows)
+        last_id = files[-1][0]
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    file = get_file_table()
+    file_content = table(
+        "file_content",
+        column("file_id", sa.String()),
+        column("content", sa.Text()),
+        column("chunks", sa.JSON()),
+    )
+
+    for file_id, data, processing, content, chunks in conn.execute(
+        sa.select(
+            file.c.id,
+            file.c.data,
+            file.c.processing,
+            file_content.c.content,
+            file_content.c.chunks,
+        ).select_from(file.outerjoin(file_content, file_content.c.file_id == file.c.id))
+    ).all():
+        if processing is None and content is None and chunks is None:
+            continue
+        data = {**(load_json(data) or {}), **(load_json(processing) or {})}
+        if content is not None:
+            data["content"] = content
+        if chunks is not None:
+            data["chunks"] = load_json(chunks)
+        conn.execute(file.update().where(file.c.id == file_id).values(data=data))
+
+    op.drop_table("file_content")
+    op.drop_column("file", "processing")
@@ -0,0 +1,128 @@
+"""Add access_grant table
+
+Revision ID: b7f3c1d2e4a5
+Revises: a5c220713937
+Create Date: 2025-10-02 10:12:41.318529
+
+"""
+
+import json
+import time
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+from open_webui.migrations.util import get_existing_tables
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f3c1d2e4a5"
+down_revision: Union[str, None] = "a5c220713937"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# resource_type -> (table name, id column)
+RESOURCE_TABLES = {
+    "knowledge": ("knowledge", "id"),
+    "model": ("model", "id"),
+    "tool": ("tool", "id"),
+    "prompt": ("prompt", "command"),
+}
+
+# Frozen copy of the app's access_control -> grants mapping at this revision
+PUBLIC_PRINCIPAL_ID = "*"
+
+
+def access_control_to_grants(access_control):
+    if access_control is None:
+        return [
+            {
+                "principal_type": "user",
+                "principal_id": PUBLIC_PRINCIPAL_ID,
+                "permission": "read",
+            }
+        ]
+
+    grants = []
+    for permission in ("read", "write"):
+        permission_access = access_control.get(permission) or {}
+        for principal_type, key in (("group", "group_ids"), ("user", "user_ids")):
+            for principal_id in set(permission_access.get(key) or []):
+                grants.append(
+                    {
+                        "principal_type": principal_type,
+                        "principal_id": principal_id,
+                        "permission": permission,
+                    }
+                )
+    return grants
+
+
+def upgrade() -> None:
+    access_grant = op.create_table(
+        "access_grant",
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("resource_type", sa.Text(), nullable=False),
+        sa.Column("resource_id", sa.Text(), nullable=False),
+        sa.Column("principal_type", sa.Text(), nullable=False),
+        sa.Column("principal_id", sa.Text(), nullable=False),
+        sa.Column("permission", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_index(
+        "idx_access_grant_resource",
+        "access_grant",
+        ["resource_type", "resource_id"],
+    )
+    op.create_index(
+        "idx_access_grant_principal",
+        "access_grant",
+        ["resource_type", "permission", "principal_type", "principal_id"],
+    )
+
+    # Backfill grants from the existing access_control JSON columns
+    conn = op.get_bind()
+    existing_tables = get_existing_tables()
+    now = int(time.time())
+
+    for resource_type, (table_name, id_column) in RESOURCE_TABLES.items():
+        if table_name not in existing_tables:
+            continue
+
+        resource = table(
+            table_name,
+            column(id_column, sa.Text()),
+            column("access_control", sa.JSON()),
+        )
+
+        rows = []
+        for row in conn.execute(
+            sa.select(resource.c[id_column], resource.c.access_control)
+        ):
+            access_control = row.access_control
+            if isinstance(access_control, str):
+                access_control = json.loads(access_control)
+
+            for grant in access_control_to_grants(access_control):
+                rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "resource_type": resource_type,
+                        "resource_id": row[0],
+                        "created_at": now,
+                        **grant,
+                    }
+                )
+
+        if rows:
+            op.bulk_insert(access_grant, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_access_grant_principal", table_name="access_grant")
+    op.drop_index("idx_access_grant_resource", table_name="access_grant")
+    op.drop_table("access_grant")
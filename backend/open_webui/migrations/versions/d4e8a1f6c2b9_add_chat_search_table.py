@@ -0,0 +1,217 @@
+"""Add chat_search table
+
+Revision ID: d4e8a1f6c2b9
+Revises: b7f3c1d2e4a5
+Create Date: 2025-10-06 09:41:27.503118
+
+"""
+
+import json
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8a1f6c2b9"
+down_revision: Union[str, None] = "b7f3c1d2e4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Frozen copies of the app's chat_search index and documents at this revision
+SQLITE_FTS_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5(
+        title, content,
+        content='chat_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat_search BEGIN
+        INSERT INTO chat_search_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat_search BEGIN
+        INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE ON chat_search BEGIN
+        INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO chat_search_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_FTS_DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS chat_search_ai",
+    "DROP TRIGGER IF EXISTS chat_search_ad",
+    "DROP TRIGGER IF EXISTS chat_search_au",
+    "DROP TABLE IF EXISTS chat_search_fts",
+]
+
+POSTGRES_STATEMENTS = [
+    """
+    ALTER TABLE chat_search ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A')
+        || setweight(to_tsvector('simple', content), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_chat_search_vector
+    ON chat_search USING gin (search_vector)
+    """,
+]
+
+POSTGRES_TRIGRAM_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS idx_chat_search_trgm
+    ON chat_search USING gin ((title || ' ' || content) gin_trgm_ops)
+    """,
+]
+
+
+def create_chat_search_index(conn) -> None:
+    if conn.dialect.name == "sqlite":
+        try:
+            for statement in SQLITE_FTS_STATEMENTS:
+                conn.execute(sa.text(statement))
+            conn.execute(
+                sa.text(
+                    "INSERT INTO chat_search_fts(chat_search_fts) VALUES ('rebuild')"
+                )
+            )
+        except Exception as e:
+            print(f"FTS5 is not available, chat search will use LIKE: {e}")
+    elif conn.dialect.name == "postgresql":
+        for statement in POSTGRES_STATEMENTS:
+            conn.execute(sa.text(statement))
+        try:
+            with conn.begin_nested():
+                for statement in POSTGRES_TRIGRAM_STATEMENTS:
+                    conn.execute(sa.text(statement))
+        except Exception as e:
+            print(f"pg_trgm is not available, skipping the trigram index: {e}")
+
+
+def get_message_text(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "")
+            for part in content
+            if isinstance(part, dict) and part.get("type") == "text"
+        )
+    return ""
+
+
+def get_chat_search_documents(chat: dict) -> dict:
+    documents = {"": (chat.get("title") or "", "")}
+
+    messages = (chat.get("history") or {}).get("messages") or {}
+    if not messages:
+        messages = {
+            message.get("id") or str(idx): message
+            for idx, message in enumerate(chat.get("messages") or [])
+            if isinstance(message, dict)
+        }
+
+    for message_id, message in messages.items():
+        if not isinstance(message, dict):
+            continue
+        content = get_message_text(message).replace("\x00", "")
+        if content.strip():
+            documents[message_id] = ("", content)
+    return documents
+
+
+def upgrade() -> None:
+    chat_search = op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("message_id", sa.Text(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False, server_default=""),
+        sa.Column("content", sa.Text(), nullable=False, server_default=""),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_index(
+        "idx_chat_search_chat_message",
+        "chat_search",
+        ["chat_id", "message_id"],
+        unique=True,
+    )
+    op.create_index("idx_chat_search_user_id", "chat_search", ["user_id"])
+
+    # Backfill from the existing chats; shared copies are never searched
+    conn = op.get_bind()
+    chat = table(
+        "chat",
+        column("id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("chat", sa.JSON()),
+    )
+    now = int(time.time())
+    last_id = None
+
+    while True:
+        query = sa.select(chat.c.id, chat.c.user_id, chat.c.chat).where(
+            ~chat.c.user_id.like("shared-%")
+        )
+        if last_id is not None:
+            query = query.where(chat.c.id > last_id)
+        chats = conn.execute(query.order_by(chat.c.id).limit(BATCH_SIZE)).all()
+        if not chats:
+            break
+
+        rows = []
+        for chat_id, user_id, data in chats:
+            if isinstance(data, str):
+                data = json.loads(data)
+            for message_id, (title, content) in get_chat_search_documents(
+                data or {}
+            ).items():
+                rows.append(
+                    {
+                        "chat_id": chat_id,
+                        "user_id": user_id,
+                        "message_id": message_id,
+                        "title": title,
+                        "content": content,
+                        "updated_at": now,
+                    }
+                )
+
+        op.bulk_insert(chat_search, rows)
+        last_id = chats[-1][0]
+
+    # Indexed once the rows are in, which is faster than row by row
+    create_chat_search_index(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        for statement in SQLITE_FTS_DROP_STATEMENTS:
+            op.execute(statement)
+
+    op.drop_index("idx_chat_search_user_id", table_name="chat_search")
+    op.drop_index("idx_chat_search_chat_message", table_name="chat_search")
+    op.drop_table("chat_search")
@@ -0,0 +1,26 @@
+"""Add chat list index
+
+Revision ID: e5f2b9c3a7d1
+Revises: d4e8a1f6c2b9
+Create Date: 2025-10-08 10:12:44.218907
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e5f2b9c3a7d1"
+down_revision = "d4e8a1f6c2b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # WHERE user_id = ... ORDER BY updated_at DESC, id DESC (keyset pagination)
+    op.create_index(
+        "user_id_updated_at_id_idx", "chat", ["user_id", "updated_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("user_id_updated_at_id_idx", table_name="chat")
@@ -0,0 +1,38 @@
+"""Add message indexes
+
+Revision ID: f6a3c8d2b5e7
+Revises: e5f2b9c3a7d1
+Create Date: 2025-10-09 14:27:05.731642
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f6a3c8d2b5e7"
+down_revision = "e5f2b9c3a7d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Message table indexes
+    op.create_index(
+        "message_channel_id_parent_id_created_at_idx",
+        "message",
+        ["channel_id", "parent_id", "created_at"],
+    )
+    op.create_index(
+        "message_parent_id_created_at_idx", "message", ["parent_id", "created_at"]
+    )
+
+    # Message reaction table index
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("message_channel_id_parent_id_created_at_idx", table_name="message")
+    op.drop_index("message_parent_id_created_at_idx", table_name="message")
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
@@ -0,0 +1,204 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Text, Index, and_, or_, select
+from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Principal id used for resources without access control (`access_control` is
+# `None`), which every user can read.
+PUBLIC_PRINCIPAL_ID = "*"
+
+####################
+# AccessGrant DB Schema
+####################
+
+
+class AccessGrant(Base):
+    __tablename__ = "access_grant"
+
+    id = Column(Text, primary_key=True)
+
+    resource_type = Column(Text, nullable=False)  # knowledge, model, tool, prompt
+    resource_id = Column(Text, nullable=False)
+
+    principal_type = Column(Text, nullable=False)  # user, group
+    principal_id = Column(Text, nullable=False)  # "*" for public resources
+
+    permission = Column(Text, nullable=False)  # read, write
+
+    created_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("idx_access_grant_resource", "resource_type", "resource_id"),
+        Index(
+            "idx_access_grant_principal",
+            "resource_type",
+            "permission",
+            "principal_type",
+            "principal_id",
+        ),
+    )
+
+
+class AccessGrantModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    resource_type: str
+    resource_id: str
+    principal_type: str
+    principal_id: str
+    permission: str
+    created_at: int  # timestamp in epoch
+
+
+####################
+# Helpers
+####################
+
+
+def access_control_to_grants(access_control: Optional[dict]) -> list[dict]:
+    """
+    Flattens an `access_control` JSON value into (principal, permission) rows.
+
+    - `None`: public, readable by everyone (write stays owner only).
+    - `{}`: private, no grants; only the owner has access.
+    - Custom permissions: one row per listed user or group and permission.
+    """
+    if access_control is None:
+        return [
+            {
+                "principal_type": "user",
+                "principal_id": PUBLIC_PRINCIPAL_ID,
+                "permission": "read",
+            }
+        ]
+
+    grants = []
+    for permission in ("read", "write"):
+        permission_access = access_control.get(permission) or {}
+        for principal_type, key in (("group", "group_ids"), ("user", "user_ids")):
+            for principal_id in set(permission_access.get(key) or []):
+                grants.append(
+                    {
+                        "principal_type": principal_type,
+                        "principal_id": principal_id,
+                        "permission": permission,
+                    }
+                )
+    return grants
+
+
+class AccessGrantsTable:
+    def set_access_grants(
+        self,
+        resource_type: str,
+        resource_id: str,
+        access_control: Optional[dict],
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        Replaces the grants of a resource with the ones described by its
+        `access_control`. When `db` is given the rows are added to that session
+        so they are committed together with the resource itself.
+        """
+        if db is None:
+            with get_db() as db:
+                self.set_access_grants(resource_type, resource_id, access_control, db)
+                db.commit()
+            return
+
+        db.query(AccessGrant).filter_by(
+            resource_type=resource_type, resource_id=resource_id
+        ).delete()
+
+        now = int(time.time())
+        for grant in access_control_to_grants(access_control):
+            db.add(
+                AccessGrant(
+                    id=str(uuid.uuid4()),
+                    resource_type=resource_type,
+                    resource_id=resource_id,
+                    created_at=now,
+                    **grant,
+                )
+            )
+
+    def delete_access_grants(
+        self,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Deletes the grants of a resource, or of every resource of a type."""
+        if db is None:
+            with get_db() as db:
+                self.delete_access_grants(resource_type, resource_id, db)
+                db.commit()
+            return
+
+        query = db.query(AccessGrant).filter_by(resource_type=resource_type)
+        if resource_id is not None:
+            query = query.filter_by(resource_id=resource_id)
+        query.delete()
+
+    def get_access_grants_by_resource(
+        self, resource_type: str, resource_id: str
+    ) -> list[AccessGrantModel]:
+        with get_db() as db:
+            return [
+                AccessGrantModel.model_validate(grant)
+                for grant in db.query(AccessGrant)
+                .filter_by(resource_type=resource_type, resource_id=resource_id)
+                .all()
+            ]
+
+    def has_access_filter(
+        self,
+        resource_type: str,
+        resource_id_column,
+        owner_column,
+        user_id: str,
+        permission: str,
+        user_group_ids: set[str],
+    ):
+        """
+        Builds a SQL filter matching the resources `user_id` can access with
+        `permission`; mirrors `has_access` (strict) plus the owner check done
+        by the list endpoints.
+        """
+        principal_filter = and_(
+            AccessGrant.principal_type == "user",
+            AccessGrant.principal_id.in_([user_id, PUBLIC_PRINCIPAL_ID]),
+        )
+        if user_group_ids:
+            principal_filter = or_(
+                principal_filter,
+                and_(
+                    AccessGrant.principal_type == "group",
+                    AccessGrant.principal_id.in_(list(user_group_ids)),
+                ),
+            )
+
+        granted_resource_ids = select(AccessGrant.resource_id).where(
+            AccessGrant.resource_type == resource_type,
+            AccessGrant.permission == permission,
+            principal_filter,
+        )
+
+        return or_(
+            owner_column == user_id,
+            resource_id_column.in_(granted_resource_ids),
+        )
+
+
+AccessGrants = AccessGrantsTable()
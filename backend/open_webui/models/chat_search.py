@@ -0,0 +1,557 @@
+import html
+import logging
+import re
+import time
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    Integer,
+    Text,
+    Index,
+    bindparam,
+    insert,
+    text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Placeholders wrapped around matched terms by ts_headline (PostgreSQL),
+# swapped for <mark> tags once the rest of the snippet has been escaped.
+SNIPPET_START = "\ue000"
+SNIPPET_END = "\ue001"
+SNIPPET_TOKENS = 16
+
+####################
+# ChatSearch DB Schema
+####################
+
+
+class ChatSearch(Base):
+    """
+    Search documents of a chat: one row for its title (`message_id` "") and
+    one per message with text content. SQLite indexes the rows with the
+    `chat_search_fts` FTS5 table, PostgreSQL with a generated `search_vector`
+    tsvector column; both are created by the migration.
+    """
+
+    __tablename__ = "chat_search"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    chat_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    message_id = Column(Text, nullable=False)
+
+    title = Column(Text, nullable=False, default="")
+    content = Column(Text, nullable=False, default="")
+
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("idx_chat_search_chat_message", "chat_id", "message_id", unique=True),
+        Index("idx_chat_search_user_id", "user_id"),
+    )
+
+
+SQLITE_FTS_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5(
+        title, content,
+        content='chat_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat_search BEGIN
+        INSERT INTO chat_search_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat_search BEGIN
+        INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE ON chat_search BEGIN
+        INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO chat_search_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_FTS_TRIGGER_DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS chat_search_ai",
+    "DROP TRIGGER IF EXISTS chat_search_ad",
+    "DROP TRIGGER IF EXISTS chat_search_au",
+]
+
+SQLITE_FTS_DROP_STATEMENTS = [
+    *SQLITE_FTS_TRIGGER_DROP_STATEMENTS,
+    "DROP TABLE IF EXISTS chat_search_fts",
+]
+
+POSTGRES_STATEMENTS = [
+    """
+    ALTER TABLE chat_search ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A')
+        || setweight(to_tsvector('simple', content), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_chat_search_vector
+    ON chat_search USING gin (search_vector)
+    """,
+]
+
+# Optional: lets searches also match inside words, as the LIKE scans did
+POSTGRES_TRIGRAM_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS idx_chat_search_trgm
+    ON chat_search USING gin ((title || ' ' || content) gin_trgm_ops)
+    """,
+]
+
+
+def create_chat_search_index(conn: Connection) -> None:
+    """
+    Creates the dialect specific full-text index over the `chat_search` rows,
+    including the existing ones. Without FTS5 (SQLite) the search falls back to
+    LIKE over `chat_search`, without pg_trgm (PostgreSQL) to word prefixes only.
+    """
+    if conn.dialect.name == "sqlite":
+        try:
+            for statement in SQLITE_FTS_STATEMENTS:
+                conn.execute(text(statement))
+            conn.execute(
+                text("INSERT INTO chat_search_fts(chat_search_fts) VALUES ('rebuild')")
+            )
+        except Exception as e:
+            log.warning(f"FTS5 is not available, chat search will use LIKE: {e}")
+    elif conn.dialect.name == "postgresql":
+        for statement in POSTGRES_STATEMENTS:
+            conn.execute(text(statement))
+        try:
+            with conn.begin_nested():
+                for statement in POSTGRES_TRIGRAM_STATEMENTS:
+                    conn.execute(text(statement))
+        except Exception as e:
+            log.info(f"pg_trgm is not available, skipping the trigram index: {e}")
+
+
+####################
+# Helpers
+####################
+
+
+def get_message_text(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Multimodal messages: only the text parts are searchable
+        return "\n".join(
+            part.get("text", "")
+            for part in content
+            if isinstance(part, dict) and part.get("type") == "text"
+        )
+    return ""
+
+
+def get_chat_search_documents(chat: dict) -> dict[str, tuple[str, str]]:
+    """Maps the message ids of a chat ("" for its title) to (title, content)."""
+    documents = {"": (chat.get("title") or "", "")}
+
+    messages = (chat.get("history") or {}).get("messages") or {}
+    if not messages:
+        messages = {
+            message.get("id") or str(idx): message
+            for idx, message in enumerate(chat.get("messages") or [])
+            if isinstance(message, dict)
+        }
+
+    for message_id, message in messages.items():
+        if not isinstance(message, dict):
+            continue
+        content = get_message_text(message).replace("\x00", "")
+        if content.strip():
+            documents[message_id] = ("", content)
+    return documents
+
+
+def get_search_terms(search_text: str) -> list[str]:
+    return [word for word in search_text.split() if any(c.isalnum() for c in word)]
+
+
+def get_fts5_query(terms: list[str]) -> str:
+    # Every term as a quoted prefix, all of them required
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def get_tsquery(terms: list[str]) -> str:
+    return " & ".join(
+        "'{}':*".format(term.replace("\\", "\\\\").replace("'", "''")) for term in terms
+    )
+
+
+def escape_snippet(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_END, "</mark>")
+    )
+
+
+def get_snippet(
+    text: str, terms: list[str], word_prefix: bool = True, width: int = 120
+) -> str:
+    """
+    Excerpt of `text` around its first matched term, with the matches wrapped
+    in <mark>. Terms match at the start of words, as the FTS5 prefix queries
+    do, or anywhere with `word_prefix=False` for the LIKE fallback.
+    """
+    text = " ".join(text.split())
+    pattern = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    if word_prefix:
+        # Highlight the whole word, as FTS5 does
+        pattern = rf"\b(?:{pattern})\w*"
+    matches = list(re.finditer(pattern, text, re.IGNORECASE))
+
+    first = matches[0] if matches else None
+    start = max(0, first.start() - width // 3) if first else 0
+    end = min(len(text), start + width)
+
+    # Cut at word boundaries
+    if start > 0:
+        start = text.find(" ", start, first.start()) + 1 or start
+    if end < len(text):
+        space = text.rfind(" ", first.end() if first else start, end)
+        if space != -1:
+            end = space
+
+    parts = []
+    pos = start
+    for match in matches:
+        if match.end() > end:
+            break
+        parts.append(html.escape(text[pos : match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        pos = match.end()
+    parts.append(html.escape(text[pos:end]))
+
+    return (
+        ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+    )
+
+
+CAPABILITY_QUERIES = {
+    "fts5": "SELECT 1 FROM sqlite_master WHERE name = 'chat_search_fts'",
+    "trigram": "SELECT 1 FROM pg_indexes WHERE indexname = 'idx_chat_search_trgm'",
+}
+
+# Seconds a capability is trusted before it is checked again, so that every
+# worker picks up an index created (or rebuilt) by another one
+CAPABILITY_CHECK_INTERVAL = 60
+
+
+class ChatSearchTable:
+    def __init__(self):
+        # Availability of the optional FTS5 table / trigram index, by name:
+        # (available, checked at)
+        self.capabilities = {}
+
+    def has_capability(self, db: Session, name: str) -> bool:
+        capability = self.capabilities.get(name)
+        now = time.monotonic()
+        if capability is None or now - capability[1] >= CAPABILITY_CHECK_INTERVAL:
+            capability = (
+                db.execute(text(CAPABILITY_QUERIES[name])).first() is not None,
+                now,
+            )
+            self.capabilities[name] = capability
+        return capability[0]
+
+    def sync_chat(
+        self,
+        chat_id: str,
+        user_id: str,
+        chat: dict,
+        message_ids: Optional[list[str]] = None,
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        Brings the search rows of a chat in line with its content, touching only
+        the rows whose text changed. With `message_ids`, only those messages
+        (and the title) are compared, for single message upserts.
+        """
+        if db is None:
+            with get_db() as db:
+                self.sync_chat(chat_id, user_id, chat, message_ids, db)
+                db.commit()
+            return
+
+        documents = get_chat_search_documents(chat)
+        keys = None
+        if message_ids is not None:
+            keys = {"", *message_ids}
+            documents = {key: value for key, value in documents.items() if key in keys}
+
+        query = db.query(ChatSearch).filter_by(chat_id=chat_id)
+        if keys is not None:
+            query = query.filter(ChatSearch.message_id.in_(keys))
+
+        now = int(time.time())
+        for row in query.all():
+            document = documents.pop(row.message_id, None)
+            if document is None:
+                db.delete(row)
+            elif (row.title, row.content) != document:
+                row.title, row.content = document
+                row.updated_at = now
+
+        for message_id, (title, content) in documents.items():
+            db.add(
+                ChatSearch(
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    message_id=message_id,
+                    title=title,
+                    content=content,
+                    updated_at=now,
+                )
+            )
+
+    def delete_chat_search_by_chat_ids(
+        self, chat_ids, db: Optional[Session] = None
+    ) -> None:
+        """`chat_ids` can be a list or a select of chat ids."""
+        if db is None:
+            with get_db() as db:
+                self.delete_chat_search_by_chat_ids(chat_ids, db)
+                db.commit()
+            return
+
+        db.query(ChatSearch).filter(ChatSearch.chat_id.in_(chat_ids)).delete(
+            synchronize_session=False
+        )
+
+    def delete_chat_search_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> None:
+        if db is None:
+            with get_db() as db:
+                self.delete_chat_search_by_user_id(user_id, db)
+                db.commit()
+            return
+
+        db.query(ChatSearch).filter_by(user_id=user_id).delete()
+
+    def get_matches_subquery(
+        self, db: Session, user_id: str, search_text: str, terms: list[str]
+    ):
+        """
+        Returns a subquery with the best matching row of each of the user's
+        chats: (chat_id, rank, search_id), lower ranks first.
+        """
+        dialect_name = db.bind.dialect.name
+        columns = {
+            "chat_id": Text(),
+            "rank": Float(),
+            "search_id": Integer(),
+        }
+
+        if dialect_name == "sqlite" and self.has_capability(db, "fts5"):
+            # LIMIT -1 keeps SQLite from flattening the FTS query, which the
+            # bm25() auxiliary function requires; the bare search_id column
+            # is taken from the row with the lowest rank.
+            query = text(
+                """
+                SELECT chat_search.chat_id AS chat_id,
+                       MIN(matches.rank) AS rank,
+                       chat_search.id AS search_id
+                FROM (
+                    SELECT rowid, bm25(chat_search_fts, 10.0, 1.0) AS rank
+                    FROM chat_search_fts
+                    WHERE chat_search_fts MATCH :match
+                    LIMIT -1
+                ) AS matches
+                JOIN chat_search ON chat_search.id = matches.rowid
+                WHERE chat_search.user_id = :user_id
+                GROUP BY chat_search.chat_id
+                """
+            ).bindparams(match=get_fts5_query(terms), user_id=user_id)
+        elif dialect_name == "sqlite":
+            like_filter = " AND ".join(
+                f"LOWER(chat_search.title || ' ' || chat_search.content) LIKE :term_{idx}"
+                for idx in range(len(terms))
+            )
+            query = text(
+                f"""
+                SELECT chat_search.chat_id AS chat_id,
+                       MIN(CASE WHEN chat_search.message_id = '' THEN 0 ELSE 1 END) AS rank,
+                       MIN(chat_search.id) AS search_id
+                FROM chat_search
+                WHERE chat_search.user_id = :user_id AND {like_filter}
+                GROUP BY chat_search.chat_id
+                """
+            ).bindparams(
+                user_id=user_id,
+                **{f"term_{idx}": f"%{term}%" for idx, term in enumerate(terms)},
+            )
+        elif dialect_name == "postgresql":
+            trigram_filter = (
+                "OR (chat_search.title || ' ' || chat_search.content) ILIKE :like"
+                if self.has_capability(db, "trigram")
+                else ""
+            )
+            query = text(
+                f"""
+                SELECT DISTINCT ON (chat_search.chat_id)
+                       chat_search.chat_id AS chat_id,
+                       -ts_rank_cd(chat_search.search_vector, to_tsquery('simple', :tsquery)) AS rank,
+                       chat_search.id AS search_id
+                FROM chat_search
+                WHERE chat_search.user_id = :user_id
+                  AND (
+                    chat_search.search_vector @@ to_tsquery('simple', :tsquery)
+                    {trigram_filter}
+                  )
+                ORDER BY chat_search.chat_id, rank
+                """
+            ).bindparams(tsquery=get_tsquery(terms), user_id=user_id)
+            if trigram_filter:
+                query = query.bindparams(like=f"%{search_text}%")
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+        return query.columns(**columns).subquery("matches")
+
+    def get_snippets(
+        self, db: Session, search_ids: list[int], terms: list[str]
+    ) -> dict[int, str]:
+        """
+        Highlighted excerpts (HTML, matched terms in <mark>) of the given
+        search rows, computed for one page of results only.
+        """
+        search_ids = [search_id for search_id in search_ids if search_id is not None]
+        if not search_ids:
+            return {}
+
+        if db.bind.dialect.name == "postgresql":
+            query = text(
+                """
+                SELECT id, ts_headline(
+                    'simple',
+                    CASE WHEN message_id = '' THEN title ELSE content END,
+                    to_tsquery('simple', :tsquery),
+                    :options
+                )
+                FROM chat_search
+                WHERE id IN :search_ids
+                """
+            ).bindparams(
+                bindparam("search_ids", value=search_ids, expanding=True),
+                tsquery=get_tsquery(terms),
+                options=(
+                    f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, "
+                    f"MaxWords={SNIPPET_TOKENS}, MinWords={SNIPPET_TOKENS // 2}"
+                ),
+            )
+            return {row[0]: escape_snippet(row[1]) for row in db.execute(query)}
+
+        # FTS5's snippet() re-runs the full-text query for every row it is
+        # asked about, so the excerpts are cut here instead
+        word_prefix = self.has_capability(db, "fts5")
+        return {
+            row.id: get_snippet(
+                row.title if row.message_id == "" else row.content,
+                terms,
+                word_prefix=word_prefix,
+            )
+            for row in db.query(ChatSearch).filter(ChatSearch.id.in_(search_ids))
+        }
+
+    def rebuild_index(self, batch_size: int = 500) -> int:
+        """
+        Recreates the search rows of every chat (shared copies excluded) and
+        the full-text index over them. Returns the number of chats indexed.
+
+        Everything happens in one transaction: other workers keep searching
+        the previous index until it commits, and chat writes wait for it.
+        """
+        from open_webui.models.chats import Chat
+
+        with get_db() as db:
+            is_sqlite = db.bind.dialect.name == "sqlite"
+            if is_sqlite:
+                # pysqlite runs DDL outside of transactions unless one was
+                # begun; IMMEDIATE takes the write lock for the whole rebuild
+                db.execute(text("BEGIN IMMEDIATE"))
+                # Indexing everything at the end is much faster than per row
+                # through the triggers
+                for statement in SQLITE_FTS_TRIGGER_DROP_STATEMENTS:
+                    db.execute(text(statement))
+            else:
+                create_chat_search_index(db.connection())
+            db.query(ChatSearch).delete()
+
+            count = 0
+            last_id = None
+            while True:
+                query = db.query(Chat.id, Chat.user_id, Chat.chat).filter(
+                    ~Chat.user_id.like("shared-%")
+                )
+                if last_id is not None:
+                    query = query.filter(Chat.id > last_id)
+                chats = query.order_by(Chat.id).limit(batch_size).all()
+                if not chats:
+                    break
+
+                now = int(time.time())
+                db.execute(
+                    insert(ChatSearch),
+                    [
+                        {
+                            "chat_id": chat_id,
+                            "user_id": user_id,
+                            "message_id": message_id,
+                            "title": title,
+                            "content": content,
+                            "updated_at": now,
+                        }
+                        for chat_id, user_id, chat in chats
+                        for message_id, (title, content) in get_chat_search_documents(
+                            chat or {}
+                        ).items()
+                    ],
+                )
+
+                count += len(chats)
+                last_id = chats[-1][0]
+                log.info(f"Indexed {count} chats for search")
+
+            if is_sqlite:
+                create_chat_search_index(db.connection())
+            db.commit()
+            self.capabilities = {}
+
+            return count
+
+
+ChatSearches = ChatSearchTable()
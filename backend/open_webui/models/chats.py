@@ -6,14 +6,14 @@ from typing import Optional
 
 from open_webui.internal.db import Base, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
+from open_webui.models.chat_search import ChatSearches, get_search_terms
 from open_webui.models.folders import Folders
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, literal, text
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
 
 ####################
 # Chat DB Schema
@@ -51,6 +51,8 @@ class Chat(Base):
         Index("user_id_archived_idx", "user_id", "archived"),
         # WHERE user_id = ... ORDER BY updated_at DESC
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
+        # WHERE user_id = ... ORDER BY updated_at DESC, id DESC (keyset pages)
+        Index("user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
     )
@@ -120,6 +122,72 @@ class ChatTitleIdResponse(BaseModel):
     title: str
     updated_at: int
     created_at: int
+    pinned: Optional[bool] = False
+    folder_id: Optional[str] = None
+
+
+class ChatSearchResponse(ChatTitleIdResponse):
+    # Best matching excerpt as HTML, matched terms wrapped in <mark>
+    snippet: Optional[str] = None
+
+
+# Columns of the chat lists; the `chat` JSON column is never loaded for them
+CHAT_LIST_COLUMNS = (
+    Chat.id,
+    Chat.title,
+    Chat.updated_at,
+    Chat.created_at,
+    Chat.pinned,
+    Chat.folder_id,
+)
+
+
+def get_chat_list_cursor(chat: ChatTitleIdResponse) -> str:
+    """Cursor of the page following `chat`, the last chat of a page."""
+    return f"{chat.updated_at}:{chat.id}"
+
+
+def parse_chat_list_cursor(cursor: str) -> tuple[int, str]:
+    """
+    Splits a cursor from `get_chat_list_cursor` into (updated_at, id). Raises
+    ValueError if it is malformed.
+    """
+    updated_at, _, id = cursor.partition(":")
+    updated_at = int(updated_at)
+    # Out of range timestamps would overflow the BIGINT comparison
+    if not id or not 0 <= updated_at < 2**63:
+        raise ValueError(f"Invalid chat list cursor: {cursor}")
+    return updated_at, id
+
+
+def paginate_chat_list(
+    query, skip: Optional[int] = None, limit: Optional[int] = None, cursor=None
+):
+    """
+    Orders a chat list query by last update, newest first. With a `cursor`
+    ("<updated_at>:<id>" of the previous page's last chat) the page is found
+    by keyset on (updated_at, id) instead of scanning `skip` rows.
+    """
+    query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+
+    if cursor:
+        updated_at, id = parse_chat_list_cursor(cursor)
+        query = query.filter(
+            or_(
+                Chat.updated_at < updated_at,
+                and_(Chat.updated_at == updated_at, Chat.id < id),
+            )
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def get_chat_list(query) -> list[ChatTitleIdResponse]:
+    return [ChatTitleIdResponse(**chat._mapping) for chat in query.all()]
 
 
 class ChatTable:
@@ -144,6 +212,7 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            ChatSearches.sync_chat(id, user_id, form_data.chat, db=db)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
@@ -181,17 +250,28 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            ChatSearches.sync_chat(id, user_id, form_data.chat, db=db)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
 
-    def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
+    def update_chat_by_id(
+        self, id: str, chat: dict, message_ids: Optional[list[str]] = None
+    ) -> Optional[ChatModel]:
+        """
+        `message_ids` limits the search index update to those messages, for
+        callers that only changed a single message.
+        """
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
                 chat_item.chat = chat
                 chat_item.title = chat["title"] if "title" in chat else "New Chat"
                 chat_item.updated_at = int(time.time())
+                if not chat_item.user_id.startswith("shared-"):
+                    ChatSearches.sync_chat(
+                        id, chat_item.user_id, chat, message_ids=message_ids, db=db
+                    )
                 db.commit()
                 db.refresh(chat_item)
 
@@ -277,7 +357,7 @@ class ChatTable:
         history["currentId"] = message_id
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, message_ids=[message_id])
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
@@ -295,7 +375,7 @@ class ChatTable:
             history["messages"][message_id]["statusHistory"] = status_history
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, message_ids=[message_id])
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -427,36 +507,15 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
-
+        cursor: Optional[str] = None,
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
-
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(Chat.title.ilike(f"%{query_key}%"))
-
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(
+                user_id=user_id, archived=True
+            )
+            return get_chat_list(
+                self.filter_chat_list(query, filter, skip, limit, cursor)
+            )
 
     def get_chat_list_by_user_id(
         self,
@@ -465,37 +524,54 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(user_id=user_id)
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(Chat.title.ilike(f"%{query_key}%"))
-
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
-
-                if order_by and direction and getattr(Chat, order_by):
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
+            return get_chat_list(
+                self.filter_chat_list(query, filter, skip, limit, cursor)
+            )
+
+    def filter_chat_list(
+        self,
+        query,
+        filter: Optional[dict],
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None,
+    ):
+        """
+        Applies the title `query` and ordering of a list `filter`. The default
+        order (last update) supports keyset pagination with `cursor`, custom
+        orders are paginated with `skip`.
+        """
+        filter = filter or {}
+
+        query_key = filter.get("query")
+        if query_key:
+            query = query.filter(Chat.title.ilike(f"%{query_key}%"))
+
+        order_by = filter.get("order_by")
+        direction = filter.get("direction")
+
+        if order_by and direction and getattr(Chat, order_by):
+            if direction.lower() == "asc":
+                query = query.order_by(getattr(Chat, order_by).asc())
+            elif direction.lower() == "desc":
+                query = query.order_by(getattr(Chat, order_by).desc())
             else:
-                query = query.order_by(Chat.updated_at.desc())
+                raise ValueError("Invalid direction for ordering")
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
+            return query
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+        return paginate_chat_list(query, skip=skip, limit=limit, cursor=cursor)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -504,9 +580,10 @@ class ChatTable:
         include_folders: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(user_id=user_id)
 
             if not include_folders:
                 query = query.filter_by(folder_id=None)
@@ -516,30 +593,10 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+            return get_chat_list(
+                paginate_chat_list(query, skip=skip, limit=limit, cursor=cursor)
             )
 
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
-
     def get_chat_list_by_chat_ids(
         self, chat_ids: list[str], skip: int = 0, limit: int = 50
     ) -> list[ChatModel]:
@@ -601,14 +658,12 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
+    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            all_chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id, pinned=True, archived=False)
-                .order_by(Chat.updated_at.desc())
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(
+                user_id=user_id, pinned=True, archived=False
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return get_chat_list(paginate_chat_list(query))
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -628,14 +683,47 @@ class ChatTable:
         limit: int = 60,
     ) -> list[ChatModel]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Full chats for the results of `search_chat_list_by_user_id`, in the same order.
         """
-        search_text = search_text.replace("\u0000", "").lower().strip()
-
-        if not search_text:
-            return self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit
+        chat_ids = [
+            chat.id
+            for chat in self.search_chat_list_by_user_id(
+                user_id,
+                search_text,
+                include_archived,
+                skip=skip,
+                limit=limit,
+                include_snippets=False,
             )
+        ]
+
+        with get_db() as db:
+            chats = {
+                chat.id: chat
+                for chat in db.query(Chat).filter(Chat.id.in_(chat_ids)).all()
+            }
+            return [
+                ChatModel.model_validate(chats[chat_id])
+                for chat_id in chat_ids
+                if chat_id in chats
+            ]
+
+    def search_chat_list_by_user_id(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        include_snippets: bool = True,
+    ) -> list[ChatSearchResponse]:
+        """
+        Searches the titles and messages of the user's chats through the
+        `chat_search` full-text index, best matches first. Filters such as
+        `tag:name`, `folder:name`, `pinned:true` narrow the results; without
+        search words the chats are listed by last update.
+        """
+        search_text = search_text.replace("\u0000", "").lower().strip()
 
         search_text_words = search_text.split(" ")
 
@@ -690,7 +778,9 @@ class ChatTable:
         search_text = " ".join(search_text_words)
 
         with get_db() as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = db.query(
+                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+            ).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 query = query.filter(Chat.archived == is_archived)
@@ -709,26 +799,8 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
-
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -760,22 +832,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                postgres_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_array_elements(Chat.chat->'messages') AS message "
-                    "    WHERE LOWER(message->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                postgres_content_clause = text(postgres_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -810,31 +866,61 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
+            terms = get_search_terms(search_text)
+            if terms:
+                matches = ChatSearches.get_matches_subquery(
+                    db, user_id, search_text, terms
+                )
+                query = (
+                    query.join(matches, matches.c.chat_id == Chat.id)
+                    .add_columns(matches.c.search_id)
+                    .order_by(matches.c.rank, Chat.updated_at.desc())
+                )
+            else:
+                query = query.add_columns(literal(None).label("search_id")).order_by(
+                    Chat.updated_at.desc()
+                )
+
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
             log.info(f"The number of chats: {len(all_chats)}")
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            snippets = {}
+            if terms and include_snippets:
+                snippets = ChatSearches.get_snippets(
+                    db, [chat.search_id for chat in all_chats], terms
+                )
+
+            return [
+                ChatSearchResponse(
+                    id=chat.id,
+                    title=chat.title,
+                    updated_at=chat.updated_at,
+                    created_at=chat.created_at,
+                    snippet=snippets.get(chat.search_id),
+                )
+                for chat in all_chats
+            ]
 
     def get_chats_by_folder_id_and_user_id(
-        self, folder_id: str, user_id: str, skip: int = 0, limit: int = 60
-    ) -> list[ChatModel]:
+        self,
+        folder_id: str,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 60,
+        cursor: Optional[str] = None,
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc())
-
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
-
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return get_chat_list(
+                paginate_chat_list(query, skip=skip, limit=limit, cursor=cursor)
+            )
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -874,9 +960,9 @@ class ChatTable:
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -899,9 +985,7 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            all_chats = query.all()
-            log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return get_chat_list(paginate_chat_list(query))
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -1008,6 +1092,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                ChatSearches.delete_chat_search_by_chat_ids([id], db=db)
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1018,6 +1103,9 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                ChatSearches.delete_chat_search_by_chat_ids(
+                    select(Chat.id).filter_by(id=id, user_id=user_id), db=db
+                )
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1030,6 +1118,7 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                ChatSearches.delete_chat_search_by_user_id(user_id, db=db)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1042,6 +1131,10 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                ChatSearches.delete_chat_search_by_chat_ids(
+                    select(Chat.id).filter_by(user_id=user_id, folder_id=folder_id),
+                    db=db,
+                )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
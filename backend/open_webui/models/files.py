@@ -1,3 +1,4 @@
+import json
 import logging
 import time
 from typing import Optional
@@ -5,7 +6,18 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    String,
+    Text,
+    JSON,
+    case,
+    cast,
+    func,
+    literal,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -26,6 +38,8 @@ class File(Base):
 
     data = Column(JSON, nullable=True)
     meta = Column(JSON, nullable=True)
+    # Status and progress, apart from `data` so progress updates stay small
+    processing = Column(JSON, nullable=True)
 
     access_control = Column(JSON, nullable=True)
 
@@ -33,6 +47,60 @@ class File(Base):
     updated_at = Column(BigInteger)
 
 
+class FileContent(Base):
+    """Extracted text and preview chunks, only loaded when asked for."""
+
+    __tablename__ = "file_content"
+
+    file_id = Column(String, primary_key=True)
+    content = Column(Text, nullable=True)
+    chunks = Column(JSON, nullable=True)
+
+    updated_at = Column(BigInteger)
+
+
+# Keys of `FileModel.data` that are stored apart from the `data` column
+FILE_PROCESSING_KEYS = ("status", "progress", "error", "processing_details")
+FILE_CONTENT_KEYS = ("content", "chunks")
+
+
+def split_file_data(data: Optional[dict]) -> tuple[dict, dict, dict]:
+    """Splits file data into what is stored in `data`, `processing` and `file_content`."""
+    data, processing, content = dict(data or {}), {}, {}
+    for keys, target in (
+        (FILE_PROCESSING_KEYS, processing),
+        (FILE_CONTENT_KEYS, content),
+    ):
+        for key in keys:
+            if key in data:
+                target[key] = data.pop(key)
+    return data, processing, content
+
+
+def merge_json_column(column, values: dict, dialect_name: str):
+    """
+    SQL expression of the JSON object in `column` with `values` merged in, so
+    that concurrent merges into the same row don't overwrite each other.
+    Anything but an object (SQL NULL, JSON null) is replaced.
+    """
+    if dialect_name == "postgresql":
+        current = case(
+            (func.jsonb_typeof(cast(column, JSONB)) == "object", cast(column, JSONB)),
+            else_=cast(literal("{}"), JSONB),
+        )
+        return cast(current.op("||")(cast(literal(json.dumps(values)), JSONB)), JSON)
+    if dialect_name == "sqlite":
+        current = case(
+            (func.json_type(column) == "object", column),
+            else_=literal("{}"),
+        )
+        args = []
+        for key, value in values.items():
+            args += [literal(f'$."{key}"'), func.json(literal(json.dumps(value)))]
+        return func.json_set(current, *args)
+    raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -52,6 +120,24 @@ class FileModel(BaseModel):
     updated_at: Optional[int]  # timestamp in epoch
 
 
+class FileContentModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    file_id: str
+    content: Optional[str] = None
+    chunks: Optional[list] = None
+
+    updated_at: Optional[int] = None  # timestamp in epoch
+
+
+def get_file_model(file: File) -> FileModel:
+    model = FileModel.model_validate(file)
+    # Processing state is stored on its own, but is still read as file data
+    if file.processing:
+        model.data = {**(model.data or {}), **file.processing}
+    return model
+
+
 ####################
 # Forms
 ####################
@@ -110,12 +196,23 @@ class FilesTable:
             )
 
             try:
-                result = File(**file.model_dump())
+                data, processing, content = split_file_data(file.data)
+                result = File(
+                    **file.model_dump(exclude={"data"}),
+                    data=data,
+                    processing=processing or None,
+                )
                 db.add(result)
+                if content:
+                    db.add(
+                        FileContent(
+                            file_id=file.id, updated_at=file.updated_at, **content
+                        )
+                    )
                 db.commit()
                 db.refresh(result)
                 if result:
-                    return FileModel.model_validate(result)
+                    return get_file_model(result)
                 else:
                     return None
             except Exception as e:
@@ -126,7 +223,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 file = db.get(File, id)
-                return FileModel.model_validate(file)
+                return get_file_model(file)
             except Exception:
                 return None
 
@@ -135,7 +232,7 @@ class FilesTable:
             try:
                 file = db.query(File).filter_by(id=id, user_id=user_id).first()
                 if file:
-                    return FileModel.model_validate(file)
+                    return get_file_model(file)
                 else:
                     return None
             except Exception:
@@ -156,7 +253,7 @@ class FilesTable:
 
     def get_files(self) -> list[FileModel]:
         with get_db() as db:
-            return [FileModel.model_validate(file) for file in db.query(File).all()]
+            return [get_file_model(file) for file in db.query(File).all()]
 
     def check_access_by_user_id(self, id, user_id, permission="write") -> bool:
         file = self.get_file_by_id(id)
@@ -170,7 +267,7 @@ class FilesTable:
     def get_files_by_ids(self, ids: list[str]) -> list[FileModel]:
         with get_db() as db:
             return [
-                FileModel.model_validate(file)
+                get_file_model(file)
                 for file in db.query(File)
                 .filter(File.id.in_(ids))
                 .order_by(File.updated_at.desc())
@@ -197,7 +294,7 @@ class FilesTable:
     def get_files_by_user_id(self, user_id: str) -> list[FileModel]:
         with get_db() as db:
             return [
-                FileModel.model_validate(file)
+                get_file_model(file)
                 for file in db.query(File).filter_by(user_id=user_id).all()
             ]
 
@@ -208,28 +305,109 @@ class FilesTable:
                 file.hash = hash
                 db.commit()
 
-                return FileModel.model_validate(file)
+                return get_file_model(file)
             except Exception:
                 return None
 
     def update_file_data_by_id(self, id: str, data: dict) -> Optional[FileModel]:
+        data, processing, content = split_file_data(data)
+        if processing:
+            self.update_file_processing_by_id(id, processing)
+        if content:
+            self.update_file_content_by_id(id, **content)
+
         with get_db() as db:
             try:
                 file = db.query(File).filter_by(id=id).first()
-                file.data = {**(file.data if file.data else {}), **data}
+                if data:
+                    file.data = {**(file.data if file.data else {}), **data}
+                    db.commit()
+                return get_file_model(file)
+            except Exception as e:
+
+                return None
+
+    def get_file_processing_by_id(self, id: str) -> Optional[dict]:
+        with get_db() as db:
+            try:
+                return db.query(File.processing).filter_by(id=id).scalar() or {}
+            except Exception:
+                return None
+
+    def update_file_processing_by_id(self, id: str, processing: dict) -> bool:
+        """Merges `processing` into the file's status and progress, touching nothing else."""
+        with get_db() as db:
+            try:
+                db.query(File).filter_by(id=id).update(
+                    {
+                        "processing": merge_json_column(
+                            File.processing, processing, db.bind.dialect.name
+                        )
+                    },
+                    synchronize_session=False,
+                )
                 db.commit()
-                return FileModel.model_validate(file)
+                return True
             except Exception as e:
+                log.exception(f"Error updating processing of file {id}: {e}")
+                return False
 
+    def get_file_content_by_id(self, id: str) -> Optional[FileContentModel]:
+        with get_db() as db:
+            file_content = db.get(FileContent, id)
+            return (
+                FileContentModel.model_validate(file_content) if file_content else None
+            )
+
+    def get_file_contents_by_ids(self, ids: list[str]) -> dict[str, FileContentModel]:
+        with get_db() as db:
+            return {
+                file_content.file_id: FileContentModel.model_validate(file_content)
+                for file_content in db.query(FileContent)
+                .filter(FileContent.file_id.in_(ids))
+                .all()
+            }
+
+    def update_file_content_by_id(
+        self, id: str, content: Optional[str] = None, chunks: Optional[list] = None
+    ) -> Optional[FileContentModel]:
+        with get_db() as db:
+            try:
+                file_content = db.get(FileContent, id)
+                if file_content is None:
+                    file_content = FileContent(file_id=id)
+                    db.add(file_content)
+                if content is not None:
+                    file_content.content = content
+                if chunks is not None:
+                    file_content.chunks = chunks
+                file_content.updated_at = int(time.time())
+                db.commit()
+                return FileContentModel.model_validate(file_content)
+            except Exception as e:
+                log.exception(f"Error updating content of file {id}: {e}")
                 return None
 
+    def load_file_contents(self, files: list[FileModel]) -> list[FileModel]:
+        """Adds the extracted content and chunks to the data of `files`, in one query."""
+        file_contents = self.get_file_contents_by_ids([file.id for file in files])
+        for file in files:
+            file_content = file_contents.get(file.id)
+            if file_content:
+                file.data = {
+                    **(file.data or {}),
+                    "content": file_content.content,
+                    "chunks": file_content.chunks,
+                }
+        return files
+
     def update_file_metadata_by_id(self, id: str, meta: dict) -> Optional[FileModel]:
         with get_db() as db:
             try:
                 file = db.query(File).filter_by(id=id).first()
                 file.meta = {**(file.meta if file.meta else {}), **meta}
                 db.commit()
-                return FileModel.model_validate(file)
+                return get_file_model(file)
             except Exception:
                 return None
 
@@ -237,6 +415,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).filter_by(id=id).delete()
+                db.query(FileContent).filter_by(file_id=id).delete()
                 db.commit()
 
                 return True
@@ -247,6 +426,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).delete()
+                db.query(FileContent).delete()
                 db.commit()
 
                 return True
@@ -187,6 +187,10 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_updated_at_by_id(self, id: str) -> Optional[int]:
+        with get_db() as db:
+            return db.query(Function.updated_at).filter(Function.id == id).scalar()
+
     def get_functions(
         self, active_only=False, include_valves=False
     ) -> list[FunctionModel | FunctionWithValvesModel]:
@@ -246,6 +250,15 @@ class FunctionsTable:
                     for function in db.query(Function).filter_by(type=type).all()
                 ]
 
+    def get_functions_by_types(
+        self, types: list[str], active_only=False
+    ) -> list[FunctionModel]:
+        with get_db() as db:
+            query = db.query(Function).filter(Function.type.in_(types))
+            if active_only:
+                query = query.filter_by(is_active=True)
+            return [FunctionModel.model_validate(function) for function in query.all()]
+
     def get_global_filter_functions(self) -> list[FunctionModel]:
         with get_db() as db:
             return [
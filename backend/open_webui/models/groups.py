@@ -8,6 +8,7 @@ from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.cache import SharedVersion, get_cache_redis
 
 
 from pydantic import BaseModel, ConfigDict
@@ -92,6 +93,14 @@ class GroupUpdateForm(GroupForm, UserIdsForm):
 
 
 class GroupTable:
+    def __init__(self):
+        # Bumped on every membership or permission change, on every replica,
+        # so that cached principals (see utils/access_control.py) are recomputed.
+        self.version = SharedVersion("groups", get_cache_redis())
+
+    def bump_version(self):
+        self.version.bump()
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -111,6 +120,7 @@ class GroupTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.bump_version()
                 if result:
                     return GroupModel.model_validate(result)
                 else:
@@ -168,6 +178,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                self.bump_version()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -178,6 +189,7 @@ class GroupTable:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                self.bump_version()
                 return True
         except Exception:
             return False
@@ -187,6 +199,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                self.bump_version()
 
                 return True
             except Exception:
@@ -207,6 +220,7 @@ class GroupTable:
                     )
                     db.commit()
 
+                self.bump_version()
                 return True
             except Exception:
                 return False
@@ -241,6 +255,9 @@ class GroupTable:
                     except Exception as e:
                         log.exception(e)
                         continue
+
+            if new_groups:
+                self.bump_version()
             return new_groups
 
     def sync_groups_by_group_names(self, user_id: str, group_names: list[str]) -> bool:
@@ -274,6 +291,7 @@ class GroupTable:
                         )
 
                 db.commit()
+                self.bump_version()
                 return True
             except Exception as e:
                 log.exception(e)
@@ -301,6 +319,7 @@ class GroupTable:
                 group.user_ids = group_user_ids
                 group.updated_at = int(time.time())
                 db.commit()
+                self.bump_version()
                 db.refresh(group)
                 return GroupModel.model_validate(group)
         except Exception as e:
@@ -331,6 +350,7 @@ class GroupTable:
                 group.updated_at = int(time.time())
 
                 db.commit()
+                self.bump_version()
                 db.refresh(group)
                 return GroupModel.model_validate(group)
         except Exception as e:
@@ -7,15 +7,15 @@ import uuid
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
+from open_webui.models.access_grants import AccessGrants
 from open_webui.models.files import FileMetadataResponse
-from open_webui.models.groups import Groups
 from open_webui.models.users import Users, UserResponse
 
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access, get_principal
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -118,6 +118,9 @@ class KnowledgeTable:
             try:
                 result = Knowledge(**knowledge.model_dump())
                 db.add(result)
+                AccessGrants.set_access_grants(
+                    "knowledge", knowledge.id, knowledge.access_control, db
+                )
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -127,29 +130,31 @@ class KnowledgeTable:
             except Exception:
                 return None
 
+    def _to_knowledge_user_models(self, all_knowledge) -> list[KnowledgeUserModel]:
+        user_ids = list(set(knowledge.user_id for knowledge in all_knowledge))
+
+        users = Users.get_users_by_user_ids(user_ids) if user_ids else []
+        users_dict = {user.id: user for user in users}
+
+        knowledge_bases = []
+        for knowledge in all_knowledge:
+            user = users_dict.get(knowledge.user_id)
+            knowledge_bases.append(
+                KnowledgeUserModel.model_validate(
+                    {
+                        **KnowledgeModel.model_validate(knowledge).model_dump(),
+                        "user": user.model_dump() if user else None,
+                    }
+                )
+            )
+        return knowledge_bases
+
     def get_knowledge_bases(self) -> list[KnowledgeUserModel]:
         with get_db() as db:
             all_knowledge = (
                 db.query(Knowledge).order_by(Knowledge.updated_at.desc()).all()
             )
-
-            user_ids = list(set(knowledge.user_id for knowledge in all_knowledge))
-
-            users = Users.get_users_by_user_ids(user_ids) if user_ids else []
-            users_dict = {user.id: user for user in users}
-
-            knowledge_bases = []
-            for knowledge in all_knowledge:
-                user = users_dict.get(knowledge.user_id)
-                knowledge_bases.append(
-                    KnowledgeUserModel.model_validate(
-                        {
-                            **KnowledgeModel.model_validate(knowledge).model_dump(),
-                            "user": user.model_dump() if user else None,
-                        }
-                    )
-                )
-            return knowledge_bases
+            return self._to_knowledge_user_models(all_knowledge)
 
     def check_access_by_user_id(self, id, user_id, permission="write") -> bool:
         knowledge = self.get_knowledge_by_id(id)
@@ -157,22 +162,37 @@ class KnowledgeTable:
             return False
         if knowledge.user_id == user_id:
             return True
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+        user_group_ids = get_principal(user_id).group_ids
         return has_access(user_id, permission, knowledge.access_control, user_group_ids)
 
     def get_knowledge_bases_by_user_id(
-        self, user_id: str, permission: str = "write"
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
     ) -> list[KnowledgeUserModel]:
-        knowledge_bases = self.get_knowledge_bases()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
-        return [
-            knowledge_base
-            for knowledge_base in knowledge_bases
-            if knowledge_base.user_id == user_id
-            or has_access(
-                user_id, permission, knowledge_base.access_control, user_group_ids
+        user_group_ids = get_principal(user_id).group_ids
+        with get_db() as db:
+            query = (
+                db.query(Knowledge)
+                .filter(
+                    AccessGrants.has_access_filter(
+                        "knowledge",
+                        Knowledge.id,
+                        Knowledge.user_id,
+                        user_id,
+                        permission,
+                        user_group_ids,
+                    )
+                )
+                .order_by(Knowledge.updated_at.desc())
             )
-        ]
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+            return self._to_knowledge_user_models(query.all())
 
     def get_knowledge_by_id(self, id: str) -> Optional[KnowledgeModel]:
         try:
@@ -194,6 +214,9 @@ class KnowledgeTable:
                         "updated_at": int(time.time()),
                     }
                 )
+                AccessGrants.set_access_grants(
+                    "knowledge", id, form_data.access_control, db
+                )
                 db.commit()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
@@ -222,6 +245,7 @@ class KnowledgeTable:
         try:
             with get_db() as db:
                 db.query(Knowledge).filter_by(id=id).delete()
+                AccessGrants.delete_access_grants("knowledge", id, db)
                 db.commit()
                 return True
         except Exception:
@@ -231,6 +255,7 @@ class KnowledgeTable:
         with get_db() as db:
             try:
                 db.query(Knowledge).delete()
+                AccessGrants.delete_access_grants("knowledge", db=db)
                 db.commit()
 
                 return True
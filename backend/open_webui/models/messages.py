@@ -9,7 +9,7 @@ from open_webui.models.users import Users, UserNameResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -26,6 +26,11 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE message_id IN (...)
+        Index("message_reaction_message_id_idx", "message_id"),
+    )
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -54,6 +59,18 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... AND parent_id = ... ORDER BY created_at DESC
+        Index(
+            "message_channel_id_parent_id_created_at_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        # WHERE parent_id IN (...) GROUP BY parent_id
+        Index("message_parent_id_created_at_idx", "parent_id", "created_at"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -106,6 +123,48 @@ class MessageResponse(MessageReplyToResponse):
     reactions: list[Reactions]
 
 
+def get_message_list_cursor(message: MessageModel) -> str:
+    """Cursor of the messages older than `message`, the last of a page."""
+    return f"{message.created_at}:{message.id}"
+
+
+def parse_message_list_cursor(cursor: str) -> tuple[int, str]:
+    """
+    Splits a cursor from `get_message_list_cursor` into (created_at, id).
+    Raises ValueError if it is malformed.
+    """
+    created_at, _, id = cursor.partition(":")
+    created_at = int(created_at)
+    # Out of range timestamps would overflow the BIGINT comparison
+    if not id or not 0 <= created_at < 2**63:
+        raise ValueError(f"Invalid message list cursor: {cursor}")
+    return created_at, id
+
+
+def paginate_message_list(query, skip: int = 0, limit: int = 50, cursor=None):
+    """
+    Orders a message query newest first. With a `cursor` ("<created_at>:<id>"
+    of the previous page's oldest message) the page is found by keyset on
+    (created_at, id), so messages arriving meanwhile do not shift it.
+    """
+    query = query.order_by(Message.created_at.desc(), Message.id.desc())
+
+    if cursor:
+        created_at, id = parse_message_list_cursor(cursor)
+        query = query.filter(
+            or_(
+                Message.created_at < created_at,
+                and_(Message.created_at == created_at, Message.id < id),
+            )
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
 class MessageTable:
     def insert_new_message(
         self, form_data: MessageForm, channel_id: str, user_id: str
@@ -148,7 +207,9 @@ class MessageTable:
             )
 
             reactions = self.get_reactions_by_message_id(id)
-            thread_replies = self.get_thread_replies_by_message_id(id)
+            reply_count, latest_reply_at = self.get_reply_stats_by_message_ids(
+                [id]
+            ).get(id, (0, None))
 
             user = Users.get_user_by_id(message.user_id)
             return MessageResponse.model_validate(
@@ -158,14 +219,61 @@ class MessageTable:
                     "reply_to_message": (
                         reply_to_message.model_dump() if reply_to_message else None
                     ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
+                    "latest_reply_at": latest_reply_at,
+                    "reply_count": reply_count,
                     "reactions": reactions,
                 }
             )
 
+    def get_message_list(
+        self, db, messages: list[Message]
+    ) -> list[MessageReplyToResponse]:
+        """
+        Adds the authors and replied-to messages to `messages`, with one query
+        for all replied-to messages and one for all their users.
+        """
+        reply_to_ids = {message.reply_to_id for message in messages} - {None}
+        reply_to_messages = (
+            {
+                message.id: message
+                for message in db.query(Message)
+                .filter(Message.id.in_(reply_to_ids))
+                .all()
+            }
+            if reply_to_ids
+            else {}
+        )
+
+        user_ids = {
+            message.user_id for message in [*messages, *reply_to_messages.values()]
+        }
+        users = {
+            user.id: UserNameResponse.model_validate(user.model_dump())
+            for user in Users.get_users_by_user_ids(list(user_ids))
+        }
+
+        def get_message_user_response(message: Message) -> dict:
+            return {
+                **MessageModel.model_validate(message).model_dump(),
+                "user": users.get(message.user_id),
+            }
+
+        return [
+            MessageReplyToResponse.model_validate(
+                {
+                    **get_message_user_response(message),
+                    "reply_to_message": (
+                        get_message_user_response(
+                            reply_to_messages[message.reply_to_id]
+                        )
+                        if message.reply_to_id in reply_to_messages
+                        else None
+                    ),
+                }
+            )
+            for message in messages
+        ]
+
     def get_thread_replies_by_message_id(self, id: str) -> list[MessageReplyToResponse]:
         with get_db() as db:
             all_messages = (
@@ -175,26 +283,30 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
+            return self.get_message_list(db, all_messages)
+
+    def get_reply_stats_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, tuple[int, int]]:
+        """Thread reply count and latest reply time per message, in one query."""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
                 )
-            return messages
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: (count, latest_reply_at)
+                for parent_id, count, latest_reply_at in rows
+            }
 
     def get_reply_user_ids_by_message_id(self, id: str) -> list[str]:
         with get_db() as db:
@@ -204,41 +316,29 @@ class MessageTable:
             ]
 
     def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db() as db:
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            all_messages = paginate_message_list(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=None),
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+            ).all()
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self.get_message_list(db, all_messages)
 
     def get_messages_by_parent_id(
-        self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        parent_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> list[MessageReplyToResponse]:
         with get_db() as db:
             message = db.get(Message, parent_id)
@@ -246,39 +346,18 @@ class MessageTable:
             if not message:
                 return []
 
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=parent_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            all_messages = paginate_message_list(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=parent_id),
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+            ).all()
 
             # If length of all_messages is less than limit, then add the parent message
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self.get_message_list(db, all_messages)
 
     def update_message_by_id(
         self, id: str, form_data: MessageForm
@@ -334,6 +413,40 @@ class MessageTable:
 
             return [Reactions(**reaction) for reaction in reactions.values()]
 
+    def get_reactions_by_message_ids(
+        self, ids: list[str]
+    ) -> dict[str, list[Reactions]]:
+        """Reactions grouped by name per message, in one query."""
+        if not ids:
+            return {}
+
+        with get_db() as db:
+            all_reactions = (
+                db.query(MessageReaction)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at)
+                .all()
+            )
+
+            reactions = {}
+            for reaction in all_reactions:
+                message_reactions = reactions.setdefault(reaction.message_id, {})
+                if reaction.name not in message_reactions:
+                    message_reactions[reaction.name] = {
+                        "name": reaction.name,
+                        "user_ids": [],
+                        "count": 0,
+                    }
+                message_reactions[reaction.name]["user_ids"].append(reaction.user_id)
+                message_reactions[reaction.name]["count"] += 1
+
+            return {
+                message_id: [
+                    Reactions(**reaction) for reaction in message_reactions.values()
+                ]
+                for message_id, message_reactions in reactions.items()
+            }
+
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
     ) -> bool:
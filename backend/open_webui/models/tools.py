@@ -4,13 +4,13 @@ from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users, UserResponse
-from open_webui.models.groups import Groups
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.models.access_grants import AccessGrants
+from open_webui.utils.access_control import get_principal
 
 
 log = logging.getLogger(__name__)
@@ -128,6 +128,7 @@ class ToolsTable:
             try:
                 result = Tool(**tool.model_dump())
                 db.add(result)
+                AccessGrants.set_access_grants("tool", tool.id, tool.access_control, db)
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -146,40 +147,62 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_updated_at_by_id(self, id: str) -> Optional[int]:
+        with get_db() as db:
+            return db.query(Tool.updated_at).filter(Tool.id == id).scalar()
+
+    def _to_tool_user_models(self, all_tools) -> list[ToolUserModel]:
+        user_ids = list(set(tool.user_id for tool in all_tools))
+
+        users = Users.get_users_by_user_ids(user_ids) if user_ids else []
+        users_dict = {user.id: user for user in users}
+
+        tools = []
+        for tool in all_tools:
+            user = users_dict.get(tool.user_id)
+            tools.append(
+                ToolUserModel.model_validate(
+                    {
+                        **ToolModel.model_validate(tool).model_dump(),
+                        "user": user.model_dump() if user else None,
+                    }
+                )
+            )
+        return tools
+
     def get_tools(self) -> list[ToolUserModel]:
         with get_db() as db:
             all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
-
-            user_ids = list(set(tool.user_id for tool in all_tools))
-
-            users = Users.get_users_by_user_ids(user_ids) if user_ids else []
-            users_dict = {user.id: user for user in users}
-
-            tools = []
-            for tool in all_tools:
-                user = users_dict.get(tool.user_id)
-                tools.append(
-                    ToolUserModel.model_validate(
-                        {
-                            **ToolModel.model_validate(tool).model_dump(),
-                            "user": user.model_dump() if user else None,
-                        }
-                    )
-                )
-            return tools
+            return self._to_tool_user_models(all_tools)
 
     def get_tools_by_user_id(
-        self, user_id: str, permission: str = "write"
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
     ) -> list[ToolUserModel]:
-        tools = self.get_tools()
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
-
-        return [
-            tool
-            for tool in tools
-            if tool.user_id == user_id
-            or has_access(user_id, permission, tool.access_control, user_group_ids)
-        ]
+        user_group_ids = get_principal(user_id).group_ids
+        with get_db() as db:
+            query = (
+                db.query(Tool)
+                .filter(
+                    AccessGrants.has_access_filter(
+                        "tool",
+                        Tool.id,
+                        Tool.user_id,
+                        user_id,
+                        permission,
+                        user_group_ids,
+                    )
+                )
+                .order_by(Tool.updated_at.desc())
+            )
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+            return self._to_tool_user_models(query.all())
 
     def get_tool_valves_by_id(self, id: str) -> Optional[dict]:
         try:
@@ -252,6 +275,10 @@ class ToolsTable:
                 db.query(Tool).filter_by(id=id).update(
                     {**updated, "updated_at": int(time.time())}
                 )
+                if "access_control" in updated:
+                    AccessGrants.set_access_grants(
+                        "tool", id, updated["access_control"], db
+                    )
                 db.commit()
 
                 tool = db.query(Tool).get(id)
@@ -264,6 +291,7 @@ class ToolsTable:
         try:
             with get_db() as db:
                 db.query(Tool).filter_by(id=id).delete()
+                AccessGrants.delete_access_grants("tool", id, db)
                 db.commit()
 
                 return True
@@ -1,21 +1,32 @@
+import hashlib
+import logging
+import threading
 import time
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+    SRC_LOG_LEVELS,
+    USER_CACHE_TTL,
+)
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups
+from open_webui.utils.cache import TTLCache, get_cache_redis
 from open_webui.utils.misc import throttle
 
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, Date
-from sqlalchemy import or_
+from sqlalchemy import or_, bindparam, update
 
 import datetime
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
 ####################
 # User DB Schema
 ####################
@@ -151,6 +162,53 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        redis = get_cache_redis()
+        # user id -> user (without api key)
+        self.user_cache = TTLCache("user", USER_CACHE_TTL, redis)
+        # sha256(api key) -> user id
+        self.api_key_cache = TTLCache("user_api_key", USER_CACHE_TTL, redis)
+
+        # user id -> last activity not yet written to the database
+        self.pending_last_active: dict[str, int] = {}
+        # user id -> last activity written (or queued) by this process
+        self.recorded_last_active: dict[str, int] = {}
+        self.last_active_lock = threading.Lock()
+
+    @staticmethod
+    def _hash_api_key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    def invalidate_user_cache(self, id: str, api_key: Optional[str] = None) -> None:
+        self.user_cache.delete(id)
+        if api_key:
+            self.api_key_cache.delete(self._hash_api_key(api_key))
+
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        """
+        Same as `get_user_by_id` for the authentication path, served from a
+        short-lived cache. The cached user never carries its api key.
+        """
+        cached = self.user_cache.get(id)
+        if cached is not None:
+            return UserModel.model_validate(cached)
+
+        user = self.get_user_by_id(id)
+        if user:
+            self.user_cache.set(id, user.model_dump(mode="json", exclude={"api_key"}))
+        return user
+
+    def get_cached_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        key = self._hash_api_key(api_key)
+        user_id = self.api_key_cache.get(key)
+        if user_id is not None:
+            return self.get_cached_user_by_id(user_id)
+
+        user = self.get_user_by_api_key(api_key)
+        if user:
+            self.api_key_cache.set(key, user.id)
+        return user
+
     def insert_new_user(
         self,
         id: str,
@@ -327,6 +385,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.invalidate_user_cache(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -341,12 +400,59 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
             return None
 
+    def mark_user_active(self, id: str) -> None:
+        """
+        Records user activity without touching the database. Updates are
+        rate-limited per user and written by `flush_user_last_active`.
+        """
+        now = int(time.time())
+        with self.last_active_lock:
+            if (
+                DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None
+                and now - self.recorded_last_active.get(id, 0)
+                < DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+            ):
+                return
+            self.recorded_last_active[id] = now
+            self.pending_last_active[id] = now
+
+    def flush_user_last_active(self) -> int:
+        """Writes all pending `last_active_at` updates in a single batch."""
+        with self.last_active_lock:
+            pending = self.pending_last_active
+            self.pending_last_active = {}
+
+        if not pending:
+            return 0
+
+        try:
+            with get_db() as db:
+                db.connection().execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("last_active_at")),
+                    [
+                        {"user_id": user_id, "last_active_at": last_active_at}
+                        for user_id, last_active_at in pending.items()
+                    ],
+                )
+                db.commit()
+            return len(pending)
+        except Exception as e:
+            log.exception(f"Failed to flush user activity: {e}")
+            # Keep the updates for the next flush unless newer ones arrived
+            with self.last_active_lock:
+                for user_id, last_active_at in pending.items():
+                    self.pending_last_active.setdefault(user_id, last_active_at)
+            return 0
+
     @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
     def update_user_last_active_by_id(self, id: str) -> Optional[UserModel]:
         try:
@@ -368,6 +474,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -379,6 +486,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -399,6 +507,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -414,10 +523,17 @@ class UsersTable:
             result = Chats.delete_chats_by_user_id(id)
             if result:
                 with get_db() as db:
+                    api_key = db.query(User.api_key).filter_by(id=id).scalar()
+
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
 
+                self.invalidate_user_cache(id, api_key)
+                with self.last_active_lock:
+                    self.pending_last_active.pop(id, None)
+                    self.recorded_last_active.pop(id, None)
+
                 return True
             else:
                 return False
@@ -427,8 +543,10 @@ class UsersTable:
     def update_user_api_key_by_id(self, id: str, api_key: str) -> bool:
         try:
             with get_db() as db:
+                old_api_key = db.query(User.api_key).filter_by(id=id).scalar()
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self.invalidate_user_cache(id, old_api_key)
                 return True if result == 1 else False
         except Exception:
             return False
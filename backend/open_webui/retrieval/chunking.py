@@ -0,0 +1,257 @@
+import logging
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from typing import Optional
+
+import tiktoken
+from langchain_core.documents import Document
+
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+TEXT_SPLITTERS = ["character", "token", "markdown_header"]
+
+# Preferred chunk boundaries, best first
+SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", "; ", ", ", " "]
+
+MARKDOWN_LINE_PATTERN = re.compile(
+    r"^(?:(?P<fence>```|~~~).*|(?P<level>#{1,6})[ \t]+(?P<title>.*?)[ \t]*)$",
+    re.MULTILINE,
+)
+WORD_PATTERN = re.compile(r"\S+")
+
+
+@lru_cache(maxsize=8)
+def get_encoding(encoding_name: str) -> Optional[tiktoken.Encoding]:
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        log.warning(f"Could not load tiktoken encoding {encoding_name}: {e}")
+        return None
+
+
+@lru_cache(maxsize=8)
+def get_token_lengths(encoding: tiktoken.Encoding) -> tuple[list[int], list[int]]:
+    """
+    Characters each token adds to decoded text, and whether it starts inside
+    a character, by token id. Lets offsets be summed without decoding.
+    """
+    lengths = [0] * encoding.n_vocab
+    continues = [0] * encoding.n_vocab
+    for token in range(encoding.n_vocab):
+        try:
+            token_bytes = encoding.decode_single_token_bytes(token)
+        except KeyError:
+            continue
+        # UTF-8 continuation bytes do not start a character
+        lengths[token] = sum(1 for byte in token_bytes if not 0x80 <= byte < 0xC0)
+        continues[token] = int(bool(token_bytes) and 0x80 <= token_bytes[0] < 0xC0)
+    return lengths, continues
+
+
+@dataclass
+class Chunk:
+    text: str
+    start: int
+    end: int
+    token_count: int
+    headings: list[str] = field(default_factory=list)
+
+
+class TextChunker:
+    """
+    Splits text into chunks in a single pass. The text is tokenized once, and
+    each chunk carries its character offsets and token count, so nothing has
+    to be encoded again to report token usage.
+
+    - `character` chunks are up to `chunk_size` characters, cut at the best
+      boundary available: a paragraph, a line, a sentence, then a word.
+    - `token` chunks are windows of `chunk_size` tokens.
+    - `markdown_header` chunks never cross a header and record the headings
+      they are under; within a section they are cut like `character`.
+
+    Without an encoding, tokens are counted as whitespace separated words.
+
+    `character` and `markdown_header` boundaries differ from those of the
+    langchain splitters used before, so re-indexing a document gives
+    different chunks than it was first indexed with.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        splitter: str = "character",
+        encoding: Optional[tiktoken.Encoding] = None,
+    ):
+        if splitter not in TEXT_SPLITTERS:
+            raise ValueError(f"Invalid text splitter: {splitter}")
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError(
+                f"Chunk overlap ({chunk_overlap}) must be smaller than the chunk size ({chunk_size})"
+            )
+        if splitter == "token" and encoding is None:
+            raise ValueError("The token text splitter needs a tiktoken encoding")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.splitter = splitter
+        self.encoding = encoding
+
+    def get_token_offsets(self, text: str) -> list[int]:
+        """Character offset of each token of `text`, in order."""
+        if self.encoding is None:
+            return [match.start() for match in WORD_PATTERN.finditer(text)]
+
+        # Same offsets as `decode_with_offsets`, without decoding every token
+        tokens = self.encoding.encode(text, disallowed_special=())
+        lengths, continues = get_token_lengths(self.encoding)
+        offsets = [0, *accumulate(map(lengths.__getitem__, tokens))][:-1]
+        if not text.isascii():
+            offsets = [
+                max(offset - continues[token], 0)
+                for offset, token in zip(offsets, tokens)
+            ]
+        return offsets
+
+    def split_text(self, text: str) -> list[Chunk]:
+        offsets = self.get_token_offsets(text)
+
+        if self.splitter == "token":
+            return self._split_tokens(text, offsets)
+        if self.splitter == "markdown_header":
+            return self._split_markdown(text, offsets)
+        return self._split_span(text, offsets, 0, len(text))
+
+    def split_documents(self, docs: list[Document]) -> list[Document]:
+        split_docs = []
+        for doc in docs:
+            for chunk in self.split_text(doc.page_content):
+                metadata = {
+                    **doc.metadata,
+                    "start_index": chunk.start,
+                    "end_index": chunk.end,
+                    "token_count": chunk.token_count,
+                }
+                if self.splitter == "markdown_header":
+                    metadata["headings"] = chunk.headings
+                split_docs.append(Document(page_content=chunk.text, metadata=metadata))
+        return split_docs
+
+    def _split_tokens(self, text: str, offsets: list[int]) -> list[Chunk]:
+        chunks = []
+        step = self.chunk_size - self.chunk_overlap
+
+        for start_token in range(0, len(offsets), step):
+            end_token = min(start_token + self.chunk_size, len(offsets))
+            start = offsets[start_token]
+            end = offsets[end_token] if end_token < len(offsets) else len(text)
+
+            if text[start:end].strip():
+                chunks.append(
+                    Chunk(text[start:end], start, end, end_token - start_token)
+                )
+            if end_token == len(offsets):
+                break
+        return chunks
+
+    def _split_markdown(self, text: str, offsets: list[int]) -> list[Chunk]:
+        chunks = []
+        headings: dict[int, str] = {}
+        section_start = 0
+        in_fence = False
+
+        def add_section(end: int):
+            section = self._split_span(text, offsets, section_start, end)
+            for chunk in section:
+                chunk.headings = [headings[level] for level in sorted(headings)]
+            chunks.extend(section)
+
+        for match in MARKDOWN_LINE_PATTERN.finditer(text):
+            if match.group("fence"):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+
+            add_section(match.start())
+            section_start = match.start()
+
+            # A header closes every section at its level or below
+            level = len(match.group("level"))
+            headings = {k: v for k, v in headings.items() if k < level}
+            headings[level] = match.group("title")
+
+        add_section(len(text))
+        return chunks
+
+    def _split_span(
+        self, text: str, offsets: list[int], span_start: int, span_end: int
+    ) -> list[Chunk]:
+        chunks = []
+        start = self._skip_whitespace(text, span_start, span_end)
+
+        while start < span_end:
+            end = min(start + self.chunk_size, span_end)
+            if end < span_end:
+                end = self._find_boundary(text, start, end)
+
+            chunk_end = end
+            while chunk_end > start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            chunks.append(
+                Chunk(
+                    text[start:chunk_end],
+                    start,
+                    chunk_end,
+                    self._count_tokens(offsets, start, chunk_end),
+                )
+            )
+
+            if end >= span_end:
+                break
+            start = self._skip_whitespace(
+                text, self._get_overlap_start(text, start, end), span_end
+            )
+        return chunks
+
+    def _find_boundary(self, text: str, start: int, end: int) -> int:
+        # Only accept boundaries that leave the chunk at least half full
+        min_end = start + self.chunk_size // 2
+        for separator in SEPARATORS:
+            idx = text.rfind(separator, min_end, end)
+            if idx != -1:
+                return idx + len(separator)
+        return end
+
+    def _get_overlap_start(self, text: str, start: int, end: int) -> int:
+        if not self.chunk_overlap:
+            return end
+
+        # The overlap starts at a word, not in the middle of one
+        overlap_start = max(end - self.chunk_overlap, start + 1)
+        while overlap_start < end and not text[overlap_start - 1].isspace():
+            overlap_start += 1
+        return overlap_start
+
+    @staticmethod
+    def _skip_whitespace(text: str, start: int, end: int) -> int:
+        while start < end and text[start].isspace():
+            start += 1
+        return start
+
+    @staticmethod
+    def _count_tokens(offsets: list[int], start: int, end: int) -> int:
+        # Counts the token the chunk starts in, e.g. " word" for "word"
+        first = max(bisect_right(offsets, start) - 1, 0)
+        return max(bisect_left(offsets, end) - first, 0)
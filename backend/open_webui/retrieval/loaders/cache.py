@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_extraction_cache_key(file_hash: str, engine: str, params: dict) -> str:
+    payload = json.dumps(
+        {"sha256": file_hash, "engine": engine, "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Extracted documents on disk, one JSON file per key. Entries are written
+    atomically, so concurrent extractions of the same file at worst both run.
+    With `max_size` (bytes), the least recently used entries are removed once
+    the cache grows beyond it.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size: int = 0):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def get_path(self, key: str) -> Path:
+        # Sharded by prefix to keep directories small
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str, file_path: str) -> Optional[list[Document]]:
+        path = self.get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+
+        try:
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except OSError:
+            pass
+
+        docs = []
+        for doc in entry["documents"]:
+            metadata = doc["metadata"]
+            # Loaders record the path they read, which differs per upload
+            if metadata.get("source") == entry["file_path"]:
+                metadata["source"] = file_path
+            docs.append(Document(page_content=doc["page_content"], metadata=metadata))
+        return docs
+
+    def set(self, key: str, file_path: str, docs: list[Document]) -> None:
+        path = self.get_path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(
+                    {
+                        "file_path": file_path,
+                        "documents": [
+                            {"page_content": doc.page_content, "metadata": doc.metadata}
+                            for doc in docs
+                        ],
+                    },
+                    f,
+                    ensure_ascii=False,
+                    default=str,
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.warning(f"Could not write extraction cache entry {path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        if self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries beyond `max_size`."""
+        entries = []
+        size = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            size += stat.st_size
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
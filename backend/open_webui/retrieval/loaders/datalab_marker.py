@@ -1,14 +1,24 @@
+import asyncio
 import os
 import time
 import requests
 import logging
 import json
 from typing import List, Optional
+
+import aiohttp
 from langchain_core.documents import Document
 from fastapi import HTTPException, status
 
+from open_webui.utils.loader_client import ExternalLoaders
+
 log = logging.getLogger(__name__)
 
+# Status polling starts fast for small files and backs off for long jobs
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 10.0
+POLL_TIMEOUT = 600
+
 
 class DatalabMarkerLoader:
     def __init__(
@@ -85,6 +95,9 @@ class DatalabMarkerLoader:
             )
 
     def load(self) -> List[Document]:
+        return ExternalLoaders.run("datalab_marker", self.load_async())
+
+    async def load_async(self) -> List[Document]:
         filename = os.path.basename(self.file_path)
         mime_type = self._get_mime_type(filename)
         headers = {"X-Api-Key": self.api_key}
@@ -107,22 +120,26 @@ class DatalabMarkerLoader:
             f"Datalab Marker POST request parameters: {{'filename': '{filename}', 'mime_type': '{mime_type}', **{form_data}}}"
         )
 
+        session = ExternalLoaders.get_session(self.api_base_url)
         try:
             with open(self.file_path, "rb") as f:
-                files = {"file": (filename, f, mime_type)}
-                response = requests.post(
-                    f"{self.api_base_url}",
-                    data=form_data,
-                    files=files,
-                    headers=headers,
-                )
-                response.raise_for_status()
-                result = response.json()
+                form = aiohttp.FormData()
+                for key, value in form_data.items():
+                    if value is not None:
+                        form.add_field(key, value)
+                # Streamed from disk rather than read into memory
+                form.add_field("file", f, filename=filename, content_type=mime_type)
+
+                async with session.post(
+                    f"{self.api_base_url}", data=form, headers=headers
+                ) as response:
+                    response.raise_for_status()
+                    result = await response.json(content_type=None)
         except FileNotFoundError:
             raise HTTPException(
                 status.HTTP_404_NOT_FOUND, detail=f"File not found: {self.file_path}"
             )
-        except requests.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
                 detail=f"Datalab Marker request failed: {e}",
@@ -145,15 +162,20 @@ class DatalabMarkerLoader:
 
         # Check if this is a direct response (self-hosted) or polling response (DataLab)
         if check_url:
-            # DataLab polling pattern
-            for _ in range(300):  # Up to 10 minutes
-                time.sleep(2)
+            # DataLab polling pattern, without holding a thread while waiting
+            delay = POLL_INITIAL_DELAY
+            deadline = time.monotonic() + POLL_TIMEOUT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, POLL_MAX_DELAY)
+
+                raw_body = ""
                 try:
-                    poll_response = requests.get(check_url, headers=headers)
-                    poll_response.raise_for_status()
-                    poll_result = poll_response.json()
-                except (requests.HTTPError, ValueError) as e:
-                    raw_body = poll_response.text
+                    async with session.get(check_url, headers=headers) as poll_response:
+                        raw_body = await poll_response.text()
+                        poll_response.raise_for_status()
+                        poll_result = json.loads(raw_body)
+                except (aiohttp.ClientResponseError, ValueError) as e:
                     log.error(f"Polling error: {e}, response body: {raw_body}")
                     raise HTTPException(
                         status.HTTP_502_BAD_GATEWAY, detail=f"Polling failed: {e}"
@@ -1,4 +1,3 @@
-import requests
 import logging, os
 from typing import Iterator, List, Union
 from urllib.parse import quote
@@ -6,6 +5,7 @@ from urllib.parse import quote
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.loader_client import ExternalLoaders
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -27,9 +27,9 @@ class ExternalDocumentLoader(BaseLoader):
         self.mime_type = mime_type
 
     def load(self) -> List[Document]:
-        with open(self.file_path, "rb") as f:
-            data = f.read()
+        return ExternalLoaders.run("external", self.load_async())
 
+    async def load_async(self) -> List[Document]:
         headers = {}
         if self.mime_type is not None:
             headers["Content-Type"] = self.mime_type
@@ -46,15 +46,24 @@ class ExternalDocumentLoader(BaseLoader):
         if url.endswith("/"):
             url = url[:-1]
 
+        session = ExternalLoaders.get_session(url)
         try:
-            response = requests.put(f"{url}/process", data=data, headers=headers)
+            # The file is streamed from disk rather than read into memory
+            with open(self.file_path, "rb") as f:
+                async with session.put(
+                    f"{url}/process", data=f, headers=headers
+                ) as response:
+                    ok = response.ok
+                    if ok:
+                        response_data = await response.json(content_type=None)
+                    else:
+                        status_code = response.status
+                        text = await response.text()
         except Exception as e:
             log.error(f"Error connecting to endpoint: {e}")
             raise Exception(f"Error connecting to endpoint: {e}")
 
-        if response.ok:
-
-            response_data = response.json()
+        if ok:
             if response_data:
                 if isinstance(response_data, dict):
                     return [
@@ -79,6 +88,4 @@ class ExternalDocumentLoader(BaseLoader):
             else:
                 raise Exception("Error loading document: No content returned")
         else:
-            raise Exception(
-                f"Error loading document: {response.status_code} {response.text}"
-            )
+            raise Exception(f"Error loading document: {status_code} {text}")
@@ -1,8 +1,9 @@
-import requests
+import aiohttp
 import logging
 import ftfy
 import sys
 import json
+from typing import Callable, Optional
 
 from azure.identity import DefaultAzureCredential
 from langchain_community.document_loaders import (
@@ -27,6 +28,13 @@ from open_webui.retrieval.loaders.external_document import ExternalDocumentLoade
 
 from open_webui.retrieval.loaders.mistral import MistralLoader
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
+from open_webui.retrieval.loaders.pdf import ParallelPyPDFLoader
+from open_webui.utils.loader_client import ExternalLoaders
+from open_webui.retrieval.loaders.cache import (
+    ExtractionCache,
+    get_extraction_cache_key,
+)
+from open_webui.utils.misc import calculate_sha256
 
 
 from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
@@ -89,6 +97,39 @@ known_source_ext = [
 ]
 
 
+# Loader settings that change the extracted documents, per engine. Worker counts
+# do not, and only whether a credential is set matters (it can switch the
+# loader), so keys are reduced to a boolean in the cache key.
+EXTRACTION_CACHE_PARAMS = {
+    "": ["PDF_EXTRACT_IMAGES"],
+    "external": [
+        "EXTERNAL_DOCUMENT_LOADER_URL",
+        "EXTERNAL_DOCUMENT_LOADER_API_KEY",
+        "MISTRAL_OCR_API_KEY",
+    ],
+    "tika": ["TIKA_SERVER_URL", "PDF_EXTRACT_IMAGES"],
+    "datalab_marker": [
+        "DATALAB_MARKER_API_KEY",
+        "DATALAB_MARKER_API_BASE_URL",
+        "DATALAB_MARKER_ADDITIONAL_CONFIG",
+        "DATALAB_MARKER_USE_LLM",
+        "DATALAB_MARKER_SKIP_CACHE",
+        "DATALAB_MARKER_FORCE_OCR",
+        "DATALAB_MARKER_PAGINATE",
+        "DATALAB_MARKER_STRIP_EXISTING_OCR",
+        "DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION",
+        "DATALAB_MARKER_FORMAT_LINES",
+        "DATALAB_MARKER_OUTPUT_FORMAT",
+    ],
+    "docling": ["DOCLING_SERVER_URL", "DOCLING_PARAMS"],
+    "document_intelligence": ["DOCUMENT_INTELLIGENCE_ENDPOINT"],
+    "mistral_ocr": ["MISTRAL_OCR_API_KEY"],
+}
+
+# Settings of the cache itself
+EXTRACTION_CACHE_SETTINGS = ["EXTRACTION_CACHE_DIR", "EXTRACTION_CACHE_MAX_SIZE"]
+
+
 class TikaLoader:
     def __init__(self, url, file_path, mime_type=None, extract_images=None):
         self.url = url
@@ -98,9 +139,9 @@ class TikaLoader:
         self.extract_images = extract_images
 
     def load(self) -> list[Document]:
-        with open(self.file_path, "rb") as f:
-            data = f.read()
+        return ExternalLoaders.run("tika", self.load_async())
 
+    async def load_async(self) -> list[Document]:
         if self.mime_type is not None:
             headers = {"Content-Type": self.mime_type}
         else:
@@ -114,20 +155,22 @@ class TikaLoader:
             endpoint += "/"
         endpoint += "tika/text"
 
-        r = requests.put(endpoint, data=data, headers=headers)
+        session = ExternalLoaders.get_session(endpoint)
+        # The file is streamed from disk rather than read into memory
+        with open(self.file_path, "rb") as f:
+            async with session.put(endpoint, data=f, headers=headers) as r:
+                if not r.ok:
+                    raise Exception(f"Error calling Tika: {r.reason}")
+                raw_metadata = await r.json(content_type=None)
 
-        if r.ok:
-            raw_metadata = r.json()
-            text = raw_metadata.get("X-TIKA:content", "<No text content found>").strip()
+        text = raw_metadata.get("X-TIKA:content", "<No text content found>").strip()
 
-            if "Content-Type" in raw_metadata:
-                headers["Content-Type"] = raw_metadata["Content-Type"]
+        if "Content-Type" in raw_metadata:
+            headers["Content-Type"] = raw_metadata["Content-Type"]
 
-            log.debug("Tika extracted text: %s", text)
+        log.debug("Tika extracted text: %s", text)
 
-            return [Document(page_content=text, metadata=headers)]
-        else:
-            raise Exception(f"Error calling Tika: {r.reason}")
+        return [Document(page_content=text, metadata=headers)]
 
 
 class DoclingLoader:
@@ -138,90 +181,105 @@ class DoclingLoader:
 
         self.params = params or {}
 
-    def load(self) -> list[Document]:
-        with open(self.file_path, "rb") as f:
-            files = {
-                "files": (
-                    self.file_path,
-                    f,
-                    self.mime_type or "application/octet-stream",
+    def get_params(self) -> dict:
+        params = {"image_export_mode": "placeholder"}
+
+        if self.params:
+            if self.params.get("do_picture_description"):
+                params["do_picture_description"] = self.params.get(
+                    "do_picture_description"
                 )
-            }
 
-            params = {"image_export_mode": "placeholder"}
+                picture_description_mode = self.params.get(
+                    "picture_description_mode", ""
+                ).lower()
 
-            if self.params:
-                if self.params.get("do_picture_description"):
-                    params["do_picture_description"] = self.params.get(
-                        "do_picture_description"
+                if picture_description_mode == "local" and self.params.get(
+                    "picture_description_local", {}
+                ):
+                    params["picture_description_local"] = json.dumps(
+                        self.params.get("picture_description_local", {})
+                    )
+
+                elif picture_description_mode == "api" and self.params.get(
+                    "picture_description_api", {}
+                ):
+                    params["picture_description_api"] = json.dumps(
+                        self.params.get("picture_description_api", {})
                     )
 
-                    picture_description_mode = self.params.get(
-                        "picture_description_mode", ""
-                    ).lower()
+            params["do_ocr"] = self.params.get("do_ocr")
 
-                    if picture_description_mode == "local" and self.params.get(
-                        "picture_description_local", {}
-                    ):
-                        params["picture_description_local"] = json.dumps(
-                            self.params.get("picture_description_local", {})
-                        )
+            params["force_ocr"] = self.params.get("force_ocr")
 
-                    elif picture_description_mode == "api" and self.params.get(
-                        "picture_description_api", {}
-                    ):
-                        params["picture_description_api"] = json.dumps(
-                            self.params.get("picture_description_api", {})
-                        )
+            if (
+                self.params.get("do_ocr")
+                and self.params.get("ocr_engine")
+                and self.params.get("ocr_lang")
+            ):
+                params["ocr_engine"] = self.params.get("ocr_engine")
+                params["ocr_lang"] = [
+                    lang.strip()
+                    for lang in self.params.get("ocr_lang").split(",")
+                    if lang.strip()
+                ]
 
-                params["do_ocr"] = self.params.get("do_ocr")
+            if self.params.get("pdf_backend"):
+                params["pdf_backend"] = self.params.get("pdf_backend")
 
-                params["force_ocr"] = self.params.get("force_ocr")
+            if self.params.get("table_mode"):
+                params["table_mode"] = self.params.get("table_mode")
 
-                if (
-                    self.params.get("do_ocr")
-                    and self.params.get("ocr_engine")
-                    and self.params.get("ocr_lang")
-                ):
-                    params["ocr_engine"] = self.params.get("ocr_engine")
-                    params["ocr_lang"] = [
-                        lang.strip()
-                        for lang in self.params.get("ocr_lang").split(",")
-                        if lang.strip()
-                    ]
+            if self.params.get("pipeline"):
+                params["pipeline"] = self.params.get("pipeline")
+
+        return params
 
-                if self.params.get("pdf_backend"):
-                    params["pdf_backend"] = self.params.get("pdf_backend")
+    def load(self) -> list[Document]:
+        return ExternalLoaders.run("docling", self.load_async())
 
-                if self.params.get("table_mode"):
-                    params["table_mode"] = self.params.get("table_mode")
+    async def load_async(self) -> list[Document]:
+        endpoint = f"{self.url}/v1/convert/file"
+        session = ExternalLoaders.get_session(endpoint)
 
-                if self.params.get("pipeline"):
-                    params["pipeline"] = self.params.get("pipeline")
+        with open(self.file_path, "rb") as f:
+            # Encoded like `requests` form data: None is left out, lists repeat
+            form = aiohttp.FormData()
+            for key, value in self.get_params().items():
+                if value is None:
+                    continue
+                for item in value if isinstance(value, list) else [value]:
+                    form.add_field(key, str(item))
+            form.add_field(
+                "files",
+                f,
+                filename=self.file_path,
+                content_type=self.mime_type or "application/octet-stream",
+            )
 
-            endpoint = f"{self.url}/v1/convert/file"
-            r = requests.post(endpoint, files=files, data=params)
+            async with session.post(endpoint, data=form) as r:
+                if r.ok:
+                    result = await r.json(content_type=None)
+                else:
+                    error_msg = f"Error calling Docling API: {r.reason}"
+                    body = await r.text()
+                    if body:
+                        try:
+                            error_data = json.loads(body)
+                            if "detail" in error_data:
+                                error_msg += f" - {error_data['detail']}"
+                        except Exception:
+                            error_msg += f" - {body}"
+                    raise Exception(f"Error calling Docling: {error_msg}")
 
-        if r.ok:
-            result = r.json()
-            document_data = result.get("document", {})
-            text = document_data.get("md_content", "<No text content found>")
+        document_data = result.get("document", {})
+        text = document_data.get("md_content", "<No text content found>")
 
-            metadata = {"Content-Type": self.mime_type} if self.mime_type else {}
+        metadata = {"Content-Type": self.mime_type} if self.mime_type else {}
 
-            log.debug("Docling extracted text: %s", text)
+        log.debug("Docling extracted text: %s", text)
 
-            return [Document(page_content=text, metadata=metadata)]
-        else:
-            error_msg = f"Error calling Docling API: {r.reason}"
-            if r.text:
-                try:
-                    error_data = r.json()
-                    if "detail" in error_data:
-                        error_msg += f" - {error_data['detail']}"
-                except Exception:
-                    error_msg += f" - {r.text}"
-            raise Exception(f"Error calling Docling: {error_msg}")
+        return [Document(page_content=text, metadata=metadata)]
 
 
 class Loader:
@@ -230,9 +288,85 @@ class Loader:
         self.kwargs = kwargs
 
     def load(
-        self, filename: str, file_content_type: str, file_path: str
+        self,
+        filename: str,
+        file_content_type: str,
+        file_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        file_hash: Optional[str] = None,
+    ) -> list[Document]:
+        """
+        With EXTRACTION_CACHE_DIR set, documents are reused for files with the
+        same bytes (`file_hash`, computed if not given) and loader settings.
+        Failed extractions (documents with an `error` in their metadata) are
+        not cached.
+        """
+        cache = None
+        if self.kwargs.get("EXTRACTION_CACHE_DIR"):
+            cache = ExtractionCache(
+                self.kwargs["EXTRACTION_CACHE_DIR"],
+                max_size=self.kwargs.get("EXTRACTION_CACHE_MAX_SIZE", 0) * 1024 * 1024,
+            )
+            cache_key = self.get_cache_key(
+                filename,
+                file_content_type,
+                file_hash or calculate_sha256(file_path, 1024 * 1024),
+            )
+
+            docs = cache.get(cache_key, file_path)
+            if docs is not None:
+                log.info(f"Using cached extraction for {filename}")
+                return docs
+
+        docs = self._load(filename, file_content_type, file_path, progress_callback)
+
+        if cache and not any(doc.metadata.get("error") for doc in docs):
+            cache.set(cache_key, file_path, docs)
+        return docs
+
+    def get_cache_key(
+        self, filename: str, file_content_type: str, file_hash: str
+    ) -> str:
+        params = EXTRACTION_CACHE_PARAMS.get(self.engine)
+        if params is None:
+            params = [
+                key
+                for key in self.kwargs
+                if "KEY" not in key and key not in EXTRACTION_CACHE_SETTINGS
+            ]
+
+        return get_extraction_cache_key(
+            file_hash,
+            self.engine,
+            {
+                # The loader is picked by extension and type within an engine
+                "file_ext": filename.split(".")[-1].lower(),
+                "file_content_type": file_content_type,
+                # Only whether a key is set matters, it can switch the loader
+                **{
+                    key: (
+                        bool(self.kwargs.get(key))
+                        if "KEY" in key
+                        else self.kwargs.get(key)
+                    )
+                    for key in params
+                },
+            },
+        )
+
+    def _load(
+        self,
+        filename: str,
+        file_content_type: str,
+        file_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
     ) -> list[Document]:
         loader = self._get_loader(filename, file_content_type, file_path)
+
+        if isinstance(loader, ParallelPyPDFLoader):
+            # Pages are extracted and fixed with ftfy in the worker processes
+            return loader.load(progress_callback=progress_callback)
+
         docs = loader.load()
 
         return [
@@ -386,7 +520,14 @@ class Loader:
                 api_key=self.kwargs.get("MISTRAL_OCR_API_KEY"), file_path=file_path
             )
         else:
-            if file_ext == "pdf":
+            if file_ext == "pdf" and self.kwargs.get("PDF_LOADER_WORKERS", 1) > 1:
+                loader = ParallelPyPDFLoader(
+                    file_path,
+                    extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES"),
+                    max_workers=self.kwargs.get("PDF_LOADER_WORKERS"),
+                    pages_per_shard=self.kwargs.get("PDF_LOADER_PAGES_PER_SHARD", 50),
+                )
+            elif file_ext == "pdf":
                 loader = PyPDFLoader(
                     file_path, extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES")
                 )
@@ -10,6 +10,7 @@ from contextlib import asynccontextmanager
 
 from langchain_core.documents import Document
 from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.utils.loader_client import ExternalLoaders
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -485,6 +486,11 @@ class MistralLoader:
     @asynccontextmanager
     async def _get_session(self):
         """Context manager for HTTP session with optimized settings."""
+        if ExternalLoaders.is_running():
+            # Pooled across documents; requests set their own headers and timeouts
+            yield ExternalLoaders.get_session(self.BASE_API_URL)
+            return
+
         connector = aiohttp.TCPConnector(
             limit=20,  # Increased total connection limit for better throughput
             limit_per_host=10,  # Increased per-host limit for API endpoints
@@ -590,9 +596,18 @@ class MistralLoader:
         return documents
 
     def load(self) -> List[Document]:
+        """
+        Executes the full OCR workflow on the shared document loader loop.
+
+        Returns:
+            A list of Document objects, one for each page processed.
+        """
+        return ExternalLoaders.run("mistral_ocr", self.load_async())
+
+    def load_sync(self) -> List[Document]:
         """
         Executes the full OCR workflow: upload, get URL, process OCR, delete file.
-        Synchronous version for backward compatibility.
+        Blocking version using requests.
 
         Returns:
             A list of Document objects, one for each page processed.
@@ -0,0 +1,235 @@
+import logging
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import ftfy
+import pypdf
+from langchain_community.document_loaders.parsers.pdf import PyPDFParser
+from langchain_core.documents import Document
+
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Shared pool for page extraction, started on first use. Workers are spawned
+    rather than forked, as forking the threaded server process is unsafe.
+    """
+    global _process_pool, _process_pool_workers
+
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != max_workers:
+            # Loads still running in the old pool finish before it shuts down
+            _shutdown_process_pool(cancel_futures=False)
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _process_pool_workers = max_workers
+        return _process_pool
+
+
+def reset_process_pool(pool: Optional[ProcessPoolExecutor] = None):
+    """
+    Shuts the shared pool down, the next load starts a new one. With `pool`,
+    only if it is still the shared pool: another load may already have
+    replaced a broken pool.
+    """
+    with _process_pool_lock:
+        if pool is None or pool is _process_pool:
+            _shutdown_process_pool()
+
+
+def _shutdown_process_pool(cancel_futures: bool = True):
+    # Called with _process_pool_lock held
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=cancel_futures)
+        _process_pool = None
+
+
+# Copies of langchain's private PyPDFParser helpers, so that the pages come
+# out exactly as PyPDFLoader returns them
+PARAGRAPH_DELIMITERS = ["\n\n\n", "\n\n"]
+METADATA_KEY_ALIASES = {"page_count": "total_pages", "file_path": "source"}
+
+
+def merge_text_and_extras(extras: list[str], text: str) -> str:
+    """
+    Inserts extras (the text of images) before the last paragraph of the page,
+    or the one before it to skip a footer, else at the end of the text.
+    """
+
+    def merge(text: str, recurse: bool) -> Optional[str]:
+        if not extras:
+            return text
+        for delimiter in PARAGRAPH_DELIMITERS:
+            pos = text.rfind(delimiter)
+            if pos != -1:
+                previous_text = merge(text[:pos], False) if recurse else None
+                if previous_text:
+                    return previous_text + text[pos:]
+                str_extras = "\n\n".join(extra for extra in extras if extra)
+                all_extras = delimiter + str_extras if str_extras else ""
+                return text[:pos] + all_extras + text[pos:]
+        return None
+
+    merged = merge(text, True)
+    if not merged:
+        str_extras = "\n\n".join(extra for extra in extras if extra)
+        merged = text + (PARAGRAPH_DELIMITERS[-1] + str_extras if str_extras else "")
+    return merged
+
+
+def purge_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Normalizes PDF metadata keys and values as PyPDFParser does."""
+    new_metadata = {}
+    for key, value in metadata.items():
+        if type(value) not in [str, int]:
+            value = str(value)
+        key = key.removeprefix("/").lower()
+        if key in ["creationdate", "moddate"]:
+            try:
+                new_metadata[key] = datetime.strptime(
+                    value.replace("'", ""), "D:%Y%m%d%H%M%S%z"
+                ).isoformat("T")
+            except ValueError:
+                new_metadata[key] = value
+        elif key in METADATA_KEY_ALIASES:
+            new_metadata[METADATA_KEY_ALIASES[key]] = value
+            new_metadata[key] = value
+        elif isinstance(value, str):
+            new_metadata[key] = value.strip()
+        else:
+            new_metadata[key] = value
+    return new_metadata
+
+
+def extract_pdf_pages(
+    file_path: str, start: int, end: int, extract_images: bool = False
+) -> list[Document]:
+    """
+    Extracts pages [start, end) of a PDF, one document per page with the same
+    text and metadata as PyPDFLoader, and fixes the text with ftfy.
+    """
+    parser = PyPDFParser(extract_images=extract_images)
+
+    with open(file_path, "rb") as f:
+        reader = pypdf.PdfReader(f)
+        metadata = purge_metadata(
+            {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+            | dict(reader.metadata or {})
+            | {"source": file_path, "total_pages": len(reader.pages)}
+        )
+
+        docs = []
+        for page_number in range(start, min(end, len(reader.pages))):
+            page = reader.pages[page_number]
+            text = merge_text_and_extras(
+                [parser.extract_images_from_page(page)],
+                page.extract_text(extraction_mode=parser.extraction_mode),
+            ).strip()
+            docs.append(
+                Document(
+                    page_content=ftfy.fix_text(text),
+                    metadata={
+                        **metadata,
+                        "page": page_number,
+                        "page_label": reader.page_labels[page_number],
+                    },
+                )
+            )
+        return docs
+
+
+class ParallelPyPDFLoader:
+    """
+    Loads a PDF like PyPDFLoader, but extracts page ranges of large files in a
+    process pool. The text comes back already fixed with ftfy.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        extract_images: bool = False,
+        max_workers: int = 4,
+        pages_per_shard: int = 50,
+    ):
+        self.file_path = file_path
+        self.extract_images = extract_images
+        self.max_workers = max_workers
+        self.pages_per_shard = max(1, pages_per_shard)
+
+    def get_page_count(self) -> int:
+        with open(self.file_path, "rb") as f:
+            return len(pypdf.PdfReader(f).pages)
+
+    def load(
+        self, progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> list[Document]:
+        """
+        `progress_callback(pages_done, total_pages)` is called as page ranges
+        complete, in completion order.
+        """
+        total_pages = self.get_page_count()
+
+        if total_pages <= self.pages_per_shard or self.max_workers <= 1:
+            docs = extract_pdf_pages(
+                self.file_path, 0, total_pages, self.extract_images
+            )
+            if progress_callback:
+                progress_callback(total_pages, total_pages)
+            return docs
+
+        shards = [
+            (start, min(start + self.pages_per_shard, total_pages))
+            for start in range(0, total_pages, self.pages_per_shard)
+        ]
+        log.info(
+            f"Extracting {total_pages} pages of {self.file_path} in {len(shards)} shards"
+        )
+
+        pool = get_process_pool(self.max_workers)
+        futures = {
+            pool.submit(
+                extract_pdf_pages, self.file_path, start, end, self.extract_images
+            ): idx
+            for idx, (start, end) in enumerate(shards)
+        }
+
+        results: list[Optional[list[Document]]] = [None] * len(shards)
+        pages_done = 0
+        try:
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+
+                start, end = shards[idx]
+                pages_done += end - start
+                if progress_callback:
+                    progress_callback(pages_done, total_pages)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory), the next load starts a new pool
+            reset_process_pool(pool)
+            raise
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+        return [doc for docs in results for doc in docs]
@@ -1226,7 +1226,10 @@ def get_sources_from_items(
             if not file_content and item.get("id"):
                 file_object = Files.get_file_by_id(item.get("id"))
                 if file_object:
-                    file_content = file_object.data.get("content", "")
+                    stored_content = Files.get_file_content_by_id(file_object.id)
+                    file_content = (
+                        stored_content.content if stored_content else None
+                    ) or ""
                     file_metadata = {
                         "file_id": item.get("id"),
                         "name": file_object.filename,
@@ -1270,11 +1273,15 @@ def get_sources_from_items(
 
                     documents = []
                     metadatas = []
+                    file_contents = Files.get_file_contents_by_ids(file_ids)
                     for file_id in file_ids:
                         file_object = Files.get_file_by_id(file_id)
 
                         if file_object:
-                            documents.append(file_object.data.get("content", ""))
+                            file_content = file_contents.get(file_id)
+                            documents.append(
+                                (file_content.content if file_content else None) or ""
+                            )
                             metadatas.append(
                                 {
                                     "file_id": file_id,
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_web_embedding_cache_key(content: str, params: dict) -> str:
+    payload = json.dumps(
+        {
+            "sha256": hashlib.sha256(content.encode()).hexdigest(),
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    """Cache-Control directives by lowercase name, with their value if any."""
+    directives = {}
+    for directive in value.split(","):
+        name, _, arg = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def is_cacheable(cache_control: dict) -> bool:
+    # The cache is shared by every user, so `private` responses are not kept
+    return "no-store" not in cache_control and "private" not in cache_control
+
+
+def get_max_age(cache_control: dict) -> Optional[int]:
+    """
+    Freshness lifetime the server allows, in seconds: 0 for `no-cache`, which
+    requires revalidation on every use, and None when it sets no limit.
+    """
+    if "no-cache" in cache_control:
+        return 0
+    # s-maxage takes precedence for shared caches
+    for directive in ("s-maxage", "max-age"):
+        try:
+            return max(0, int(cache_control[directive]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class JSONFileCache:
+    """
+    One JSON file per key, sharded by prefix. Entries are written atomically,
+    so concurrent writers of the same key at worst both do the work. With
+    `max_size` (bytes), the least recently used entries are removed once the
+    cache grows beyond it.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size: int = 0):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def get_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def read(self, key: str) -> Optional[Any]:
+        path = self.get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        try:
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def write(self, key: str, entry: Any) -> None:
+        path = self.get_path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.warning(f"Could not write cache entry {path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        if self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries beyond `max_size`."""
+        entries = []
+        size = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            size += stat.st_size
+
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+
+class WebPageCache(JSONFileCache):
+    """
+    Fetched pages by URL. An entry younger than `ttl` seconds, or than the
+    max-age its server allowed if shorter, is used as is; an older one is
+    revalidated with its ETag / Last-Modified, and reused if the server
+    answers 304 Not Modified.
+    """
+
+    def __init__(self, cache_dir: str | Path, ttl: int = 3600, max_size: int = 0):
+        super().__init__(cache_dir, max_size=max_size)
+        self.ttl = ttl
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[dict]:
+        entry = self.read(self.get_key(url))
+        if entry is None or entry.get("url") != url:
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        ttl = self.ttl
+        if entry.get("max_age") is not None:
+            ttl = min(ttl, entry["max_age"])
+        return time.time() - entry.get("fetched_at", 0) < ttl
+
+    def get_revalidation_headers(self, entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def set(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        self.write(
+            self.get_key(url),
+            {
+                "url": url,
+                "html": html,
+                "etag": etag,
+                "last_modified": last_modified,
+                "max_age": max_age,
+                "fetched_at": time.time(),
+            },
+        )
+
+    def touch(self, entry: dict) -> None:
+        """Marks a revalidated entry as fresh again."""
+        self.write(self.get_key(entry["url"]), {**entry, "fetched_at": time.time()})
+
+
+class WebEmbeddingCache(JSONFileCache):
+    """
+    Chunk embeddings of fetched pages, keyed by the page content and the
+    embedding and chunking settings (see `get_web_embedding_cache_key`), so
+    an unchanged page is never embedded twice, whichever search found it.
+    """
+
+    def get(self, key: str) -> Optional[list[list[float]]]:
+        entry = self.read(key)
+        return entry["embeddings"] if entry else None
+
+    def set(self, key: str, embeddings: list[list[float]]) -> None:
+        self.write(key, {"embeddings": embeddings})
@@ -26,6 +26,12 @@ from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
+from open_webui.retrieval.web.cache import (
+    WebPageCache,
+    get_max_age,
+    is_cacheable,
+    parse_cache_control,
+)
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.config import (
     ENABLE_RAG_LOCAL_WEB_FETCH,
@@ -38,6 +44,11 @@ from open_webui.config import (
     TAVILY_EXTRACT_DEPTH,
     EXTERNAL_WEB_LOADER_URL,
     EXTERNAL_WEB_LOADER_API_KEY,
+    WEB_LOADER_CONCURRENT_REQUESTS_PER_DOMAIN,
+    ENABLE_WEB_FETCH_CACHE,
+    WEB_FETCH_CACHE_DIR,
+    WEB_FETCH_CACHE_MAX_SIZE,
+    WEB_FETCH_CACHE_TTL,
 )
 from open_webui.env import SRC_LOG_LEVELS, AIOHTTP_CLIENT_SESSION_SSL
 
@@ -493,23 +504,44 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 class SafeWebBaseLoader(WebBaseLoader):
     """WebBaseLoader with enhanced error handling for URLs."""
 
-    def __init__(self, trust_env: bool = False, *args, **kwargs):
+    def __init__(
+        self,
+        trust_env: bool = False,
+        *args,
+        requests_per_domain: int = 2,
+        cache: Optional[WebPageCache] = None,
+        **kwargs,
+    ):
         """Initialize SafeWebBaseLoader
         Args:
             trust_env (bool, optional): set to True if using proxy to make web requests, for example
                 using http(s)_proxy environment variables. Defaults to False.
+            requests_per_domain (int, optional): pages fetched at once from a single domain,
+                within the overall `requests_per_second` limit. Defaults to 2.
+            cache (WebPageCache, optional): reuses and revalidates previously fetched pages.
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        self.requests_per_domain = requests_per_domain
+        self.cache = cache
 
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
+        entry = None
+        headers = dict(self.session.headers)
+        if self.cache:
+            entry = await asyncio.to_thread(self.cache.get, url)
+            if entry:
+                if self.cache.is_fresh(entry):
+                    return entry["html"]
+                headers.update(self.cache.get_revalidation_headers(entry))
+
         async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
             for i in range(retries):
                 try:
                     kwargs: Dict = dict(
-                        headers=self.session.headers,
+                        headers=headers,
                         cookies=self.session.cookies.get_dict(),
                     )
                     if not self.session.verify:
@@ -520,9 +552,33 @@ class SafeWebBaseLoader(WebBaseLoader):
                         **(self.requests_kwargs | kwargs),
                         allow_redirects=False,
                     ) as response:
+                        cache_control = parse_cache_control(
+                            response.headers.get("Cache-Control", "")
+                        )
+                        if entry and response.status == 304:
+                            # A 304 without Cache-Control keeps the stored one
+                            if "Cache-Control" in response.headers:
+                                entry["max_age"] = get_max_age(cache_control)
+                            await asyncio.to_thread(self.cache.touch, entry)
+                            return entry["html"]
                         if self.raise_for_status:
                             response.raise_for_status()
-                        return await response.text()
+                        text = await response.text()
+
+                        if (
+                            self.cache
+                            and response.status == 200
+                            and is_cacheable(cache_control)
+                        ):
+                            await asyncio.to_thread(
+                                self.cache.set,
+                                url,
+                                text,
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified"),
+                                max_age=get_max_age(cache_control),
+                            )
+                        return text
                 except aiohttp.ClientConnectionError as e:
                     if i == retries - 1:
                         raise
@@ -574,10 +630,45 @@ class SafeWebBaseLoader(WebBaseLoader):
                 # Log the error and continue with the next URL
                 log.exception(f"Error loading {path}: {e}")
 
+    async def _fetch_with_limits(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        domain_semaphore: asyncio.Semaphore,
+    ) -> tuple[str, str]:
+        # Wait for the domain first, so queued pages do not hold a global slot
+        async with domain_semaphore, semaphore:
+            try:
+                return url, await self._fetch(url)
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.warning(f"Error fetching {url}, skipping: {e}")
+                    return url, ""
+                raise e
+
     async def alazy_load(self) -> AsyncIterator[Document]:
-        """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
+        """
+        Async lazy load text from the url(s) in web_path. Pages are yielded
+        as they arrive, not in web_path order, so callers can start on the
+        first pages while slow ones are still loading.
+        """
+        semaphore = asyncio.Semaphore(self.requests_per_second)
+        domain_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self.requests_per_domain)
+        )
+
+        for next_page in asyncio.as_completed(
+            [
+                self._fetch_with_limits(
+                    path,
+                    semaphore,
+                    domain_semaphores[urllib.parse.urlparse(path).netloc],
+                )
+                for path in self.web_paths
+            ]
+        ):
+            path, result = await next_page
+            soup = self._unpack_fetch_results([result], [path])[0]
             text = soup.get_text(**self.bs_get_text_kwargs)
             metadata = {"source": path}
             if title := soup.find("title"):
@@ -591,8 +682,10 @@ class SafeWebBaseLoader(WebBaseLoader):
             yield Document(page_content=text, metadata=metadata)
 
     async def aload(self) -> list[Document]:
-        """Load data into Document objects."""
-        return [document async for document in self.alazy_load()]
+        """Load data into Document objects, in web_path order."""
+        order = {path: idx for idx, path in reversed(list(enumerate(self.web_paths)))}
+        docs = [document async for document in self.alazy_load()]
+        return sorted(docs, key=lambda doc: order[doc.metadata["source"]])
 
 
 def get_web_loader(
@@ -614,6 +707,15 @@ def get_web_loader(
 
     if WEB_LOADER_ENGINE.value == "" or WEB_LOADER_ENGINE.value == "safe_web":
         WebLoaderClass = SafeWebBaseLoader
+        web_loader_args["requests_per_domain"] = (
+            WEB_LOADER_CONCURRENT_REQUESTS_PER_DOMAIN
+        )
+        if ENABLE_WEB_FETCH_CACHE:
+            web_loader_args["cache"] = WebPageCache(
+                WEB_FETCH_CACHE_DIR / "pages",
+                ttl=WEB_FETCH_CACHE_TTL,
+                max_size=WEB_FETCH_CACHE_MAX_SIZE * 1024 * 1024,
+            )
     if WEB_LOADER_ENGINE.value == "playwright":
         WebLoaderClass = SafePlaywrightURLLoader
         web_loader_args["playwright_timeout"] = PLAYWRIGHT_TIMEOUT.value
@@ -1,14 +1,19 @@
+import asyncio
 import hashlib
 import json
 import logging
 import os
 import uuid
 import html
+from collections import deque
 from functools import lru_cache
+from io import BytesIO
+from itertools import islice
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, Optional
 
 from fnmatch import fnmatch
 import aiohttp
@@ -29,16 +34,32 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.audio import (
+    SAMPLE_RATE,
+    get_audio_duration,
+    get_samples,
+    get_speech_spans,
+    get_whisper_pool,
+    has_speech,
+    merge_transcripts,
+    offset_segments,
+    plan_audio_chunks,
+    reset_whisper_pool,
+    transcribe_samples,
+)
+from open_webui.utils.loader_client import LoaderClient
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_MODEL_DIR,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    AUDIO_STT_CHUNK_DURATION,
+    AUDIO_STT_WORKERS,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -66,6 +87,11 @@ log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
 SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Requests of the external STT engines for the chunks of long recordings
+SpeechToTextClient = LoaderClient(
+    max_concurrency=AUDIO_STT_WORKERS, name="speech-to-text"
+)
+
 
 ##########################################
 #
@@ -120,18 +146,22 @@ def convert_audio_to_mp3(file_path):
         return None
 
 
+def get_faster_whisper_kwargs(model: str, auto_update: bool = False) -> dict:
+    return {
+        "model_size_or_path": model,
+        "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
+        "compute_type": "int8",
+        "download_root": WHISPER_MODEL_DIR,
+        "local_files_only": not auto_update,
+    }
+
+
 def set_faster_whisper_model(model: str, auto_update: bool = False):
     whisper_model = None
     if model:
         from faster_whisper import WhisperModel
 
-        faster_whisper_kwargs = {
-            "model_size_or_path": model,
-            "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
-            "compute_type": "int8",
-            "download_root": WHISPER_MODEL_DIR,
-            "local_files_only": not auto_update,
-        }
+        faster_whisper_kwargs = get_faster_whisper_kwargs(model, auto_update)
 
         try:
             whisper_model = WhisperModel(**faster_whisper_kwargs)
@@ -570,20 +600,13 @@ def transcription_handler(request, file_path, metadata):
                 request.app.state.config.WHISPER_MODEL
             )
 
-        model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
+        data = transcribe_samples(
             file_path,
-            beam_size=5,
-            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
             language=languages[0],
+            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
+            model=request.app.state.faster_whisper_model,
         )
-        log.info(
-            "Detected language '%s' with probability %f"
-            % (info.language, info.language_probability)
-        )
-
-        transcript = "".join([segment.text for segment in list(segments)])
-        data = {"text": transcript.strip()}
+        log.info(f"Detected language '{data['language']}'")
 
         # save the transcript to a json file
         transcript_file = f"{file_dir}/{id}.json"
@@ -829,119 +852,245 @@ def transcription_handler(request, file_path, metadata):
             )
 
 
-def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None):
-    log.info(f"transcribe: {file_path} {metadata}")
+async def transcribe_openai_async(
+    request: Request, audio: bytes, filename: str, metadata: Optional[dict] = None
+) -> dict:
+    """Async counterpart of the OpenAI engine of `transcription_handler`."""
+    metadata = metadata or {}
+    languages = [
+        metadata.get("language", None) if not WHISPER_LANGUAGE else WHISPER_LANGUAGE,
+        None,  # Always fallback to None in case transcription fails
+    ]
 
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
+    base_url = request.app.state.config.STT_OPENAI_API_BASE_URL
+    session = SpeechToTextClient.get_session(base_url)
 
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
+    detail = None
+    for language in languages:
+        form = aiohttp.FormData()
+        form.add_field("model", request.app.state.config.STT_MODEL)
+        if language:
+            form.add_field("language", language)
+        form.add_field("file", audio, filename=filename)
 
-    # Always produce a list of chunk paths (could be one entry if small)
-    try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
-    except Exception as e:
-        log.exception(e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
+        async with session.post(
+            f"{base_url}/audio/transcriptions",
+            data=form,
+            headers={
+                "Authorization": f"Bearer {request.app.state.config.STT_OPENAI_API_KEY}"
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+        ) as r:
+            if r.status == 200:
+                return await r.json()
+
+            try:
+                res = await r.json()
+                if "error" in res:
+                    detail = f"External: {res['error'].get('message', '')}"
+            except Exception:
+                detail = f"External: {r.status} {r.reason}"
 
-    results = []
+    raise Exception(detail if detail else "Open WebUI: Server Connection Error")
+
+
+def iter_results_in_order(submit, items, max_pending: int):
+    """
+    Submits `items` with `submit`, keeping up to `max_pending` futures in
+    flight, and yields their results in the order of `items`.
+    """
+    items = iter(items)
+    pending = deque(submit(item) for item in islice(items, max_pending))
     try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(transcription_handler, request, chunk_path, metadata)
-                for chunk_path in chunk_paths
-            ]
-            # Gather results as they complete
-            for future in futures:
-                try:
-                    results.append(future.result())
-                except Exception as transcribe_exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Error transcribing chunk: {transcribe_exc}",
-                    )
+        while pending:
+            result = pending.popleft().result()
+            pending.extend(submit(item) for item in islice(items, 1))
+            yield result
     finally:
-        # Clean up only the temporary chunks, never the original file
-        for chunk_path in chunk_paths:
-            if chunk_path != file_path and os.path.isfile(chunk_path):
-                try:
-                    os.remove(chunk_path)
-                except Exception:
-                    pass
+        for future in pending:
+            future.cancel()
+
+
+def get_chunk_transcript(result: dict, start: float, end: float) -> dict:
+    text = result.get("text", "").strip()
+    segments = result.get("segments")
+    if not (
+        isinstance(segments, list)
+        and all("start" in segment and "end" in segment for segment in segments)
+    ):
+        # Engines without timestamps get one segment per chunk
+        segments = [{"start": 0.0, "end": end - start, "text": text}]
 
     return {
-        "text": " ".join([result["text"] for result in results]),
+        "start": round(start, 3),
+        "end": round(end, 3),
+        "text": text,
+        "segments": offset_segments(
+            [
+                {"start": s["start"], "end": s["end"], "text": s.get("text", "")}
+                for s in segments
+            ],
+            start,
+        ),
     }
 
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
+def transcribe_chunks(
+    request: Request, file_path: str, metadata: Optional[dict] = None
+) -> Iterator[dict]:
+    """
+    Transcribes a recording and yields the transcript chunk by chunk, in order,
+    with segment timestamps relative to the whole recording.
 
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
+    Recordings longer than AUDIO_STT_CHUNK_DURATION are cut at pauses found
+    by the VAD, and the chunks with speech are transcribed concurrently: in a
+    process pool for the local whisper model, as async requests for OpenAI,
+    and in threads for the other engines.
+    """
+    if is_audio_conversion_required(file_path):
+        file_path = convert_audio_to_mp3(file_path)
+
+    engine = request.app.state.config.STT_ENGINE
+    if engine == "" and request.app.state.faster_whisper_model is None:
+        request.app.state.faster_whisper_model = set_faster_whisper_model(
+            request.app.state.config.WHISPER_MODEL
+        )
 
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
+    # Short recordings are transcribed in one call, without decoding them here
+    duration = get_audio_duration(file_path)
+    uploadable = engine == "" or os.path.getsize(file_path) <= MAX_FILE_SIZE
 
-        return compressed_path
+    audio = None
+    if not (
+        uploadable and duration is not None and duration <= AUDIO_STT_CHUNK_DURATION
+    ):
+        try:
+            audio = AudioSegment.from_file(file_path)
+            duration = len(audio) / 1000
+        except Exception as e:
+            log.warning(f"Could not decode {file_path}, transcribing it whole: {e}")
+
+    if audio is None or (uploadable and duration <= AUDIO_STT_CHUNK_DURATION):
+        result = transcription_handler(request, file_path, metadata)
+        yield {"index": 0, **get_chunk_transcript(result, 0.0, duration or 0.0)}
+        return
+
+    samples = get_samples(audio)
+    speech_spans = get_speech_spans(samples)
+    chunks = [
+        (start, end)
+        for start, end in plan_audio_chunks(
+            speech_spans, len(samples), AUDIO_STT_CHUNK_DURATION * SAMPLE_RATE
+        )
+        if has_speech(speech_spans, start, end)
+    ]
+    log.info(
+        f"Transcribing {len(samples) / SAMPLE_RATE:.0f}s of {file_path} "
+        f"in {len(chunks)} chunks with speech"
+    )
+
+    executor = None
+    if engine == "":
+        language = WHISPER_LANGUAGE or (metadata or {}).get("language")
+        vad_filter = request.app.state.config.WHISPER_VAD_FILTER
+
+        if AUDIO_STT_WORKERS > 1:
+            pool = get_whisper_pool(
+                get_faster_whisper_kwargs(request.app.state.config.WHISPER_MODEL),
+                AUDIO_STT_WORKERS,
+            )
+
+            def submit(chunk):
+                start, end = chunk
+                return pool.submit(
+                    transcribe_samples, samples[start:end], language, vad_filter
+                )
+
+            results = iter_results_in_order(submit, chunks, 2 * AUDIO_STT_WORKERS)
+        else:
+            model = request.app.state.faster_whisper_model
+            results = (
+                transcribe_samples(samples[start:end], language, vad_filter, model)
+                for start, end in chunks
+            )
     else:
-        return file_path
+        # External engines get compressed audio, small enough to upload
+        audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1)
+        base, _ = os.path.splitext(file_path)
+
+        def export_chunk(start: int, end: int) -> bytes:
+            chunk = audio[start * 1000 // SAMPLE_RATE : end * 1000 // SAMPLE_RATE]
+            data = chunk.export(BytesIO(), format="mp3", bitrate="32k").getvalue()
+            if len(data) > MAX_FILE_SIZE:
+                raise Exception("Audio chunk cannot be reduced below max file size.")
+            return data
 
+        if engine == "openai":
 
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
-    """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
-    """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+            async def transcribe_chunk(idx: int, start: int, end: int) -> dict:
+                data = await asyncio.to_thread(export_chunk, start, end)
+                return await transcribe_openai_async(
+                    request, data, f"{os.path.basename(base)}_chunk_{idx}.mp3", metadata
+                )
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+            def submit(item):
+                idx, (start, end) = item
+                return SpeechToTextClient.submit(
+                    engine, transcribe_chunk(idx, start, end)
+                )
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
+        else:
 
-    base, _ = os.path.splitext(file_path)
+            def transcribe_chunk(idx: int, start: int, end: int) -> dict:
+                chunk_path = f"{base}_chunk_{idx}.mp3"
+                try:
+                    with open(chunk_path, "wb") as f:
+                        f.write(export_chunk(start, end))
+                    return transcription_handler(request, chunk_path, metadata)
+                finally:
+                    if os.path.isfile(chunk_path):
+                        os.remove(chunk_path)
 
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+            executor = ThreadPoolExecutor(max_workers=AUDIO_STT_WORKERS)
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+            def submit(item):
+                idx, (start, end) = item
+                return executor.submit(transcribe_chunk, idx, start, end)
 
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
+        results = iter_results_in_order(
+            submit, enumerate(chunks), 2 * AUDIO_STT_WORKERS
+        )
 
-        chunks.append(chunk_path)
-        start = end
-        i += 1
+    try:
+        for idx, ((start, end), result) in enumerate(zip(chunks, results)):
+            yield {
+                "index": idx,
+                **get_chunk_transcript(result, start / SAMPLE_RATE, end / SAMPLE_RATE),
+            }
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory), the next call starts a new pool
+        reset_whisper_pool()
+        raise
+    finally:
+        results.close()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-    return chunks
+
+def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None):
+    log.info(f"transcribe: {file_path} {metadata}")
+
+    try:
+        chunks = list(transcribe_chunks(request, file_path, metadata))
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error transcribing chunk: {e}",
+        )
+
+    return merge_transcripts(chunks)
 
 
 @router.post("/transcriptions")
@@ -949,8 +1098,14 @@ def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
+    """
+    With `stream`, the transcript is sent as server-sent events: a `partial`
+    event per chunk as soon as it is transcribed, then `done` with the whole
+    transcript.
+    """
     log.info(f"file.content_type: {file.content_type}")
 
     stt_supported_content_types = getattr(
@@ -991,6 +1146,27 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
+            if stream:
+
+                def event_stream():
+                    chunks = []
+                    try:
+                        for chunk in transcribe_chunks(request, file_path, metadata):
+                            chunks.append(chunk)
+                            yield f"data: {json.dumps({'type': 'partial', **chunk})}\n\n"
+
+                        result = {
+                            "type": "done",
+                            **merge_transcripts(chunks),
+                            "filename": os.path.basename(file_path),
+                        }
+                        yield f"data: {json.dumps(result)}\n\n"
+                    except Exception as e:
+                        log.exception(e)
+                        yield f"data: {json.dumps({'type': 'error', 'detail': ERROR_MESSAGES.DEFAULT(e)})}\n\n"
+
+                return StreamingResponse(event_stream(), media_type="text/event-stream")
+
             result = transcribe(request, file_path, metadata)
 
             return {
@@ -22,6 +22,7 @@ from open_webui.models.messages import (
     MessageModel,
     MessageResponse,
     MessageForm,
+    parse_message_list_cursor,
 )
 
 
@@ -47,6 +48,18 @@ log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+
+def validate_message_list_cursor(cursor: Optional[str]):
+    if cursor:
+        try:
+            parse_message_list_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.INCORRECT_FORMAT(" for the cursor."),
+            )
+
+
 ############################
 # GetChatList
 ############################
@@ -172,8 +185,13 @@ class MessageUserResponse(MessageResponse):
 
 @router.get("/{id}/messages", response_model=list[MessageUserResponse])
 async def get_channel_messages(
-    id: str, skip: int = 0, limit: int = 50, user=Depends(get_verified_user)
+    id: str,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    user=Depends(get_verified_user),
 ):
+    validate_message_list_cursor(cursor)
     channel = Channels.get_channel_by_id(id)
     if not channel:
         raise HTTPException(
@@ -187,28 +205,24 @@ async def get_channel_messages(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit)
-    users = {}
+    message_list = Messages.get_messages_by_channel_id(id, skip, limit, cursor=cursor)
+
+    # Replies and reactions of the whole page are aggregated in one query each
+    message_ids = [message.id for message in message_list]
+    reply_stats = Messages.get_reply_stats_by_message_ids(message_ids)
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
+        reply_count, latest_reply_at = reply_stats.get(message.id, (0, None))
 
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reply_count": reply_count,
+                    "latest_reply_at": latest_reply_at,
+                    "reactions": reactions.get(message.id, []),
                 }
             )
         )
@@ -307,15 +321,9 @@ async def model_response_handler(request, channel, message, user):
 
                 thread_history = []
                 images = []
-                message_users = {}
 
                 for thread_message in thread_messages:
-                    message_user = None
-                    if thread_message.user_id not in message_users:
-                        message_user = Users.get_user_by_id(thread_message.user_id)
-                        message_users[thread_message.user_id] = message_user
-                    else:
-                        message_user = message_users[thread_message.user_id]
+                    message_user = thread_message.user
 
                     if thread_message.meta and thread_message.meta.get(
                         "model_id", None
@@ -578,8 +586,10 @@ async def get_channel_thread_messages(
     message_id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
+    validate_message_list_cursor(cursor)
     channel = Channels.get_channel_by_id(id)
     if not channel:
         raise HTTPException(
@@ -593,23 +603,22 @@ async def get_channel_thread_messages(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message_list = Messages.get_messages_by_parent_id(id, message_id, skip, limit)
-    users = {}
+    message_list = Messages.get_messages_by_parent_id(
+        id, message_id, skip, limit, cursor=cursor
+    )
+    reactions = Messages.get_reactions_by_message_ids(
+        [message.id for message in message_list]
+    )
 
     messages = []
     for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
         messages.append(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
+                    "reactions": reactions.get(message.id, []),
                 }
             )
         )
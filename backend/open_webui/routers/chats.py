@@ -9,7 +9,9 @@ from open_webui.models.chats import (
     ChatImportForm,
     ChatResponse,
     Chats,
+    ChatSearchResponse,
     ChatTitleIdResponse,
+    parse_chat_list_cursor,
 )
 from open_webui.models.tags import TagModel, Tags
 from open_webui.models.folders import Folders
@@ -27,6 +29,18 @@ from open_webui.utils.access_control import has_permission
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+
+def validate_chat_list_cursor(cursor: Optional[str]):
+    if cursor:
+        try:
+            parse_chat_list_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.INCORRECT_FORMAT(" for the cursor."),
+            )
+
+
 router = APIRouter()
 
 ############################
@@ -40,14 +54,20 @@ def get_session_user_chat_list(
     user=Depends(get_verified_user),
     page: Optional[int] = None,
     include_folders: Optional[bool] = False,
+    cursor: Optional[str] = None,
 ):
+    validate_chat_list_cursor(cursor)
     try:
-        if page is not None:
+        if page is not None or cursor:
             limit = 60
-            skip = (page - 1) * limit
+            skip = ((page or 1) - 1) * limit
 
             return Chats.get_chat_title_id_list_by_user_id(
-                user.id, include_folders=include_folders, skip=skip, limit=limit
+                user.id,
+                include_folders=include_folders,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
             )
         else:
             return Chats.get_chat_title_id_list_by_user_id(
@@ -92,6 +112,7 @@ async def get_user_chat_list_by_user_id(
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_admin_user),
 ):
     if not ENABLE_ADMIN_CHAT_ACCESS:
@@ -100,6 +121,7 @@ async def get_user_chat_list_by_user_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
+    validate_chat_list_cursor(cursor)
     if page is None:
         page = 1
 
@@ -115,7 +137,12 @@ async def get_user_chat_list_by_user_id(
         filter["direction"] = direction
 
     return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit
+        user_id,
+        include_archived=True,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
     )
 
 
@@ -169,7 +196,7 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
 ############################
 
 
-@router.get("/search", response_model=list[ChatTitleIdResponse])
+@router.get("/search", response_model=list[ChatSearchResponse])
 def search_user_chats(
     text: str, page: Optional[int] = None, user=Depends(get_verified_user)
 ):
@@ -179,12 +206,7 @@ def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit
-        )
-    ]
+    chat_list = Chats.search_chat_list_by_user_id(user.id, text, skip=skip, limit=limit)
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -220,8 +242,12 @@ async def get_chats_by_folder_id(folder_id: str, user=Depends(get_verified_user)
 
 @router.get("/folder/{folder_id}/list")
 async def get_chat_list_by_folder_id(
-    folder_id: str, page: Optional[int] = 1, user=Depends(get_verified_user)
+    folder_id: str,
+    page: Optional[int] = 1,
+    cursor: Optional[str] = None,
+    user=Depends(get_verified_user),
 ):
+    validate_chat_list_cursor(cursor)
     try:
         limit = 60
         skip = (page - 1) * limit
@@ -229,7 +255,7 @@ async def get_chat_list_by_folder_id(
         return [
             {"title": chat.title, "id": chat.id, "updated_at": chat.updated_at}
             for chat in Chats.get_chats_by_folder_id_and_user_id(
-                folder_id, user.id, skip=skip, limit=limit
+                folder_id, user.id, skip=skip, limit=limit, cursor=cursor
             )
         ]
 
@@ -247,10 +273,7 @@ async def get_chat_list_by_folder_id(
 
 @router.get("/pinned", response_model=list[ChatTitleIdResponse])
 async def get_user_pinned_chats(user=Depends(get_verified_user)):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id)
-    ]
+    return Chats.get_pinned_chats_by_user_id(user.id)
 
 
 ############################
@@ -322,8 +345,10 @@ async def get_archived_session_user_chat_list(
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
+    validate_chat_list_cursor(cursor)
     if page is None:
         page = 1
 
@@ -338,17 +363,13 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
-            user.id,
-            filter=filter,
-            skip=skip,
-            limit=limit,
-        )
-    ]
-
-    return chat_list
+    return Chats.get_archived_chat_list_by_user_id(
+        user.id,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 ############################
@@ -142,7 +142,7 @@ def process_uploaded_file(request, file, file_path, file_item, file_metadata, us
         )
         processing_details["updated_at"] = int(time.time())
 
-        Files.update_file_data_by_id(
+        Files.update_file_processing_by_id(
             file_item.id,
             {
                 "status": "failed",
@@ -220,7 +220,7 @@ def upload_file_handler(
         id = str(uuid.uuid4())
         name = filename
         filename = f"{id}_{filename}"
-        contents, file_path = Storage.upload_file(
+        uploaded, file_path = Storage.upload_file(
             file.file,
             filename,
             {
@@ -290,7 +290,8 @@ def upload_file_handler(
                     "meta": {
                         "name": name,
                         "content_type": file.content_type,
-                        "size": len(contents),
+                        "size": uploaded.size,
+                        "sha256": uploaded.sha256,
                         "data": file_metadata,
                     },
                 }
@@ -348,10 +349,8 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
     else:
         files = Files.get_files_by_user_id(user.id)
 
-    if not content:
-        for file in files:
-            if "content" in file.data:
-                del file.data["content"]
+    if content:
+        Files.load_file_contents(files)
 
     return files
 
@@ -390,10 +389,8 @@ async def search_files(
             detail="No files found matching the pattern.",
         )
 
-    if not content:
-        for file in matching_files:
-            if "content" in file.data:
-                del file.data["content"]
+    if content:
+        Files.load_file_contents(matching_files)
 
     return matching_files
 
@@ -445,7 +442,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
         or user.role == "admin"
         or has_access_to_file(id, "read", user)
     ):
-        return file
+        return Files.load_file_contents([file])[0]
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -476,9 +473,9 @@ async def get_file_process_status(
             async def event_stream(file_item):
                 if file_item:
                     for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
-                        if file_item:
-                            data = file_item.model_dump().get("data", {})
+                        # Only the processing state is read, not the whole file
+                        data = Files.get_file_processing_by_id(file_item.id)
+                        if data is not None:
                             status = data.get("status")
 
                             if status:
@@ -539,7 +536,8 @@ async def get_file_data_content_by_id(id: str, user=Depends(get_verified_user)):
         or user.role == "admin"
         or has_access_to_file(id, "read", user)
     ):
-        return {"content": file.data.get("content", "")}
+        file_content = Files.get_file_content_by_id(id)
+        return {"content": (file_content.content if file_content else None) or ""}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -579,12 +577,12 @@ async def update_file_data_content_by_id(
                 ProcessFileForm(file_id=id, content=form_data.content),
                 user=user,
             )
-            file = Files.get_file_by_id(id=id)
         except Exception as e:
             log.exception(e)
             log.error(f"Error processing file: {file.id}")
 
-        return {"content": file.data.get("content", "")}
+        file_content = Files.get_file_content_by_id(id)
+        return {"content": (file_content.content if file_content else None) or ""}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
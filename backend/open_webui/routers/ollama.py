@@ -1,12 +1,7 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -37,7 +32,7 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, validator
-from starlette.background import BackgroundTask
+from starlette.background import BackgroundTasks
 
 
 from open_webui.models.models import Models
@@ -51,6 +46,8 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.load_balancer import LoadBalancer
+from open_webui.utils.upstream import Upstreams, last_good_model_lists
 
 
 from open_webui.config import (
@@ -61,15 +58,26 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     BYPASS_MODEL_ACCESS_CONTROL,
+    OLLAMA_LOAD_BALANCING_STRATEGY,
+    ENABLE_OLLAMA_CHAT_AFFINITY,
+    OLLAMA_EJECTION_FAILURES,
+    OLLAMA_EJECTION_TIME,
 )
 from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 
+# Spreads requests for a model across the Ollama backends serving it
+load_balancer = LoadBalancer(
+    strategy=OLLAMA_LOAD_BALANCING_STRATEGY,
+    affinity=ENABLE_OLLAMA_CHAT_AFFINITY,
+    ejection_failures=OLLAMA_EJECTION_FAILURES,
+    ejection_time=OLLAMA_EJECTION_TIME,
+)
+
 
 ##########################################
 #
@@ -78,41 +86,56 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 ##########################################
 
 
-async def send_get_request(url, key=None, user: UserModel = None):
+async def send_get_request(
+    url, key=None, user: UserModel = None, last_good: bool = False
+):
+    # `last_good` falls back to the last successful response of a model list
+    # url when the upstream is unreachable or answers with an error.
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        session = Upstreams.get_session(url)
+        async with session.get(
+            url,
+            headers={
+                "Content-Type": "application/json",
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            data = await response.json()
+            if last_good:
+                if response.ok:
+                    last_good_model_lists.set(url, data)
+                else:
+                    data = last_good_model_lists.get(url) or data
+            return data
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
+        if last_good:
+            return last_good_model_lists.get(url)
         return None
 
 
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+    session: Optional[aiohttp.ClientSession] = None,
 ):
+    # Releasing (instead of closing) hands the connection back to the pool
+    # when the body was fully read; pooled sessions are never closed here.
     if response:
-        response.close()
+        response.release()
     if session:
         await session.close()
 
@@ -125,14 +148,14 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    url_idx: Optional[int] = None,
 ):
-
+    # `url_idx` reports the outcome to the load balancer for that backend
     r = None
+    streaming = False
+    start = load_balancer.begin(url_idx) if url_idx is not None else None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = Upstreams.get_session(url)
         r = await session.post(
             url,
             data=payload,
@@ -158,10 +181,13 @@ async def send_post_request(
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
+        if url_idx is not None:
+            load_balancer.observe(url_idx, start, error=r.status >= 500)
+
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -180,13 +206,17 @@ async def send_post_request(
             if content_type:
                 response_headers["Content-Type"] = content_type
 
+            background = BackgroundTasks()
+            background.add_task(cleanup_response, response=r)
+            if url_idx is not None:
+                background.add_task(load_balancer.end, url_idx)
+
+            streaming = True
             return StreamingResponse(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=background,
             )
         else:
             res = await r.json()
@@ -195,6 +225,9 @@ async def send_post_request(
     except HTTPException as e:
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if url_idx is not None and r is None:
+            load_balancer.observe(url_idx, start, error=True)
+
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -203,7 +236,9 @@ async def send_post_request(
         )
     finally:
         if not stream:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+        if url_idx is not None and not streaming:
+            load_balancer.end(url_idx)
 
 
 def get_api_key(idx, url, configs):
@@ -284,6 +319,11 @@ async def verify_connection(
             raise HTTPException(status_code=500, detail=error_detail)
 
 
+@router.get("/load_balancer")
+async def get_load_balancer_metrics(user=Depends(get_admin_user)):
+    return load_balancer.get_metrics()
+
+
 @router.get("/config")
 async def get_config(request: Request, user=Depends(get_admin_user)):
     return {
@@ -346,13 +386,16 @@ def merge_ollama_models_lists(model_lists):
 )
 async def get_all_models(request: Request, user: UserModel = None):
     log.info("get_all_models()")
+    load_balancer.sync_urls(request.app.state.config.OLLAMA_BASE_URLS)
     if request.app.state.config.ENABLE_OLLAMA_API:
         request_tasks = []
         for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(
+                    send_get_request(f"{url}/api/tags", user=user, last_good=True)
+                )
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -366,7 +409,9 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        send_get_request(
+                            f"{url}/api/tags", key, user=user, last_good=True
+                        )
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
@@ -418,6 +463,10 @@ async def get_all_models(request: Request, user: UserModel = None):
 
         try:
             loaded_models = await get_ollama_loaded_models(request, user=user)
+            load_balancer.set_loaded_models(
+                {m["model"]: m.get("urls", []) for m in loaded_models["models"]}
+            )
+
             expires_map = {
                 m["model"]: m["expires_at"]
                 for m in loaded_models["models"]
@@ -967,7 +1016,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = select_ollama_url_idx(model, models[model]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1045,7 +1094,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1063,6 +1112,8 @@ async def embed(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    r = None
+    start = load_balancer.begin(url_idx)
     try:
         r = requests.request(
             method="POST",
@@ -1083,6 +1134,7 @@ async def embed(
             },
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        load_balancer.observe(url_idx, start, error=r.status_code >= 500)
         r.raise_for_status()
 
         data = r.json()
@@ -1098,11 +1150,15 @@ async def embed(
                     detail = f"Ollama: {res['error']}"
             except Exception:
                 detail = f"Ollama: {e}"
+        else:
+            load_balancer.observe(url_idx, start, error=True)
 
         raise HTTPException(
             status_code=r.status_code if r else 500,
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
+    finally:
+        load_balancer.end(url_idx)
 
 
 class GenerateEmbeddingsForm(BaseModel):
@@ -1132,7 +1188,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1150,6 +1206,8 @@ async def embeddings(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    r = None
+    start = load_balancer.begin(url_idx)
     try:
         r = requests.request(
             method="POST",
@@ -1170,6 +1228,7 @@ async def embeddings(
             },
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        load_balancer.observe(url_idx, start, error=r.status_code >= 500)
         r.raise_for_status()
 
         data = r.json()
@@ -1185,11 +1244,15 @@ async def embeddings(
                     detail = f"Ollama: {res['error']}"
             except Exception:
                 detail = f"Ollama: {e}"
+        else:
+            load_balancer.observe(url_idx, start, error=True)
 
         raise HTTPException(
             status_code=r.status_code if r else 500,
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
+    finally:
+        load_balancer.end(url_idx)
 
 
 class GenerateCompletionForm(BaseModel):
@@ -1225,7 +1288,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1247,6 +1310,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        url_idx=url_idx,
     )
 
 
@@ -1284,7 +1348,21 @@ class GenerateChatCompletionForm(BaseModel):
     )
 
 
-async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] = None):
+def select_ollama_url_idx(
+    model: str, url_idxs: list[int], affinity_key: Optional[str] = None
+) -> int:
+    url_idx = load_balancer.select(model, url_idxs, affinity_key=affinity_key)
+    # Serving the request loads the model on that backend
+    load_balancer.mark_loaded(model, url_idx)
+    return url_idx
+
+
+async def get_ollama_url(
+    request: Request,
+    model: str,
+    url_idx: Optional[int] = None,
+    affinity_key: Optional[str] = None,
+):
     if url_idx is None:
         models = request.app.state.OLLAMA_MODELS
         if model not in models:
@@ -1292,7 +1370,9 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = select_ollama_url_idx(
+            model, models[model].get("urls", []), affinity_key=affinity_key
+        )
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1362,7 +1442,12 @@ async def generate_chat_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        affinity_key=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1380,6 +1465,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        url_idx=url_idx,
     )
 
 
@@ -1468,7 +1554,12 @@ async def generate_openai_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        affinity_key=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1486,6 +1577,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        url_idx=url_idx,
     )
 
 
@@ -1551,7 +1643,12 @@ async def generate_openai_chat_completion(
     if ":" not in payload["model"]:
         payload["model"] = f"{payload['model']}:latest"
 
-    url, url_idx = await get_ollama_url(request, payload["model"], url_idx)
+    url, url_idx = await get_ollama_url(
+        request,
+        payload["model"],
+        url_idx,
+        affinity_key=metadata.get("chat_id") if metadata else None,
+    )
     api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
         str(url_idx),
         request.app.state.config.OLLAMA_API_CONFIGS.get(url, {}),  # Legacy support
@@ -1568,6 +1665,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        url_idx=url_idx,
     )
 
 
@@ -2,6 +2,7 @@ import asyncio
 import hashlib
 import json
 import logging
+import re
 from typing import AsyncIterator, Optional
 
 import aiohttp
@@ -28,7 +29,6 @@ from open_webui.config import (
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     ENABLE_FORWARD_USER_INFO_HEADERS,
     BYPASS_MODEL_ACCESS_CONTROL,
@@ -49,6 +49,7 @@ from open_webui.utils.misc import (
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.upstream import Upstreams, last_good_model_lists
 from open_webui.utils.models import check_model_access
 
 
@@ -63,105 +64,274 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 ##########################################
 
 
-async def send_get_request(url, key=None, user: UserModel = None):
+async def send_get_request(
+    url, key=None, user: UserModel = None, last_good: bool = False
+):
+    # `last_good` falls back to the last successful response of a model list
+    # url when the upstream is unreachable or answers with an error.
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        session = Upstreams.get_session(url)
+        async with session.get(
+            url,
+            headers={
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            data = await response.json()
+            if last_good:
+                if response.ok:
+                    last_good_model_lists.set(url, data)
+                else:
+                    data = last_good_model_lists.get(url) or data
+            return data
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
+        if last_good:
+            return last_good_model_lists.get(url)
         return None
 
 
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+    session: Optional[aiohttp.ClientSession] = None,
 ):
+    # Releasing (instead of closing) hands the connection back to the pool
+    # when the body was fully read; pooled sessions are never closed here.
     if response:
-        response.close()
+        response.release()
     if session:
         await session.close()
 
 
-def stream_json_response_as_sse(
-    response: aiohttp.ClientResponse,
-) -> AsyncIterator[str]:
-    """Convert chunked JSON responses into SSE messages for frontend streaming."""
+def get_json_value_pattern(max_depth: int) -> re.Pattern:
+    """
+    Matches a complete JSON object or array nested up to `max_depth` levels.
+    Possessive quantifiers keep a failed match linear in the input length.
+    """
+    token = rb'[^\[\]{}"]++|"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    pattern = rb"[\[{](?:" + token + rb")*+[\]}]"
+    for _ in range(max_depth - 1):
+        pattern = rb"[\[{](?:" + token + rb"|" + pattern + rb")*+[\]}]"
+    return re.compile(pattern)
 
-    async def generator() -> AsyncIterator[str]:
-        decoder = json.JSONDecoder()
-        buffer = ""
-        done_sent = False
 
-        async for chunk in response.content.iter_chunked(1024):
-            if not chunk:
-                continue
-            buffer += chunk.decode("utf-8", errors="ignore")
+class JSONStreamFramer:
+    """
+    Splits a byte stream of concatenated JSON values, as sent by upstreams that
+    stream without SSE framing, into the raw bytes of each value. Objects and
+    arrays are the norm, but bare strings, numbers and literals pass through too.
 
-            while True:
-                buffer = buffer.lstrip()
-                if not buffer:
-                    break
+    Every byte is scanned once: the nesting depth and string state carry over
+    between chunks, so a value split across many chunks is never re-parsed.
+    """
 
-                if buffer.startswith("[DONE]"):
-                    if not done_sent:
-                        yield "data: [DONE]\n\n"
-                        done_sent = True
-                    buffer = buffer[len("[DONE]") :]
+    DONE = b"[DONE]"
+
+    # Everything up to the next bracket, complete strings included
+    SKIP = re.compile(rb'(?:[^\[\]{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+    STRING = re.compile(rb'["\\]')
+    VALUE = get_json_value_pattern(4)
+    VALUE_START = re.compile(rb'[\[{"0-9tfn-]')
+    LITERALS = (b"true", b"false", b"null")
+    LITERAL = re.compile(rb"true|false|null")
+    NUMBER = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+    NUMBER_RUN = re.compile(rb"[0-9.eE+-]+")
+    WHITESPACE = b" \t\r\n"
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.pos = 0
+        # Start of the value being scanned, None between values
+        self.start = None
+        self.depth = 0
+        self.in_string = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        self.buffer += chunk
+        values = []
+        consumed = 0
+        buffer = self.buffer
+        length = len(buffer)
+        pos = self.pos
+
+        while pos < length:
+            if self.start is None:
+                if buffer[pos] in self.WHITESPACE:
+                    pos += 1
                     continue
 
-                try:
-                    obj, idx = decoder.raw_decode(buffer)
-                except json.JSONDecodeError:
-                    break
+                if buffer[pos] == 0x5B:  # "["
+                    head = bytes(buffer[pos : pos + len(self.DONE)])
+                    if head == self.DONE:
+                        values.append(self.DONE)
+                        pos += len(self.DONE)
+                        consumed = pos
+                        continue
+                    if self.DONE.startswith(head):
+                        # Could still be "[DONE]", wait for more data
+                        break
+
+                if buffer[pos] == 0x22:  # '"', a string value
+                    self.start = pos
+                    self.depth = 0
+                    self.in_string = True
+                    pos += 1
+                    continue
 
-                if idx == 0:
+                if buffer[pos] not in b"[{":
+                    if buffer[pos] in b"tfn":
+                        match = self.LITERAL.match(buffer, pos)
+                        head = bytes(buffer[pos : pos + 5])
+                        if not match and any(
+                            literal.startswith(head) for literal in self.LITERALS
+                        ):
+                            # A literal continued in the next chunk
+                            break
+                    else:
+                        match = self.NUMBER_RUN.match(buffer, pos)
+                        if match and match.end() == length:
+                            # A number continued in the next chunk
+                            break
+                        if match and not self.NUMBER.fullmatch(match.group()):
+                            match = None
+
+                    if match:
+                        values.append(bytes(buffer[pos : match.end()]))
+                        pos = consumed = match.end()
+                        continue
+
+                    match = self.VALUE_START.search(buffer, pos + 1)
+                    skipped = (match.start() if match else length) - pos
+                    log.debug(f"Skipping {skipped} unexpected bytes in JSON stream")
+                    pos += skipped
+                    consumed = pos
+                    continue
+
+                # Complete values in the buffer are matched whole, anything
+                # longer or deeper is scanned as it arrives
+                match = self.VALUE.match(buffer, pos)
+                if match:
+                    values.append(bytes(buffer[pos : match.end()]))
+                    pos = consumed = match.end()
+                    continue
+
+                self.start = pos
+                self.depth = 1
+                pos += 1
+                continue
+
+            if self.in_string:
+                match = self.STRING.search(buffer, pos)
+                if not match:
+                    pos = length
                     break
+                pos = match.end()
+                if buffer[match.start()] == 0x5C:  # backslash escapes the next byte
+                    if pos >= length:
+                        # Rescan the backslash once the escaped byte arrives
+                        pos -= 1
+                        break
+                    pos += 1
+                else:
+                    self.in_string = False
+                    if self.depth == 0:
+                        values.append(bytes(buffer[self.start : pos]))
+                        self.start = None
+                        consumed = pos
+                continue
+
+            pos = self.SKIP.match(buffer, pos).end()
+            if pos >= length:
+                break
+            char = buffer[pos]
+            pos += 1
+            if char == 0x22:  # '"', a string continued in the next chunk
+                self.in_string = True
+            elif char in b"[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    values.append(bytes(buffer[self.start : pos]))
+                    self.start = None
+                    consumed = pos
+
+        # Drop consumed bytes; a partial value stays in place so its bytes are
+        # only copied once it completes
+        if self.start is not None:
+            consumed = self.start
+            self.start = 0
+        if consumed:
+            del buffer[:consumed]
+        self.pos = pos - consumed
+        return values
+
+    def flush(self) -> list[bytes]:
+        """Returns a trailing "[DONE]" or scalar, and logs any other leftover."""
+        values = []
+        tail = bytes(self.buffer).strip()
+        if tail == self.DONE or self.NUMBER.fullmatch(tail):
+            values.append(tail)
+        elif tail:
+            log.debug(
+                "Unconsumed streamed buffer: %s",
+                tail if len(tail) < 200 else f"{tail[:200]}...",
+            )
+        self.buffer.clear()
+        self.pos = 0
+        self.start = None
+        self.depth = 0
+        self.in_string = False
+        return values
+
 
-                buffer = buffer[idx:]
-                yield f"data: {json.dumps(obj, separators=(',', ':'))}\n\n"
+def stream_json_response_as_sse(
+    response: aiohttp.ClientResponse,
+) -> AsyncIterator[bytes]:
+    """Convert chunked JSON responses into SSE messages for frontend streaming."""
 
-        buffer = buffer.lstrip()
-        if buffer:
-            if buffer.startswith("[DONE]"):
-                if not done_sent:
-                    yield "data: [DONE]\n\n"
+    async def generator() -> AsyncIterator[bytes]:
+        framer = JSONStreamFramer()
+        done_sent = False
+
+        def frame(values):
+            nonlocal done_sent
+            for value in values:
+                if value == JSONStreamFramer.DONE:
+                    if done_sent:
+                        continue
                     done_sent = True
-            else:
-                try:
-                    obj, idx = decoder.raw_decode(buffer)
-                except json.JSONDecodeError:
-                    log.debug(
-                        "Unconsumed streamed buffer: %s",
-                        buffer if len(buffer) < 200 else f"{buffer[:200]}...",
-                    )
-                else:
-                    yield f"data: {json.dumps(obj, separators=(',', ':'))}\n\n"
-                    buffer = buffer[idx:].lstrip()
-                    if buffer.startswith("[DONE]") and not done_sent:
-                        yield "data: [DONE]\n\n"
-                        done_sent = True
+                elif b"\n" in value or b"\r" in value:
+                    # Line breaks can only be whitespace between JSON tokens,
+                    # but would end the SSE event early
+                    value = value.replace(b"\r", b" ").replace(b"\n", b" ")
+                yield b"data: " + value + b"\n\n"
+
+        async for chunk in response.content.iter_any():
+            if not chunk:
+                continue
+            for event in frame(framer.feed(chunk)):
+                yield event
+
+        for event in frame(framer.flush()):
+            yield event
 
         if not done_sent:
-            yield "data: [DONE]\n\n"
+            yield b"data: [DONE]\n\n"
 
     return generator()
 
@@ -449,6 +619,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
                     f"{url}/models",
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
+                    last_good=True,
                 )
             )
         else:
@@ -469,6 +640,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
+                            last_good=True,
                         )
                     )
                 else:
@@ -634,67 +806,67 @@ async def get_models(
         )
 
         r = None
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-        ) as session:
-            try:
-                headers, cookies = await get_headers_and_cookies(
-                    request, url, key, api_config, user=user
-                )
-
-                if api_config.get("azure", False):
-                    models = {
-                        "data": api_config.get("model_ids", []) or [],
-                        "object": "list",
-                    }
-                else:
-                    async with session.get(
-                        f"{url}/models",
-                        headers=headers,
-                        cookies=cookies,
-                        ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                    ) as r:
-                        if r.status != 200:
-                            # Extract response error details if available
-                            error_detail = f"HTTP Error: {r.status}"
-                            res = await r.json()
-                            if "error" in res:
-                                error_detail = f"External Error: {res['error']}"
-                            raise Exception(error_detail)
+        session = Upstreams.get_session(url)
+        try:
+            headers, cookies = await get_headers_and_cookies(
+                request, url, key, api_config, user=user
+            )
 
-                        response_data = await r.json()
+            if api_config.get("azure", False):
+                models = {
+                    "data": api_config.get("model_ids", []) or [],
+                    "object": "list",
+                }
+            else:
+                async with session.get(
+                    f"{url}/models",
+                    headers=headers,
+                    cookies=cookies,
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=aiohttp.ClientTimeout(
+                        total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST
+                    ),
+                ) as r:
+                    if r.status != 200:
+                        # Extract response error details if available
+                        error_detail = f"HTTP Error: {r.status}"
+                        res = await r.json()
+                        if "error" in res:
+                            error_detail = f"External Error: {res['error']}"
+                        raise Exception(error_detail)
+
+                    response_data = await r.json()
+
+                    # Check if we're calling OpenAI API based on the URL
+                    if "api.openai.com" in url:
+                        # Filter models according to the specified conditions
+                        response_data["data"] = [
+                            model
+                            for model in response_data.get("data", [])
+                            if not any(
+                                name in model["id"]
+                                for name in [
+                                    "babbage",
+                                    "dall-e",
+                                    "davinci",
+                                    "embedding",
+                                    "tts",
+                                    "whisper",
+                                ]
+                            )
+                        ]
 
-                        # Check if we're calling OpenAI API based on the URL
-                        if "api.openai.com" in url:
-                            # Filter models according to the specified conditions
-                            response_data["data"] = [
-                                model
-                                for model in response_data.get("data", [])
-                                if not any(
-                                    name in model["id"]
-                                    for name in [
-                                        "babbage",
-                                        "dall-e",
-                                        "davinci",
-                                        "embedding",
-                                        "tts",
-                                        "whisper",
-                                    ]
-                                )
-                            ]
-
-                        models = response_data
-            except aiohttp.ClientError as e:
-                # ClientError covers all aiohttp requests issues
-                log.exception(f"Client error: {str(e)}")
-                raise HTTPException(
-                    status_code=500, detail="Open WebUI: Server Connection Error"
-                )
-            except Exception as e:
-                log.exception(f"Unexpected error: {e}")
-                error_detail = f"Unexpected error: {str(e)}"
-                raise HTTPException(status_code=500, detail=error_detail)
+                    models = response_data
+        except aiohttp.ClientError as e:
+            # ClientError covers all aiohttp requests issues
+            log.exception(f"Client error: {str(e)}")
+            raise HTTPException(
+                status_code=500, detail="Open WebUI: Server Connection Error"
+            )
+        except Exception as e:
+            log.exception(f"Unexpected error: {e}")
+            error_detail = f"Unexpected error: {str(e)}"
+            raise HTTPException(status_code=500, detail=error_detail)
 
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
         models["data"] = await get_filtered_models(models, user)
@@ -995,15 +1167,11 @@ async def generate_chat_completion(
     payload = json.dumps(payload)
 
     r = None
-    session = None
     streaming = False
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = Upstreams.get_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
@@ -1022,9 +1190,7 @@ async def generate_chat_completion(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         elif stream_requested:
             streaming = True
@@ -1036,9 +1202,7 @@ async def generate_chat_completion(
                 stream_json_response_as_sse(r),
                 status_code=r.status,
                 headers=headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -1063,7 +1227,7 @@ async def generate_chat_completion(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 async def embeddings(request: Request, form_data: dict, user):
@@ -1096,14 +1260,13 @@ async def embeddings(request: Request, form_data: dict, user):
     )
 
     r = None
-    session = None
     streaming = False
 
     headers, cookies = await get_headers_and_cookies(
         request, url, key, api_config, user=user
     )
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = Upstreams.get_session(url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
@@ -1118,9 +1281,7 @@ async def embeddings(request: Request, form_data: dict, user):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -1145,7 +1306,7 @@ async def embeddings(request: Request, form_data: dict, user):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -1167,7 +1328,6 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     )
 
     r = None
-    session = None
     streaming = False
 
     try:
@@ -1193,7 +1353,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
+        session = Upstreams.get_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
@@ -1210,9 +1370,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -1238,4 +1396,4 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
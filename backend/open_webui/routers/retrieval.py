@@ -28,11 +28,8 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
-from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain_core.documents import Document
 
 from open_webui.models.files import FileModel, Files
@@ -41,6 +38,7 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.chunking import TextChunker, get_encoding
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -72,6 +70,10 @@ from open_webui.retrieval.web.perplexity import search_perplexity
 from open_webui.retrieval.web.sougou import search_sougou
 from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
+from open_webui.retrieval.web.cache import (
+    WebEmbeddingCache,
+    get_web_embedding_cache_key,
+)
 
 from open_webui.retrieval.utils import (
     get_content_from_url,
@@ -99,6 +101,14 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    PDF_LOADER_WORKERS,
+    PDF_LOADER_PAGES_PER_SHARD,
+    ENABLE_EXTRACTION_CACHE,
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_SIZE,
+    ENABLE_WEB_FETCH_CACHE,
+    WEB_FETCH_CACHE_DIR,
+    WEB_FETCH_CACHE_MAX_SIZE,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -1285,31 +1295,68 @@ async def update_rag_config(
 ####################################
 
 
-DEFAULT_CHUNK_WORD_COUNT = 3000
-
-
-def chunk_text_by_words(text: str, chunk_size: int = DEFAULT_CHUNK_WORD_COUNT) -> List[str]:
-    """Split text into chunks of up to chunk_size words while preserving spacing."""
-    if not text:
-        return []
-
-    chunks: List[str] = []
-    buffer: list[str] = []
-    word_count = 0
-
-    for match in re.finditer(r"\S+\s*", text):
-        buffer.append(match.group())
-        word_count += 1
+def get_text_chunker(request: Request) -> TextChunker:
+    splitter = request.app.state.config.TEXT_SPLITTER or "character"
+    encoding_name = str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
+    encoding = get_encoding(encoding_name)
+    if splitter == "token":
+        log.info(f"Using token text splitter: {encoding_name}")
+        if encoding is None:
+            raise ValueError(
+                ERROR_MESSAGES.DEFAULT(f"Could not load encoding {encoding_name}")
+            )
 
-        if word_count >= chunk_size:
-            chunks.append("".join(buffer).strip())
-            buffer.clear()
-            word_count = 0
+    try:
+        return TextChunker(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            splitter=splitter,
+            encoding=encoding,
+        )
+    except ValueError as e:
+        raise ValueError(ERROR_MESSAGES.DEFAULT(str(e)))
 
-    if buffer:
-        chunks.append("".join(buffer).strip())
 
-    return chunks
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    """
+    Splits documents into the chunks that get embedded. The chunks carry
+    their offsets and token counts in `start_index`, `end_index` and
+    `token_count`, so callers can split once and reuse them for previews.
+    """
+    return get_text_chunker(request).split_documents(docs)
+
+
+def get_document_embedding_function(request: Request):
+    """Embedding function for documents, with the batch size of the settings."""
+    return get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+    )
 
 
 def save_docs_to_vector_db(
@@ -1357,74 +1404,7 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+        docs = split_docs(request, docs)
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1463,51 +1443,26 @@ def save_docs_to_vector_db(
                 }
 
         log.info(f"generating embeddings for {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-        )
+        embedding_function = get_document_embedding_function(request)
 
+        # Split documents already know their token counts
+        encoding = None
         token_counts: list[int] = []
-        total_tokens = 0
-        try:
-            encoding_name = str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
-            encoding = tiktoken.get_encoding(encoding_name)
-        except Exception:
-            encoding = tiktoken.get_encoding("cl100k_base")
-
-        for text in texts:
-            try:
-                token_len = len(encoding.encode(text))
-            except Exception:
-                token_len = len(text.split())
+        for doc in docs:
+            token_len = doc.metadata.get("token_count")
+            if token_len is None:
+                if encoding is None:
+                    encoding = get_encoding(
+                        str(request.app.state.config.TIKTOKEN_ENCODING_NAME)
+                    ) or get_encoding("cl100k_base")
+                try:
+                    token_len = len(
+                        encoding.encode(doc.page_content, disallowed_special=())
+                    )
+                except Exception:
+                    token_len = len(doc.page_content.split())
             token_counts.append(token_len)
-            total_tokens += token_len
+        total_tokens = sum(token_counts)
 
         total_items = len(texts)
         cumulative_tokens = list(accumulate(token_counts))
@@ -1664,7 +1619,12 @@ class ProcessingProgressTracker:
             self.progress = progress
         update_payload["progress"] = self.progress
 
-        Files.update_file_data_by_id(self.file_id, update_payload)
+        Files.update_file_processing_by_id(self.file_id, update_payload)
+
+
+def get_file_text_content(file_id: str) -> str:
+    file_content = Files.get_file_content_by_id(file_id)
+    return (file_content.content if file_content else None) or ""
 
 
 class ProcessFileForm(BaseModel):
@@ -1787,7 +1747,7 @@ def process_file(
                 else:
                     docs = [
                         Document(
-                            page_content=file.data.get("content", ""),
+                            page_content=get_file_text_content(file.id),
                             metadata={
                                 **file.meta,
                                 "name": file.filename,
@@ -1806,7 +1766,7 @@ def process_file(
                         extra_step={"source": "cached_file"},
                     )
 
-                text_content = file.data.get("content", "")
+                text_content = get_file_text_content(file.id)
             else:
                 current_step = "text_extraction"
                 tracker.update(
@@ -1853,14 +1813,39 @@ def process_file(
                             **request.app.state.config.DOCLING_PARAMS,
                         },
                         PDF_EXTRACT_IMAGES=request.app.state.config.PDF_EXTRACT_IMAGES,
+                        PDF_LOADER_WORKERS=PDF_LOADER_WORKERS,
+                        PDF_LOADER_PAGES_PER_SHARD=PDF_LOADER_PAGES_PER_SHARD,
+                        EXTRACTION_CACHE_DIR=(
+                            EXTRACTION_CACHE_DIR if ENABLE_EXTRACTION_CACHE else None
+                        ),
+                        EXTRACTION_CACHE_MAX_SIZE=EXTRACTION_CACHE_MAX_SIZE,
                         DOCUMENT_INTELLIGENCE_ENDPOINT=request.app.state.config.DOCUMENT_INTELLIGENCE_ENDPOINT,
                         DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                         MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                     )
 
+                    def on_extraction_progress(pages_done: int, total_pages: int):
+                        # Reported per page range while large PDFs are extracted
+                        tracker.update(
+                            progress=max(
+                                tracker.progress, 15 + 15 * pages_done // total_pages
+                            ),
+                            stage="extracting",
+                            step="text_extraction",
+                            step_progress=15 + 85 * pages_done // total_pages,
+                            extra_step={
+                                "pages_done": pages_done,
+                                "total_pages": total_pages,
+                            },
+                        )
+
                     extraction_start = time.time()
                     loaded_docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
+                        file.filename,
+                        file.meta.get("content_type"),
+                        file_path,
+                        progress_callback=on_extraction_progress,
+                        file_hash=file.meta.get("sha256"),
                     )
                     extraction_duration = time.time() - extraction_start
 
@@ -1892,7 +1877,7 @@ def process_file(
                 else:
                     docs = [
                         Document(
-                            page_content=file.data.get("content", ""),
+                            page_content=get_file_text_content(file.id),
                             metadata={
                                 **file.meta,
                                 "name": file.filename,
@@ -1923,7 +1908,9 @@ def process_file(
                 step_progress=20,
             )
 
-            text_chunks = chunk_text_by_words(text_content)
+            # Split once; the chunks are both the preview and what gets embedded
+            docs = split_docs(request, docs)
+            text_chunks = [doc.page_content for doc in docs]
             log.debug(f"text_content: {text_content}")
             tracker.update(
                 progress=max(tracker.progress, 55),
@@ -1934,10 +1921,7 @@ def process_file(
                 extra_step={"preview_chunks": len(text_chunks)},
             )
 
-            Files.update_file_data_by_id(
-                file.id,
-                {"content": text_content, "chunks": text_chunks},
-            )
+            Files.update_file_content_by_id(file.id, text_content, text_chunks)
             hash = calculate_sha256_string(text_content)
             Files.update_file_hash_by_id(file.id, hash)
 
@@ -2040,6 +2024,7 @@ def process_file(
                             "hash": hash,
                         },
                         add=bool(form_data.collection_name),
+                        split=False,
                         user=user,
                         progress_update=handle_embedding_progress,
                     )
@@ -2547,6 +2532,97 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
         raise Exception("No search engine API key found in environment variables")
 
 
+def embed_web_page(
+    request: Request,
+    doc: Document,
+    user=None,
+    cache: Optional[WebEmbeddingCache] = None,
+) -> list[dict]:
+    """
+    Splits and embeds one fetched page into vector db items. The embeddings
+    are reused from `cache` when the page and the settings are unchanged.
+    """
+    chunks = split_docs(request, [doc])
+    if not chunks:
+        return []
+
+    key = get_web_embedding_cache_key(
+        doc.page_content,
+        {
+            "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+            "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+            "prefix": RAG_EMBEDDING_CONTENT_PREFIX,
+            "text_splitter": request.app.state.config.TEXT_SPLITTER,
+            "chunk_size": request.app.state.config.CHUNK_SIZE,
+            "chunk_overlap": request.app.state.config.CHUNK_OVERLAP,
+            "tiktoken_encoding_name": request.app.state.config.TIKTOKEN_ENCODING_NAME,
+        },
+    )
+    embeddings = cache.get(key) if cache else None
+    if embeddings is None or len(embeddings) != len(chunks):
+        embeddings = get_document_embedding_function(request)(
+            [chunk.page_content.replace("\n", " ") for chunk in chunks],
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=user,
+        )
+        if cache:
+            cache.set(key, embeddings)
+    else:
+        log.debug(f"reusing embeddings of {doc.metadata.get('source')}")
+
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "text": chunk.page_content,
+            "vector": embeddings[idx],
+            "metadata": {**chunk.metadata, "embedding_config": embedding_config},
+        }
+        for idx, chunk in enumerate(chunks)
+    ]
+
+
+async def load_and_embed_web_pages(
+    request: Request, loader, user=None
+) -> tuple[list[Document], list[dict]]:
+    """
+    Embeds each page as soon as the loader yields it, while the remaining
+    pages are still being fetched.
+    """
+    cache = (
+        WebEmbeddingCache(
+            WEB_FETCH_CACHE_DIR / "embeddings",
+            max_size=WEB_FETCH_CACHE_MAX_SIZE * 1024 * 1024,
+        )
+        if ENABLE_WEB_FETCH_CACHE
+        else None
+    )
+
+    docs, items = [], []
+    async for doc in loader.alazy_load():
+        docs.append(doc)
+        try:
+            items.extend(
+                await run_in_threadpool(embed_web_page, request, doc, user, cache)
+            )
+        except Exception as e:
+            log.warning(f"error embedding {doc.metadata.get('source')}: {e}")
+    return docs, items
+
+
+def save_web_search_items(collection_name: str, items: list[dict]) -> None:
+    if not items:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+    VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=items)
+    log.info(f"added {len(items)} items to collection {collection_name}")
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
@@ -2622,7 +2698,16 @@ async def process_web_search(
                 requests_per_second=request.app.state.config.WEB_LOADER_CONCURRENT_REQUESTS,
                 trust_env=request.app.state.config.WEB_SEARCH_TRUST_ENV,
             )
-            docs = await loader.aload()
+            if request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
+                docs = await loader.aload()
+            else:
+                docs, items = await load_and_embed_web_pages(request, loader, user)
+
+                # Pages arrive as they load, list them in search result order
+                order = {url: idx for idx, url in enumerate(urls)}
+                docs.sort(
+                    key=lambda doc: order.get(doc.metadata.get("source"), len(order))
+                )
 
         urls = [
             doc.metadata.get("source") for doc in docs if doc.metadata.get("source")
@@ -2655,14 +2740,19 @@ async def process_web_search(
             )
 
             try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
-                    request,
-                    docs,
-                    collection_name,
-                    overwrite=True,
-                    user=user,
-                )
+                if request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER:
+                    await run_in_threadpool(
+                        save_docs_to_vector_db,
+                        request,
+                        docs,
+                        collection_name,
+                        overwrite=True,
+                        user=user,
+                    )
+                else:
+                    await run_in_threadpool(
+                        save_web_search_items, collection_name, items
+                    )
             except Exception as e:
                 log.debug(f"error saving docs: {e}")
 
@@ -2921,9 +3011,16 @@ def process_files_batch(
 
     # Prepare all documents first
     all_docs: List[Document] = []
+    file_contents = Files.get_file_contents_by_ids(
+        [file.id for file in form_data.files]
+    )
     for file in form_data.files:
         try:
-            text_content = file.data.get("content", "")
+            # Content sent with the file wins over the stored one
+            text_content = (file.data or {}).get("content")
+            if not text_content and file.id in file_contents:
+                text_content = file_contents[file.id].content
+            text_content = text_content or ""
 
             docs: List[Document] = [
                 Document(
@@ -2940,10 +3037,9 @@ def process_files_batch(
 
             hash = calculate_sha256_string(text_content)
             Files.update_file_hash_by_id(file.id, hash)
-            text_chunks = chunk_text_by_words(text_content)
-            Files.update_file_data_by_id(
-                file.id, {"content": text_content, "chunks": text_chunks}
-            )
+            docs = split_docs(request, docs)
+            text_chunks = [doc.page_content for doc in docs]
+            Files.update_file_content_by_id(file.id, text_content, text_chunks)
 
             all_docs.extend(docs)
             results.append(BatchProcessFilesResult(file_id=file.id, status="prepared"))
@@ -2962,6 +3058,7 @@ def process_files_batch(
                 docs=all_docs,
                 collection_name=collection_name,
                 add=True,
+                split=False,
                 user=user,
             )
 
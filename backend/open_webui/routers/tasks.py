@@ -16,6 +16,10 @@ from open_webui.utils.task import (
     tags_generation_template,
     emoji_generation_template,
     moa_response_generation_template,
+    chat_metadata_generation_template,
+    truncate_messages_by_token_budget,
+    task_response_cache,
+    TaskSupersededError,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.constants import TASKS
@@ -33,6 +37,7 @@ from open_webui.config import (
     DEFAULT_AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_EMOJI_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_MOA_GENERATION_PROMPT_TEMPLATE,
+    DEFAULT_CHAT_METADATA_GENERATION_PROMPT_TEMPLATE,
 )
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -43,6 +48,30 @@ log.setLevel(SRC_LOG_LEVELS["MODELS"])
 router = APIRouter()
 
 
+async def generate_cached_task_completion(
+    request: Request,
+    payload: dict,
+    user,
+    prompt: str,
+    session_key: Optional[str] = None,
+):
+    """
+    Runs a task completion through the task response cache, keyed by the task,
+    task model, user and rendered prompt. Direct connections are not cached.
+    """
+    if getattr(request.state, "direct", False):
+        return await generate_chat_completion(request, form_data=payload, user=user)
+
+    key = task_response_cache.get_key(
+        payload["metadata"]["task"], payload["model"], user.id, prompt
+    )
+    return await task_response_cache.get_or_generate(
+        key,
+        lambda: generate_chat_completion(request, form_data=payload, user=user),
+        session_key=session_key,
+    )
+
+
 ##################################
 #
 # Task Endpoints
@@ -64,6 +93,9 @@ async def get_task_config(request: Request, user=Depends(get_verified_user)):
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_TITLE_GENERATION": request.app.state.config.ENABLE_TITLE_GENERATION,
+        "ENABLE_CHAT_METADATA_GENERATION": request.app.state.config.ENABLE_CHAT_METADATA_GENERATION,
+        "CHAT_METADATA_GENERATION_PROMPT_TEMPLATE": request.app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE,
+        "CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS": request.app.state.config.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -83,6 +115,9 @@ class TaskConfigForm(BaseModel):
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE: str
     ENABLE_FOLLOW_UP_GENERATION: bool
     ENABLE_TAGS_GENERATION: bool
+    ENABLE_CHAT_METADATA_GENERATION: Optional[bool] = None
+    CHAT_METADATA_GENERATION_PROMPT_TEMPLATE: Optional[str] = None
+    CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS: Optional[int] = None
     ENABLE_SEARCH_QUERY_GENERATION: bool
     ENABLE_RETRIEVAL_QUERY_GENERATION: bool
     QUERY_GENERATION_PROMPT_TEMPLATE: str
@@ -122,6 +157,20 @@ async def update_task_config(
         form_data.TAGS_GENERATION_PROMPT_TEMPLATE
     )
     request.app.state.config.ENABLE_TAGS_GENERATION = form_data.ENABLE_TAGS_GENERATION
+
+    if form_data.ENABLE_CHAT_METADATA_GENERATION is not None:
+        request.app.state.config.ENABLE_CHAT_METADATA_GENERATION = (
+            form_data.ENABLE_CHAT_METADATA_GENERATION
+        )
+    if form_data.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE is not None:
+        request.app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE = (
+            form_data.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE
+        )
+    if form_data.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS is not None:
+        request.app.state.config.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS = (
+            form_data.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS
+        )
+
     request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION = (
         form_data.ENABLE_SEARCH_QUERY_GENERATION
     )
@@ -148,6 +197,9 @@ async def update_task_config(
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE": request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+        "ENABLE_CHAT_METADATA_GENERATION": request.app.state.config.ENABLE_CHAT_METADATA_GENERATION,
+        "CHAT_METADATA_GENERATION_PROMPT_TEMPLATE": request.app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE,
+        "CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS": request.app.state.config.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -385,6 +437,99 @@ async def generate_chat_tags(
         )
 
 
+@router.post("/metadata/completions")
+async def generate_chat_metadata(
+    request: Request, form_data: dict, user=Depends(get_verified_user)
+):
+    """
+    Generates several chat metadata fields ("title", "tags", "follow_ups") with
+    a single task model call returning one JSON object.
+    """
+
+    enabled_fields = {
+        "title": request.app.state.config.ENABLE_TITLE_GENERATION,
+        "tags": request.app.state.config.ENABLE_TAGS_GENERATION,
+        "follow_ups": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
+    }
+    fields = [
+        field
+        for field in form_data.get("fields", list(enabled_fields))
+        if enabled_fields.get(field)
+    ]
+
+    if not request.app.state.config.ENABLE_CHAT_METADATA_GENERATION or not fields:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"detail": "Chat metadata generation is disabled"},
+        )
+
+    if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
+        models = {
+            request.state.model["id"]: request.state.model,
+        }
+    else:
+        models = request.app.state.MODELS
+
+    model_id = form_data["model"]
+    if model_id not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    # Check if the user has a custom task model
+    # If the user has a custom task model, use that model
+    task_model_id = get_task_model_id(
+        model_id,
+        request.app.state.config.TASK_MODEL,
+        request.app.state.config.TASK_MODEL_EXTERNAL,
+        models,
+    )
+
+    log.debug(
+        f"generating chat metadata {fields} using model {task_model_id} for user {user.email} "
+    )
+
+    if request.app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE != "":
+        template = request.app.state.config.CHAT_METADATA_GENERATION_PROMPT_TEMPLATE
+    else:
+        template = DEFAULT_CHAT_METADATA_GENERATION_PROMPT_TEMPLATE
+
+    messages = truncate_messages_by_token_budget(
+        form_data["messages"],
+        request.app.state.config.CHAT_METADATA_GENERATION_MAX_CONTEXT_TOKENS,
+        request.app.state.config.TIKTOKEN_ENCODING_NAME,
+    )
+    content = chat_metadata_generation_template(template, messages, fields, user)
+
+    payload = {
+        "model": task_model_id,
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "metadata": {
+            **(request.state.metadata if hasattr(request.state, "metadata") else {}),
+            "task": str(TASKS.CHAT_METADATA_GENERATION),
+            "task_body": form_data,
+            "chat_id": form_data.get("chat_id", None),
+        },
+    }
+
+    # Process the payload through the pipeline
+    try:
+        payload = await process_pipeline_inlet_filter(request, payload, user, models)
+    except Exception as e:
+        raise e
+
+    try:
+        return await generate_chat_completion(request, form_data=payload, user=user)
+    except Exception as e:
+        log.error("Exception occurred", exc_info=True)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "An internal error has occurred."},
+        )
+
+
 @router.post("/image_prompt/completions")
 async def generate_image_prompt(
     request: Request, form_data: dict, user=Depends(get_verified_user)
@@ -527,7 +672,7 @@ async def generate_queries(
         raise e
 
     try:
-        return await generate_chat_completion(request, form_data=payload, user=user)
+        return await generate_cached_task_completion(request, payload, user, content)
     except Exception as e:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -612,7 +757,19 @@ async def generate_autocompletion(
         raise e
 
     try:
-        return await generate_chat_completion(request, form_data=payload, user=user)
+        # Typing on supersedes the autocompletion of the previous input
+        return await generate_cached_task_completion(
+            request,
+            payload,
+            user,
+            content,
+            session_key=f"{user.id}:{form_data.get('chat_id') or ''}",
+        )
+    except TaskSupersededError:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": "Autocompletion superseded by a newer request"},
+        )
     except Exception as e:
         log.error(f"Error generating chat completion: {e}")
         return JSONResponse(
@@ -681,7 +838,7 @@ async def generate_emoji(
         raise e
 
     try:
-        return await generate_chat_completion(request, form_data=payload, user=user)
+        return await generate_cached_task_completion(request, payload, user, content)
     except Exception as e:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
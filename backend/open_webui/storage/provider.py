@@ -2,9 +2,14 @@ import os
 import shutil
 import json
 import logging
+import hashlib
+import base64
 import re
+import threading
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Tuple, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, List, Optional, Tuple, Dict
 
 import boto3
 from botocore.config import Config
@@ -25,6 +30,8 @@ from open_webui.config import (
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_KEY,
     STORAGE_PROVIDER,
+    STORAGE_UPLOAD_CHUNK_SIZE,
+    STORAGE_UPLOAD_MAX_CONCURRENCY,
     UPLOAD_DIR,
 )
 from google.cloud import storage
@@ -39,6 +46,67 @@ from open_webui.env import SRC_LOG_LEVELS
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# S3 rejects multipart parts smaller than 5 MiB (except for the last one)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+# GCS resumable uploads only accept chunks in multiples of 256 KiB
+GCS_CHUNK_ALIGNMENT = 256 * 1024
+
+
+def get_gcs_chunk_size(chunk_size: int) -> int:
+    """Rounds `chunk_size` up to the next multiple of 256 KiB."""
+    return max(1, -(-chunk_size // GCS_CHUNK_ALIGNMENT)) * GCS_CHUNK_ALIGNMENT
+
+
+@dataclass(frozen=True)
+class UploadedFile:
+    """Handle to a file that has been streamed into storage."""
+
+    local_path: str
+    size: int
+    sha256: str
+
+
+class ConcurrentPartUploader:
+    """
+    Uploads numbered parts on a thread pool while the caller keeps reading the
+    source stream. At most `max_concurrency` parts are held in memory at once,
+    so a single upload never needs more than `max_concurrency * chunk_size` bytes.
+    """
+
+    def __init__(
+        self,
+        upload_part: Callable[[int, bytes], object],
+        max_concurrency: int = STORAGE_UPLOAD_MAX_CONCURRENCY,
+    ):
+        self.upload_part = upload_part
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.futures: List[Future] = []
+
+    def _run(self, part_number: int, chunk: bytes):
+        try:
+            return self.upload_part(part_number, chunk)
+        finally:
+            self.slots.release()
+
+    def submit(self, chunk: bytes) -> None:
+        # Blocks the reader until a slot is free, which bounds memory usage
+        self.slots.acquire()
+        part_number = len(self.futures) + 1
+        self.futures.append(self.executor.submit(self._run, part_number, chunk))
+
+    def results(self) -> list:
+        """Waits for all parts and returns their results in part order."""
+        try:
+            return [future.result() for future in self.futures]
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def cancel(self) -> None:
+        for future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -48,7 +116,7 @@ class StorageProvider(ABC):
     @abstractmethod
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[UploadedFile, str]:
         pass
 
     @abstractmethod
@@ -61,17 +129,48 @@ class StorageProvider(ABC):
 
 
 class LocalStorageProvider(StorageProvider):
+    @staticmethod
+    def stream_to_local(
+        file: BinaryIO,
+        filename: str,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+        chunk_size: int = STORAGE_UPLOAD_CHUNK_SIZE,
+    ) -> UploadedFile:
+        """
+        Copies the stream to the upload directory chunk by chunk, hashing it on
+        the way. `on_chunk` receives every chunk so remote providers can upload
+        in the same pass instead of re-reading the local copy.
+        """
+        file_path = f"{UPLOAD_DIR}/{filename}"
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            with open(file_path, "wb") as f:
+                while True:
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+
+            if size == 0:
+                raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+        except Exception:
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            raise
+
+        return UploadedFile(local_path=file_path, size=size, sha256=sha256.hexdigest())
+
     @staticmethod
     def upload_file(
         file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
-            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
-        file_path = f"{UPLOAD_DIR}/{filename}"
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        return contents, file_path
+    ) -> Tuple[UploadedFile, str]:
+        uploaded = LocalStorageProvider.stream_to_local(file, filename)
+        return uploaded, uploaded.local_path
 
     @staticmethod
     def get_file(file_path: str) -> str:
@@ -147,12 +246,12 @@ class S3StorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[UploadedFile, str]:
         """Handles uploading of the file to S3 storage."""
-        _, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         s3_key = os.path.join(self.key_prefix, filename)
+        chunk_size = max(STORAGE_UPLOAD_CHUNK_SIZE, S3_MIN_PART_SIZE)
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+            uploaded = self._multipart_upload(file, filename, s3_key, chunk_size)
             if S3_ENABLE_TAGGING and tags:
                 sanitized_tags = {
                     self.sanitize_tag_value(k): self.sanitize_tag_value(v)
@@ -168,13 +267,74 @@ class S3StorageProvider(StorageProvider):
                     Key=s3_key,
                     Tagging=tagging,
                 )
-            return (
-                open(file_path, "rb").read(),
-                f"s3://{self.bucket_name}/{s3_key}",
-            )
+            return uploaded, f"s3://{self.bucket_name}/{s3_key}"
         except ClientError as e:
             raise RuntimeError(f"Error uploading file to S3: {e}")
 
+    def _multipart_upload(
+        self, file: BinaryIO, filename: str, s3_key: str, chunk_size: int
+    ) -> UploadedFile:
+        """
+        Streams the file to S3 while it is being written locally. Parts are sent
+        concurrently as soon as they are read; files that fit in a single chunk
+        are sent with a plain PUT.
+        """
+        state = {"upload_id": None, "uploader": None, "pending": None}
+
+        def upload_part(part_number: int, chunk: bytes) -> dict:
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=state["upload_id"],
+                PartNumber=part_number,
+                Body=chunk,
+            )
+            return {"ETag": response["ETag"], "PartNumber": part_number}
+
+        def on_chunk(chunk: bytes) -> None:
+            # Hold one chunk back so the final part is known when the stream ends
+            if state["pending"] is not None:
+                if state["uploader"] is None:
+                    response = self.s3_client.create_multipart_upload(
+                        Bucket=self.bucket_name, Key=s3_key
+                    )
+                    state["upload_id"] = response["UploadId"]
+                    state["uploader"] = ConcurrentPartUploader(upload_part)
+                state["uploader"].submit(state["pending"])
+            state["pending"] = chunk
+
+        try:
+            uploaded = LocalStorageProvider.stream_to_local(
+                file, filename, on_chunk=on_chunk, chunk_size=chunk_size
+            )
+
+            if state["uploader"] is None:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name, Key=s3_key, Body=state["pending"]
+                )
+            else:
+                state["uploader"].submit(state["pending"])
+                parts = state["uploader"].results()
+                self.s3_client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=state["upload_id"],
+                    MultipartUpload={"Parts": parts},
+                )
+            return uploaded
+        except Exception:
+            if state["uploader"] is not None:
+                state["uploader"].cancel()
+                try:
+                    self.s3_client.abort_multipart_upload(
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        UploadId=state["upload_id"],
+                    )
+                except ClientError as e:
+                    log.warning(f"Failed to abort multipart upload for {s3_key}: {e}")
+            raise
+
     def get_file(self, file_path: str) -> str:
         """Handles downloading of the file from S3 storage."""
         try:
@@ -240,13 +400,28 @@ class GCSStorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[UploadedFile, str]:
         """Handles uploading of the file to GCS storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
         try:
             blob = self.bucket.blob(filename)
-            blob.upload_from_filename(file_path)
-            return contents, "gs://" + self.bucket_name + "/" + filename
+            # Resumable upload fed chunk by chunk while the local copy is written
+            writer = blob.open(
+                "wb", chunk_size=get_gcs_chunk_size(STORAGE_UPLOAD_CHUNK_SIZE)
+            )
+            try:
+                uploaded = LocalStorageProvider.stream_to_local(
+                    file, filename, on_chunk=writer.write
+                )
+            except Exception:
+                # Closing finalizes whatever was sent, so drop the partial object
+                try:
+                    writer.close()
+                    blob.delete()
+                except GoogleCloudError as e:
+                    log.warning(f"Failed to discard partial GCS upload {filename}: {e}")
+                raise
+            writer.close()
+            return uploaded, "gs://" + self.bucket_name + "/" + filename
         except GoogleCloudError as e:
             raise RuntimeError(f"Error uploading file to GCS: {e}")
 
@@ -312,14 +487,30 @@ class AzureStorageProvider(StorageProvider):
 
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[UploadedFile, str]:
         """Handles uploading of the file to Azure Blob Storage."""
-        contents, file_path = LocalStorageProvider.upload_file(file, filename, tags)
+        uploader = None
         try:
             blob_client = self.container_client.get_blob_client(filename)
-            blob_client.upload_blob(contents, overwrite=True)
-            return contents, f"{self.endpoint}/{self.container_name}/{filename}"
+
+            def stage_block(part_number: int, chunk: bytes) -> str:
+                block_id = base64.b64encode(f"{part_number:08d}".encode()).decode()
+                blob_client.stage_block(block_id=block_id, data=chunk)
+                return block_id
+
+            uploader = ConcurrentPartUploader(stage_block)
+            uploaded = LocalStorageProvider.stream_to_local(
+                file, filename, on_chunk=uploader.submit
+            )
+            blob_client.commit_block_list(uploader.results())
+            return uploaded, f"{self.endpoint}/{self.container_name}/{filename}"
+        except ValueError:
+            if uploader:
+                uploader.cancel()
+            raise
         except Exception as e:
+            if uploader:
+                uploader.cancel()
             raise RuntimeError(f"Error uploading file to Azure Blob Storage: {e}")
 
     def get_file(self, file_path: str) -> str:
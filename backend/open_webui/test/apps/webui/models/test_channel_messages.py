@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.db import QueryCounter
+
+
+class TestChannelMessages(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.channels import ChannelForm, Channels
+        from open_webui.models.messages import Messages
+        from open_webui.models.users import Users
+
+        self.messages = Messages
+        self.users = [
+            Users.insert_new_user(f"user-{idx}", f"User {idx}", f"{idx}@test.com")
+            for idx in range(3)
+        ]
+        self.channel = Channels.insert_new_channel(
+            None, ChannelForm(name="channel"), self.users[0].id
+        )
+
+    def post_messages(self, count):
+        from open_webui.models.messages import MessageForm
+
+        messages = []
+        for idx in range(count):
+            user = self.users[idx % len(self.users)]
+            message = self.messages.insert_new_message(
+                MessageForm(
+                    content=f"Message {idx}",
+                    reply_to_id=messages[-1].id if messages and idx % 4 == 0 else None,
+                ),
+                self.channel.id,
+                user.id,
+            )
+            messages.append(message)
+
+            for reply in range(idx % 3):
+                self.messages.insert_new_message(
+                    MessageForm(content=f"Reply {reply}", parent_id=message.id),
+                    self.channel.id,
+                    user.id,
+                )
+            if idx % 2 == 0:
+                for reactor in self.users[: idx % 3 + 1]:
+                    self.messages.add_reaction_to_message(message.id, reactor.id, "+1")
+        return messages
+
+    async def get_message_list(self, **kwargs):
+        import open_webui.routers.openai  # noqa: F401 (loads utils.models before the channels router)
+        from open_webui.routers.channels import get_channel_messages
+
+        return await get_channel_messages(
+            self.channel.id,
+            user=SimpleNamespace(id=self.users[0].id, role="admin"),
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_message_list_query_count(self):
+        self.post_messages(10)
+        with QueryCounter() as small:
+            await self.get_message_list()
+
+        self.post_messages(40)
+        with QueryCounter() as large:
+            messages = await self.get_message_list()
+
+        assert len(messages) == 50
+        # Batched per page instead of a few queries per message
+        assert large.count == small.count <= 8
+
+    @pytest.mark.asyncio
+    async def test_message_list_matches_per_message_lookups(self):
+        from open_webui.models.messages import get_message_list_cursor
+
+        posted = self.post_messages(12)
+        messages = await self.get_message_list(limit=10)
+        assert [message.id for message in messages] == [
+            message.id for message in posted[::-1][:10]
+        ]
+
+        for message in messages:
+            expected = self.messages.get_message_by_id(message.id)
+            assert message.reply_count == expected.reply_count
+            assert message.latest_reply_at == expected.latest_reply_at
+            assert message.reactions == expected.reactions
+            assert message.user.id == expected.user.id
+            if message.reply_to_id:
+                assert message.reply_to_message.id == message.reply_to_id
+                assert (
+                    message.reply_to_message.user.id
+                    == expected.reply_to_message.user.id
+                )
+
+        older = await self.get_message_list(
+            limit=10, cursor=get_message_list_cursor(messages[-1])
+        )
+        assert [message.id for message in older] == [posted[1].id, posted[0].id]
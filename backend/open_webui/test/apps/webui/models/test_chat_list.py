@@ -0,0 +1,156 @@
+import time
+import uuid
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.benchmark import benchmark, measure
+from test.util.chats import make_chat
+
+
+def get_chat_data(idx):
+    content = f"Message {idx} " + "lorem ipsum dolor sit amet " * 40
+    return make_chat(f"Chat {idx}", [content] * 8)
+
+
+def insert_chats(user_id, count, batch_size=5000):
+    from open_webui.internal.db import get_db
+    from open_webui.models.chats import Chat
+
+    now = int(time.time())
+    with get_db() as db:
+        for start in range(0, count, batch_size):
+            db.execute(
+                Chat.__table__.insert(),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "user_id": user_id,
+                        "title": f"Chat {idx}",
+                        "chat": get_chat_data(idx),
+                        "meta": {},
+                        "archived": False,
+                        "pinned": False,
+                        # Several chats share a timestamp, as after an import
+                        "created_at": now - idx // 3,
+                        "updated_at": now - idx // 3,
+                    }
+                    for idx in range(start, min(start + batch_size, count))
+                ],
+            )
+        db.commit()
+
+
+class TestChatList(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import Chats
+
+        self.chats = Chats
+
+    def test_cursor_pages_match_offset_pages(self):
+        from open_webui.models.chats import get_chat_list_cursor
+
+        insert_chats("1", 200)
+
+        by_offset = [
+            chat.id
+            for page in range(4)
+            for chat in self.chats.get_chat_title_id_list_by_user_id(
+                "1", skip=page * 60, limit=60
+            )
+        ]
+
+        by_cursor = []
+        cursor = None
+        while True:
+            chats = self.chats.get_chat_title_id_list_by_user_id(
+                "1", limit=60, cursor=cursor
+            )
+            if not chats:
+                break
+            by_cursor.extend(chat.id for chat in chats)
+            cursor = get_chat_list_cursor(chats[-1])
+
+        assert len(by_cursor) == len(set(by_cursor)) == 200
+        assert by_cursor == by_offset
+
+        pinned = self.chats.toggle_chat_pinned_by_id(by_cursor[0])
+        assert [chat.id for chat in self.chats.get_pinned_chats_by_user_id("1")] == [
+            pinned.id
+        ]
+        assert pinned.id not in [
+            chat.id for chat in self.chats.get_chat_title_id_list_by_user_id("1")
+        ]
+
+    def test_archived_list_keeps_custom_order(self):
+        insert_chats("1", 5)
+        self.chats.archive_all_chats_by_user_id("1")
+
+        chats = self.chats.get_archived_chat_list_by_user_id(
+            "1", filter={"order_by": "title", "direction": "asc"}, skip=1, limit=2
+        )
+        assert [chat.title for chat in chats] == ["Chat 1", "Chat 2"]
+
+
+@benchmark
+class TestChatListBenchmark(AbstractPostgresTest):
+    """First and deep sidebar pages of a user with 50k chats"""
+
+    COUNT = 50_000
+
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import Chats
+
+        self.chats = Chats
+
+    def get_full_rows(self, user_id, skip, limit):
+        from open_webui.internal.db import get_db
+        from open_webui.models.chats import Chat, ChatModel
+
+        # The list query as it was: whole rows, `chat` JSON included
+        with get_db() as db:
+            query = (
+                db.query(Chat)
+                .filter_by(user_id=user_id, folder_id=None, archived=False)
+                .order_by(Chat.updated_at.desc())
+                .offset(skip)
+                .limit(limit)
+            )
+            return [ChatModel.model_validate(chat) for chat in query.all()]
+
+    def test_benchmark(self):
+        from open_webui.models.chats import get_chat_list_cursor
+
+        insert_chats("1", self.COUNT)
+        deep = self.COUNT - 120
+
+        _, full_first = measure(lambda: self.get_full_rows("1", 0, 60))
+        _, full_deep = measure(lambda: self.get_full_rows("1", deep, 60))
+
+        first, first_page = measure(
+            lambda: self.chats.get_chat_title_id_list_by_user_id("1", skip=0, limit=60)
+        )
+        by_offset, offset_deep = measure(
+            lambda: self.chats.get_chat_title_id_list_by_user_id(
+                "1", skip=deep, limit=60
+            )
+        )
+        before = self.chats.get_chat_title_id_list_by_user_id(
+            "1", skip=deep - 60, limit=60
+        )
+        by_cursor, cursor_deep = measure(
+            lambda: self.chats.get_chat_title_id_list_by_user_id(
+                "1", limit=60, cursor=get_chat_list_cursor(before[-1])
+            )
+        )
+
+        print(
+            f"\n{self.COUNT} chats, 60 per page"
+            f"\nfirst page: full rows {full_first * 1000:.1f} ms,"
+            f" projection {first_page * 1000:.1f} ms"
+            f"\npage {deep // 60 + 1}: full rows + offset {full_deep * 1000:.1f} ms,"
+            f" projection + offset {offset_deep * 1000:.1f} ms,"
+            f" projection + cursor {cursor_deep * 1000:.1f} ms"
+        )
+        assert len(first) == 60
+        assert [chat.id for chat in by_cursor] == [chat.id for chat in by_offset]
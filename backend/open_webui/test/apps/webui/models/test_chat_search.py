@@ -0,0 +1,107 @@
+import time
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.chats import make_chat
+
+
+class TestChatSearch(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chat_search import ChatSearch, ChatSearches
+        from open_webui.models.chats import ChatForm, Chats
+
+        self.chat_search = ChatSearch
+        self.chat_searches = ChatSearches
+        self.chats = Chats
+
+        self.insert_chat = lambda user_id, title, contents: Chats.insert_new_chat(
+            user_id, ChatForm(chat=make_chat(title, contents))
+        )
+
+    def get_search_rows(self, chat_id):
+        from open_webui.internal.db import get_db
+
+        with get_db() as db:
+            return {
+                row.message_id: (row.id, row.content)
+                for row in db.query(self.chat_search).filter_by(chat_id=chat_id)
+            }
+
+    def search(self, user_id, search_text):
+        return self.chats.search_chat_list_by_user_id(user_id, search_text)
+
+    def test_ranked_search_with_snippets(self):
+        bread = self.insert_chat("1", "Bread baking", ["How long to proof <dough>?"])
+        python = self.insert_chat(
+            "1", "Python help", ["Read a file", "Use open(), then bread"]
+        )
+        self.insert_chat("2", "Bread", ["bread"])
+
+        # Title matches rank first, prefixes match as the user types
+        results = self.search("1", "BREA")
+        assert [chat.id for chat in results] == [bread.id, python.id]
+        assert results[0].snippet == "<mark>Bread</mark> baking"
+        assert results[1].snippet == "Use open(), then <mark>bread</mark>"
+
+        results = self.search("1", "proof dough")
+        assert [chat.id for chat in results] == [bread.id]
+        assert "<mark>proof</mark> &lt;<mark>dough</mark>&gt;" in results[0].snippet
+
+        assert not self.search("1", "missing")
+        # Without search words the chats are listed as before
+        assert len(self.search("1", "pinned:false")) == 2
+        assert [
+            chat.title
+            for chat in self.chats.get_chats_by_user_id_and_search_text("1", "file")
+        ] == ["Python help"]
+
+    def test_incremental_updates(self):
+        chat = self.insert_chat("1", "Trip", ["Plan a trip", "Sure"])
+        rows = self.get_search_rows(chat.id)
+        assert set(rows) == {"", "message-0", "message-1"}
+
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "message-1", {"content": "Visit the zebra park"}
+        )
+        updated_rows = self.get_search_rows(chat.id)
+        # Only the changed message is rewritten, in place
+        assert updated_rows["message-1"] == (
+            rows["message-1"][0],
+            "Visit the zebra park",
+        )
+        assert updated_rows["message-0"] == rows["message-0"]
+        assert [result.id for result in self.search("1", "zebra")] == [chat.id]
+
+        # Saving the whole chat drops removed messages
+        self.chats.update_chat_by_id(chat.id, make_chat("Trip", ["Plan a trip"]))
+        assert set(self.get_search_rows(chat.id)) == {"", "message-0"}
+        assert not self.search("1", "zebra")
+
+        self.chats.delete_chat_by_id_and_user_id(chat.id, "1")
+        assert not self.get_search_rows(chat.id)
+
+    def test_trigram_capability(self, monkeypatch):
+        chat = self.insert_chat("1", "Bread", ["Sourdough starter"])
+        # pg_trgm matches inside words, the full-text index word prefixes only
+        assert [result.id for result in self.search("1", "dough")] == [chat.id]
+
+        monkeypatch.setitem(
+            self.chat_searches.capabilities, "trigram", (False, time.monotonic())
+        )
+        assert not self.search("1", "dough")
+        assert [result.id for result in self.search("1", "sour")] == [chat.id]
+
+    def test_rebuild_index(self):
+        from open_webui.internal.db import get_db
+
+        chat = self.insert_chat("1", "Garden", ["Tomato plants"])
+        self.chats.delete_chats_by_user_id("1")
+        self.insert_chat("1", "Garden", ["Tomato plants"])
+        with get_db() as db:
+            db.query(self.chat_search).filter_by(user_id="1").delete()
+            db.commit()
+        assert not self.search("1", "tomato")
+
+        assert self.chat_searches.rebuild_index() == 1
+        results = self.search("1", "tomato")
+        assert len(results) == 1 and results[0].id != chat.id
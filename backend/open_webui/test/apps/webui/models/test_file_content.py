@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestFileContent(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.files import FileForm, Files
+
+        self.files = Files
+        Files.insert_new_file(
+            "1",
+            FileForm(
+                id="file-1",
+                filename="report.pdf",
+                path="/tmp/report.pdf",
+                data={"status": "uploaded", "progress": 0, "content": "Extracted text"},
+                meta={"name": "report.pdf"},
+            ),
+        )
+
+    def get_row(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.files import File
+
+        with get_db() as db:
+            file = db.get(File, "file-1")
+            return file.data, file.processing
+
+    def test_content_and_progress_are_stored_apart(self):
+        assert self.get_row() == ({}, {"status": "uploaded", "progress": 0})
+
+        # Progress reads as file data, the content only when asked for
+        file = self.files.get_file_by_id("file-1")
+        assert file.data == {"status": "uploaded", "progress": 0}
+        assert self.files.get_file_content_by_id("file-1").content == "Extracted text"
+        assert self.files.load_file_contents([file])[0].data == {
+            "status": "uploaded",
+            "progress": 0,
+            "content": "Extracted text",
+            "chunks": None,
+        }
+
+    def test_updates_touch_only_their_part(self):
+        self.files.update_file_processing_by_id("file-1", {"progress": 40})
+        assert self.get_row() == ({}, {"status": "uploaded", "progress": 40})
+        assert self.files.get_file_processing_by_id("file-1")["progress"] == 40
+
+        self.files.update_file_content_by_id("file-1", "New text", ["New", "text"])
+        file_content = self.files.get_file_content_by_id("file-1")
+        assert (file_content.content, file_content.chunks) == (
+            "New text",
+            ["New", "text"],
+        )
+
+        # The generic update still takes every key, and stores each in its place
+        self.files.update_file_data_by_id(
+            "file-1",
+            {"status": "completed", "content": "Final", "metadata": {"a": 1}},
+        )
+        assert self.get_row() == (
+            {"metadata": {"a": 1}},
+            {"status": "completed", "progress": 40},
+        )
+        file_content = self.files.get_file_content_by_id("file-1")
+        assert (file_content.content, file_content.chunks) == (
+            "Final",
+            ["New", "text"],
+        )
+
+    def test_concurrent_processing_updates_are_merged(self):
+        updates = [{"progress": 50}, {"status": "processing"}, {"error": None}] * 4
+        with ThreadPoolExecutor(4) as executor:
+            list(
+                executor.map(
+                    lambda update: self.files.update_file_processing_by_id(
+                        "file-1", update
+                    ),
+                    updates,
+                )
+            )
+        assert self.get_row()[1] == {
+            "status": "processing",
+            "progress": 50,
+            "error": None,
+        }
+
+    def test_delete_removes_content(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.files import FileContent
+
+        self.files.delete_file_by_id("file-1")
+        with get_db() as db:
+            assert db.get(FileContent, "file-1") is None
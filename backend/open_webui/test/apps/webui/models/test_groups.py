@@ -0,0 +1,33 @@
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestGroupVersion(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.groups import Groups
+
+        self.groups = Groups
+
+    def test_creating_groups_bumps_the_version(self):
+        from open_webui.models.groups import GroupUpdateForm
+        from open_webui.utils.access_control import get_principal
+
+        assert get_principal("u1").group_ids == set()
+
+        version = self.groups.version.get()
+        group = self.groups.insert_new_group(
+            "admin",
+            GroupUpdateForm(name="Reviewers", description="", user_ids=["u1"]),
+        )
+        assert self.groups.version.get() != version
+        # Members of the new group are not served their cached principal
+        assert get_principal("u1").group_ids == {group.id}
+
+        version = self.groups.version.get()
+        assert self.groups.create_groups_by_group_names("admin", ["Editors"])
+        assert self.groups.version.get() != version
+
+        # Nothing new, nothing to invalidate
+        version = self.groups.version.get()
+        assert self.groups.create_groups_by_group_names("admin", ["Editors"]) == []
+        assert self.groups.version.get() == version
@@ -1,5 +1,6 @@
 import io
 import os
+import hashlib
 import boto3
 import pytest
 from botocore.exceptions import ClientError
@@ -66,10 +67,11 @@ class TestLocalStorageProvider:
 
     def test_upload_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
+        uploaded, file_path = self.Storage.upload_file(self.file_bytesio, self.filename)
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert uploaded.size == len(self.file_content)
+        assert uploaded.sha256 == hashlib.sha256(self.file_content).hexdigest()
         assert file_path == str(upload_dir / self.filename)
         with pytest.raises(ValueError):
             self.Storage.upload_file(self.file_bytesio_empty, self.filename)
@@ -116,7 +118,7 @@ class TestS3StorageProvider:
         with pytest.raises(Exception):
             self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        uploaded, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
@@ -124,15 +126,46 @@ class TestS3StorageProvider:
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert uploaded.size == len(self.file_content)
+        assert uploaded.sha256 == hashlib.sha256(self.file_content).hexdigest()
         assert s3_file_path == "s3://" + self.Storage.bucket_name + "/" + self.filename
         with pytest.raises(ValueError):
             self.Storage.upload_file(self.file_bytesio_empty, self.filename)
 
+    def test_upload_file_in_parts(self, monkeypatch, tmp_path):
+        upload_dir = mock_upload_dir(monkeypatch, tmp_path)
+        self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
+        # Raised to the 5 MiB S3 minimum: two full parts and a short last one
+        monkeypatch.setattr(provider, "STORAGE_UPLOAD_CHUNK_SIZE", 1024)
+        content = os.urandom(2 * provider.S3_MIN_PART_SIZE + 1000)
+
+        parts = []
+        upload_part = self.Storage.s3_client.upload_part
+
+        def record_part(**kwargs):
+            parts.append((kwargs["PartNumber"], len(kwargs["Body"])))
+            return upload_part(**kwargs)
+
+        monkeypatch.setattr(self.Storage.s3_client, "upload_part", record_part)
+
+        uploaded, s3_file_path = self.Storage.upload_file(
+            io.BytesIO(content), self.filename, {}
+        )
+        object = self.s3_client.Object(self.Storage.bucket_name, self.filename)
+        assert content == object.get()["Body"].read()
+        assert sorted(parts) == [
+            (1, provider.S3_MIN_PART_SIZE),
+            (2, provider.S3_MIN_PART_SIZE),
+            (3, 1000),
+        ]
+        assert (upload_dir / self.filename).read_bytes() == content
+        assert uploaded.size == len(content)
+        assert uploaded.sha256 == hashlib.sha256(content).hexdigest()
+
     def test_get_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        uploaded, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         file_path = self.Storage.get_file(s3_file_path)
@@ -142,7 +175,7 @@ class TestS3StorageProvider:
     def test_delete_file(self, monkeypatch, tmp_path):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
         self.s3_client.create_bucket(Bucket=self.Storage.bucket_name)
-        contents, s3_file_path = self.Storage.upload_file(
+        uploaded, s3_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         assert (upload_dir / self.filename).exists()
@@ -229,7 +262,7 @@ class TestGCSStorageProvider:
         with pytest.raises(Exception):
             self.Storage.bucket = monkeypatch(self.Storage, "bucket", None)
             self.Storage.upload_file(io.BytesIO(self.file_content), self.filename)
-        contents, gcs_file_path = self.Storage.upload_file(
+        uploaded, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         object = self.Storage.bucket.get_blob(self.filename)
@@ -237,7 +270,8 @@ class TestGCSStorageProvider:
         # local checks
         assert (upload_dir / self.filename).exists()
         assert (upload_dir / self.filename).read_bytes() == self.file_content
-        assert contents == self.file_content
+        assert uploaded.size == len(self.file_content)
+        assert uploaded.sha256 == hashlib.sha256(self.file_content).hexdigest()
         assert gcs_file_path == "gs://" + self.Storage.bucket_name + "/" + self.filename
         # test error if file is empty
         with pytest.raises(ValueError):
@@ -245,7 +279,7 @@ class TestGCSStorageProvider:
 
     def test_get_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
+        uploaded, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         file_path = self.Storage.get_file(gcs_file_path)
@@ -254,7 +288,7 @@ class TestGCSStorageProvider:
 
     def test_delete_file(self, monkeypatch, tmp_path, setup):
         upload_dir = mock_upload_dir(monkeypatch, tmp_path)
-        contents, gcs_file_path = self.Storage.upload_file(
+        uploaded, gcs_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
         # ensure that local directory has the uploaded file as well
@@ -290,6 +324,26 @@ class TestGCSStorageProvider:
         assert self.Storage.bucket.get_blob(self.filename) == None
         assert self.Storage.bucket.get_blob(self.filename_extra) == None
 
+    def test_chunk_size_is_rounded_to_256_kib(self):
+        assert provider.get_gcs_chunk_size(1) == 256 * 1024
+        assert provider.get_gcs_chunk_size(256 * 1024) == 256 * 1024
+        assert provider.get_gcs_chunk_size(5 * 1024 * 1024 + 1) == 21 * 256 * 1024
+
+    def test_upload_file_in_chunks(self, monkeypatch, tmp_path, setup):
+        upload_dir = mock_upload_dir(monkeypatch, tmp_path)
+        # Not a multiple of 256 KiB, rounded up to one 256 KiB chunk
+        monkeypatch.setattr(provider, "STORAGE_UPLOAD_CHUNK_SIZE", 100_000)
+        content = os.urandom(3 * 256 * 1024 + 1000)
+
+        uploaded, gcs_file_path = self.Storage.upload_file(
+            io.BytesIO(content), self.filename, {}
+        )
+        object = self.Storage.bucket.get_blob(self.filename)
+        assert content == object.download_as_bytes()
+        assert (upload_dir / self.filename).read_bytes() == content
+        assert uploaded.size == len(content)
+        assert uploaded.sha256 == hashlib.sha256(content).hexdigest()
+
 
 class TestAzureStorageProvider:
     def __init__(self):
@@ -348,16 +402,18 @@ class TestAzureStorageProvider:
         # Reset side effect and create container
         self.Storage.container_client.get_blob_client.side_effect = None
         self.Storage.create_container()
-        contents, azure_file_path = self.Storage.upload_file(
+        uploaded, azure_file_path = self.Storage.upload_file(
             io.BytesIO(self.file_content), self.filename
         )
 
         # Assertions
         self.Storage.container_client.get_blob_client.assert_called_with(self.filename)
-        self.Storage.container_client.get_blob_client().upload_blob.assert_called_once_with(
-            self.file_content, overwrite=True
-        )
-        assert contents == self.file_content
+        blob_client = self.Storage.container_client.get_blob_client()
+        blob_client.stage_block.assert_called_once()
+        assert blob_client.stage_block.call_args.kwargs["data"] == self.file_content
+        blob_client.commit_block_list.assert_called_once()
+        assert uploaded.size == len(self.file_content)
+        assert uploaded.sha256 == hashlib.sha256(self.file_content).hexdigest()
         assert (
             azure_file_path
             == f"https://myaccount.blob.core.windows.net/{self.Storage.container_name}/{self.filename}"
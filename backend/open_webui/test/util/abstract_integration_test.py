@@ -148,9 +148,16 @@ class AbstractPostgresTest(AbstractIntegrationTest):
         tables = [
             "auth",
             "chat",
+            "chat_search",
             "chatidtag",
+            "channel",
             "document",
+            "file",
+            "file_content",
+            '"group"',
             "memory",
+            "message",
+            "message_reaction",
             "model",
             "prompt",
             "tag",
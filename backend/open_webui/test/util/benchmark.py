@@ -0,0 +1,20 @@
+import os
+import time
+
+import pytest
+
+# Benchmarks are slow and timing dependent; run them with RUN_BENCHMARKS=1
+benchmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="benchmark, set RUN_BENCHMARKS=1 to run",
+)
+
+
+def measure(fn, repeat=3):
+    """Returns the result of `fn` and its best time over `repeat` runs."""
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed.append(time.perf_counter() - start)
+    return result, min(elapsed)
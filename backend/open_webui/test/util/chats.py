@@ -0,0 +1,11 @@
+def make_chat(title, contents):
+    """Chat data with one message per content, alternating user and assistant."""
+    messages = {
+        f"message-{idx}": {
+            "id": f"message-{idx}",
+            "role": "user" if idx % 2 == 0 else "assistant",
+            "content": content,
+        }
+        for idx, content in enumerate(contents)
+    }
+    return {"title": title, "history": {"messages": messages}, "messages": []}
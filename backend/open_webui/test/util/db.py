@@ -0,0 +1,21 @@
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Counts the statements sent to the database while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        from open_webui.internal.db import engine
+
+        self.engine = engine
+        event.listen(engine, "before_cursor_execute", self.on_execute)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(self.engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+
+
+def wait_for(condition, timeout=5):
+    """Waits for a listener thread to make `condition()` true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        with self.redis.lock:
+            self.redis.subscribers.setdefault(channel, []).append(self)
+
+    def listen(self):
+        while True:
+            message = self.messages.get()
+            if message is None:
+                raise ConnectionError("Connection closed")
+            yield message
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    def execute(self):
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """In-memory stand-in for the parts of redis.Redis the app uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+        self.lock = threading.RLock()
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("Redis is down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        self._check()
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value if isinstance(value, (str, bytes)) else str(value)
+            return True
+
+    def delete(self, *keys):
+        self._check()
+        with self.lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key):
+        self._check()
+        with self.lock:
+            value = int(self.data.get(key, 0)) + 1
+            self.data[key] = str(value)
+            return value
+
+    def publish(self, channel, message):
+        self._check()
+        with self.lock:
+            subscribers = list(self.subscribers.get(channel, []))
+        for pubsub in subscribers:
+            pubsub.messages.put(
+                {"type": "message", "channel": channel, "data": str(message)}
+            )
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        self._check()
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def disconnect(self):
+        """Drops every subscription, as a lost connection would."""
+        with self.lock:
+            subscribers = [p for ps in self.subscribers.values() for p in ps]
+            self.subscribers = {}
+        for pubsub in subscribers:
+            pubsub.messages.put(None)
+
+
+class AsyncFakeRedis:
+    """Async facade over FakeRedis, like `redis.asyncio.Redis`."""
+
+    def __init__(self, redis=None):
+        self.redis = redis or FakeRedis()
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        async def command(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return command
@@ -0,0 +1,133 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from open_webui.models.access_grants import AccessGrant, AccessGrants
+from open_webui.models.knowledge import Knowledge
+
+MIGRATION = next(
+    (Path(__file__).parents[2] / "migrations" / "versions").glob("b7f3c1d2e4a5_*.py")
+)
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("b7f3c1d2e4a5", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_migration_backfills_grants(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text("CREATE TABLE knowledge (id TEXT PRIMARY KEY, access_control JSON)")
+        )
+        conn.execute(
+            sa.text("INSERT INTO knowledge VALUES (:id, :access_control)"),
+            [
+                {"id": "public", "access_control": None},
+                {"id": "private", "access_control": json.dumps({})},
+                {
+                    "id": "shared",
+                    "access_control": json.dumps(
+                        {
+                            "read": {"group_ids": ["g1"], "user_ids": ["u1"]},
+                            "write": {"group_ids": [], "user_ids": ["u2"]},
+                        }
+                    ),
+                },
+            ],
+        )
+
+        with Operations.context(MigrationContext.configure(conn)):
+            load_migration().upgrade()
+
+        rows = conn.execute(
+            sa.text(
+                "SELECT resource_type, resource_id, principal_type, principal_id, "
+                "permission FROM access_grant"
+            )
+        ).all()
+
+    assert sorted(rows) == [
+        ("knowledge", "public", "user", "*", "read"),
+        ("knowledge", "shared", "group", "g1", "read"),
+        ("knowledge", "shared", "user", "u1", "read"),
+        ("knowledge", "shared", "user", "u2", "write"),
+    ]
+
+
+@pytest.fixture
+def knowledge(engine):
+    Knowledge.__table__.create(engine)
+    AccessGrant.__table__.create(engine)
+
+    resources = {
+        "owned": ("u1", {}),
+        "public": ("u9", None),
+        "private": ("u9", {}),
+        "user_read": ("u9", {"read": {"user_ids": ["u1"]}}),
+        "user_write": ("u9", {"write": {"user_ids": ["u1"]}}),
+        "group_read": ("u9", {"read": {"group_ids": ["g1"]}}),
+        "group_write": ("u9", {"write": {"group_ids": ["g1"]}}),
+        "other_group": ("u9", {"read": {"group_ids": ["g2"]}}),
+    }
+    with sa.orm.Session(engine) as db:
+        for id, (user_id, access_control) in resources.items():
+            db.add(
+                Knowledge(
+                    id=id,
+                    user_id=user_id,
+                    name=id,
+                    description="",
+                    access_control=access_control,
+                    created_at=0,
+                    updated_at=0,
+                )
+            )
+            AccessGrants.set_access_grants("knowledge", id, access_control, db)
+        db.commit()
+
+    def get_accessible(user_id, permission, group_ids):
+        with sa.orm.Session(engine) as db:
+            return {
+                row.id
+                for row in db.query(Knowledge).filter(
+                    AccessGrants.has_access_filter(
+                        "knowledge",
+                        Knowledge.id,
+                        Knowledge.user_id,
+                        user_id,
+                        permission,
+                        group_ids,
+                    )
+                )
+            }
+
+    return get_accessible
+
+
+def test_has_access_filter(knowledge):
+    assert knowledge("u1", "read", set()) == {"owned", "public", "user_read"}
+    assert knowledge("u1", "read", {"g1"}) == {
+        "owned",
+        "public",
+        "user_read",
+        "group_read",
+    }
+    # Public resources are read only
+    assert knowledge("u1", "write", {"g1"}) == {"owned", "user_write", "group_write"}
+    assert knowledge("u2", "read", {"g2"}) == {"public", "other_group"}
+    assert knowledge("u2", "write", set()) == set()
@@ -0,0 +1,65 @@
+import pytest
+
+from open_webui import config
+from open_webui.config import AppConfig, PersistentConfig
+from open_webui.test.util.fake_redis import FakeRedis, wait_for
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(config, "get_redis_connection", lambda *a, **kw: redis)
+    monkeypatch.setattr(PersistentConfig, "save", lambda self: None)
+    # Only invalidation messages trigger a reload during the test
+    monkeypatch.setattr(config, "REDIS_CONFIG_SYNC_INTERVAL", 3600)
+    return redis
+
+
+def make_app_config():
+    app_config = AppConfig(redis_url="redis://localhost:6379/0")
+    app_config.WEBUI_NAME = PersistentConfig("WEBUI_NAME", "ui.name", "Open WebUI")
+    app_config.ENABLE_SIGNUP = PersistentConfig("ENABLE_SIGNUP", "ui.signup", True)
+    return app_config
+
+
+def test_writes_are_seen_by_other_replicas(redis):
+    first, second = make_app_config(), make_app_config()
+    assert second.WEBUI_NAME == "Open WebUI"
+    wait_for(lambda: "open-webui:config:invalidate" in redis.subscribers)
+
+    first.WEBUI_NAME = "Court WebUI"
+    wait_for(lambda: second.WEBUI_NAME == "Court WebUI")
+    assert second.ENABLE_SIGNUP is True
+    assert first.WEBUI_NAME == "Court WebUI"
+    assert second._version == 1
+
+    # Without new writes, reads don't go to Redis again
+    redis.data["open-webui:config:WEBUI_NAME"] = '"Stale"'
+    assert second.WEBUI_NAME == "Court WebUI"
+
+
+def test_reconnects_and_resyncs(redis):
+    first, second = make_app_config(), make_app_config()
+    assert second.WEBUI_NAME == "Open WebUI"
+    wait_for(lambda: "open-webui:config:invalidate" in redis.subscribers)
+
+    # A write published while the listener was disconnected
+    redis.disconnect()
+    redis.data["open-webui:config:WEBUI_NAME"] = '"Court WebUI"'
+    redis.incr("open-webui:config:version")
+    wait_for(lambda: second.WEBUI_NAME == "Court WebUI")
+
+
+def test_falls_back_to_local_values_when_redis_is_down(redis):
+    app_config = make_app_config()
+    assert app_config.WEBUI_NAME == "Open WebUI"
+
+    redis.down = True
+    app_config._invalidated.set()
+    app_config.WEBUI_NAME = "Court WebUI"
+    assert app_config.WEBUI_NAME == "Court WebUI"
+    assert app_config.ENABLE_SIGNUP is True
+
+    redis.down = False
+    app_config._invalidated.set()
+    assert app_config.WEBUI_NAME == "Court WebUI"
@@ -0,0 +1,146 @@
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.routers import audio
+from open_webui.utils.audio import SAMPLE_RATE, get_audio_duration, plan_audio_chunks
+
+
+def test_chunks_are_cut_in_pauses():
+    # Speech with short pauses at 40 and 150, and a long one from 70 to 80
+    speech = [(0, 39), (41, 70), (80, 150), (151, 200)]
+    chunks = plan_audio_chunks(speech, 200, 100)
+
+    assert chunks == [(0, 75), (75, 150), (150, 200)]
+    # Without a pause in the second half, the chunk is cut at its limit
+    assert plan_audio_chunks([(0, 200)], 200, 100) == [(0, 100), (100, 200)]
+    assert plan_audio_chunks([], 50, 100) == [(0, 50)]
+
+
+def test_results_are_yielded_in_order_with_bounded_pending():
+    pending = {"current": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work(delay):
+        time.sleep(delay)
+        with lock:
+            pending["current"] -= 1
+        return delay
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+
+        def submit(delay):
+            with lock:
+                pending["current"] += 1
+                pending["peak"] = max(pending["peak"], pending["current"])
+            return executor.submit(work, delay)
+
+        delays = [0.05, 0.01, 0.03, 0.0, 0.02, 0.01]
+        results = list(audio.iter_results_in_order(submit, delays, 3))
+
+    assert results == delays
+    assert pending["peak"] == 3
+
+
+class FakeWhisperModel:
+    def __init__(self):
+        self.lengths = []
+
+    def transcribe(self, samples, **kwargs):
+        self.lengths.append(len(samples))
+        seconds = len(samples) / SAMPLE_RATE
+        idx = len(self.lengths)
+        segments = [
+            SimpleNamespace(start=1.0, end=2.0, text=f" chunk {idx} start"),
+            SimpleNamespace(
+                start=seconds - 2, end=seconds - 1, text=f" chunk {idx} end"
+            ),
+        ]
+        return iter(segments), SimpleNamespace(language="en")
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "hearing.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"\x00\x00" * SAMPLE_RATE * 100)
+    return str(path)
+
+
+def make_request(model):
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                faster_whisper_model=model,
+                config=SimpleNamespace(
+                    STT_ENGINE="", WHISPER_VAD_FILTER=False, WHISPER_MODEL="base"
+                ),
+            )
+        )
+    )
+
+
+def test_short_recordings_are_transcribed_whole(recording, monkeypatch):
+    assert get_audio_duration(recording) == 100.0
+    assert get_audio_duration(__file__) is None
+
+    def decode(*args, **kwargs):
+        raise AssertionError("Short recordings are not decoded")
+
+    calls = []
+
+    def transcription_handler(request, file_path, metadata):
+        calls.append(file_path)
+        return {"text": "hearing", "segments": [{"start": 1.0, "end": 2.0}]}
+
+    monkeypatch.setattr(audio.AudioSegment, "from_file", decode)
+    monkeypatch.setattr(audio, "get_speech_spans", decode)
+    monkeypatch.setattr(audio, "transcription_handler", transcription_handler)
+    monkeypatch.setattr(audio, "AUDIO_STT_CHUNK_DURATION", 100)
+
+    chunks = list(audio.transcribe_chunks(make_request(FakeWhisperModel()), recording))
+
+    assert calls == [recording]
+    assert [(chunk["index"], chunk["start"], chunk["end"]) for chunk in chunks] == [
+        (0, 0.0, 100.0)
+    ]
+    assert chunks[0]["text"] == "hearing"
+
+
+def test_long_recordings_are_transcribed_in_chunks(recording, monkeypatch):
+    # Speech until 25 s, a pause, speech from 35 s to 55 s, silence after
+    speech = [(0, 25 * SAMPLE_RATE), (35 * SAMPLE_RATE, 55 * SAMPLE_RATE)]
+    monkeypatch.setattr(audio, "get_speech_spans", lambda samples: speech)
+    monkeypatch.setattr(audio, "AUDIO_STT_CHUNK_DURATION", 30)
+    monkeypatch.setattr(audio, "AUDIO_STT_WORKERS", 1)
+
+    model = FakeWhisperModel()
+    chunks = list(audio.transcribe_chunks(make_request(model), recording))
+
+    # Cut in the pauses, before 30 s and after 55 s; silent chunks are skipped
+    assert [(chunk["start"], chunk["end"]) for chunk in chunks] == [
+        (0.0, 27.5),
+        (27.5, 56.25),
+    ]
+    assert model.lengths == [27.5 * SAMPLE_RATE, 28.75 * SAMPLE_RATE]
+    assert [chunk["text"] for chunk in chunks] == [
+        "chunk 1 start chunk 1 end",
+        "chunk 2 start chunk 2 end",
+    ]
+
+    # Timestamps are relative to the whole recording
+    transcript = audio.merge_transcripts(chunks)
+    assert [(s["start"], s["end"]) for s in transcript["segments"]] == [
+        (1.0, 2.0),
+        (25.5, 26.5),
+        (28.5, 29.5),
+        (54.25, 55.25),
+    ]
+    assert transcript["text"] == "chunk 1 start chunk 1 end chunk 2 start chunk 2 end"
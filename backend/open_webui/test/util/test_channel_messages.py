@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+import open_webui.routers.openai  # noqa: F401 (loads utils.models before the channels router)
+from open_webui.models.messages import parse_message_list_cursor
+from open_webui.routers.channels import (
+    get_channel_messages,
+    get_channel_thread_messages,
+)
+
+
+def test_parse_message_list_cursor():
+    assert parse_message_list_cursor("1700000000000:m1") == (1700000000000, "m1")
+
+    for cursor in ("abc:m1", "1700000000000", "-1:m1", f"{2**63}:m1"):
+        with pytest.raises(ValueError):
+            parse_message_list_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursors_are_rejected():
+    user = SimpleNamespace(id="u1", role="admin")
+    with pytest.raises(HTTPException) as e:
+        await get_channel_messages("c1", cursor="abc:m1", user=user)
+    assert e.value.status_code == 400
+
+    with pytest.raises(HTTPException) as e:
+        await get_channel_thread_messages("c1", "m1", cursor="abc:m1", user=user)
+    assert e.value.status_code == 400
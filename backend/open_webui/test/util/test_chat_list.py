@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from open_webui.models.chats import parse_chat_list_cursor
+from open_webui.models.users import UserModel
+
+
+def test_parse_chat_list_cursor():
+    assert parse_chat_list_cursor("1700000000:a:b") == (1700000000, "a:b")
+
+    for cursor in ("abc:id", "1700000000", "1700000000:", "-1:id", f"{2**63}:id"):
+        with pytest.raises(ValueError):
+            parse_chat_list_cursor(cursor)
+
+
+def test_malformed_cursors_are_rejected():
+    from open_webui.main import app
+    from open_webui.utils.auth import get_admin_user, get_verified_user
+
+    user = UserModel(
+        id="u1",
+        name="User",
+        email="user@example.com",
+        role="admin",
+        profile_image_url="",
+        last_active_at=0,
+        updated_at=0,
+        created_at=0,
+    )
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[get_verified_user] = lambda: user
+        app.dependency_overrides[get_admin_user] = lambda: user
+        for path in (
+            "/api/v1/chats/list",
+            "/api/v1/chats/list/user/u2",
+            "/api/v1/chats/folder/f1/list",
+            "/api/v1/chats/archived",
+        ):
+            response = client.get(path, params={"cursor": "abc:id"})
+            assert response.status_code == 400, path
+    finally:
+        app.dependency_overrides = {}
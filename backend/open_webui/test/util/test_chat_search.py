@@ -0,0 +1,31 @@
+from open_webui.models.chat_search import get_chat_search_documents, get_snippet
+from open_webui.test.util.chats import make_chat
+
+
+def test_get_chat_search_documents():
+    chat = make_chat("Bread", ["How do I bake <b>bread</b>?", "", "Knead it"])
+    chat["history"]["messages"]["image"] = {
+        "content": [{"type": "text", "text": "What is this?"}, {"type": "image_url"}]
+    }
+
+    assert get_chat_search_documents(chat) == {
+        "": ("Bread", ""),
+        "message-0": ("", "How do I bake <b>bread</b>?"),
+        "message-2": ("", "Knead it"),
+        "image": ("", "What is this?"),
+    }
+
+
+def test_get_snippet():
+    text = "<b>Sourdough</b>\n bread needs a starter. " + "Knead it. " * 20
+    assert get_snippet(text, ["bread", "sta"]) == (
+        "&lt;b&gt;Sourdough&lt;/b&gt; <mark>bread</mark> needs a <mark>starter</mark>."
+        + " Knead it." * 8
+        + "…"
+    )
+    # Word prefixes only, unless matching anywhere like the LIKE fallback
+    assert "<mark>" not in get_snippet(text, ["dough"])
+    assert "Sour<mark>dough</mark>" in get_snippet(text, ["dough"], word_prefix=False)
+
+    snippet = get_snippet("word " * 100 + "needle", ["needle"])
+    assert snippet.startswith("…") and snippet.endswith("<mark>needle</mark>")
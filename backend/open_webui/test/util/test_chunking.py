@@ -0,0 +1,187 @@
+import re
+
+import pytest
+import tiktoken
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from open_webui.retrieval.chunking import TextChunker
+from open_webui.test.util.benchmark import benchmark, measure
+
+PARAGRAPH = (
+    "The river rises in the hills. It runs north through the town, then "
+    "bends west. Farmers there grow wheat and barley! Is the water clean? "
+    "Mostly, although the spring floods carry silt into the fields.\n\n"
+)
+
+
+def get_test_encoding():
+    """
+    BPE that knows the words of PARAGRAPH, so tokens are about word sized
+    like in real encodings, and no encoding has to be downloaded.
+    """
+    ranks = {bytes([i]): i for i in range(256)}
+    for word in re.findall(r" ?\w+", PARAGRAPH) + re.findall(r"\w+", PARAGRAPH):
+        word = word.encode()
+        # Every prefix is a token, so BPE can merge up to the whole word
+        for end in range(2, len(word) + 1):
+            ranks.setdefault(word[:end], len(ranks))
+    return tiktoken.Encoding(
+        name="test_words",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+
+
+ENCODING = get_test_encoding()
+
+
+def test_character_chunks_cut_at_boundaries():
+    text = PARAGRAPH * 20
+    chunks = TextChunker(300, 50, encoding=ENCODING).split_text(text)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.text == text[chunk.start : chunk.end]
+        assert 0 < len(chunk.text) <= 300
+        # Cut at a sentence or paragraph, never inside a word
+        assert chunk.text[-1] in ".!?"
+        # Counted from the whole text, so a merge across the cut may differ
+        assert abs(chunk.token_count - len(ENCODING.encode(chunk.text))) <= 1
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # Consecutive chunks overlap by up to chunk_overlap characters
+        assert previous.end - 50 <= chunk.start < previous.end
+        assert text[chunk.start - 1].isspace()
+    assert chunks[-1].end == len(text.rstrip())
+
+
+def test_long_words_are_cut_hard():
+    text = "x" * 250
+    chunks = TextChunker(100, 0, encoding=ENCODING).split_text(text)
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [
+        (0, 100),
+        (100, 200),
+        (200, 250),
+    ]
+
+
+def test_token_chunks():
+    text = PARAGRAPH * 10
+    tokens = ENCODING.encode(text)
+    chunks = TextChunker(64, 16, "token", ENCODING).split_text(text)
+
+    assert [chunk.token_count for chunk in chunks[:-1]] == [64] * (len(chunks) - 1)
+    assert chunks[1].text == ENCODING.decode(tokens[48:112])
+    assert chunks[-1].end == len(text)
+
+    chunks = TextChunker(64, 0, "token", ENCODING).split_text(text)
+    assert "".join(chunk.text for chunk in chunks) == text
+    assert sum(chunk.token_count for chunk in chunks) == len(tokens)
+
+
+def test_markdown_chunks_follow_headers():
+    text = (
+        "Intro text.\n"
+        "# Rivers\n"
+        "Rivers flow.\n"
+        "## Floods\n"
+        "```bash\n# not a header\n```\n"
+        "Floods happen in spring.\n"
+        "# Lakes\n" + "Lakes are still. " * 20
+    )
+    chunks = TextChunker(120, 0, "markdown_header", ENCODING).split_text(text)
+
+    assert [(chunk.text.splitlines()[0], chunk.headings) for chunk in chunks[:4]] == [
+        ("Intro text.", []),
+        ("# Rivers", ["Rivers"]),
+        ("## Floods", ["Rivers", "Floods"]),
+        ("# Lakes", ["Lakes"]),
+    ]
+    assert "# not a header" in chunks[2].text
+    assert all(chunk.headings == ["Lakes"] for chunk in chunks[3:])
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+
+
+def test_split_documents_metadata():
+    from langchain_core.documents import Document
+
+    docs = TextChunker(200, 0, "markdown_header").split_documents(
+        [Document(page_content="# Title\nSome words here.", metadata={"name": "a"})]
+    )
+    assert [(doc.page_content, doc.metadata) for doc in docs] == [
+        (
+            "# Title\nSome words here.",
+            {
+                "name": "a",
+                "start_index": 0,
+                "end_index": 24,
+                # Counted as words without an encoding
+                "token_count": 5,
+                "headings": ["Title"],
+            },
+        )
+    ]
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        TextChunker(100, 100)
+    with pytest.raises(ValueError):
+        TextChunker(100, 0, "sentence")
+    with pytest.raises(ValueError):
+        TextChunker(100, 0, "token")
+
+
+def chunk_text_by_words(text, chunk_size=3000):
+    # The preview chunking of process_file, as it was
+    chunks, buffer, word_count = [], [], 0
+    for match in re.finditer(r"\S+\s*", text):
+        buffer.append(match.group())
+        word_count += 1
+        if word_count >= chunk_size:
+            chunks.append("".join(buffer).strip())
+            buffer.clear()
+            word_count = 0
+    if buffer:
+        chunks.append("".join(buffer).strip())
+    return chunks
+
+
+@benchmark
+def test_benchmark():
+    """A 1 MB document with the default chunk settings"""
+    text = PARAGRAPH * 5000
+
+    def count_tokens(chunks):
+        # As save_docs_to_vector_db did: every chunk encoded again
+        return [len(ENCODING.encode(chunk)) for chunk in chunks]
+
+    def split_characters_previous():
+        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        chunks = splitter.split_text(text)
+        return chunk_text_by_words(text), count_tokens(chunks)
+
+    def split_tokens_previous():
+        # TokenTextSplitter, with the test encoding instead of a named one
+        tokens = ENCODING.encode(text)
+        chunks = [
+            ENCODING.decode(tokens[start : start + 1000])
+            for start in range(0, len(tokens), 900)
+        ]
+        return chunk_text_by_words(text), count_tokens(chunks)
+
+    for splitter, previous in (
+        ("character", split_characters_previous),
+        ("token", split_tokens_previous),
+    ):
+        (_, previous_counts), previous_time = measure(previous)
+        chunks, single_pass_time = measure(
+            lambda: TextChunker(1000, 100, splitter, ENCODING).split_text(text)
+        )
+
+        print(
+            f"\n{splitter}, {len(text) / 1e6:.1f} MB:"
+            f" previous {previous_time * 1000:.0f} ms ({len(previous_counts)} chunks),"
+            f" single pass {single_pass_time * 1000:.0f} ms ({len(chunks)} chunks)"
+        )
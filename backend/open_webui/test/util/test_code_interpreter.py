@@ -0,0 +1,163 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from open_webui.utils import code_interpreter
+from open_webui.utils.code_interpreter import JupyterKernelPool
+
+# e.g. http://localhost:8888 with `jupyter server --IdentityProvider.token=test`
+JUPYTER_TEST_URL = os.environ.get("JUPYTER_TEST_URL")
+JUPYTER_TEST_TOKEN = os.environ.get("JUPYTER_TEST_TOKEN", "")
+
+
+class FakeKernelWebSocket:
+    """Replies to an execute request with its code echoed on stdout."""
+
+    def __init__(self, kernel_id):
+        self.kernel_id = kernel_id
+        self.replies = []
+
+    async def send(self, message):
+        request = json.loads(message)
+        parent = {"msg_id": request["header"]["msg_id"]}
+        self.replies = [
+            {
+                "parent_header": parent,
+                "msg_type": "stream",
+                "content": {
+                    "name": "stdout",
+                    "text": f"{self.kernel_id}:{request['content']['code']}",
+                },
+            },
+            {
+                "parent_header": parent,
+                "msg_type": "status",
+                "content": {"execution_state": "idle"},
+            },
+        ]
+
+    async def recv(self):
+        return json.dumps(self.replies.pop(0))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeJupyterServer:
+    def __init__(self):
+        self.started = 0
+        self.running = set()
+
+    async def start_kernel(self):
+        self.started += 1
+        kernel_id = f"kernel-{self.started}"
+        self.running.add(kernel_id)
+        return kernel_id
+
+    async def shutdown_kernel(self, kernel_id):
+        self.running.discard(kernel_id)
+
+    async def connect(self, url, additional_headers=None):
+        kernel_id = url.split("api/kernels/")[1].split("/")[0]
+        if kernel_id not in self.running:
+            raise ConnectionError("kernel not found")
+        return FakeKernelWebSocket(kernel_id)
+
+
+def make_pool(server, **kwargs):
+    pool = JupyterKernelPool("http://jupyter", token="test", **kwargs)
+    pool.signed_in = True
+    pool.start_kernel = server.start_kernel
+    pool.shutdown_kernel = server.shutdown_kernel
+    return pool
+
+
+class TestJupyterKernelPool:
+    @pytest.mark.asyncio
+    async def test_chat_affinity_and_prewarming(self):
+        server = FakeJupyterServer()
+        pool = make_pool(server, size=1)
+
+        with patch.object(code_interpreter.websockets, "connect", server.connect):
+            first = await pool.execute("a = 1", chat_id="chat", user_id="user")
+            await pool.warm_task
+            second = await pool.execute("a", chat_id="chat", user_id="user")
+            other = await pool.execute("b", chat_id="other", user_id="user")
+            await pool.warm_task
+
+        # Same kernel for both turns of a chat, a spare for the next chat
+        assert first.stdout == "kernel-1:a = 1"
+        assert second.stdout == "kernel-1:a"
+        assert other.stdout == "kernel-2:b"
+        assert pool.spares == ["kernel-3"]
+
+    @pytest.mark.asyncio
+    async def test_one_shot_execution_releases_kernel(self):
+        server = FakeJupyterServer()
+        pool = make_pool(server, size=0)
+
+        with patch.object(code_interpreter.websockets, "connect", server.connect):
+            result = await pool.execute("print(1)", user_id="user")
+
+        assert result.stdout == "kernel-1:print(1)"
+        assert not server.running
+        assert not pool.kernels
+
+    @pytest.mark.asyncio
+    async def test_max_kernels_per_user(self):
+        server = FakeJupyterServer()
+        pool = make_pool(server, size=0, max_per_user=2)
+
+        with patch.object(code_interpreter.websockets, "connect", server.connect):
+            for chat_id in ["chat-1", "chat-2", "chat-3"]:
+                await pool.execute("x", chat_id=chat_id, user_id="user")
+            await pool.execute("x", chat_id="chat-1", user_id="other")
+
+        # The least recently used chat of the user was shut down
+        assert set(pool.kernels) == {"user:chat-2", "user:chat-3", "other:chat-1"}
+        assert server.running == {"kernel-2", "kernel-3", "kernel-4"}
+
+    @pytest.mark.asyncio
+    async def test_idle_reaping_and_dead_kernels(self):
+        server = FakeJupyterServer()
+        pool = make_pool(server, size=0, idle_timeout=60)
+
+        with patch.object(code_interpreter.websockets, "connect", server.connect):
+            await pool.execute("x", chat_id="chat", user_id="user")
+
+            # Kernel culled by the server: the chat gets a new one
+            server.running.clear()
+            result = await pool.execute("y", chat_id="chat", user_id="user")
+            assert result.stdout == "kernel-2:y"
+
+        assert not await pool.reap()
+        pool.kernels["user:chat"].last_used -= 120
+        pool.last_used -= 120
+        assert await pool.reap()
+        assert not pool.kernels
+        assert not server.running
+
+
+@pytest.mark.skipif(not JUPYTER_TEST_URL, reason="JUPYTER_TEST_URL not set")
+class TestJupyterKernelPoolServer:
+    @pytest.mark.asyncio
+    async def test_state_persists_across_turns(self):
+        pool = JupyterKernelPool(JUPYTER_TEST_URL, token=JUPYTER_TEST_TOKEN, size=1)
+        try:
+            await pool.execute("counter = 41", chat_id="chat", user_id="user")
+            result = await pool.execute(
+                "print(counter + 1)", chat_id="chat", user_id="user"
+            )
+            assert result.stdout == "42"
+
+            result = await pool.execute(
+                "print('counter' in globals())", chat_id="new", user_id="user"
+            )
+            assert result.stdout == "False"
+        finally:
+            await pool.close()
@@ -0,0 +1,253 @@
+import asyncio
+import threading
+import time
+from urllib.parse import unquote
+
+import pytest
+from aiohttp import web
+
+from open_webui.retrieval.loaders import datalab_marker
+from open_webui.utils.loader_client import LoaderClient
+from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
+from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
+from open_webui.retrieval.loaders.main import DoclingLoader, TikaLoader
+
+
+class FakeServer:
+    """An aiohttp app served from its own thread and loop."""
+
+    def __init__(self, app: web.Application):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        self.runner = web.AppRunner(self.app)
+        asyncio.run_coroutine_threadsafe(self.runner.setup(), self.loop).result()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        asyncio.run_coroutine_threadsafe(site.start(), self.loop).result()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    def __exit__(self, *args):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    client = LoaderClient(max_concurrency=2)
+    for module in (
+        "open_webui.retrieval.loaders.main",
+        "open_webui.retrieval.loaders.external_document",
+        "open_webui.retrieval.loaders.datalab_marker",
+    ):
+        monkeypatch.setattr(f"{module}.ExternalLoaders", client)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4 fake" * 1000)
+    return str(path)
+
+
+def test_tika_and_external_stream_the_file(loaders, document):
+    received = {}
+
+    async def tika(request):
+        received["tika"] = (await request.read(), request.headers["Content-Type"])
+        return web.json_response(
+            {"X-TIKA:content": " Tika text ", "Content-Type": "application/pdf"}
+        )
+
+    async def external(request):
+        received["external"] = (
+            await request.read(),
+            request.headers["Authorization"],
+        )
+        return web.json_response(
+            [{"page_content": "External text", "metadata": {"page": 1}}]
+        )
+
+    app = web.Application()
+    app.router.add_put("/tika/text", tika)
+    app.router.add_put("/process", external)
+
+    with FakeServer(app) as server:
+        docs = TikaLoader(server.url, document, "application/pdf").load()
+        assert docs[0].page_content == "Tika text"
+        assert docs[0].metadata == {"Content-Type": "application/pdf"}
+
+        docs = ExternalDocumentLoader(
+            document, server.url, "secret", "application/pdf"
+        ).load()
+        assert [(doc.page_content, doc.metadata) for doc in docs] == [
+            ("External text", {"page": 1})
+        ]
+
+    with open(document, "rb") as f:
+        content = f.read()
+    assert received["tika"] == (content, "application/pdf")
+    assert received["external"] == (content, "Bearer secret")
+
+
+def test_docling_form_fields(loaders, document):
+    received = {}
+
+    async def convert(request):
+        form = await request.post()
+        received["fields"] = {
+            key: form.getall(key) for key in form.keys() if key != "files"
+        }
+        received["file"] = form["files"].filename
+        return web.json_response({"document": {"md_content": "Docling text"}})
+
+    app = web.Application()
+    app.router.add_post("/v1/convert/file", convert)
+
+    with FakeServer(app) as server:
+        docs = DoclingLoader(
+            server.url,
+            document,
+            "application/pdf",
+            {"do_ocr": True, "ocr_engine": "tesseract", "ocr_lang": "eng, deu"},
+        ).load()
+
+    assert docs[0].page_content == "Docling text"
+    assert unquote(received["file"]) == document
+    assert received["fields"]["ocr_lang"] == ["eng", "deu"]
+    assert received["fields"]["do_ocr"] == ["True"]
+    # Unset options are left to the server's defaults
+    assert "force_ocr" not in received["fields"]
+
+
+def test_datalab_marker_polls_without_blocking(loaders, document, monkeypatch):
+    monkeypatch.setattr(datalab_marker, "POLL_INITIAL_DELAY", 0.05)
+    monkeypatch.setattr(datalab_marker.os, "makedirs", lambda *args, **kwargs: None)
+    polls = []
+
+    async def convert(request):
+        form = await request.post()
+        assert form["output_format"] == "markdown"
+        return web.json_response(
+            {
+                "success": True,
+                "request_id": "job-1",
+                "request_check_url": f"{request.url.origin()}/check/job-1",
+            }
+        )
+
+    async def check(request):
+        polls.append(time.monotonic())
+        if len(polls) < 3:
+            return web.json_response({"status": "processing"})
+        return web.json_response(
+            {
+                "status": "complete",
+                "success": True,
+                "markdown": "# Marker text",
+                "page_count": 2,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post("/marker", convert)
+    app.router.add_get("/check/job-1", check)
+
+    with FakeServer(app) as server:
+        docs = DatalabMarkerLoader(
+            document, "key", f"{server.url}/marker", output_format="markdown"
+        ).load()
+
+    assert docs[0].page_content == "# Marker text"
+    assert docs[0].metadata["page_count"] == 2
+    assert docs[0].metadata["request_id"] == "job-1"
+    # The delay between polls backs off
+    assert polls[2] - polls[1] > polls[1] - polls[0]
+
+
+def test_concurrency_is_bounded_per_engine(loaders, document):
+    active = {"current": 0, "peak": 0}
+
+    async def tika(request):
+        await request.read()
+        active["current"] += 1
+        active["peak"] = max(active["peak"], active["current"])
+        await asyncio.sleep(0.05)
+        active["current"] -= 1
+        return web.json_response({"X-TIKA:content": "text"})
+
+    app = web.Application()
+    app.router.add_put("/tika/text", tika)
+
+    with FakeServer(app) as server:
+        threads = [
+            threading.Thread(target=TikaLoader(server.url, document).load)
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert active["peak"] == loaders.max_concurrency
+    # All requests went through one pooled session
+    assert len(loaders.sessions.sessions) == 1
+
+
+def test_run_times_out_and_cancels(loaders):
+    loaders.timeout = 0.05
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        loaders.run("tika", slow())
+    assert cancelled.wait(1)
+
+    async def run_async():
+        with pytest.raises(TimeoutError):
+            await loaders.run_async("tika", asyncio.sleep(10))
+
+    asyncio.run(run_async())
+
+
+def test_queued_requests_do_not_use_their_timeout(loaders):
+    loaders.max_concurrency = 1
+    loaders.timeout = 0.5
+
+    async def job():
+        await asyncio.sleep(0.3)
+        return "done"
+
+    # The second job waits 0.3 s for the first, then runs within its timeout
+    futures = [loaders.submit("tika", job()) for _ in range(2)]
+    assert [future.result() for future in futures] == ["done", "done"]
+
+
+def test_close_closes_the_sessions_then_the_loop(loaders):
+    async def open_session():
+        return loaders.get_session("http://127.0.0.1:1")
+
+    session = loaders.run("tika", open_session())
+    loop, thread = loaders.loop, loaders.thread
+
+    loaders.close()
+    assert session.closed
+    assert loop.is_closed() and not thread.is_alive()
+    assert loaders.loop is None
+
+    # Started again on the next request
+    assert loaders.run("tika", asyncio.sleep(0, "ok")) == "ok"
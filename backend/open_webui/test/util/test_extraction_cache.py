@@ -0,0 +1,139 @@
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.loaders.cache import ExtractionCache
+from open_webui.retrieval.loaders.main import Loader
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    load = Loader._load
+
+    def counting_load(self, filename, *args, **kwargs):
+        calls.append(filename)
+        return load(self, filename, *args, **kwargs)
+
+    monkeypatch.setattr(Loader, "_load", counting_load)
+    return calls
+
+
+def write_file(path, content="Ruling of the court\n"):
+    path.write_text(content)
+    return str(path)
+
+
+def test_reuses_extraction_for_same_bytes_and_settings(tmp_path, calls):
+    cache_dir = tmp_path / "cache"
+    first = write_file(tmp_path / "first.txt")
+    second = write_file(tmp_path / "second.txt")
+
+    loader = Loader(EXTRACTION_CACHE_DIR=cache_dir)
+    docs = loader.load("ruling.txt", "text/plain", first)
+    cached = loader.load("ruling.txt", "text/plain", second)
+
+    assert calls == ["ruling.txt"]
+    assert [doc.page_content for doc in cached] == [doc.page_content for doc in docs]
+    # The path recorded by the loader is the one of the file being processed
+    assert docs[0].metadata["source"] == first
+    assert cached[0].metadata["source"] == second
+
+
+def test_misses_on_changed_bytes_or_settings(tmp_path, calls):
+    cache_dir = tmp_path / "cache"
+    file_path = write_file(tmp_path / "ruling.txt")
+
+    Loader(EXTRACTION_CACHE_DIR=cache_dir).load("a.txt", "text/plain", file_path)
+    Loader(EXTRACTION_CACHE_DIR=cache_dir, PDF_EXTRACT_IMAGES=True).load(
+        "b.txt", "text/plain", file_path
+    )
+    Loader("tika", EXTRACTION_CACHE_DIR=cache_dir).load(
+        "c.txt", "text/plain", file_path
+    )
+    write_file(tmp_path / "ruling.txt", "Appeal dismissed\n")
+    docs = Loader(EXTRACTION_CACHE_DIR=cache_dir).load("d.txt", "text/plain", file_path)
+
+    assert calls == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert docs[0].page_content == "Appeal dismissed\n"
+
+
+def test_ignores_credentials_and_unreadable_entries(tmp_path, calls):
+    cache_dir = tmp_path / "cache"
+    file_path = write_file(tmp_path / "ruling.txt")
+
+    loader = Loader(
+        "mistral_ocr", EXTRACTION_CACHE_DIR=cache_dir, MISTRAL_OCR_API_KEY="old"
+    )
+    loader.load("ruling.txt", "text/plain", file_path, file_hash="abc")
+    Loader(
+        "mistral_ocr", EXTRACTION_CACHE_DIR=cache_dir, MISTRAL_OCR_API_KEY="new"
+    ).load("ruling.txt", "text/plain", file_path, file_hash="abc")
+    assert len(calls) == 1
+
+    for entry in cache_dir.glob("*/*.json"):
+        entry.write_text("{")
+    loader.load("ruling.txt", "text/plain", file_path, file_hash="abc")
+    assert len(calls) == 2
+
+
+def test_disabled_without_cache_dir(tmp_path, calls):
+    file_path = write_file(tmp_path / "ruling.txt")
+    Loader().load("ruling.txt", "text/plain", file_path)
+    Loader().load("ruling.txt", "text/plain", file_path)
+    assert len(calls) == 2
+
+
+def test_whether_a_key_is_set_is_part_of_the_key(tmp_path):
+    for engine, key in (
+        ("mistral_ocr", "MISTRAL_OCR_API_KEY"),
+        ("datalab_marker", "DATALAB_MARKER_API_KEY"),
+        ("external", "EXTERNAL_DOCUMENT_LOADER_API_KEY"),
+    ):
+        with_key = Loader(engine, **{key: "secret"})
+        assert with_key.get_cache_key("a.pdf", None, "abc") == Loader(
+            engine, **{key: "other"}
+        ).get_cache_key("a.pdf", None, "abc")
+        assert with_key.get_cache_key("a.pdf", None, "abc") != Loader(
+            engine, **{key: ""}
+        ).get_cache_key("a.pdf", None, "abc")
+
+
+def test_failed_extractions_are_not_cached(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_load(self, filename, *args, **kwargs):
+        calls.append(filename)
+        return [
+            Document(
+                page_content="Error during processing",
+                metadata={"error": "processing_failed"},
+            )
+        ]
+
+    monkeypatch.setattr(Loader, "_load", failing_load)
+    file_path = write_file(tmp_path / "ruling.txt")
+    loader = Loader("mistral_ocr", EXTRACTION_CACHE_DIR=tmp_path / "cache")
+    loader.load("ruling.pdf", "application/pdf", file_path)
+    loader.load("ruling.pdf", "application/pdf", file_path)
+    assert len(calls) == 2
+    assert not list((tmp_path / "cache").glob("*/*.json"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size=3500)
+    docs = [Document(page_content="x" * 1000)]
+    for idx, key in enumerate(("aa1", "bb2", "cc3")):
+        cache.set(key, "ruling.txt", docs)
+        # Used one after the other
+        os.utime(cache.get_path(key), (idx, idx))
+
+    # Reading an entry makes it the most recently used
+    assert cache.get("aa1", "ruling.txt") is not None
+    cache.set("dd4", "ruling.txt", docs)
+
+    # Room for three entries: the oldest one is evicted
+    assert cache.get("bb2", "ruling.txt") is None
+    for key in ("aa1", "cc3", "dd4"):
+        assert cache.get(key, "ruling.txt") is not None
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, update
+
+from open_webui.models.files import File, merge_json_column, split_file_data
+
+
+def test_split_file_data():
+    assert split_file_data(
+        {"status": "completed", "progress": 100, "content": "Text", "name": "a.pdf"}
+    ) == (
+        {"name": "a.pdf"},
+        {"status": "completed", "progress": 100},
+        {"content": "Text"},
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'files.db'}")
+    File.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def merge_processing(engine, file_id, values):
+    with engine.begin() as conn:
+        conn.execute(
+            update(File.__table__)
+            .where(File.__table__.c.id == file_id)
+            .values(processing=merge_json_column(File.processing, values, "sqlite"))
+        )
+
+
+def get_processing(engine, file_id):
+    with engine.connect() as conn:
+        return (
+            conn.execute(File.__table__.select().where(File.__table__.c.id == file_id))
+            .one()
+            ._mapping["processing"]
+        )
+
+
+def test_merge_json_column(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            File.__table__.insert(),
+            [
+                {"id": "a", "processing": {"status": "uploaded", "progress": 0}},
+                # Stored as JSON null
+                {"id": "b", "processing": None},
+            ],
+        )
+
+    merge_processing(engine, "a", {"progress": 40, "error": None})
+    merge_processing(engine, "a", {"processing_details": {"pages": [1, 'a "b"']}})
+    assert get_processing(engine, "a") == {
+        "status": "uploaded",
+        "progress": 40,
+        "error": None,
+        "processing_details": {"pages": [1, 'a "b"']},
+    }
+
+    merge_processing(engine, "b", {"status": "completed"})
+    assert get_processing(engine, "b") == {"status": "completed"}
+
+
+def test_concurrent_merges_are_not_lost(engine):
+    with engine.begin() as conn:
+        conn.execute(File.__table__.insert(), [{"id": "a", "processing": {}}])
+
+    threads = [
+        threading.Thread(
+            target=merge_processing, args=(engine, "a", {f"key_{idx}": idx})
+        )
+        for idx in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert get_processing(engine, "a") == {f"key_{idx}": idx for idx in range(8)}
@@ -0,0 +1,105 @@
+import pytest
+
+from open_webui.utils import load_balancer as load_balancer_module
+from open_webui.utils.load_balancer import LoadBalancer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(load_balancer_module.time, "monotonic", lambda: clock["now"])
+    return clock
+
+
+@pytest.fixture
+def load_balancer(clock):
+    load_balancer = LoadBalancer(affinity=True, ejection_failures=2, ejection_time=30.0)
+    load_balancer.sync_urls(["http://a:11434", "http://b:11434", "http://c:11434"])
+    return load_balancer
+
+
+def test_selects_least_outstanding_then_fastest(load_balancer, clock):
+    load_balancer.begin(0)
+    assert load_balancer.select("llama3", [0, 1]) == 1
+
+    load_balancer.begin(1)
+    for url_idx, latency in ((0, 2.0), (1, 0.5)):
+        start = clock["now"]
+        clock["now"] += latency
+        load_balancer.observe(url_idx, start)
+        load_balancer.end(url_idx)
+    assert load_balancer.select("llama3", [0, 1]) == 1
+    assert load_balancer.select("llama3", [0]) == 0
+
+    with pytest.raises(ValueError):
+        load_balancer.select("llama3", [])
+
+
+def test_prefers_backends_with_the_model_loaded(load_balancer, clock):
+    load_balancer.begin(1)
+    load_balancer.set_loaded_models({"llama3": [1]})
+    assert load_balancer.select("llama3", [0, 1, 2]) == 1
+    assert load_balancer.select("mistral", [0, 1, 2]) in (0, 2)
+
+    load_balancer.mark_loaded("mistral", 2)
+    assert load_balancer.select("mistral", [0, 1, 2]) == 2
+
+    # Loaded models are forgotten after the keep alive
+    clock["now"] += load_balancer_module.LOADED_MODEL_TTL
+    assert load_balancer.select("llama3", [0, 1, 2]) in (0, 2)
+
+
+def test_affinity_keeps_chats_on_one_backend(load_balancer):
+    url_idx = load_balancer.select("llama3", [0, 1, 2], affinity_key="chat-1")
+    for _ in range(10):
+        assert load_balancer.select("llama3", [0, 1, 2], "chat-1") == url_idx
+
+    # Unless that backend is overloaded
+    for _ in range(3):
+        load_balancer.begin(url_idx)
+    assert load_balancer.select("llama3", [0, 1, 2], "chat-1") != url_idx
+
+
+def test_failing_backends_are_ejected_and_recover(load_balancer, clock):
+    for _ in range(2):
+        load_balancer.begin(0)
+        load_balancer.observe(0, clock["now"], error=True)
+        load_balancer.end(0)
+    load_balancer.begin(1)
+
+    # Ejected although it has the fewest outstanding requests
+    assert load_balancer.select("llama3", [0, 1]) == 1
+    assert load_balancer.get_metrics()["backends"]["http://a:11434"] == {
+        "url_idx": 0,
+        "in_flight": 0,
+        "requests": 2,
+        "errors": 2,
+        "consecutive_failures": 2,
+        "ewma_latency": None,
+        "ejected": True,
+    }
+    # Fail open when every candidate is ejected
+    assert load_balancer.select("llama3", [0, 2]) == 2
+    load_balancer.begin(2)
+    load_balancer.observe(2, clock["now"], error=True)
+    load_balancer.observe(2, clock["now"], error=True)
+    assert load_balancer.select("llama3", [0, 2]) in (0, 2)
+
+    # Tried again after the ejection time, and healthy after a success
+    clock["now"] += 30
+    assert load_balancer.select("llama3", [0, 1]) == 0
+    load_balancer.observe(0, clock["now"])
+    assert load_balancer.get_stats(0).consecutive_failures == 0
+    assert not load_balancer.get_metrics()["backends"]["http://a:11434"]["ejected"]
+
+
+def test_state_is_reset_when_urls_change(load_balancer):
+    load_balancer.begin(0)
+    load_balancer.mark_loaded("llama3", 0)
+
+    load_balancer.sync_urls(["http://a:11434", "http://b:11434", "http://c:11434"])
+    assert load_balancer.get_stats(0).in_flight == 1
+
+    load_balancer.sync_urls(["http://b:11434"])
+    assert load_balancer.stats == {}
+    assert load_balancer.loaded_models == {}
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import open_webui.routers.openai  # noqa: F401 (resolves the utils.models import cycle)
+from open_webui.test.util.fake_redis import AsyncFakeRedis
+from open_webui.utils import models as models_module
+from open_webui.utils.models import ModelCatalog
+
+
+def make_request(redis=None):
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                redis=redis,
+                config=SimpleNamespace(ENABLE_BASE_MODELS_CACHE=False),
+            )
+        )
+    )
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Counts discoveries; each one returns a new model list."""
+    upstream = SimpleNamespace(calls=[], delay=0)
+
+    async def get_all_base_models(request, **kwargs):
+        upstream.calls.append(kwargs)
+        await asyncio.sleep(upstream.delay)
+        idx = len(upstream.calls)
+        return [
+            {"id": f"gpt-{idx}", "urlIdx": 0},
+            {"id": f"llama-{idx}", "ollama": {"model": f"llama-{idx}"}},
+        ]
+
+    monkeypatch.setattr(models_module, "get_all_base_models", get_all_base_models)
+    return upstream
+
+
+def ids(models):
+    return [model["id"] for model in models]
+
+
+def test_stale_catalog_is_served_while_revalidating(upstream):
+    catalog = ModelCatalog(60)
+    request = make_request()
+
+    async def run():
+        assert ids(await catalog.get(request)) == ["gpt-1", "llama-1"]
+        assert ids(await catalog.get(request)) == ["gpt-1", "llama-1"]
+        assert len(upstream.calls) == 1
+
+        catalog.refreshed_at -= 60
+        # The stale catalog is returned at once and refreshed in the background
+        assert ids(await catalog.get(request)) == ["gpt-1", "llama-1"]
+        await catalog._sync_task
+        assert ids(await catalog.get(request)) == ["gpt-2", "llama-2"]
+
+    asyncio.run(run())
+    assert len(upstream.calls) == 2
+    # The catalog is shared, so it is never discovered for a user
+    assert all(call.get("user") is None for call in upstream.calls)
+    assert request.app.state.OPENAI_MODELS == {"gpt-2": {"id": "gpt-2", "urlIdx": 0}}
+    assert request.app.state.OLLAMA_MODELS == {"llama-2": {"model": "llama-2"}}
+
+
+def test_cold_start_waits_a_bounded_time(upstream, monkeypatch):
+    monkeypatch.setattr(models_module, "MODELS_CATALOG_COLD_START_TIMEOUT", 0.05)
+    upstream.delay = 0.5
+    catalog = ModelCatalog(60)
+    request = make_request()
+
+    async def run():
+        assert await catalog.get(request) == []
+        # Discovery goes on, and is shared with later requests
+        assert await catalog.get(request) == []
+        await catalog._refresh_task
+        return await catalog.get(request)
+
+    assert ids(asyncio.run(run())) == ["gpt-1", "llama-1"]
+    assert len(upstream.calls) == 1
+
+
+def test_shared_catalog_is_loaded_by_version(upstream):
+    redis = AsyncFakeRedis()
+    first, second = ModelCatalog(60), ModelCatalog(60)
+    first_request, second_request = make_request(redis), make_request(redis)
+
+    async def run():
+        await first.refresh(first_request)
+        assert await second.load_shared(second_request)
+        assert second.version == first.version == 1
+        assert ids(second.models) == ["gpt-1", "llama-1"]
+        # Nothing newer
+        assert not await second.load_shared(second_request)
+
+        await second.refresh(second_request)
+        assert await first.load_shared(first_request)
+        assert (first.version, ids(first.models)) == (2, ["gpt-2", "llama-2"])
+
+        # A catalog older than the version counter is ignored
+        redis.redis.data["open-webui:models:version"] = "5"
+        assert not await first.load_shared(first_request)
+        assert first.version == 2
+
+    asyncio.run(run())
+    assert len(upstream.calls) == 2
+    assert second_request.app.state.OLLAMA_MODELS == {"llama-2": {"model": "llama-2"}}
+
+
+def test_one_replica_refreshes_per_interval(upstream):
+    redis = AsyncFakeRedis()
+    first, second = ModelCatalog(60), ModelCatalog(60)
+    first_request, second_request = make_request(redis), make_request(redis)
+
+    async def run():
+        await first.sync(first_request)
+        assert len(upstream.calls) == 1
+
+        # Another replica picks up the fresh catalog instead of refreshing
+        await second.sync(second_request)
+        assert len(upstream.calls) == 1
+        assert ids(second.models) == ["gpt-1", "llama-1"]
+
+        # Stale everywhere, but the lock is held: no second upstream refresh
+        first.refreshed_at -= 60
+        second.refreshed_at -= 60
+        await first.sync(first_request)
+        await second.sync(second_request)
+        assert len(upstream.calls) == 1
+
+        # Once the lock expires the next replica refreshes
+        del redis.redis.data["open-webui:models:refresh_lock"]
+        await second.sync(second_request)
+        assert len(upstream.calls) == 2
+        assert await first.load_shared(first_request)
+
+        # Without Redis every replica refreshes on its own
+        redis.redis.down = True
+        await first.sync(first_request)
+        assert len(upstream.calls) == 3
+
+    asyncio.run(run())
@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+import open_webui.routers.openai  # noqa: F401 (resolves the utils.models import cycle)
+from open_webui.models.functions import FunctionMeta, FunctionModel
+from open_webui.models.models import ModelMeta, ModelModel, ModelParams
+from open_webui.utils import models as models_utils
+
+
+def make_function(id, type, is_global=False):
+    return FunctionModel(
+        id=id,
+        user_id="admin",
+        name=id,
+        type=type,
+        content="",
+        meta=FunctionMeta(description=f"{id} description", manifest={}),
+        is_active=True,
+        is_global=is_global,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+def make_custom_model(id, base_model_id=None, is_active=True, meta=None):
+    return ModelModel(
+        id=id,
+        user_id="admin",
+        base_model_id=base_model_id,
+        name=f"Custom {id}",
+        params=ModelParams(),
+        meta=ModelMeta(**(meta or {})),
+        access_control=None,
+        is_active=is_active,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+def make_request():
+    state = SimpleNamespace(
+        MODELS={},
+        BASE_MODELS=[],
+        redis=None,
+        config=SimpleNamespace(
+            ENABLE_BASE_MODELS_CACHE=False,
+            ENABLE_EVALUATION_ARENA_MODELS=False,
+        ),
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=state))
+
+
+class TestGetAllModels:
+    """Catalog build over a synthetic 1,000 model catalog"""
+
+    NUM_MODELS = 1000
+    NUM_CUSTOM_MODELS = 400
+    NUM_FUNCTIONS = 20
+
+    def build_fixtures(self):
+        base_models = [
+            {"id": f"model-{i}:latest", "name": f"model-{i}", "owned_by": "ollama"}
+            for i in range(self.NUM_MODELS)
+        ]
+
+        functions = [
+            make_function(f"action-{i}", "action", is_global=i == 0)
+            for i in range(self.NUM_FUNCTIONS // 2)
+        ] + [
+            make_function(f"filter-{i}", "filter", is_global=i == 0)
+            for i in range(self.NUM_FUNCTIONS // 2)
+        ]
+
+        custom_models = [
+            make_custom_model(
+                f"model-{i}",
+                meta={"actionIds": ["action-1"], "filterIds": ["filter-1"]},
+            )
+            for i in range(self.NUM_CUSTOM_MODELS)
+        ]
+        custom_models += [
+            make_custom_model("preset", base_model_id="model-1"),
+            make_custom_model(f"model-{self.NUM_MODELS - 1}", is_active=False),
+        ]
+
+        module = SimpleNamespace(toggle=True)
+        return base_models, functions, custom_models, module
+
+    @pytest.mark.asyncio
+    async def test_get_all_models_indexes_and_bulk_loads(self):
+        base_models, functions, custom_models, module = self.build_fixtures()
+
+        functions_table = Mock()
+        functions_table.get_functions_by_types.return_value = functions
+        models_table = Mock()
+        models_table.get_all_models.return_value = custom_models
+        get_module = Mock(return_value=(module, None, None))
+
+        with (
+            patch.object(models_utils, "Functions", functions_table),
+            patch.object(models_utils, "Models", models_table),
+            patch.object(models_utils, "get_function_module_from_cache", get_module),
+            patch.object(
+                models_utils,
+                "get_all_base_models",
+                AsyncMock(return_value=base_models),
+            ),
+            patch.object(models_utils.model_catalog, "refresh_interval", 0),
+        ):
+            models = await models_utils.get_all_models(make_request())
+
+        # Single bulk load of custom models and functions, one module lookup
+        # per referenced function, whatever the number of models
+        models_table.get_all_models.assert_called_once()
+        models_table.get_model_by_id.assert_not_called()
+        functions_table.get_functions_by_type.assert_not_called()
+        functions_table.get_function_by_id.assert_not_called()
+        functions_table.get_functions_by_types.assert_called_once()
+        assert get_module.call_count == 4
+
+        models_by_id = {model["id"]: model for model in models}
+        assert len(models) == self.NUM_MODELS  # one removed, one preset added
+        assert f"model-{self.NUM_MODELS - 1}:latest" not in models_by_id
+
+        custom = models_by_id["model-0:latest"]
+        assert custom["name"] == "Custom model-0"
+        assert [action["id"] for action in custom["actions"]] == [
+            "action-1",
+            "action-0",
+        ]
+        assert [f["id"] for f in custom["filters"]] == ["filter-1", "filter-0"]
+
+        preset = models_by_id["preset"]
+        assert preset["owned_by"] == "ollama"
+        assert [action["id"] for action in preset["actions"]] == ["action-0"]
+
+        plain = models_by_id[f"model-{self.NUM_MODELS - 2}:latest"]
+        assert plain["name"] == f"model-{self.NUM_MODELS - 2}"
+        assert [action["id"] for action in plain["actions"]] == ["action-0"]
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.routers.openai import JSONStreamFramer, stream_json_response_as_sse
+from open_webui.test.util.benchmark import benchmark
+
+
+class FakeStreamReader:
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def iter_any(self):
+        for i in range(0, len(self.data), self.chunk_size):
+            yield self.data[i : i + self.chunk_size]
+
+
+def make_response(data: bytes, chunk_size: int = 1024):
+    return SimpleNamespace(content=FakeStreamReader(data, chunk_size))
+
+
+async def collect(data: bytes, chunk_size: int = 1024) -> list[bytes]:
+    return [
+        event
+        async for event in stream_json_response_as_sse(make_response(data, chunk_size))
+    ]
+
+
+def parse_events(events: list[bytes]) -> list:
+    assert all(event.startswith(b"data: ") for event in events)
+    assert all(event.endswith(b"\n\n") for event in events)
+    assert all(event.count(b"\n") == 2 for event in events)
+    return [
+        (
+            event[len(b"data: ") : -2].decode()
+            if event == b"data: [DONE]\n\n"
+            else json.loads(event[len(b"data: ") :])
+        )
+        for event in events
+    ]
+
+
+def make_chunk(i: int, content: str = "Hello") -> dict:
+    return {
+        "id": f"chatcmpl-{i}",
+        "object": "chat.completion.chunk",
+        "choices": [{"index": 0, "delta": {"content": content}}],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+async def test_frames_concatenated_json(chunk_size):
+    values = [
+        make_chunk(0, 'brace } and [bracket] in "quotes" \\ '),
+        make_chunk(1, "naïve ✓ \n multi-line"),
+        [1, {"nested": [2, 3]}],
+    ]
+    data = (
+        json.dumps(values[0]).encode()
+        + json.dumps(values[1], ensure_ascii=False, indent=2).encode()
+        + b"\r\n  "
+        + json.dumps(values[2]).encode()
+        + b"\n[DONE]\n[DONE]"
+    )
+
+    events = await collect(data, chunk_size)
+    assert parse_events(events) == values + ["[DONE]"]
+
+
+@pytest.mark.asyncio
+async def test_skips_garbage_and_incomplete_values():
+    data = b'noise {"a": 1} , {"b": [2' + b"]}" + b' {"c": "unterminated'
+
+    events = await collect(data, 4)
+    assert parse_events(events) == [{"a": 1}, {"b": [2]}, "[DONE]"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+async def test_passes_scalars_through(chunk_size):
+    data = b'"a \\"quoted\\" [string]" 42 -1.5e3 true false null {"a": 1} 7'
+
+    events = await collect(data, chunk_size)
+    assert parse_events(events) == [
+        'a "quoted" [string]',
+        42,
+        -1.5e3,
+        True,
+        False,
+        None,
+        {"a": 1},
+        7,
+        "[DONE]",
+    ]
+
+
+def test_framer_keeps_partial_value_only():
+    framer = JSONStreamFramer()
+    assert framer.feed(b'{"a": 1}{"b": "x\\') == [b'{"a": 1}']
+    # The completed value was dropped, the partial one is kept as is
+    assert bytes(framer.buffer) == b'{"b": "x\\'
+    assert framer.feed(b'"}"}') == [b'{"b": "x\\"}"}']
+    assert not framer.buffer
+
+
+@benchmark
+class TestStreamThroughput:
+    """Re-framing throughput over 10 MB streams"""
+
+    SIZE = 10 * 1024 * 1024
+
+    def build_many_small(self) -> bytes:
+        chunks = []
+        size = 0
+        i = 0
+        while size < self.SIZE:
+            chunk = json.dumps(make_chunk(i, "token ")).encode()
+            chunks.append(chunk)
+            size += len(chunk)
+            i += 1
+        return b"\n".join(chunks) + b"\n[DONE]"
+
+    def build_single_large(self) -> bytes:
+        return json.dumps(make_chunk(0, "x" * self.SIZE)).encode()
+
+    async def measure(self, data: bytes, chunk_size: int) -> tuple[int, float]:
+        start = time.perf_counter()
+        count = 0
+        async for _ in stream_json_response_as_sse(make_response(data, chunk_size)):
+            count += 1
+        return count, time.perf_counter() - start
+
+    @pytest.mark.asyncio
+    async def test_many_small_objects(self):
+        data = self.build_many_small()
+        count, elapsed = await self.measure(data, 1024)
+
+        print(f"10 MB of small objects: {len(data) / elapsed / 1e6:.1f} MB/s")
+        assert count == data.count(b"\n") + 1
+
+    @pytest.mark.asyncio
+    async def test_single_large_object(self):
+        data = self.build_single_large()
+        count, elapsed = await self.measure(data, 1024)
+
+        print(f"10 MB single object: {len(data) / elapsed / 1e6:.1f} MB/s")
+        assert count == 2
@@ -0,0 +1,137 @@
+import os
+import time
+
+import pytest
+from fpdf import FPDF
+from langchain_community.document_loaders import PyPDFLoader
+
+from open_webui.retrieval.loaders import pdf
+from open_webui.retrieval.loaders.main import Loader
+from open_webui.retrieval.loaders.pdf import (
+    ParallelPyPDFLoader,
+    get_process_pool,
+    merge_text_and_extras,
+    purge_metadata,
+    reset_process_pool,
+)
+from open_webui.test.util.benchmark import benchmark
+
+
+def make_pdf(path, pages: int, lines: int = 20):
+    pdf = FPDF()
+    pdf.set_font("helvetica", size=10)
+    for page in range(pages):
+        pdf.add_page()
+        for line in range(lines):
+            pdf.cell(0, 8, f"Page {page} line {line}: the court finds the motion moot")
+            pdf.ln()
+    pdf.output(str(path))
+    return str(path)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def process_pool():
+    yield
+    reset_process_pool()
+
+
+def test_matches_pypdf_loader(tmp_path):
+    file_path = make_pdf(tmp_path / "archive.pdf", 23, lines=3)
+    expected = Loader().load("archive.pdf", "application/pdf", file_path)
+
+    progress = []
+    docs = Loader(PDF_LOADER_WORKERS=2, PDF_LOADER_PAGES_PER_SHARD=5).load(
+        "archive.pdf",
+        "application/pdf",
+        file_path,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert [doc.page_content for doc in docs] == [doc.page_content for doc in expected]
+    assert [doc.metadata for doc in docs] == [doc.metadata for doc in expected]
+    assert [doc.metadata["page"] for doc in docs] == list(range(23))
+    # One report per page range, in whatever order they complete
+    assert len(progress) == 5 and progress[-1] == (23, 23)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_small_pdf_is_extracted_in_process(tmp_path, monkeypatch):
+    file_path = make_pdf(tmp_path / "small.pdf", 3, lines=2)
+    monkeypatch.setattr(
+        "open_webui.retrieval.loaders.pdf.get_process_pool",
+        lambda *args: pytest.fail("no pool for a single page range"),
+    )
+
+    docs = ParallelPyPDFLoader(file_path, max_workers=4, pages_per_shard=10).load()
+    assert [doc.metadata["page"] for doc in docs] == [0, 1, 2]
+
+
+def test_merge_text_and_extras():
+    # Before the last paragraph, or the one before it when that is a footer
+    assert merge_text_and_extras(["img"], "a\n\nb") == "a\n\nimg\n\nb"
+    assert merge_text_and_extras(["img"], "a\n\nb\n\nc") == "a\n\nimg\n\nb\n\nc"
+    assert merge_text_and_extras(["img", ""], "a b") == "a b\n\nimg"
+    assert merge_text_and_extras([], "a b") == "a b"
+
+
+def test_purge_metadata():
+    assert purge_metadata(
+        {
+            "/Producer": " PyPDF ",
+            "/CreationDate": "D:20240101120000+01'00'",
+            "/ModDate": "unknown",
+            "page_count": 3,
+            "/Trapped": True,
+        }
+    ) == {
+        "producer": "PyPDF",
+        "creationdate": "2024-01-01T12:00:00+01:00",
+        "moddate": "unknown",
+        "total_pages": 3,
+        "page_count": 3,
+        "trapped": "True",
+    }
+
+
+def test_resizing_the_pool_lets_running_loads_finish():
+    old = get_process_pool(1)
+    futures = [old.submit(pow, 2, exponent) for exponent in range(4)]
+
+    new = get_process_pool(2)
+    assert new is not old
+    assert [future.result(timeout=60) for future in futures] == [1, 2, 4, 8]
+
+
+def test_late_reset_keeps_the_new_pool():
+    broken = get_process_pool(2)
+    reset_process_pool(broken)
+    replacement = get_process_pool(2)
+
+    # A load still holding the broken pool reports it after it was replaced
+    reset_process_pool(broken)
+    assert pdf._process_pool is replacement
+    assert get_process_pool(2) is replacement
+
+
+@benchmark
+def test_benchmark(tmp_path):
+    file_path = make_pdf(tmp_path / "large.pdf", 600)
+    workers = max(2, min(os.cpu_count() or 1, 4))
+
+    start = time.perf_counter()
+    expected = Loader().load("large.pdf", "application/pdf", file_path)
+    serial = time.perf_counter() - start
+
+    # Timed with the pool already started, as in a running server
+    loader = ParallelPyPDFLoader(file_path, max_workers=workers, pages_per_shard=50)
+    loader.load()
+
+    start = time.perf_counter()
+    docs = loader.load()
+    parallel = time.perf_counter() - start
+
+    print(
+        f"\n600 pages: serial {serial:.2f} s,"
+        f" {workers} workers {parallel:.2f} s on {os.cpu_count()} CPUs"
+    )
+    assert [doc.page_content for doc in docs] == [doc.page_content for doc in expected]
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils import plugin
+from open_webui.utils.plugin import PluginVersion, get_plugin_module_from_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        plugin,
+        "time",
+        SimpleNamespace(time=lambda: clock.now, monotonic=lambda: clock.now),
+    )
+    monkeypatch.setattr(plugin, "PLUGIN_MODULE_CACHE_CHECK_INTERVAL", 5)
+    return clock
+
+
+class FakeFunctions:
+    """Function table recording which queries the cache makes."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.function = SimpleNamespace(content="x = 1", updated_at=990)
+        self.calls = []
+        self.loads = []
+
+    def update(self, content=None):
+        if content is not None:
+            self.function.content = content
+        self.function.updated_at = int(self.clock.now)
+
+    def get_updated_at(self, id):
+        self.calls.append("updated_at")
+        return self.function.updated_at if self.function else None
+
+    def get(self, id):
+        self.calls.append("get")
+        return self.function
+
+    def load(self, id, content):
+        self.loads.append(content)
+        return SimpleNamespace(content=content), "filter", {}
+
+    def get_module(self, request):
+        module, _ = get_plugin_module_from_cache(
+            request,
+            "f1",
+            "Function",
+            "FUNCTIONS",
+            "FUNCTION_VERSIONS",
+            get_updated_at=self.get_updated_at,
+            get_plugin=self.get,
+            update_plugin=lambda id, form: None,
+            load_module=self.load,
+        )
+        return module
+
+
+@pytest.fixture
+def functions(clock):
+    return FakeFunctions(clock)
+
+
+@pytest.fixture
+def request_():
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+
+def test_module_is_trusted_during_the_check_interval(functions, clock, request_):
+    module = functions.get_module(request_)
+    assert functions.calls == ["get"]
+
+    clock.now += 4
+    assert functions.get_module(request_) is module
+    assert functions.calls == ["get"]
+
+    # Then only updated_at is polled while it doesn't change
+    clock.now += 1
+    assert functions.get_module(request_) is module
+    assert functions.calls == ["get", "updated_at"]
+    clock.now += 4
+    functions.get_module(request_)
+    assert functions.calls == ["get", "updated_at"]
+    assert functions.loads == ["x = 1"]
+
+
+def test_edits_invalidate_the_module(functions, clock, request_):
+    module = functions.get_module(request_)
+
+    # Valves or metadata edits: the source is read again but not re-executed
+    clock.now += 10
+    functions.update()
+    clock.now += 5
+    assert functions.get_module(request_) is module
+    assert functions.calls == ["get", "updated_at", "get"]
+
+    clock.now += 10
+    functions.update("x = 2")
+    clock.now += 5
+    assert functions.get_module(request_).content == "x = 2"
+    assert functions.loads == ["x = 1", "x = 2"]
+    assert request_.app.state.FUNCTIONS["f1"].content == "x = 2"
+
+
+def test_update_in_the_second_of_the_last_read_is_not_missed(
+    functions, clock, request_
+):
+    functions.get_module(request_)
+    # Edited in the same second the source was read: same updated_at
+    functions.update("x = 2")
+    version = request_.app.state.FUNCTION_VERSIONS["f1"]
+    assert not version.is_unchanged(functions.function.updated_at)
+
+    clock.now += 5
+    assert functions.get_module(request_).content == "x = 2"
+
+
+def test_deleted_functions_are_not_served(functions, clock, request_):
+    functions.get_module(request_)
+    functions.function = None
+
+    clock.now += 5
+    with pytest.raises(Exception, match="Function not found: f1"):
+        functions.get_module(request_)
+
+
+def test_plugin_version(clock):
+    version = PluginVersion(990, "hash")
+    assert version.is_fresh()
+    assert version.is_unchanged(990)
+    assert not version.is_unchanged(991)
+    assert not version.is_unchanged(None)
+
+    clock.now += 5
+    assert not version.is_fresh()
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from open_webui.models.groups import GroupModel, Groups
+from open_webui.test.util.fake_redis import FakeRedis, wait_for
+from open_webui.utils import access_control, cache
+from open_webui.utils.cache import SharedVersion, TTLCache
+
+
+def make_group(id, permissions=None):
+    return GroupModel(
+        id=id,
+        user_id="admin",
+        name=id,
+        description="",
+        permissions=permissions,
+        user_ids=[],
+        created_at=0,
+        updated_at=0,
+    )
+
+
+@pytest.fixture
+def memberships():
+    return {"u1": [make_group("g1", {"chat": {"delete": True}})]}
+
+
+@pytest.fixture
+def lookups(monkeypatch, memberships):
+    lookups = []
+
+    def get_groups_by_member_id(user_id):
+        lookups.append(user_id)
+        return memberships.get(user_id, [])
+
+    monkeypatch.setattr(Groups, "get_groups_by_member_id", get_groups_by_member_id)
+    monkeypatch.setattr(Groups, "version", SharedVersion("groups"))
+    monkeypatch.setattr(access_control, "_principal_cache", TTLCache("principals", 10))
+    return lookups
+
+
+def test_principal_is_cached(lookups):
+    assert access_control.get_principal("u1").group_ids == {"g1"}
+    assert access_control.get_principal("u1").group_ids == {"g1"}
+    assert access_control.get_permissions("u1", {"chat": {"delete": False}}) == {
+        "chat": {"delete": True}
+    }
+    assert lookups == ["u1"]
+
+    access_control.get_principal("u2")
+    assert lookups == ["u1", "u2"]
+
+
+def test_principal_cache_is_bounded(lookups, monkeypatch):
+    monkeypatch.setattr(
+        access_control, "_principal_cache", TTLCache("principals", 10, maxsize=2)
+    )
+    for user_id in ("u1", "u2", "u3", "u1"):
+        access_control.get_principal(user_id)
+
+    # u1 was evicted by u3
+    assert lookups == ["u1", "u2", "u3", "u1"]
+    assert access_control.get_principal("u1").group_ids == {"g1"}
+    assert lookups == ["u1", "u2", "u3", "u1"]
+
+
+def test_group_change_invalidates_principal(lookups, memberships):
+    token = access_control.start_principal_scope()
+    try:
+        assert access_control.get_principal("u1").group_ids == {"g1"}
+
+        memberships["u1"] = [make_group("g1"), make_group("g2")]
+        Groups.bump_version()
+
+        # Also within the request that made the change
+        assert access_control.get_principal("u1").group_ids == {"g1", "g2"}
+        assert lookups == ["u1", "u1"]
+    finally:
+        access_control.end_principal_scope(token)
+
+
+def test_principal_expires_after_ttl(lookups, monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    access_control.get_principal("u1")
+
+    now += 9
+    access_control.get_principal("u1")
+    assert lookups == ["u1"]
+
+    now += 2
+    access_control.get_principal("u1")
+    assert lookups == ["u1", "u1"]
+
+    # Without a TTL, principals are only reused within a request
+    access_control._principal_cache.ttl = 0
+    access_control.get_principal("u1")
+    access_control.get_principal("u1")
+    assert lookups == ["u1"] * 4
+
+
+def test_version_is_shared_through_redis():
+    redis = FakeRedis()
+    first = SharedVersion("groups", redis)
+    second = SharedVersion("groups", redis)
+
+    version = second.get()
+    first.bump()
+    wait_for(lambda: second.get() != version)
+
+    # A dropped subscription triggers a resync
+    version = second.get()
+    redis.disconnect()
+    redis.incr("open-webui:groups:version")
+    wait_for(lambda: second.get() != version)
+
+
+def test_version_is_local_when_redis_is_down():
+    redis = FakeRedis()
+    version = SharedVersion("groups", redis)
+    before = version.get()
+
+    redis.down = True
+    version.bump()
+    assert version.get() != before
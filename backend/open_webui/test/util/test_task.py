@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+import pytest
+
+from open_webui.config import DEFAULT_CHAT_METADATA_GENERATION_PROMPT_TEMPLATE
+from open_webui.utils.task import (
+    TaskResponseCache,
+    TaskSupersededError,
+    chat_metadata_generation_template,
+    parse_chat_metadata_response,
+    truncate_messages_by_token_budget,
+)
+
+
+def make_response(content):
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+def test_truncate_messages_by_token_budget():
+    messages = [
+        {"role": "user", "content": "word " * 500},
+        {"role": "assistant", "content": "word " * 500},
+        {"role": "user", "content": "short question"},
+    ]
+
+    truncated = truncate_messages_by_token_budget(messages, 700)
+    assert truncated == messages[1:]
+
+    # A single message over the budget is cut rather than dropped
+    truncated = truncate_messages_by_token_budget(messages[:1], 50)
+    assert len(truncated) == 1
+    assert len(truncated[0]["content"]) < len(messages[0]["content"])
+
+    assert truncate_messages_by_token_budget(messages, 0) == messages
+
+
+def test_chat_metadata_generation_template():
+    content = chat_metadata_generation_template(
+        DEFAULT_CHAT_METADATA_GENERATION_PROMPT_TEMPLATE,
+        [{"role": "user", "content": "How do I bake bread?"}],
+        ["title", "follow_ups"],
+    )
+
+    assert '- "title":' in content and '- "follow_ups":' in content
+    assert '"tags"' not in content
+    assert "USER: How do I bake bread?" in content
+
+
+def test_parse_chat_metadata_response_keeps_valid_fields():
+    fields = ["title", "tags", "follow_ups"]
+    response = make_response(
+        "Sure! "
+        + json.dumps(
+            {"title": " 🍞 Bread Baking ", "tags": "Cooking", "follow_ups": []}
+        )
+    )
+
+    # Malformed tags are left out, to be generated separately
+    assert parse_chat_metadata_response(response, fields) == {
+        "title": "🍞 Bread Baking",
+        "follow_ups": [],
+    }
+    assert parse_chat_metadata_response(make_response("not json"), fields) == {}
+    assert parse_chat_metadata_response(None, fields) == {}
+
+
+class TestTaskResponseCache:
+    @pytest.mark.asyncio
+    async def test_caches_and_deduplicates(self):
+        cache = TaskResponseCache(ttl=60)
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return make_response("😀")
+
+        key = cache.get_key("emoji_generation", "model", "user", "Hello  world")
+        same_key = cache.get_key("emoji_generation", "model", "user", " Hello world")
+        other_user_key = cache.get_key("emoji_generation", "model", "other", "Hello")
+        assert key == same_key and key != other_user_key
+
+        responses = await asyncio.gather(
+            cache.get_or_generate(key, generate), cache.get_or_generate(key, generate)
+        )
+        assert responses[0] == responses[1] == make_response("😀")
+        assert await cache.get_or_generate(key, generate) == make_response("😀")
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_newer_request_supersedes_session(self):
+        cache = TaskResponseCache(ttl=60)
+
+        async def generate(content, delay):
+            await asyncio.sleep(delay)
+            return make_response(content)
+
+        first = asyncio.create_task(
+            cache.get_or_generate(
+                "a", lambda: generate("Hel", 1), session_key="user:chat"
+            )
+        )
+        await asyncio.sleep(0)
+        second = await cache.get_or_generate(
+            "b", lambda: generate("Hello", 0), session_key="user:chat"
+        )
+
+        assert second == make_response("Hello")
+        with pytest.raises(TaskSupersededError):
+            await first
+        # The cancelled response is not cached
+        assert cache.cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_cached_response_supersedes_session(self):
+        cache = TaskResponseCache(ttl=60)
+
+        async def generate(content, delay):
+            await asyncio.sleep(delay)
+            return make_response(content)
+
+        await cache.get_or_generate("b", lambda: generate("Hello", 0))
+
+        first = asyncio.create_task(
+            cache.get_or_generate(
+                "a", lambda: generate("Hel", 1), session_key="user:chat"
+            )
+        )
+        await asyncio.sleep(0)
+        stale = cache.pending["a"]
+        # Served from the cache, and still cancels the stale request
+        second = await cache.get_or_generate(
+            "b", lambda: generate("Hello", 1), session_key="user:chat"
+        )
+
+        assert second == make_response("Hello")
+        with pytest.raises(TaskSupersededError):
+            await first
+        assert stale.cancelled()
+        assert cache.latest == {} and cache.pending == {}
+
+    @pytest.mark.asyncio
+    async def test_shared_call_is_not_cancelled_for_other_sessions(self):
+        cache = TaskResponseCache(ttl=60)
+        calls = []
+
+        async def generate(content, delay):
+            calls.append(content)
+            await asyncio.sleep(delay)
+            return make_response(content)
+
+        first = asyncio.create_task(
+            cache.get_or_generate(
+                "a", lambda: generate("Hel", 0.05), session_key="user:chat-1"
+            )
+        )
+        other = asyncio.create_task(
+            cache.get_or_generate(
+                "a", lambda: generate("Hel", 0.05), session_key="user:chat-2"
+            )
+        )
+        await asyncio.sleep(0)
+        await cache.get_or_generate(
+            "b", lambda: generate("Hello", 0), session_key="user:chat-1"
+        )
+
+        # Only the superseded session is detached from the shared call
+        with pytest.raises(TaskSupersededError):
+            await first
+        assert await other == make_response("Hel")
+        assert calls == ["Hel", "Hello"]
+        assert cache.cache.get("a") == make_response("Hel")
+        assert cache.waiters == {}
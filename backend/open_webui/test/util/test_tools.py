@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.utils.tools import (
+    ToolServerSpecCache,
+    convert_openapi_to_tool_payload,
+    get_tool_servers_data,
+    resolve_schema,
+    tool_server_specs,
+)
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Notes", "description": "Notes API"},
+    "paths": {
+        "/notes": {
+            "post": {
+                "operationId": "create_note",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Note"}
+                        }
+                    }
+                },
+            }
+        },
+        "/notes/batch": {
+            "post": {
+                "operationId": "create_notes",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "array",
+                                "items": {"$ref": "#/components/schemas/Note"},
+                            }
+                        }
+                    }
+                },
+            }
+        },
+    },
+    "components": {
+        "schemas": {
+            "Note": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "parent": {"$ref": "#/components/schemas/Note"},
+                },
+                "required": ["title"],
+            }
+        }
+    },
+}
+
+
+class SpecServer:
+    def __init__(self):
+        self.body = json.dumps(SPEC)
+        self.etag = '"v1"'
+        self.requests = []
+        self.fail = False
+
+    async def handle(self, request):
+        self.requests.append(request.headers.get("If-None-Match"))
+        await asyncio.sleep(0.05)
+        if self.fail:
+            return web.json_response({"detail": "down"}, status=503)
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        return web.Response(
+            text=self.body,
+            content_type="application/json",
+            headers={"ETag": self.etag},
+        )
+
+
+@pytest_asyncio.fixture
+async def spec_server():
+    spec_server = SpecServer()
+    app = web.Application()
+    app.router.add_get("/openapi.json", spec_server.handle)
+    server = TestServer(app)
+    await server.start_server()
+    spec_server.url = str(server.make_url("/openapi.json"))
+    yield spec_server
+    await server.close()
+
+
+class TestToolServerSpecCache:
+    @pytest.mark.asyncio
+    async def test_conditional_revalidation(self, spec_server):
+        cache = ToolServerSpecCache(ttl=300)
+
+        # Concurrent lookups share one download
+        first, second = await asyncio.gather(
+            cache.get("key", spec_server.url), cache.get("key", spec_server.url)
+        )
+        assert first is second
+        assert spec_server.requests == [None]
+
+        # Within the TTL no request is made; past it, a 304 keeps the payload
+        payload = first.payload
+        assert await cache.get("key", spec_server.url) is first
+        entry = await cache.get("key", spec_server.url, max_age=0)
+        assert entry is first and entry.payload is payload
+        assert spec_server.requests == [None, '"v1"']
+
+        # A new version is parsed again
+        spec_server.body = json.dumps({**SPEC, "paths": {}})
+        spec_server.etag = '"v2"'
+        entry = await cache.get("key", spec_server.url, max_age=0)
+        assert entry is not first and entry.payload == []
+
+        # Failed revalidation serves the last good spec, unless asked not to
+        spec_server.fail = True
+        assert await cache.get("key", spec_server.url, max_age=0) is entry
+        with pytest.raises(Exception):
+            await cache.get("key", spec_server.url, max_age=0, stale_if_error=False)
+
+    @pytest.mark.asyncio
+    async def test_get_tool_servers_data(self, spec_server):
+        servers = [
+            {
+                "url": spec_server.url.rsplit("/", 1)[0],
+                "path": "openapi.json",
+                "config": {"enable": True},
+                "info": {"id": "notes", "name": "My Notes"},
+            }
+        ]
+
+        results = await get_tool_servers_data(servers)
+        results = await get_tool_servers_data(servers)
+
+        assert len(spec_server.requests) == 1
+        assert results[0]["openapi"]["info"]["title"] == "My Notes"
+        assert [spec["name"] for spec in results[0]["specs"]] == [
+            "create_note",
+            "create_notes",
+        ]
+        # The cached spec itself is not modified by the overrides
+        entry = next(iter(tool_server_specs.entries.values()))
+        assert entry.spec["info"]["title"] == "Notes"
+
+
+def test_convert_openapi_to_tool_payload_resolves_recursive_refs():
+    create_note, create_notes = convert_openapi_to_tool_payload(SPEC)
+
+    assert create_note["parameters"]["required"] == ["title"]
+    # The self reference stops at its first recursion
+    assert create_note["parameters"]["properties"]["parent"] == {}
+
+    assert create_notes["parameters"]["type"] == "array"
+    assert create_notes["parameters"]["items"]["properties"]["title"] == {
+        "type": "string"
+    }
+
+
+def test_resolved_refs_are_not_shared():
+    components = SPEC["components"]
+    resolved_refs = {}
+    schema = {"$ref": "#/components/schemas/Note"}
+
+    first = resolve_schema(schema, components, resolved_refs)
+    first["required"].append("parent")
+    first["properties"]["title"]["type"] = "integer"
+
+    # A memo hit must not see changes made to an earlier result, nor the spec
+    second = resolve_schema(schema, components, resolved_refs)
+    assert second["required"] == ["title"]
+    assert second["properties"]["title"] == {"type": "string"}
+    assert components["schemas"]["Note"]["required"] == ["title"]
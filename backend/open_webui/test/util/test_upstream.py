@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from fastapi.testclient import TestClient
+
+from open_webui.models.users import UserModel
+from open_webui.test.util.test_document_loaders import FakeServer
+from open_webui.utils.upstream import UpstreamSessions
+
+METRICS_KEYS = {
+    "open",
+    "active_connections",
+    "idle_connections",
+    "requests",
+    "errors",
+    "connections_created",
+    "connections_reused",
+    "dns_cache_hits",
+    "dns_cache_misses",
+    "last_error",
+    "created_at",
+}
+
+
+@pytest.fixture
+def server():
+    async def ok(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/{name}", ok)
+    with FakeServer(app) as server:
+        yield server
+
+
+def test_sessions_are_reused_per_upstream(server):
+    upstreams = UpstreamSessions()
+    port = server.url.rsplit(":", 1)[1]
+
+    async def run():
+        session = upstreams.get_session(f"{server.url}/api/tags")
+        assert upstreams.get_session(f"{server.url.upper()}/v1/models") is session
+        other = upstreams.get_session(f"http://localhost:{port}/api/tags")
+        assert other is not session
+
+        for name in ("tags", "version"):
+            async with session.get(f"{server.url}/{name}") as response:
+                assert await response.json() == {"ok": True}
+
+        metrics = upstreams.get_metrics()[server.url]
+        await upstreams.close()
+        return metrics, session, other
+
+    metrics, session, other = asyncio.run(run())
+
+    assert metrics["requests"] == 2
+    assert metrics["connections_created"] == 1
+    assert metrics["connections_reused"] == 1
+    assert metrics["idle_connections"] == 1
+    # Closed on shutdown
+    assert session.closed and other.closed
+    assert upstreams.sessions == {}
+    assert upstreams.get_metrics()[server.url]["open"] is False
+
+
+def test_sessions_are_recreated_on_a_new_loop(server):
+    upstreams = UpstreamSessions()
+
+    async def get_session():
+        return upstreams.get_session(server.url)
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+    assert first is not second
+
+
+def test_errors_are_counted():
+    upstreams = UpstreamSessions()
+
+    async def run():
+        session = upstreams.get_session("http://127.0.0.1:1")
+        with pytest.raises(Exception):
+            await session.get("http://127.0.0.1:1/api/tags")
+        await upstreams.close()
+
+    asyncio.run(run())
+    metrics = upstreams.get_metrics()["http://127.0.0.1:1"]
+    assert metrics["errors"] == 1
+    assert metrics["last_error"]
+
+
+def make_user(role):
+    return UserModel(
+        id="u1",
+        name="User",
+        email="user@example.com",
+        role=role,
+        profile_image_url="",
+        last_active_at=0,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+def test_metrics_endpoint_is_admin_only(server, monkeypatch):
+    from open_webui.main import app
+    from open_webui.utils.auth import get_current_user
+
+    upstreams = UpstreamSessions()
+    monkeypatch.setattr(app.state, "upstreams", upstreams, raising=False)
+
+    async def request_upstream():
+        async with upstreams.get_session(server.url).get(f"{server.url}/tags"):
+            pass
+        await upstreams.close()
+
+    asyncio.run(request_upstream())
+
+    client = TestClient(app)
+    try:
+        app.dependency_overrides[get_current_user] = lambda: make_user("user")
+        assert client.get("/api/connections/metrics").status_code == 401
+
+        app.dependency_overrides[get_current_user] = lambda: make_user("admin")
+        response = client.get("/api/connections/metrics")
+    finally:
+        app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    metrics = response.json()
+    assert list(metrics) == [server.url]
+    assert set(metrics[server.url]) == METRICS_KEYS
+    assert metrics[server.url]["requests"] == 1
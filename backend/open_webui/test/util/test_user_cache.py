@@ -0,0 +1,137 @@
+import pytest
+
+from open_webui.models import users
+from open_webui.models.users import UserModel, UsersTable
+from open_webui.test.util.fake_redis import FakeRedis, wait_for
+from open_webui.utils import cache
+from open_webui.utils.cache import TTLCache
+
+
+def make_user(role="user", api_key=None):
+    return UserModel(
+        id="u1",
+        name="User",
+        email="user@example.com",
+        role=role,
+        profile_image_url="",
+        api_key=api_key,
+        last_active_at=0,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+def test_entries_expire(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    users_cache = TTLCache("user", 10, maxsize=2)
+
+    users_cache.set("u1", {"role": "user"})
+    assert users_cache.get("u1") == {"role": "user"}
+    # Every get is a copy
+    users_cache.get("u1")["role"] = "admin"
+    assert users_cache.get("u1") == {"role": "user"}
+
+    now += 10
+    assert users_cache.get("u1") is None
+
+    # The oldest entry makes room for new ones
+    for key in ("u1", "u2", "u3"):
+        users_cache.set(key, key)
+    assert [users_cache.get(key) for key in ("u1", "u2", "u3")] == [None, "u2", "u3"]
+
+    assert TTLCache("user", 0).get("u1") is None
+
+
+def test_deletes_reach_other_replicas():
+    redis = FakeRedis()
+    first = TTLCache("user", 60, redis)
+    second = TTLCache("user", 60, redis)
+
+    first.set("u1", {"role": "admin"})
+    assert second.get("u1") == {"role": "admin"}
+    wait_for(lambda: "open-webui:user:invalidate" in redis.subscribers)
+    assert len(redis.subscribers["open-webui:user:invalidate"]) == 1
+
+    first.delete("u1")
+    wait_for(lambda: "u1" not in second._entries)
+    assert second.get("u1") is None
+
+
+def test_redis_errors_are_cache_misses():
+    redis = FakeRedis()
+    users_cache = TTLCache("user", 60, redis)
+    redis.down = True
+
+    users_cache.set("u1", "user")
+    users_cache.delete("u1")
+    assert users_cache.get("u1") is None
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    """Two UsersTable instances sharing Redis, as on two replicas."""
+    monkeypatch.setattr(users, "USER_CACHE_TTL", 60)
+    redis = FakeRedis()
+    monkeypatch.setattr(users, "get_cache_redis", lambda: redis)
+
+    database = {"user": make_user(api_key="sk-1"), "lookups": 0}
+
+    def get_user_by_id(self, id):
+        database["lookups"] += 1
+        return database["user"]
+
+    def get_user_by_api_key(self, api_key):
+        database["lookups"] += 1
+        user = database["user"]
+        return user if user and user.api_key == api_key else None
+
+    monkeypatch.setattr(UsersTable, "get_user_by_id", get_user_by_id)
+    monkeypatch.setattr(UsersTable, "get_user_by_api_key", get_user_by_api_key)
+
+    first, second = UsersTable(), UsersTable()
+    first.get_cached_user_by_id("u1")
+    wait_for(lambda: len(redis.subscribers.get("open-webui:user:invalidate", [])))
+    return first, second, database
+
+
+def test_user_is_cached_without_api_key(replicas):
+    first, second, database = replicas
+
+    assert first.get_cached_user_by_api_key("sk-1").id == "u1"
+    assert first.get_cached_user_by_api_key("sk-1").api_key is None
+    # Served from Redis on the other replica
+    assert second.get_cached_user_by_id("u1").role == "user"
+    assert database["lookups"] == 2
+
+
+def test_demotion_and_deletion_reach_other_replicas(replicas):
+    first, second, database = replicas
+    assert first.get_cached_user_by_id("u1").role == "user"
+
+    database["user"] = make_user(role="pending")
+    second.invalidate_user_cache("u1")
+    wait_for(lambda: "u1" not in first.user_cache._entries)
+    assert first.get_cached_user_by_id("u1").role == "pending"
+
+    database["user"] = None
+    second.invalidate_user_cache("u1", "sk-1")
+    wait_for(lambda: "u1" not in first.user_cache._entries)
+    assert first.get_cached_user_by_id("u1") is None
+    assert first.get_cached_user_by_api_key("sk-1") is None
+
+
+def test_activity_is_recorded_per_interval(monkeypatch):
+    table = UsersTable()
+
+    monkeypatch.setattr(users, "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", None)
+    table.mark_user_active("u1")
+    table.recorded_last_active["u1"] -= 1
+    table.mark_user_active("u1")
+    assert table.pending_last_active["u1"] == table.recorded_last_active["u1"]
+    assert table.recorded_last_active["u1"] > 0
+
+    monkeypatch.setattr(users, "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", 60)
+    table.pending_last_active.clear()
+    table.mark_user_active("u1")
+    assert table.pending_last_active == {}
@@ -0,0 +1,255 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+from aiohttp import web
+from langchain_core.documents import Document
+
+from open_webui.retrieval.web.cache import (
+    WebEmbeddingCache,
+    WebPageCache,
+    get_max_age,
+    is_cacheable,
+    parse_cache_control,
+)
+from open_webui.retrieval.web.utils import SafeWebBaseLoader
+from open_webui.routers.retrieval import embed_web_page
+from open_webui.test.util.test_document_loaders import FakeServer
+
+
+def load(loader, ordered=True):
+    async def run():
+        if ordered:
+            return await loader.aload()
+        return [doc async for doc in loader.alazy_load()]
+
+    return asyncio.run(run())
+
+
+def test_pages_are_cached_and_revalidated(tmp_path):
+    requests = []
+
+    async def page(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text="<html><title>Page</title><body>Page text</body></html>",
+            content_type="text/html",
+            headers={"ETag": '"v1"'},
+        )
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+
+    with FakeServer(app) as server:
+        url = f"{server.url}/page"
+
+        cache = WebPageCache(tmp_path, ttl=3600)
+        first = load(SafeWebBaseLoader(web_paths=[url], cache=cache))
+        second = load(SafeWebBaseLoader(web_paths=[url], cache=cache))
+        # Fresh entries are used without a request
+        assert requests == [None]
+
+        cache.ttl = 0
+        third = load(SafeWebBaseLoader(web_paths=[url], cache=cache))
+        # Stale entries are revalidated, and reused on 304 Not Modified
+        assert requests == [None, '"v1"']
+
+    assert first[0].page_content == "PagePage text"
+    assert first[0].metadata["title"] == "Page"
+    assert [doc.page_content for doc in second + third] == ["PagePage text"] * 2
+
+
+def test_cache_control_directives():
+    directives = parse_cache_control('Public, max-age=60, s-maxage="30", no-cache')
+    assert directives == {
+        "public": None,
+        "max-age": "60",
+        "s-maxage": "30",
+        "no-cache": None,
+    }
+    assert get_max_age(directives) == 0
+    assert get_max_age(parse_cache_control("max-age=60, s-maxage=30")) == 30
+    assert get_max_age(parse_cache_control("max-age=60")) == 60
+    assert get_max_age(parse_cache_control("max-age=soon")) is None
+    assert get_max_age(parse_cache_control("")) is None
+
+    assert is_cacheable(parse_cache_control("public, max-age=60"))
+    assert not is_cacheable(parse_cache_control("no-store"))
+    assert not is_cacheable(parse_cache_control("private, max-age=60"))
+
+
+def test_pages_follow_cache_control(tmp_path):
+    requests = []
+    cache_control = {
+        "/private": "private, max-age=600",
+        "/no-store": "no-store",
+        "/no-cache": "no-cache",
+        "/max-age": "max-age=600",
+    }
+
+    async def page(request):
+        requests.append((request.path, request.headers.get("If-None-Match")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            text="<p>text</p>",
+            content_type="text/html",
+            headers={"ETag": '"v1"', "Cache-Control": cache_control[request.path]},
+        )
+
+    app = web.Application()
+    app.router.add_get("/{name}", page)
+
+    with FakeServer(app) as server:
+        urls = [f"{server.url}{path}" for path in cache_control]
+        cache = WebPageCache(tmp_path, ttl=3600)
+        for _ in range(2):
+            load(SafeWebBaseLoader(web_paths=urls, cache=cache))
+
+        # max-age within the TTL: reused; no-cache: kept but revalidated
+        assert sorted(requests, key=str) == [
+            ("/max-age", None),
+            ("/no-cache", '"v1"'),
+            ("/no-cache", None),
+            ("/no-store", None),
+            ("/no-store", None),
+            ("/private", None),
+            ("/private", None),
+        ]
+        assert cache.get(f"{server.url}/private") is None
+        assert cache.get(f"{server.url}/no-store") is None
+
+        # A shorter max-age than the TTL makes the entry stale sooner
+        entry = cache.get(f"{server.url}/max-age")
+        assert entry["max_age"] == 600 and cache.is_fresh(entry)
+        entry["fetched_at"] -= 600
+        assert not cache.is_fresh(entry)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = WebEmbeddingCache(tmp_path, max_size=150)
+    for idx, key in enumerate(("aa1", "bb2", "cc3")):
+        cache.set(key, [[float(idx)] * 5])
+        # Distinct modification times, oldest first
+        os.utime(cache.get_path(key), (1000 + idx, 1000 + idx))
+    assert cache.get("aa1") == [[0.0] * 5]
+
+    cache.set("dd4", [[3.0] * 5])
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") and cache.get("cc3") and cache.get("dd4")
+
+    # Without a size limit every entry is kept
+    cache.max_size = 0
+    cache.set("ee5", [[4.0] * 5])
+    assert len(list(tmp_path.glob("*/*.json"))) == 4
+
+
+def test_concurrency_is_limited_per_domain():
+    active = {}
+    peak = {}
+
+    async def page(request):
+        host = request.host.split(":")[0]
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        peak["all"] = max(peak.get("all", 0), sum(active.values()))
+        await asyncio.sleep(0.05)
+        active[host] -= 1
+        return web.Response(text="<p>text</p>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{name}", page)
+
+    with FakeServer(app) as server:
+        port = server.url.rsplit(":", 1)[1]
+        urls = [
+            f"http://{host}:{port}/{idx}"
+            for host in ("127.0.0.1", "localhost")
+            for idx in range(6)
+        ]
+        docs = load(
+            SafeWebBaseLoader(
+                web_paths=urls, requests_per_second=10, requests_per_domain=2
+            )
+        )
+
+    assert [doc.metadata["source"] for doc in docs] == urls
+    assert peak == {"127.0.0.1": 2, "localhost": 2, "all": 4}
+
+
+def test_pages_are_yielded_as_they_arrive():
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return web.Response(text="<p>slow</p>", content_type="text/html")
+
+    async def fast(request):
+        return web.Response(text="<p>fast</p>", content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/fast", fast)
+
+    with FakeServer(app) as server:
+        urls = [f"{server.url}/slow", f"{server.url}/fast"]
+        arrived = load(SafeWebBaseLoader(web_paths=urls), ordered=False)
+        ordered = load(SafeWebBaseLoader(web_paths=urls))
+
+    assert [doc.page_content for doc in arrived] == ["fast", "slow"]
+    assert [doc.page_content for doc in ordered] == ["slow", "fast"]
+
+
+class CountingModel:
+    def __init__(self):
+        self.texts = []
+
+    def encode(self, texts, **kwargs):
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_page_embeddings_are_reused(tmp_path):
+    model = CountingModel()
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                ef=model,
+                config=SimpleNamespace(
+                    RAG_EMBEDDING_ENGINE="",
+                    RAG_EMBEDDING_MODEL="test-model",
+                    RAG_EMBEDDING_BATCH_SIZE=8,
+                    RAG_AZURE_OPENAI_BASE_URL="",
+                    RAG_AZURE_OPENAI_API_KEY="",
+                    TEXT_SPLITTER="character",
+                    CHUNK_SIZE=100,
+                    CHUNK_OVERLAP=0,
+                    TIKTOKEN_ENCODING_NAME="test-encoding",
+                ),
+            )
+        )
+    )
+    cache = WebEmbeddingCache(tmp_path)
+    doc = Document(
+        page_content="The river rises in the hills. " * 10,
+        metadata={"source": "https://example.com/river"},
+    )
+
+    items = embed_web_page(request, doc, cache=cache)
+    embedded = len(model.texts)
+    assert embedded == len(items) > 1
+
+    # Same page from another search: nothing is embedded again
+    reused = embed_web_page(request, doc, cache=cache)
+    assert len(model.texts) == embedded
+    assert [item["vector"] for item in reused] == [item["vector"] for item in items]
+    assert reused[0]["metadata"]["source"] == "https://example.com/river"
+    assert reused[0]["metadata"]["embedding_config"] == {
+        "engine": "",
+        "model": "test-model",
+    }
+
+    # Other chunk settings give other chunks, which are embedded again
+    request.app.state.config.CHUNK_SIZE = 200
+    embed_web_page(request, doc, cache=cache)
+    assert len(model.texts) > embedded
@@ -1,12 +1,88 @@
+from contextvars import ContextVar
 from typing import Optional, Set, Union, List, Dict, Any
 from open_webui.models.users import Users, UserModel
-from open_webui.models.groups import Groups
+from open_webui.models.groups import Groups, GroupModel
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
+from open_webui.env import PRINCIPAL_CACHE_TTL
+from open_webui.utils.cache import TTLCache
 import json
 
 
+class Principal:
+    """
+    A user's group memberships together with the permissions resolved from them.
+    Resolved once per request (and reused for PRINCIPAL_CACHE_TTL seconds) so
+    access checks on hot paths don't query the groups table again.
+    """
+
+    def __init__(self, user_id: str, groups: List[GroupModel], version):
+        self.user_id = user_id
+        self.groups = groups
+        self.group_ids = {group.id for group in groups}
+        self.version = version
+        self._permissions: Dict[str, Dict[str, Any]] = {}
+
+    def get_permissions(self, default_permissions: Dict[str, Any]) -> Dict[str, Any]:
+        key = json.dumps(default_permissions, sort_keys=True)
+        if key not in self._permissions:
+            self._permissions[key] = combine_group_permissions(
+                self.groups, default_permissions
+            )
+        # Hand out copies so callers can't mutate the cached result
+        return json.loads(json.dumps(self._permissions[key]))
+
+
+# Principals resolved during the current request, keyed by user id
+_request_principals: ContextVar[Optional[Dict[str, Principal]]] = ContextVar(
+    "request_principals", default=None
+)
+
+# Group memberships shared across requests of this process, keyed by user id,
+# with the groups version they were read at
+_principal_cache = TTLCache("principals", PRINCIPAL_CACHE_TTL)
+
+
+def start_principal_scope():
+    """Starts a request scope; returns a token for `end_principal_scope`."""
+    return _request_principals.set({})
+
+
+def end_principal_scope(token) -> None:
+    _request_principals.reset(token)
+
+
+def get_principal(user_id: str) -> Principal:
+    version = Groups.version.get()
+
+    request_principals = _request_principals.get()
+    if request_principals:
+        # Groups changed during the request: resolve everyone again
+        if any(p.version != version for p in request_principals.values()):
+            request_principals.clear()
+        elif user_id in request_principals:
+            return request_principals[user_id]
+
+    entry = _principal_cache.get(user_id)
+    if entry is not None and entry["version"] == list(version):
+        groups = [GroupModel.model_validate(group) for group in entry["groups"]]
+    else:
+        groups = Groups.get_groups_by_member_id(user_id)
+        _principal_cache.set(
+            user_id,
+            {
+                "version": list(version),
+                "groups": [group.model_dump() for group in groups],
+            },
+        )
+    principal = Principal(user_id, groups, version)
+
+    if request_principals is not None:
+        request_principals[user_id] = principal
+    return principal
+
+
 def fill_missing_permissions(
     permissions: Dict[str, Any], default_permissions: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -25,14 +101,13 @@ def fill_missing_permissions(
     return permissions
 
 
-def get_permissions(
-    user_id: str,
+def combine_group_permissions(
+    user_groups: List[GroupModel],
     default_permissions: Dict[str, Any],
 ) -> Dict[str, Any]:
     """
-    Get all permissions for a user by combining the permissions of all groups the user is a member of.
+    Combine the permissions of the given groups on top of the default permissions.
     If a permission is defined in multiple groups, the most permissive value is used (True > False).
-    Permissions are nested in a dict with the permission key as the key and a boolean as the value.
     """
 
     def combine_permissions(
@@ -53,8 +128,6 @@ def get_permissions(
                     )  # Use the most permissive value (True > False)
         return permissions
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
-
     # Deep copy default permissions to avoid modifying the original dict
     permissions = json.loads(json.dumps(default_permissions))
 
@@ -68,6 +141,18 @@ def get_permissions(
     return permissions
 
 
+def get_permissions(
+    user_id: str,
+    default_permissions: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Get all permissions for a user by combining the permissions of all groups the user is a member of.
+    If a permission is defined in multiple groups, the most permissive value is used (True > False).
+    Permissions are nested in a dict with the permission key as the key and a boolean as the value.
+    """
+    return get_principal(user_id).get_permissions(default_permissions)
+
+
 def has_permission(
     user_id: str,
     permission_key: str,
@@ -92,7 +177,7 @@ def has_permission(
     permission_hierarchy = permission_key.split(".")
 
     # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id)
+    user_groups = get_principal(user_id).groups
 
     for group in user_groups:
         if get_permission(group.permissions or {}, permission_hierarchy):
@@ -119,8 +204,7 @@ def has_access(
             return True
 
     if user_group_ids is None:
-        user_groups = Groups.get_groups_by_member_id(user_id)
-        user_group_ids = {group.id for group in user_groups}
+        user_group_ids = get_principal(user_id).group_ids
 
     permission_access = access_control.get(type, {})
     permitted_group_ids = permission_access.get("group_ids", [])
@@ -0,0 +1,198 @@
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["AUDIO"])
+
+# Whisper and the VAD model both work on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+
+def get_audio_duration(file_path: str) -> Optional[float]:
+    """
+    Duration of a recording in seconds, read from its header without decoding
+    it, or None if it cannot be found that way.
+    """
+    import soundfile as sf
+
+    try:
+        return sf.info(file_path).duration
+    except Exception:
+        pass
+
+    from pydub.utils import mediainfo
+
+    try:
+        return float(mediainfo(file_path)["duration"])
+    except Exception:
+        return None
+
+
+def get_samples(audio: AudioSegment) -> np.ndarray:
+    """16 kHz mono float32 samples of `audio`, as faster_whisper expects."""
+    audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    return np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+
+
+def get_speech_spans(samples: np.ndarray) -> list[tuple[int, int]]:
+    """(start, end) sample offsets of speech, found with the Silero VAD."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    return [
+        (span["start"], span["end"])
+        for span in get_speech_timestamps(
+            samples, VadOptions(min_silence_duration_ms=500)
+        )
+    ]
+
+
+def plan_audio_chunks(
+    speech_spans: list[tuple[int, int]], total: int, max_chunk: int
+) -> list[tuple[int, int]]:
+    """
+    Cuts [0, total) into consecutive chunks of at most `max_chunk`. Each cut
+    is in the middle of the longest pause in the second half of the chunk, so
+    words are not split; without a pause there, the chunk is cut at its limit.
+    """
+    pauses = [
+        (end, next_start)
+        for (_, end), (next_start, _) in zip(speech_spans, speech_spans[1:])
+    ]
+    if speech_spans:
+        pauses = [(0, speech_spans[0][0]), *pauses, (speech_spans[-1][1], total)]
+    else:
+        pauses = [(0, total)]
+
+    chunks = []
+    start = 0
+    while total - start > max_chunk:
+        window_start, window_end = start + max_chunk // 2, start + max_chunk
+
+        cut, longest = window_end, 0
+        for pause_start, pause_end in pauses:
+            pause_start = max(pause_start, window_start)
+            pause_end = min(pause_end, window_end)
+            if pause_end - pause_start > longest:
+                cut, longest = (pause_start + pause_end) // 2, pause_end - pause_start
+
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, total))
+    return chunks
+
+
+def has_speech(speech_spans: list[tuple[int, int]], start: int, end: int) -> bool:
+    return any(
+        span_start < end and start < span_end for span_start, span_end in speech_spans
+    )
+
+
+def offset_segments(segments: list[dict], offset: float) -> list[dict]:
+    """Moves chunk relative segment timestamps to the whole recording."""
+    return [
+        {
+            **segment,
+            "start": round(segment["start"] + offset, 3),
+            "end": round(segment["end"] + offset, 3),
+        }
+        for segment in segments
+    ]
+
+
+def merge_transcripts(chunks: list[dict]) -> dict:
+    return {
+        "text": " ".join(chunk["text"] for chunk in chunks if chunk["text"]),
+        "segments": [segment for chunk in chunks for segment in chunk["segments"]],
+    }
+
+
+####################
+# Local whisper workers
+####################
+
+_whisper_model = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_key = None
+_process_pool_lock = threading.Lock()
+
+
+def init_whisper_worker(model_kwargs: dict):
+    global _whisper_model
+    from faster_whisper import WhisperModel
+
+    _whisper_model = WhisperModel(**model_kwargs)
+
+
+def transcribe_samples(
+    samples: np.ndarray,
+    language: Optional[str] = None,
+    vad_filter: bool = False,
+    model=None,
+) -> dict:
+    """
+    Transcribes 16 kHz samples, or an audio file, with `model`, or with the
+    model of the worker process when called in the whisper process pool.
+    """
+    model = model or _whisper_model
+    segments, info = model.transcribe(
+        samples,
+        beam_size=5,
+        vad_filter=vad_filter,
+        language=language,
+    )
+    segments = [
+        {"start": segment.start, "end": segment.end, "text": segment.text}
+        for segment in segments
+    ]
+    return {
+        "text": "".join(segment["text"] for segment in segments).strip(),
+        "segments": segments,
+        "language": info.language,
+    }
+
+
+def get_whisper_pool(model_kwargs: dict, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Shared pool of whisper workers, each with its own copy of the model, started
+    on first use and restarted when the model changes. Workers are spawned
+    rather than forked, as forking the threaded server process is unsafe.
+    """
+    global _process_pool, _process_pool_key
+
+    # Workers share the CPU instead of each using all of it
+    model_kwargs = {
+        **model_kwargs,
+        "cpu_threads": max(1, (os.cpu_count() or 1) // max_workers),
+    }
+    key = (tuple(sorted(model_kwargs.items())), max_workers)
+
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_key != key:
+            reset_whisper_pool()
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_whisper_worker,
+                initargs=(model_kwargs,),
+            )
+            _process_pool_key = key
+        return _process_pool
+
+
+def reset_whisper_pool():
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -12,6 +12,7 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 import json
+import asyncio
 
 
 from datetime import datetime, timedelta
@@ -34,6 +35,7 @@ from open_webui.env import (
     STATIC_DIR,
     SRC_LOG_LEVELS,
     WEBUI_AUTH_TRUSTED_EMAIL_HEADER,
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
 )
 
 from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, status
@@ -275,7 +277,7 @@ def get_current_user(
             )
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = Users.get_cached_user_by_id(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -300,12 +302,9 @@ def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(
-                        Users.update_user_last_active_by_id, user.id
-                    )
+                # Record the activity in memory; it is written to the
+                # database in batches by `periodic_user_last_active_flush`
+                Users.mark_user_active(user.id)
             return user
         else:
             raise HTTPException(
@@ -328,7 +327,7 @@ def get_current_user(
 
 
 def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+    user = Users.get_cached_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -344,11 +343,23 @@ def get_current_user_by_api_key(api_key: str):
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
-        Users.update_user_last_active_by_id(user.id)
+        Users.mark_user_active(user.id)
 
     return user
 
 
+async def periodic_user_last_active_flush():
+    """Writes batched `last_active_at` updates until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL)
+            await asyncio.to_thread(Users.flush_user_last_active)
+    except asyncio.CancelledError:
+        # Don't lose the activity recorded since the last flush on shutdown
+        await asyncio.to_thread(Users.flush_user_last_active)
+        raise
+
+
 def get_verified_user(user=Depends(get_current_user)):
     if user.role not in {"user", "admin"}:
         raise HTTPException(
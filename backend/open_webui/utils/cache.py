@@ -0,0 +1,250 @@
+import json
+import logging
+import math
+import threading
+import time
+from typing import Any, Optional
+
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_CONFIG_SYNC_INTERVAL,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def get_cache_redis():
+    """Returns the shared synchronous Redis connection, or None without Redis."""
+    if not REDIS_URL:
+        return None
+    try:
+        return get_redis_connection(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+        )
+    except Exception as e:
+        log.warning(f"Unable to connect to Redis for caching: {e}")
+        return None
+
+
+def start_invalidation_listener(
+    redis, channel: str, on_message, name: str
+) -> threading.Thread:
+    """
+    Calls `on_message(data)` for every message published on `channel`, in a
+    daemon thread that resubscribes when the connection drops. After a drop
+    `on_message(None)` is called, as messages may have been missed.
+    """
+
+    def listen():
+        while True:
+            try:
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                for message in pubsub.listen():
+                    if message and message.get("type") == "message":
+                        on_message(message.get("data"))
+            except Exception as e:
+                log.debug(f"Invalidation listener for {channel} disconnected: {e}")
+                on_message(None)
+                time.sleep(REDIS_CONFIG_SYNC_INTERVAL)
+
+    listener = threading.Thread(target=listen, name=name, daemon=True)
+    listener.start()
+    return listener
+
+
+class SharedVersion:
+    """
+    Version of some shared data, bumped on every change so that caches derived
+    from it can tell they are stale.
+
+    With Redis, bumps also increment `{REDIS_KEY_PREFIX}:{namespace}:version`
+    and are published on `{REDIS_KEY_PREFIX}:{namespace}:invalidate`, so other
+    replicas see them once the message arrives, or at most
+    REDIS_CONFIG_SYNC_INTERVAL seconds later (the same scheme as AppConfig).
+    Local bumps are visible immediately, even when Redis is down.
+    """
+
+    def __init__(self, namespace: str, redis=None):
+        self.namespace = namespace
+        self.redis = redis
+        self._local = 0
+        self._shared: Optional[int] = None
+        self._checked_at = 0.0
+        self._invalidated = threading.Event()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def _redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def get(self) -> tuple[Optional[int], int]:
+        """Opaque value that changes whenever any replica bumps the version."""
+        if self.redis is not None:
+            self._sync()
+        return (self._shared, self._local)
+
+    def bump(self) -> None:
+        with self._lock:
+            self._local += 1
+
+        if self.redis is not None:
+            try:
+                version = self.redis.incr(self._redis_key("version"))
+                self.redis.publish(self._redis_key("invalidate"), version)
+            except Exception as e:
+                log.error(f"Failed to publish {self.namespace} version: {e}")
+
+    def _sync(self) -> None:
+        now = time.monotonic()
+        if (
+            not self._invalidated.is_set()
+            and self._shared is not None
+            and now - self._checked_at < REDIS_CONFIG_SYNC_INTERVAL
+        ):
+            return
+
+        with self._lock:
+            if self._listener is None:
+                self._listener = start_invalidation_listener(
+                    self.redis,
+                    self._redis_key("invalidate"),
+                    lambda data: self._invalidated.set(),
+                    name=f"{self.namespace}-version-listener",
+                )
+
+            self._invalidated.clear()
+            self._checked_at = now
+            try:
+                version = self.redis.get(self._redis_key("version"))
+                self._shared = int(version) if version is not None else 0
+            except Exception as e:
+                log.debug(f"Failed to sync {self.namespace} version: {e}")
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache of JSON-serializable values with a time to live.
+
+    When a Redis connection is given, entries are also written to Redis under
+    `{REDIS_KEY_PREFIX}:{namespace}:{key}` so replicas can reuse each other's
+    lookups, and deletes are published on `{REDIS_KEY_PREFIX}:{namespace}:invalidate`
+    so every replica drops its local copy too. Values are stored serialized, so
+    every `get` returns a fresh copy. Redis errors are logged and treated as
+    cache misses.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        redis=None,
+        maxsize: int = 10000,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.redis = redis
+        self.maxsize = maxsize
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def _redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def _on_invalidate(self, key) -> None:
+        if key is None:
+            self.clear()
+            return
+        if isinstance(key, bytes):
+            key = key.decode()
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _listen(self) -> None:
+        # Started on first use, so deletes made on other replicas evict our copy
+        with self._lock:
+            if self._listener is None:
+                self._listener = start_invalidation_listener(
+                    self.redis,
+                    self._redis_key("invalidate"),
+                    self._on_invalidate,
+                    name=f"{self.namespace}-cache-listener",
+                )
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.ttl or self.ttl <= 0:
+            return None
+
+        if self.redis is not None and self._listener is None:
+            self._listen()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    return json.loads(entry[1])
+                del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                value = self.redis.get(self._redis_key(key))
+            except Exception as e:
+                log.debug(f"Redis cache read failed for {self.namespace}: {e}")
+                value = None
+
+            if value is not None:
+                self._set_local(key, value)
+                return json.loads(value)
+
+        return None
+
+    def _set_local(self, key: str, value: str) -> None:
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.ttl or self.ttl <= 0:
+            return
+
+        serialized = json.dumps(value, default=str)
+        self._set_local(key, serialized)
+
+        if self.redis is not None:
+            try:
+                self.redis.set(
+                    self._redis_key(key), serialized, ex=max(1, math.ceil(self.ttl))
+                )
+            except Exception as e:
+                log.debug(f"Redis cache write failed for {self.namespace}: {e}")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self.redis is not None:
+            try:
+                self.redis.delete(self._redis_key(key))
+                self.redis.publish(self._redis_key("invalidate"), key)
+            except Exception as e:
+                log.debug(f"Redis cache delete failed for {self.namespace}: {e}")
+
+    def clear(self) -> None:
+        """Clears the local entries; Redis entries expire on their own."""
+        with self._lock:
+            self._entries.clear()
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from typing import Optional
 
@@ -8,7 +9,13 @@ import aiohttp
 import websockets
 from pydantic import BaseModel
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    ENABLE_JUPYTER_KERNEL_POOL,
+    JUPYTER_KERNEL_IDLE_TIMEOUT,
+    JUPYTER_KERNEL_MAX_PER_USER,
+    JUPYTER_KERNEL_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -24,6 +31,139 @@ class ResultModel(BaseModel):
     result: Optional[str] = ""
 
 
+async def jupyter_sign_in(
+    session: aiohttp.ClientSession, token: str = "", password: str = ""
+) -> dict:
+    """
+    Authenticates `session` against a Jupyter server.
+
+    Password authentication stores the login cookies and XSRF header on the
+    session; token authentication returns the query params to send instead.
+    """
+    # password authentication
+    if password and not token:
+        async with session.get("login") as response:
+            response.raise_for_status()
+            xsrf_token = response.cookies["_xsrf"].value
+            if not xsrf_token:
+                raise ValueError("_xsrf token not found")
+            session.cookie_jar.update_cookies(response.cookies)
+            session.headers.update({"X-XSRFToken": xsrf_token})
+        async with session.post(
+            "login",
+            data={"_xsrf": xsrf_token, "password": password},
+            allow_redirects=False,
+        ) as response:
+            response.raise_for_status()
+            session.cookie_jar.update_cookies(response.cookies)
+
+    # token authentication
+    if token:
+        return {"token": token}
+    return {}
+
+
+def get_jupyter_ws(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    kernel_id: str,
+    params: dict,
+    use_cookies: bool,
+) -> (str, dict):
+    ws_base = base_url.replace("http", "ws", 1)
+    ws_params = "?" + "&".join([f"{key}={val}" for key, val in params.items()])
+    websocket_url = f"{ws_base}api/kernels/{kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
+    ws_headers = {}
+    if use_cookies:
+        ws_headers = {
+            "Cookie": "; ".join(
+                [f"{cookie.key}={cookie.value}" for cookie in session.cookie_jar]
+            ),
+            **session.headers,
+        }
+    return websocket_url, ws_headers
+
+
+async def execute_in_kernel(ws, code: str, timeout: int) -> (ResultModel, bool):
+    """
+    Runs `code` over an open kernel websocket and collects its output.
+
+    Returns the result and whether the execution timed out (in which case the
+    kernel may still be busy running it).
+    """
+    # send message
+    msg_id = uuid.uuid4().hex
+    await ws.send(
+        json.dumps(
+            {
+                "header": {
+                    "msg_id": msg_id,
+                    "msg_type": "execute_request",
+                    "username": "user",
+                    "session": uuid.uuid4().hex,
+                    "date": "",
+                    "version": "5.3",
+                },
+                "parent_header": {},
+                "metadata": {},
+                "content": {
+                    "code": code,
+                    "silent": False,
+                    "store_history": True,
+                    "user_expressions": {},
+                    "allow_stdin": False,
+                    "stop_on_error": True,
+                },
+                "channel": "shell",
+            }
+        )
+    )
+    # parse message
+    stdout, stderr, result = "", "", []
+    timed_out = False
+    while True:
+        try:
+            # wait for message
+            message = await asyncio.wait_for(ws.recv(), timeout)
+            message_data = json.loads(message)
+            # msg id not match, skip
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            # check message type
+            msg_type = message_data.get("msg_type")
+            match msg_type:
+                case "stream":
+                    if message_data["content"]["name"] == "stdout":
+                        stdout += message_data["content"]["text"]
+                    elif message_data["content"]["name"] == "stderr":
+                        stderr += message_data["content"]["text"]
+                case "execute_result" | "display_data":
+                    data = message_data["content"]["data"]
+                    if "image/png" in data:
+                        result.append(f"data:image/png;base64,{data['image/png']}")
+                    elif "text/plain" in data:
+                        result.append(data["text/plain"])
+                case "error":
+                    stderr += "\n".join(message_data["content"]["traceback"])
+                case "status":
+                    if message_data["content"]["execution_state"] == "idle":
+                        break
+
+        except asyncio.TimeoutError:
+            stderr += "\nExecution timed out."
+            timed_out = True
+            break
+
+    return (
+        ResultModel(
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            result="\n".join(result).strip() if result else "",
+        ),
+        timed_out,
+    )
+
+
 class JupyterCodeExecuter:
     """
     Execute code in jupyter notebook
@@ -81,26 +221,9 @@ class JupyterCodeExecuter:
         return self.result
 
     async def sign_in(self) -> None:
-        # password authentication
-        if self.password and not self.token:
-            async with self.session.get("login") as response:
-                response.raise_for_status()
-                xsrf_token = response.cookies["_xsrf"].value
-                if not xsrf_token:
-                    raise ValueError("_xsrf token not found")
-                self.session.cookie_jar.update_cookies(response.cookies)
-                self.session.headers.update({"X-XSRFToken": xsrf_token})
-            async with self.session.post(
-                "login",
-                data={"_xsrf": xsrf_token, "password": self.password},
-                allow_redirects=False,
-            ) as response:
-                response.raise_for_status()
-                self.session.cookie_jar.update_cookies(response.cookies)
-
-        # token authentication
-        if self.token:
-            self.params.update({"token": self.token})
+        self.params.update(
+            await jupyter_sign_in(self.session, self.token, self.password)
+        )
 
     async def init_kernel(self) -> None:
         async with self.session.post(url="api/kernels", params=self.params) as response:
@@ -109,21 +232,13 @@ class JupyterCodeExecuter:
             self.kernel_id = kernel_data["id"]
 
     def init_ws(self) -> (str, dict):
-        ws_base = self.base_url.replace("http", "ws", 1)
-        ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
-        websocket_url = f"{ws_base}api/kernels/{self.kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
-        ws_headers = {}
-        if self.password and not self.token:
-            ws_headers = {
-                "Cookie": "; ".join(
-                    [
-                        f"{cookie.key}={cookie.value}"
-                        for cookie in self.session.cookie_jar
-                    ]
-                ),
-                **self.session.headers,
-            }
-        return websocket_url, ws_headers
+        return get_jupyter_ws(
+            self.session,
+            self.base_url,
+            self.kernel_id,
+            self.params,
+            use_cookies=bool(self.password and not self.token),
+        )
 
     async def execute_code(self) -> None:
         # initialize ws
@@ -135,74 +250,312 @@ class JupyterCodeExecuter:
             await self.execute_in_jupyter(ws)
 
     async def execute_in_jupyter(self, ws) -> None:
-        # send message
-        msg_id = uuid.uuid4().hex
-        await ws.send(
-            json.dumps(
-                {
-                    "header": {
-                        "msg_id": msg_id,
-                        "msg_type": "execute_request",
-                        "username": "user",
-                        "session": uuid.uuid4().hex,
-                        "date": "",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": self.code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                        "stop_on_error": True,
-                    },
-                    "channel": "shell",
-                }
-            )
-        )
-        # parse message
-        stdout, stderr, result = "", "", []
-        while True:
-            try:
-                # wait for message
-                message = await asyncio.wait_for(ws.recv(), self.timeout)
-                message_data = json.loads(message)
-                # msg id not match, skip
-                if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+        self.result, _ = await execute_in_kernel(ws, self.code, self.timeout)
+
+
+class JupyterKernel:
+    def __init__(
+        self,
+        kernel_id: str,
+        user_id: Optional[str] = None,
+        key: Optional[str] = None,
+    ):
+        self.id = kernel_id
+        self.user_id = user_id
+        self.key = key
+        self.last_used = time.monotonic()
+        # Executions on a kernel run one at a time
+        self.lock = asyncio.Lock()
+
+
+class JupyterKernelPool:
+    """
+    Kernels on one Jupyter server, shared by every execution against it.
+
+    - The server is signed in to once; the authenticated session (token or
+      password cookies) is reused and only renewed when the server rejects it.
+    - `size` spare kernels are started ahead of time, so executions do not wait
+      for kernel startup.
+    - Executions with a chat id stick to that chat's kernel, so variables and
+      imports persist across turns. Executions without one run on a spare
+      kernel that is shut down afterwards.
+    - A user holds at most `max_per_user` chat kernels (their least recently
+      used one is shut down to make room), and `reap()` shuts down chat
+      kernels unused for `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        password: str = "",
+        size: int = 1,
+        max_per_user: int = 3,
+        idle_timeout: int = 900,
+    ):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.token = token or ""
+        self.password = password or ""
+        self.size = max(0, size)
+        self.max_per_user = max(1, max_per_user)
+        self.idle_timeout = idle_timeout
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.params: dict = {}
+        self.signed_in = False
+        self.auth_lock = asyncio.Lock()
+
+        self.spares: list[str] = []
+        self.kernels: dict[str, JupyterKernel] = {}
+        self.warm_task: Optional[asyncio.Task] = None
+        self.last_used = time.monotonic()
+
+    async def sign_in(self, renew: bool = False) -> None:
+        async with self.auth_lock:
+            if self.signed_in and not renew:
+                return
+            if self.session is None or self.session.closed or renew:
+                if self.session is not None:
+                    await self.session.close()
+                self.session = aiohttp.ClientSession(
+                    trust_env=True, base_url=self.base_url
+                )
+            self.params = await jupyter_sign_in(self.session, self.token, self.password)
+            self.signed_in = True
+
+    async def request(self, method: str, path: str) -> Optional[dict]:
+        await self.sign_in()
+        for attempt in range(2):
+            async with self.session.request(
+                method, path, params=self.params
+            ) as response:
+                if response.status in (401, 403) and attempt == 0:
+                    # Login cookies expired (or the server restarted)
+                    await self.sign_in(renew=True)
                     continue
-                # check message type
-                msg_type = message_data.get("msg_type")
-                match msg_type:
-                    case "stream":
-                        if message_data["content"]["name"] == "stdout":
-                            stdout += message_data["content"]["text"]
-                        elif message_data["content"]["name"] == "stderr":
-                            stderr += message_data["content"]["text"]
-                    case "execute_result" | "display_data":
-                        data = message_data["content"]["data"]
-                        if "image/png" in data:
-                            result.append(f"data:image/png;base64,{data['image/png']}")
-                        elif "text/plain" in data:
-                            result.append(data["text/plain"])
-                    case "error":
-                        stderr += "\n".join(message_data["content"]["traceback"])
-                    case "status":
-                        if message_data["content"]["execution_state"] == "idle":
-                            break
-
-            except asyncio.TimeoutError:
-                stderr += "\nExecution timed out."
+                response.raise_for_status()
+                if response.content_type == "application/json":
+                    return await response.json()
+                return None
+
+    async def start_kernel(self) -> str:
+        kernel_data = await self.request("POST", "api/kernels")
+        return kernel_data["id"]
+
+    async def shutdown_kernel(self, kernel_id: str) -> None:
+        try:
+            await self.request("DELETE", f"api/kernels/{kernel_id}")
+        except Exception as err:
+            logger.warning(f"close kernel {kernel_id} failed, {err}")
+
+    async def interrupt_kernel(self, kernel_id: str) -> None:
+        try:
+            await self.request("POST", f"api/kernels/{kernel_id}/interrupt")
+        except Exception as err:
+            logger.warning(f"interrupt kernel {kernel_id} failed, {err}")
+
+    async def warm(self) -> None:
+        while len(self.spares) < self.size:
+            try:
+                self.spares.append(await self.start_kernel())
+            except Exception as err:
+                logger.warning(f"pre-starting kernel failed, {err}")
+                return
+
+    def schedule_warm(self) -> None:
+        if self.size and (self.warm_task is None or self.warm_task.done()):
+            self.warm_task = asyncio.create_task(self.warm())
+
+    async def take_spare(self) -> str:
+        kernel_id = self.spares.pop(0) if self.spares else await self.start_kernel()
+        self.schedule_warm()
+        return kernel_id
+
+    async def discard(self, kernel: JupyterKernel) -> None:
+        if kernel.key and self.kernels.get(kernel.key) is kernel:
+            del self.kernels[kernel.key]
+        await self.shutdown_kernel(kernel.id)
+
+    async def acquire(self, key: Optional[str], user_id: Optional[str]):
+        if key is None:
+            return JupyterKernel(await self.take_spare(), user_id)
+
+        kernel = self.kernels.get(key)
+        if kernel is not None:
+            return kernel
+
+        kernel_id = await self.take_spare()
+        kernel = self.kernels.get(key)
+        if kernel is not None:
+            # A concurrent execution for the same chat got there first
+            self.spares.append(kernel_id)
+            return kernel
+
+        kernel = self.kernels[key] = JupyterKernel(kernel_id, user_id, key)
+        await self.enforce_user_limit(user_id)
+        return kernel
+
+    async def enforce_user_limit(self, user_id: Optional[str]) -> None:
+        user_kernels = sorted(
+            (kernel for kernel in self.kernels.values() if kernel.user_id == user_id),
+            key=lambda kernel: kernel.last_used,
+        )
+        excess = len(user_kernels) - self.max_per_user
+        for kernel in user_kernels:
+            if excess <= 0:
                 break
-        self.result.stdout = stdout.strip()
-        self.result.stderr = stderr.strip()
-        self.result.result = "\n".join(result).strip() if result else ""
+            # Never evict a kernel that is running code (including the new one)
+            if kernel.lock.locked() or kernel is user_kernels[-1]:
+                continue
+            logger.debug(f"shutting down least recently used kernel {kernel.id}")
+            await self.discard(kernel)
+            excess -= 1
+
+    async def execute(
+        self,
+        code: str,
+        timeout: int = 60,
+        chat_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> ResultModel:
+        self.last_used = time.monotonic()
+        key = f"{user_id}:{chat_id}" if chat_id else None
+
+        for attempt in range(2):
+            kernel = await self.acquire(key, user_id)
+            try:
+                async with kernel.lock:
+                    kernel.last_used = time.monotonic()
+                    websocket_url, ws_headers = get_jupyter_ws(
+                        self.session,
+                        self.base_url,
+                        kernel.id,
+                        self.params,
+                        use_cookies=bool(self.password and not self.token),
+                    )
+                    try:
+                        ws = await websockets.connect(
+                            websocket_url, additional_headers=ws_headers
+                        )
+                    except Exception as err:
+                        # The kernel died or was culled by the server
+                        if key:
+                            await self.discard(kernel)
+                        if attempt:
+                            raise
+                        logger.debug(f"kernel {kernel.id} unavailable, {err}")
+                        continue
+
+                    async with ws:
+                        result, timed_out = await execute_in_kernel(ws, code, timeout)
+                    if timed_out and key:
+                        await self.interrupt_kernel(kernel.id)
+                    kernel.last_used = time.monotonic()
+                    return result
+            finally:
+                if key is None:
+                    await self.shutdown_kernel(kernel.id)
+
+    async def reap(self) -> bool:
+        """Shuts down idle chat kernels; returns whether the pool is unused."""
+        now = time.monotonic()
+        for kernel in list(self.kernels.values()):
+            if not kernel.lock.locked() and now - kernel.last_used > self.idle_timeout:
+                logger.debug(f"shutting down idle kernel {kernel.id}")
+                await self.discard(kernel)
+
+        return not self.kernels and now - self.last_used > self.idle_timeout
+
+    async def close(self) -> None:
+        if self.warm_task is not None:
+            self.warm_task.cancel()
+        spares, self.spares = self.spares, []
+        kernels, self.kernels = list(self.kernels.values()), {}
+        if self.session is not None and not self.session.closed:
+            for kernel_id in spares + [kernel.id for kernel in kernels]:
+                await self.shutdown_kernel(kernel_id)
+            await self.session.close()
+
+
+class JupyterKernelPools:
+    """
+    Registry of kernel pools, one per Jupyter server and credentials, so the
+    code execution and code interpreter settings can point at different
+    servers. Pools unused for the idle timeout are closed by `reap()`.
+    """
+
+    def __init__(self):
+        self.pools: dict[tuple, JupyterKernelPool] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_pool(
+        self, base_url: str, token: str = "", password: str = ""
+    ) -> JupyterKernelPool:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions and locks are bound to the loop they were created on
+            self.pools = {}
+            self._loop = loop
+
+        key = (base_url, token or "", password or "")
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = JupyterKernelPool(
+                base_url,
+                token,
+                password,
+                size=JUPYTER_KERNEL_POOL_SIZE,
+                max_per_user=JUPYTER_KERNEL_MAX_PER_USER,
+                idle_timeout=JUPYTER_KERNEL_IDLE_TIMEOUT,
+            )
+        return pool
+
+    async def reap(self) -> None:
+        for key, pool in list(self.pools.items()):
+            try:
+                if await pool.reap():
+                    del self.pools[key]
+                    await pool.close()
+            except Exception as err:
+                logger.warning(f"reaping kernels of {pool.base_url} failed, {err}")
+
+    async def close(self) -> None:
+        pools, self.pools = self.pools, {}
+        for pool in pools.values():
+            try:
+                await pool.close()
+            except Exception as err:
+                logger.warning(f"closing kernels of {pool.base_url} failed, {err}")
+
+
+KernelPools = JupyterKernelPools()
+
+
+async def periodic_kernel_pool_reaper(interval: float = 60):
+    while True:
+        await asyncio.sleep(interval)
+        await KernelPools.reap()
 
 
 async def execute_code_jupyter(
-    base_url: str, code: str, token: str = "", password: str = "", timeout: int = 60
+    base_url: str,
+    code: str,
+    token: str = "",
+    password: str = "",
+    timeout: int = 60,
+    chat_id: Optional[str] = None,
+    user_id: Optional[str] = None,
 ) -> dict:
+    if ENABLE_JUPYTER_KERNEL_POOL:
+        try:
+            result = await KernelPools.get_pool(base_url, token, password).execute(
+                code, timeout, chat_id=chat_id, user_id=user_id
+            )
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            result = ResultModel(stderr=f"Error: {err}")
+        return result.model_dump()
+
     async with JupyterCodeExecuter(
         base_url, code, token, password, timeout
     ) as executor:
@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import math
+import random
+import time
+from typing import Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.3
+
+# A chat keeps its backend until that backend has this many times its fair
+# share of outstanding requests (consistent hashing with bounded loads).
+AFFINITY_LOAD_FACTOR = 1.25
+
+# Seconds a backend is assumed to keep a model loaded after serving it, when
+# not confirmed by a fresher `/api/ps` snapshot (Ollama's default keep_alive).
+LOADED_MODEL_TTL = 300
+
+
+class BackendStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ewma_latency: Optional[float] = None
+        self.ejected_until = 0.0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+
+class LoadBalancer:
+    """
+    Picks a backend (by url index) for a model among the backends serving it.
+
+    - Passive health checks: backends failing `ejection_failures` times in a
+      row are skipped for `ejection_time` seconds, then tried again.
+    - Backends that already have the model loaded are preferred, to avoid
+      cold model loads.
+    - With an affinity key (e.g. a chat id), rendezvous hashing keeps the
+      same chat on the same backend unless it is overloaded.
+    - Otherwise the backend with the fewest outstanding requests wins, ties
+      broken by the lowest moving-average latency.
+
+    State is per process and indexed by url position; it is reset whenever
+    the configured base urls change.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "least_outstanding",
+        affinity: bool = True,
+        ejection_failures: int = 3,
+        ejection_time: float = 30.0,
+    ):
+        self.strategy = strategy
+        self.affinity = affinity
+        self.ejection_failures = ejection_failures
+        self.ejection_time = ejection_time
+
+        self.urls: list[str] = []
+        self.stats: dict[int, BackendStats] = {}
+        # model -> {url_idx: loaded until (monotonic)}
+        self.loaded_models: dict[str, dict[int, float]] = {}
+
+    def sync_urls(self, urls: list[str]):
+        if list(urls) != self.urls:
+            self.urls = list(urls)
+            self.stats = {}
+            self.loaded_models = {}
+
+    def get_url(self, url_idx: int) -> str:
+        return self.urls[url_idx] if url_idx < len(self.urls) else str(url_idx)
+
+    def get_stats(self, url_idx: int) -> BackendStats:
+        stats = self.stats.get(url_idx)
+        if stats is None:
+            stats = self.stats[url_idx] = BackendStats()
+        return stats
+
+    def set_loaded_models(self, loaded_models: dict[str, list[int]]):
+        """Replaces the loaded model map with an `/api/ps` snapshot."""
+        until = time.monotonic() + LOADED_MODEL_TTL
+        self.loaded_models = {
+            model: {url_idx: until for url_idx in url_idxs}
+            for model, url_idxs in loaded_models.items()
+        }
+
+    def mark_loaded(self, model: str, url_idx: int):
+        self.loaded_models.setdefault(model, {})[url_idx] = (
+            time.monotonic() + LOADED_MODEL_TTL
+        )
+
+    def select(
+        self,
+        model: str,
+        url_idxs: list[int],
+        affinity_key: Optional[str] = None,
+    ) -> int:
+        if not url_idxs:
+            raise ValueError(f"No backend available for model {model}")
+        if len(url_idxs) == 1 or self.strategy == "random":
+            return random.choice(url_idxs)
+
+        now = time.monotonic()
+
+        # Fail open: if every backend is ejected, try them all anyway
+        candidates = [
+            url_idx
+            for url_idx in url_idxs
+            if not self.get_stats(url_idx).is_ejected(now)
+        ] or list(url_idxs)
+
+        loaded = self.loaded_models.get(model, {})
+        warm = [url_idx for url_idx in candidates if loaded.get(url_idx, 0) > now]
+        if warm:
+            candidates = warm
+
+        if self.affinity and affinity_key and len(candidates) > 1:
+            # Rendezvous hashing on the url, so every replica picks the same
+            # backend and removing one only moves the chats it served
+            url_idx = max(
+                candidates,
+                key=lambda url_idx: hashlib.blake2b(
+                    f"{affinity_key}:{self.get_url(url_idx)}".encode(),
+                    digest_size=8,
+                ).digest(),
+            )
+
+            total = sum(self.get_stats(idx).in_flight for idx in candidates)
+            capacity = math.ceil(AFFINITY_LOAD_FACTOR * (total + 1) / len(candidates))
+            if self.get_stats(url_idx).in_flight < capacity:
+                return url_idx
+
+        lowest = min(self.get_stats(url_idx).in_flight for url_idx in candidates)
+        candidates = [
+            url_idx
+            for url_idx in candidates
+            if self.get_stats(url_idx).in_flight == lowest
+        ]
+        random.shuffle(candidates)
+        return min(
+            candidates,
+            key=lambda url_idx: self.get_stats(url_idx).ewma_latency or 0.0,
+        )
+
+    def begin(self, url_idx: int) -> float:
+        """Marks a request as outstanding; returns its start time."""
+        stats = self.get_stats(url_idx)
+        stats.in_flight += 1
+        stats.requests += 1
+        return time.monotonic()
+
+    def observe(self, url_idx: int, start: float, error: bool = False):
+        """Records the time to first response (or a failure) of a request."""
+        stats = self.get_stats(url_idx)
+        if error:
+            stats.errors += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.ejection_failures:
+                stats.ejected_until = time.monotonic() + self.ejection_time
+                log.warning(
+                    f"Ejecting backend {self.get_url(url_idx)} for {self.ejection_time}s "
+                    f"after {stats.consecutive_failures} consecutive failures"
+                )
+            return
+
+        latency = time.monotonic() - start
+        stats.consecutive_failures = 0
+        stats.ejected_until = 0.0
+        stats.ewma_latency = (
+            latency
+            if stats.ewma_latency is None
+            else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * stats.ewma_latency
+        )
+
+    def end(self, url_idx: int):
+        """Marks an outstanding request (including its streamed body) as done."""
+        stats = self.get_stats(url_idx)
+        stats.in_flight = max(0, stats.in_flight - 1)
+
+    def get_metrics(self) -> dict:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "backends": {
+                self.get_url(url_idx): {
+                    "url_idx": url_idx,
+                    "in_flight": stats.in_flight,
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "consecutive_failures": stats.consecutive_failures,
+                    "ewma_latency": stats.ewma_latency,
+                    "ejected": stats.is_ejected(now),
+                }
+                for url_idx, stats in self.stats.items()
+            },
+        }
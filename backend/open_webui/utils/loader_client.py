@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import sys
+import threading
+from typing import Any, Coroutine, Optional
+
+import aiohttp
+
+from open_webui.env import (
+    DOCUMENT_LOADER_MAX_CONCURRENCY,
+    DOCUMENT_LOADER_TIMEOUT,
+    GLOBAL_LOG_LEVEL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.upstream import UpstreamSessions
+
+logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class LoaderClient:
+    """
+    Runs the requests of external engines, such as the document loaders or the
+    speech-to-text services, on one background event loop, so uploads and
+    status polling of many files overlap instead of each holding a blocking
+    connection. Connections are pooled per upstream, and each engine has at
+    most `max_concurrency` requests in flight.
+
+    The synchronous `run` is for the loaders' `load()`, called from worker
+    threads; async code awaits `run_async` instead. A request is cancelled
+    once it has run for `timeout` seconds (None waits indefinitely); the
+    time spent queued behind the other documents of its engine is not
+    counted.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DOCUMENT_LOADER_MAX_CONCURRENCY,
+        name: str = "document-loaders",
+        timeout: Optional[float] = DOCUMENT_LOADER_TIMEOUT,
+    ):
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self.timeout = timeout
+        self.sessions = UpstreamSessions()
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self.loop.run_forever,
+                    name=self.name,
+                    daemon=True,
+                )
+                self.thread.start()
+            return self.loop
+
+    def close(self, timeout: float = 10):
+        """
+        Closes the pooled sessions on the loader loop, then stops and closes
+        the loop. A later request starts a new one.
+        """
+        with self.lock:
+            loop, self.loop = self.loop, None
+            thread, self.thread = self.thread, None
+            # Semaphores are bound to the loop they were first used on
+            self.semaphores = {}
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.sessions.close(), loop).result(
+                timeout
+            )
+        except Exception as e:
+            log.warning(f"Error closing the {self.name} sessions: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def is_running(self) -> bool:
+        """Whether the caller runs on the loader loop."""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """Pooled session for `url`, only usable on the loader loop."""
+        return self.sessions.get_session(url)
+
+    async def _run(self, engine: str, coro: Coroutine) -> Any:
+        semaphore = self.semaphores.get(engine)
+        if semaphore is None:
+            semaphore = self.semaphores[engine] = asyncio.Semaphore(
+                self.max_concurrency
+            )
+
+        async with semaphore:
+            return await asyncio.wait_for(coro, self.timeout)
+
+    def submit(self, engine: str, coro: Coroutine):
+        if self.is_running():
+            coro.close()
+            raise RuntimeError("Cannot wait for a document loader on its own loop")
+        return asyncio.run_coroutine_threadsafe(
+            self._run(engine, coro), self.get_loop()
+        )
+
+    def run(self, engine: str, coro: Coroutine) -> Any:
+        return self.submit(engine, coro).result()
+
+    async def run_async(self, engine: str, coro: Coroutine) -> Any:
+        return await asyncio.wrap_future(self.submit(engine, coro))
+
+
+ExternalLoaders = LoaderClient()
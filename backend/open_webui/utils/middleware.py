@@ -32,6 +32,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_chat_metadata,
 )
 from open_webui.routers.retrieval import (
     process_web_search,
@@ -68,6 +69,7 @@ from open_webui.retrieval.utils import get_sources_from_items
 from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.task import (
     get_task_model_id,
+    parse_chat_metadata_response,
     rag_template,
     tools_function_calling_generation_template,
 )
@@ -1600,11 +1602,106 @@ async def process_chat_response(
             if message:
                 message["model"] = form_data.get("model")
 
+        async def save_follow_ups(follow_ups):
+            await event_emitter(
+                {
+                    "type": "chat:message:follow_ups",
+                    "data": {
+                        "follow_ups": follow_ups,
+                    },
+                }
+            )
+
+            if not metadata.get("chat_id", "").startswith("local:"):
+                Chats.upsert_message_to_chat_by_id_and_message_id(
+                    metadata["chat_id"],
+                    metadata["message_id"],
+                    {
+                        "followUps": follow_ups,
+                    },
+                )
+
+        async def save_title(title):
+            Chats.update_chat_title_by_id(metadata["chat_id"], title)
+
+            await event_emitter(
+                {
+                    "type": "chat:title",
+                    "data": title,
+                }
+            )
+
+        async def save_tags(tags):
+            Chats.update_chat_tags_by_id(metadata["chat_id"], tags, user)
+
+            await event_emitter(
+                {
+                    "type": "chat:tags",
+                    "data": tags,
+                }
+            )
+
         if message and "model" in message:
             if tasks and messages:
+                is_temp_chat = metadata.get("chat_id", "").startswith("local:")
+
+                # Fields generated together in one task model call; fields with
+                # a custom prompt template keep their own call
+                metadata_fields = []
                 if (
                     TASKS.FOLLOW_UP_GENERATION in tasks
                     and tasks[TASKS.FOLLOW_UP_GENERATION]
+                    and not request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
+                ):
+                    metadata_fields.append("follow_ups")
+                if not is_temp_chat:
+                    if (
+                        TASKS.TITLE_GENERATION in tasks
+                        and tasks[TASKS.TITLE_GENERATION]
+                        and not request.app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE
+                    ):
+                        metadata_fields.append("title")
+                    if (
+                        TASKS.TAGS_GENERATION in tasks
+                        and tasks[TASKS.TAGS_GENERATION]
+                        and not request.app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE
+                    ):
+                        metadata_fields.append("tags")
+
+                chat_metadata = {}
+                if (
+                    request.app.state.config.ENABLE_CHAT_METADATA_GENERATION
+                    and len(metadata_fields) > 1
+                ):
+                    try:
+                        res = await generate_chat_metadata(
+                            request,
+                            {
+                                "model": message["model"],
+                                "messages": messages,
+                                "fields": metadata_fields,
+                                "message_id": metadata["message_id"],
+                                "chat_id": metadata["chat_id"],
+                            },
+                            user,
+                        )
+                        chat_metadata = parse_chat_metadata_response(
+                            res, metadata_fields
+                        )
+                    except Exception as e:
+                        log.debug(f"Error generating chat metadata: {e}")
+
+                    missing_fields = set(metadata_fields) - set(chat_metadata)
+                    if missing_fields:
+                        log.debug(
+                            f"Generating chat metadata {missing_fields} separately"
+                        )
+
+                if "follow_ups" in chat_metadata:
+                    await save_follow_ups(chat_metadata["follow_ups"])
+                elif (
+                    TASKS.FOLLOW_UP_GENERATION in tasks
+                    and tasks[TASKS.FOLLOW_UP_GENERATION]
                 ):
                     res = await generate_follow_ups(
                         request,
@@ -1638,31 +1735,15 @@ async def process_chat_response(
                             follow_ups = json.loads(follow_ups_string).get(
                                 "follow_ups", []
                             )
-                            await event_emitter(
-                                {
-                                    "type": "chat:message:follow_ups",
-                                    "data": {
-                                        "follow_ups": follow_ups,
-                                    },
-                                }
-                            )
-
-                            if not metadata.get("chat_id", "").startswith("local:"):
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
-                                    metadata["chat_id"],
-                                    metadata["message_id"],
-                                    {
-                                        "followUps": follow_ups,
-                                    },
-                                )
+                            await save_follow_ups(follow_ups)
 
                         except Exception as e:
                             pass
 
-                if not metadata.get("chat_id", "").startswith(
-                    "local:"
-                ):  # Only update titles and tags for non-temp chats
-                    if (
+                if not is_temp_chat:  # Only update titles and tags for non-temp chats
+                    if "title" in chat_metadata:
+                        await save_title(chat_metadata["title"])
+                    elif (
                         TASKS.TITLE_GENERATION in tasks
                         and tasks[TASKS.TITLE_GENERATION]
                     ):
@@ -1712,16 +1793,7 @@ async def process_chat_response(
                                 if not title:
                                     title = messages[0].get("content", user_message)
 
-                                Chats.update_chat_title_by_id(
-                                    metadata["chat_id"], title
-                                )
-
-                                await event_emitter(
-                                    {
-                                        "type": "chat:title",
-                                        "data": title,
-                                    }
-                                )
+                                await save_title(title)
                         elif len(messages) == 2:
                             title = messages[0].get("content", user_message)
 
@@ -1734,7 +1806,11 @@ async def process_chat_response(
                                 }
                             )
 
-                    if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
+                    if "tags" in chat_metadata:
+                        await save_tags(chat_metadata["tags"])
+                    elif (
+                        TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]
+                    ):
                         res = await generate_chat_tags(
                             request,
                             {
@@ -1764,16 +1840,7 @@ async def process_chat_response(
 
                             try:
                                 tags = json.loads(tags_string).get("tags", [])
-                                Chats.update_chat_tags_by_id(
-                                    metadata["chat_id"], tags, user
-                                )
-
-                                await event_emitter(
-                                    {
-                                        "type": "chat:tags",
-                                        "data": tags,
-                                    }
-                                )
+                                await save_tags(tags)
                             except Exception as e:
                                 pass
 
@@ -3026,6 +3093,8 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        chat_id=metadata.get("chat_id"),
+                                        user_id=user.id,
                                     )
                                 else:
                                     output = {
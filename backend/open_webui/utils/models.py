@@ -1,7 +1,9 @@
 import time
+import json
 import logging
 import asyncio
 import sys
+from typing import Optional
 
 from aiocache import cached
 from fastapi import Request
@@ -26,7 +28,14 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    MODELS_CATALOG_COLD_START_TIMEOUT,
+    MODELS_CATALOG_REFRESH_INTERVAL,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+)
 from open_webui.models.users import UserModel
 
 
@@ -77,11 +86,199 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
+class ModelCatalog:
+    """
+    Base models (upstream and function models) discovered in the background.
+
+    Requests are served from the last good catalog; once it is older than the
+    refresh interval it is revalidated in the background (stale-while-
+    revalidate). On a cold start requests wait at most
+    MODELS_CATALOG_COLD_START_TIMEOUT seconds for the first discovery. With
+    Redis the catalog is shared across replicas under a version stamp, and a
+    lock lets a single replica contact the upstreams per interval.
+
+    The catalog is shared by all users, so it is always discovered without a
+    user: upstream calls made on behalf of a user never end up in it.
+    """
+
+    def __init__(self, refresh_interval: int):
+        self.refresh_interval = refresh_interval
+        self.models: Optional[list] = None
+        self.version = 0
+        self.refreshed_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def _redis_key(self, name: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:models:{name}"
+
+    def is_stale(self) -> bool:
+        return time.time() - self.refreshed_at >= self.refresh_interval
+
+    def _set(self, request, models: list, version: int, refreshed_at: float):
+        self.models = models
+        self.version = version
+        self.refreshed_at = refreshed_at
+        request.app.state.BASE_MODELS = models
+
+        # Replicas restoring a shared catalog skip the upstream calls that
+        # normally fill the routing tables, so rebuild them from the catalog
+        request.app.state.OPENAI_MODELS = {
+            model["id"]: model for model in models if "urlIdx" in model
+        }
+        request.app.state.OLLAMA_MODELS = {
+            model["id"]: model["ollama"] for model in models if "ollama" in model
+        }
+
+    async def refresh(self, request) -> list:
+        """Rebuilds the catalog from the upstreams; concurrent calls share one run."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(request))
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self, request) -> list:
+        models = await get_all_base_models(request)
+        version = self.version + 1
+        refreshed_at = time.time()
+
+        redis = getattr(request.app.state, "redis", None)
+        if redis is not None:
+            try:
+                version = await redis.incr(self._redis_key("version"))
+                await redis.set(
+                    self._redis_key("catalog"),
+                    json.dumps(
+                        {
+                            "version": version,
+                            "refreshed_at": refreshed_at,
+                            "models": models,
+                        },
+                        default=str,
+                    ),
+                )
+            except Exception as e:
+                log.warning(f"Failed to share the model catalog: {e}")
+
+        self._set(request, models, version, refreshed_at)
+        log.debug(f"Model catalog refreshed: {len(models)} models (v{version})")
+        return models
+
+    async def load_shared(self, request) -> bool:
+        """Loads a newer catalog published by another replica, if any."""
+        redis = getattr(request.app.state, "redis", None)
+        if redis is None:
+            return False
+
+        try:
+            version = int(await redis.get(self._redis_key("version")) or 0)
+            if version <= self.version:
+                return False
+
+            data = await redis.get(self._redis_key("catalog"))
+            if not data:
+                return False
+            catalog = json.loads(data)
+        except Exception as e:
+            log.debug(f"Failed to load the shared model catalog: {e}")
+            return False
+
+        if catalog["version"] <= self.version:
+            return False
+
+        self._set(
+            request, catalog["models"], catalog["version"], catalog["refreshed_at"]
+        )
+        return True
+
+    async def sync(self, request):
+        """
+        Brings a stale catalog up to date, from another replica when possible
+        and otherwise from the upstreams if no other replica is refreshing.
+        """
+        if await self.load_shared(request) and not self.is_stale():
+            return
+
+        redis = getattr(request.app.state, "redis", None)
+        if redis is not None:
+            try:
+                acquired = await redis.set(
+                    self._redis_key("refresh_lock"),
+                    "1",
+                    nx=True,
+                    ex=max(1, self.refresh_interval),
+                )
+            except Exception:
+                acquired = True
+            if not acquired:
+                return
+
+        await self.refresh(request)
+
+    def revalidate(self, request):
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._revalidate(request))
+
+    async def _revalidate(self, request):
+        try:
+            await self.sync(request)
+        except Exception as e:
+            log.exception(f"Failed to refresh the model catalog: {e}")
+
+    async def get(self, request) -> list:
+        if self.models is None:
+            if await self.load_shared(request):
+                return self.models
+            try:
+                return await asyncio.wait_for(
+                    self.refresh(request), MODELS_CATALOG_COLD_START_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                log.warning("Model discovery still running, serving no base models")
+                return []
+        elif self.is_stale() and not request.app.state.config.ENABLE_BASE_MODELS_CACHE:
+            self.revalidate(request)
+        return self.models
+
+
+model_catalog = ModelCatalog(MODELS_CATALOG_REFRESH_INTERVAL)
+
+
+async def periodic_model_catalog_sync(request):
+    """
+    Keeps the model catalog (and `app.state.MODELS`) warm in the background.
+    With the base models cache enabled only catalogs refreshed manually (on
+    any replica) are picked up.
+    """
+    version = None
+    while True:
+        try:
+            if model_catalog.models is None:
+                # Unlike requests, wait for the first discovery however long
+                if not await model_catalog.load_shared(request):
+                    await model_catalog.refresh(request)
+            elif request.app.state.config.ENABLE_BASE_MODELS_CACHE:
+                await model_catalog.load_shared(request)
+            elif model_catalog.is_stale():
+                await model_catalog.sync(request)
+
+            if model_catalog.version != version:
+                await get_all_models(request)
+                version = model_catalog.version
+        except Exception as e:
+            log.exception(f"Model catalog sync failed: {e}")
+
+        await asyncio.sleep(max(1, model_catalog.refresh_interval))
+
+
 async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
+    if refresh:
+        base_models = await model_catalog.refresh(request)
+    elif model_catalog.refresh_interval > 0:
+        base_models = await model_catalog.get(request)
+    elif (
         request.app.state.MODELS
         and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
+        and request.app.state.config.ENABLE_BASE_MODELS_CACHE
     ):
         base_models = request.app.state.BASE_MODELS
     else:
@@ -130,73 +327,91 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             ]
         models = models + arena_models
 
+    # Load every active action and filter once, instead of once per model
+    functions = {
+        function.id: function
+        for function in Functions.get_functions_by_types(
+            ["action", "filter"], active_only=True
+        )
+    }
+    enabled_action_ids = {
+        function.id for function in functions.values() if function.type == "action"
+    }
+    enabled_filter_ids = {
+        function.id for function in functions.values() if function.type == "filter"
+    }
     global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
         function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+        for function in functions.values()
+        if function.type == "action" and function.is_global
     ]
-
     global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
         function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        for function in functions.values()
+        if function.type == "filter" and function.is_global
     ]
 
+    # Index models by id and by id without its tag ('llama3' for 'llama3:7b'),
+    # keeping list order so lookups return the same model a scan would
+    models_by_id = {}
+    models_by_name = {}
+    model_positions = {}
+    removed = set()
+
+    def index_model(model):
+        model_positions[id(model)] = len(model_positions)
+        models_by_id.setdefault(model["id"], []).append(model)
+        name = model["id"].split(":")[0]
+        if name != model["id"]:
+            models_by_name.setdefault(name, []).append(model)
+
+    def find_models(model_id, include_names=False, owned_by=None):
+        candidates = models_by_id.get(model_id, [])
+        if include_names:
+            candidates = candidates + [
+                model
+                for model in models_by_name.get(model_id, [])
+                if owned_by is None or model.get("owned_by") == owned_by
+            ]
+        return [model for model in candidates if id(model) not in removed]
+
+    for model in models:
+        index_model(model)
+
     custom_models = Models.get_all_models()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model and "meta" in model["info"]:
-                            action_ids.extend(
-                                model["info"]["meta"].get("actionIds", [])
-                            )
-                            filter_ids.extend(
-                                model["info"]["meta"].get("filterIds", [])
-                            )
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
-        ):
+            # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
+            for model in find_models(
+                custom_model.id, include_names=True, owned_by="ollama"
+            ):
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    model["info"] = custom_model.model_dump()
+
+                    # Set action_ids and filter_ids
+                    meta = model["info"].get("meta") or {}
+                    model["action_ids"] = list(meta.get("actionIds") or [])
+                    model["filter_ids"] = list(meta.get("filterIds") or [])
+                else:
+                    removed.add(id(model))
+
+        elif custom_model.is_active and not find_models(custom_model.id):
             owned_by = "openai"
             pipe = None
 
             action_ids = []
             filter_ids = []
 
-            for model in models:
-                if (
-                    custom_model.base_model_id == model["id"]
-                    or custom_model.base_model_id == model["id"].split(":")[0]
-                ):
-                    owned_by = model.get("owned_by", "unknown owner")
-                    if "pipe" in model:
-                        pipe = model["pipe"]
-                    break
+            base_models = find_models(custom_model.base_model_id, include_names=True)
+            if base_models:
+                # First match in catalog order
+                model = min(base_models, key=lambda model: model_positions[id(model)])
+
+                owned_by = model.get("owned_by", "unknown owner")
+                if "pipe" in model:
+                    pipe = model["pipe"]
 
             if custom_model.meta:
                 meta = custom_model.meta.model_dump()
@@ -207,20 +422,23 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
                 if "filterIds" in meta:
                     filter_ids.extend(meta["filterIds"])
 
-            models.append(
-                {
-                    "id": f"{custom_model.id}",
-                    "name": custom_model.name,
-                    "object": "model",
-                    "created": custom_model.created_at,
-                    "owned_by": owned_by,
-                    "info": custom_model.model_dump(),
-                    "preset": True,
-                    **({"pipe": pipe} if pipe is not None else {}),
-                    "action_ids": action_ids,
-                    "filter_ids": filter_ids,
-                }
-            )
+            preset_model = {
+                "id": f"{custom_model.id}",
+                "name": custom_model.name,
+                "object": "model",
+                "created": custom_model.created_at,
+                "owned_by": owned_by,
+                "info": custom_model.model_dump(),
+                "preset": True,
+                **({"pipe": pipe} if pipe is not None else {}),
+                "action_ids": action_ids,
+                "filter_ids": filter_ids,
+            }
+            models.append(preset_model)
+            index_model(preset_model)
+
+    if removed:
+        models = [model for model in models if id(model) not in removed]
 
     # Process action_ids to get the actions
     def get_action_items_from_module(function, module):
@@ -271,41 +489,55 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
         function_module, _, _ = get_function_module_from_cache(request, function_id)
         return function_module
 
+    # Descriptors are built once per function and shared by every model using it
+    action_items = {}
+    filter_items = {}
+
+    def get_action_items(action_id):
+        if action_id not in action_items:
+            function_module = get_function_module_by_id(action_id)
+            action_items[action_id] = get_action_items_from_module(
+                functions[action_id], function_module
+            )
+        return action_items[action_id]
+
+    def get_filter_items(filter_id):
+        if filter_id not in filter_items:
+            function_module = get_function_module_by_id(filter_id)
+            filter_items[filter_id] = (
+                get_filter_items_from_module(functions[filter_id], function_module)
+                if getattr(function_module, "toggle", None)
+                else []
+            )
+        return filter_items[filter_id]
+
     for model in models:
+        # dict.fromkeys dedupes while keeping the configured order
         action_ids = [
             action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
+            for action_id in dict.fromkeys(
+                model.pop("action_ids", []) + global_action_ids
+            )
             if action_id in enabled_action_ids
         ]
         filter_ids = [
             filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
+            for filter_id in dict.fromkeys(
+                model.pop("filter_ids", []) + global_filter_ids
+            )
             if filter_id in enabled_filter_ids
         ]
 
-        model["actions"] = []
-        for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
-
-        model["filters"] = []
-        for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
-
-            function_module = get_function_module_by_id(filter_id)
-
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
-                )
+        model["actions"] = [
+            dict(item)
+            for action_id in action_ids
+            for item in get_action_items(action_id)
+        ]
+        model["filters"] = [
+            dict(item)
+            for filter_id in filter_ids
+            for item in get_filter_items(filter_id)
+        ]
 
     log.debug(f"get_all_models() returned {len(models)} models")
 
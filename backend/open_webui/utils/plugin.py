@@ -1,19 +1,52 @@
+import hashlib
 import os
 import re
 import subprocess
 import sys
+import threading
+import time
 from importlib import util
 import types
 import tempfile
 import logging
-
-from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+from typing import Optional
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    PLUGIN_MODULE_CACHE_CHECK_INTERVAL,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Compiled plugin sources by content hash, so reloading a tool or function
+# whose source did not change skips parsing and compiling it again
+CODE_CACHE_MAXSIZE = 256
+_code_cache: dict[str, types.CodeType] = {}
+_code_cache_lock = threading.Lock()
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compile_plugin_content(content: str) -> types.CodeType:
+    content_hash = get_content_hash(content)
+    with _code_cache_lock:
+        code = _code_cache.get(content_hash)
+    if code is None:
+        code = compile(content, "<string>", "exec")
+        with _code_cache_lock:
+            if len(_code_cache) >= CODE_CACHE_MAXSIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                _code_cache.pop(next(iter(_code_cache)))
+            _code_cache[content_hash] = code
+    return code
+
 
 def extract_frontmatter(content):
     """
@@ -98,7 +131,7 @@ def load_tool_module_by_id(tool_id, content=None):
         module.__dict__["__file__"] = temp_file.name
 
         # Executing the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        exec(compile_plugin_content(content), module.__dict__)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -142,7 +175,7 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         module.__dict__["__file__"] = temp_file.name
 
         # Execute the modified content in the created module's namespace
-        exec(content, module.__dict__)
+        exec(compile_plugin_content(content), module.__dict__)
         frontmatter = extract_frontmatter(content)
         log.info(f"Loaded module: {module.__name__}")
 
@@ -166,102 +199,139 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
-def get_tool_module_from_cache(request, tool_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        tool = Tools.get_tool_by_id(tool_id)
-        if not tool:
-            raise Exception(f"Tool not found: {tool_id}")
-        content = tool.content
-
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the tool content in the database
-            Tools.update_tool_by_id(tool_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
-        ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
-
-        tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
-    else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
-            return request.app.state.TOOLS[tool_id], None
+class PluginVersion:
+    """Source version a cached tool/function module was loaded from."""
 
-        tool_module, frontmatter = load_tool_module_by_id(tool_id)
+    def __init__(self, updated_at: int, content_hash: str):
+        self.updated_at = updated_at
+        self.content_hash = content_hash
+        self.verified_at = int(time.time())
+        self.checked_at = time.monotonic()
 
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.checked_at < PLUGIN_MODULE_CACHE_CHECK_INTERVAL
 
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
+    def is_unchanged(self, updated_at: Optional[int]) -> bool:
+        # `updated_at` has second resolution: an update within the second the
+        # source was last read could keep it, so that case reads the source.
+        return updated_at == self.updated_at and updated_at < self.verified_at
 
-    request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
 
-    return tool_module, frontmatter
+def get_plugin_module_from_cache(
+    request,
+    plugin_id: str,
+    label: str,
+    modules_key: str,
+    versions_key: str,
+    get_updated_at,
+    get_plugin,
+    update_plugin,
+    load_module,
+):
+    """
+    Returns `(module, load_result)` for a tool or function, reusing the loaded
+    module while its source is unchanged. `load_result` is the value returned
+    by `load_module` when the module had to be (re)loaded, otherwise `None`.
+
+    The hot path is a dict lookup: a module is trusted for
+    PLUGIN_MODULE_CACHE_CHECK_INTERVAL seconds, then only `updated_at` is
+    queried. The source is read (and `replace_imports` applied) only when it
+    changed, and the module is re-executed only if the source hash differs.
+    """
+    state = request.app.state
+    if not hasattr(state, modules_key):
+        setattr(state, modules_key, {})
+    if not hasattr(state, versions_key):
+        setattr(state, versions_key, {})
+    modules = getattr(state, modules_key)
+    versions = getattr(state, versions_key)
+
+    module = modules.get(plugin_id)
+    version = versions.get(plugin_id)
+
+    if module is not None and version is not None:
+        if version.is_fresh():
+            return module, None
+
+        updated_at = get_updated_at(plugin_id)
+        if updated_at is None:
+            raise Exception(f"{label} not found: {plugin_id}")
+        if version.is_unchanged(updated_at):
+            version.checked_at = time.monotonic()
+            return module, None
+
+    plugin = get_plugin(plugin_id)
+    if not plugin:
+        raise Exception(f"{label} not found: {plugin_id}")
+    content = plugin.content
+
+    new_content = replace_imports(content)
+    if new_content != content:
+        content = new_content
+        # Update the content in the database
+        plugin = update_plugin(plugin_id, {"content": content}) or plugin
+
+    content_hash = get_content_hash(content)
+    if (
+        module is not None
+        and version is not None
+        and version.content_hash == content_hash
+    ):
+        versions[plugin_id] = PluginVersion(plugin.updated_at, content_hash)
+        return module, None
+
+    result = load_module(plugin_id, content)
+    modules[plugin_id] = result[0]
+    versions[plugin_id] = PluginVersion(plugin.updated_at, content_hash)
+    return result[0], result
 
 
-def get_function_module_from_cache(request, function_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+    if not load_from_db:
+        # Skip the version check (e.g. hot paths that just need any version)
+        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
+            return request.app.state.TOOLS[tool_id], None
 
-        function = Functions.get_function_by_id(function_id)
-        if not function:
-            raise Exception(f"Function not found: {function_id}")
-        content = function.content
+    tool_module, result = get_plugin_module_from_cache(
+        request,
+        tool_id,
+        "Tool",
+        "TOOLS",
+        "TOOL_VERSIONS",
+        get_updated_at=Tools.get_tool_updated_at_by_id,
+        get_plugin=Tools.get_tool_by_id,
+        update_plugin=Tools.update_tool_by_id,
+        load_module=load_tool_module_by_id,
+    )
 
-        new_content = replace_imports(content)
-        if new_content != content:
-            content = new_content
-            # Update the function content in the database
-            Functions.update_function_by_id(function_id, {"content": content})
+    return tool_module, result[1] if result else None
 
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
 
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id, content
-        )
-    else:
+def get_function_module_from_cache(request, function_id, load_from_db=True):
+    if not load_from_db:
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
-
         if (
             hasattr(request.app.state, "FUNCTIONS")
             and function_id in request.app.state.FUNCTIONS
         ):
             return request.app.state.FUNCTIONS[function_id], None, None
 
-        function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id
-        )
-
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
-
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
-
-    request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
-
-    return function_module, function_type, frontmatter
+    function_module, result = get_plugin_module_from_cache(
+        request,
+        function_id,
+        "Function",
+        "FUNCTIONS",
+        "FUNCTION_VERSIONS",
+        get_updated_at=Functions.get_function_updated_at_by_id,
+        get_plugin=Functions.get_function_by_id,
+        update_plugin=Functions.update_function_by_id,
+        load_module=load_function_module_by_id,
+    )
+
+    if result:
+        return result
+    return function_module, None, None
 
 
 def install_frontmatter_requirements(requirements: str):
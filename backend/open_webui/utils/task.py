@@ -1,14 +1,25 @@
+import asyncio
+import hashlib
+import json
 import logging
 import math
 import re
 from datetime import datetime
-from typing import Optional, Any
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Any
 import uuid
 
+import tiktoken
 
-from open_webui.utils.misc import get_last_user_message, get_messages_content
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.misc import (
+    get_content_from_message,
+    get_last_user_message,
+    get_messages_content,
+)
+
+from open_webui.utils.cache import TTLCache, get_cache_redis
+from open_webui.env import SRC_LOG_LEVELS, TASK_RESPONSE_CACHE_TTL
 from open_webui.config import DEFAULT_RAG_TEMPLATE
 
 
@@ -32,6 +43,105 @@ def get_task_model_id(
     return task_model_id
 
 
+class TaskSupersededError(Exception):
+    """Raised for a task request replaced by a newer one from the same session."""
+
+
+class TaskResponseCache:
+    """
+    Short-lived cache of task model responses, keyed by task, task model, user
+    and normalized prompt, so repeated autocomplete, query and emoji requests
+    are not sent to the model again.
+
+    Identical requests in flight share one model call. With a session key, a
+    new request supersedes the previous one from the same session (e.g.
+    autocompletion of text the user kept typing), whose caller gets a
+    `TaskSupersededError`. The superseded model call is cancelled unless
+    other callers still wait on it. Only successful responses are cached.
+    """
+
+    def __init__(self, ttl: float, redis=None):
+        self.cache = TTLCache("tasks:responses", ttl, redis, maxsize=1000)
+        self.pending: dict[str, asyncio.Task] = {}
+        # Callers waiting on each pending call
+        self.waiters: dict[str, int] = {}
+        # Key and supersede signal of the latest request of each session
+        self.latest: dict[str, tuple[str, asyncio.Future]] = {}
+
+    @staticmethod
+    def get_key(task: str, model_id: str, user_id: str, prompt: str) -> str:
+        normalized_prompt = " ".join(prompt.split())
+        return hashlib.sha256(
+            json.dumps([task, model_id, user_id, normalized_prompt]).encode()
+        ).hexdigest()
+
+    async def _run(self, key: str, generate: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            response = await generate()
+            if isinstance(response, dict) and "error" not in response:
+                self.cache.set(key, response)
+            return response
+        finally:
+            if self.pending.get(key) is asyncio.current_task():
+                del self.pending[key]
+
+    def supersede(self, session_key: str, key: str) -> None:
+        previous = self.latest.get(session_key)
+        # A repeated request joins the one in flight instead
+        if previous is None or previous[0] == key:
+            return
+
+        del self.latest[session_key]
+        previous_key, superseded = previous
+        if not superseded.done():
+            superseded.set_result(None)
+        task = self.pending.get(previous_key)
+        if task is not None and self.waiters.get(previous_key, 0) <= 1:
+            # Cancelled before it started, the call would not remove itself
+            del self.pending[previous_key]
+            task.cancel()
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[Any]],
+        session_key: Optional[str] = None,
+    ) -> Any:
+        if session_key is not None:
+            self.supersede(session_key, key)
+
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        task = self.pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(key, generate))
+            self.pending[key] = task
+
+        superseded = asyncio.get_running_loop().create_future()
+        if session_key is not None:
+            self.latest[session_key] = (key, superseded)
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+
+        try:
+            # Cancelling a caller leaves the call to the others waiting on it
+            await asyncio.wait({task, superseded}, return_when=asyncio.FIRST_COMPLETED)
+            if superseded.done() or task.cancelled():
+                raise TaskSupersededError()
+            return task.result()
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+            latest = self.latest.get(session_key) if session_key else None
+            if latest is not None and latest[1] is superseded:
+                del self.latest[session_key]
+
+
+task_response_cache = TaskResponseCache(TASK_RESPONSE_CACHE_TTL, get_cache_redis())
+
+
 def prompt_variables_template(template: str, variables: dict[str, str]) -> str:
     for variable, value in variables.items():
         template = template.replace(variable, value)
@@ -261,6 +371,136 @@ def tags_generation_template(
     return template
 
 
+# Instructions and example value of each field of the chat metadata task
+CHAT_METADATA_FIELDS = {
+    "title": (
+        "a concise, 3-5 word title with an emoji summarizing the chat history, "
+        "without quotation marks or special formatting",
+        "📉 Stock Market Trends",
+    ),
+    "tags": (
+        "1-3 broad tags categorizing the main themes of the chat history (e.g. "
+        "Science, Technology, Arts, Business, Health), along with 1-3 more "
+        'specific subtopic tags; use only ["General"] if the chat is too short '
+        "or too diverse",
+        ["tag1", "tag2", "tag3"],
+    ),
+    "follow_ups": (
+        "3-5 concise follow-up questions the user might naturally ask next, "
+        "written from the user's point of view and directed to the assistant, "
+        "that do not repeat what was already covered",
+        ["Question 1?", "Question 2?", "Question 3?"],
+    ),
+}
+
+
+@lru_cache(maxsize=4)
+def get_token_encoding(encoding_name: str):
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        log.debug(f"Unable to load tiktoken encoding {encoding_name}: {e}")
+        return None
+
+
+def truncate_messages_by_token_budget(
+    messages: list[dict], max_tokens: int, encoding_name: str = "cl100k_base"
+) -> list[dict]:
+    """
+    Keeps the most recent messages whose text fits in `max_tokens`.
+
+    The oldest message kept is cut down to the remaining budget rather than
+    dropped when it is the only one (e.g. a single very long answer). Tokens
+    are estimated at 4 characters each when the encoding is not available.
+    """
+    if not max_tokens or max_tokens <= 0:
+        return messages
+
+    encoding = get_token_encoding(encoding_name)
+
+    def count_tokens(text: str) -> int:
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+    budget = max_tokens
+    truncated = []
+    for message in reversed(messages):
+        content = get_content_from_message(message) or ""
+        tokens = count_tokens(content)
+        if tokens <= budget:
+            truncated.append(message)
+            budget -= tokens
+            continue
+
+        if not truncated and budget > 0:
+            if encoding is not None:
+                content = encoding.decode(
+                    encoding.encode(content, disallowed_special=())[:budget]
+                )
+            else:
+                content = content[: budget * 4]
+            truncated.append({**message, "content": f"{content}..."})
+        break
+
+    return list(reversed(truncated))
+
+
+def chat_metadata_generation_template(
+    template: str,
+    messages: list[dict],
+    fields: list[str],
+    user: Optional[Any] = None,
+) -> str:
+    metadata_fields = "\n".join(
+        f'- "{field}": {CHAT_METADATA_FIELDS[field][0]}' for field in fields
+    )
+    metadata_format = json.dumps(
+        {field: CHAT_METADATA_FIELDS[field][1] for field in fields},
+        ensure_ascii=False,
+    )
+
+    template = template.replace("{{METADATA_FIELDS}}", metadata_fields)
+    template = template.replace("{{METADATA_FORMAT}}", metadata_format)
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(template, user)
+    return template
+
+
+def parse_chat_metadata_response(response: Any, fields: list[str]) -> dict:
+    """
+    Extracts the valid fields of a chat metadata task completion. Fields that
+    are missing or malformed are left out, to be generated separately.
+    """
+    if not isinstance(response, dict) or len(response.get("choices", [])) != 1:
+        return {}
+
+    message = response["choices"][0].get("message", {})
+    content = message.get("content") or message.get("reasoning_content") or ""
+    content = content[content.find("{") : content.rfind("}") + 1]
+
+    try:
+        data = json.loads(content)
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    metadata = {}
+    for field in fields:
+        value = data.get(field)
+        if field == "title":
+            if isinstance(value, str) and value.strip():
+                metadata[field] = value.strip()
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            metadata[field] = value
+    return metadata
+
+
 def image_prompt_generation_template(
     template: str, messages: list[dict], user: Optional[Any] = None
 ) -> str:
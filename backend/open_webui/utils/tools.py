@@ -4,6 +4,8 @@ import re
 import inspect
 import aiohttp
 import asyncio
+import hashlib
+import time
 import yaml
 import json
 
@@ -37,11 +39,14 @@ from langchain_core.utils.function_calling import (
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.upstream import Upstreams
 from open_webui.env import (
     SRC_LOG_LEVELS,
     AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    TOOL_SERVER_SPEC_CACHE_TTL,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
 )
 
 import copy
@@ -405,32 +410,54 @@ def get_tool_specs(tool_module: object) -> list[dict]:
     return specs
 
 
-def resolve_schema(schema, components):
+def resolve_schema(schema, components, resolved_refs=None, resolving=None):
     """
     Recursively resolves a JSON schema using OpenAPI components.
+
+    `resolved_refs` memoizes resolved `$ref`s across calls for the same spec;
+    every use gets its own copy, so callers may modify the result. A schema
+    referencing itself resolves to `{}` where it recurses.
     """
     if not schema:
         return {}
 
+    if resolved_refs is None:
+        resolved_refs = {}
+    if resolving is None:
+        resolving = set()
+
     if "$ref" in schema:
         ref_path = schema["$ref"]
+        if ref_path in resolved_refs:
+            return copy.deepcopy(resolved_refs[ref_path])
+        if ref_path in resolving:
+            return {}
+
         ref_parts = ref_path.strip("#/").split("/")
         resolved = components
         for part in ref_parts[1:]:  # Skip the initial 'components'
             resolved = resolved.get(part, {})
-        return resolve_schema(resolved, components)
+
+        resolving.add(ref_path)
+        resolved_refs[ref_path] = resolve_schema(
+            resolved, components, resolved_refs, resolving
+        )
+        resolving.discard(ref_path)
+        return copy.deepcopy(resolved_refs[ref_path])
 
     resolved_schema = copy.deepcopy(schema)
 
     # Recursively resolve inner schemas
     if "properties" in resolved_schema:
-        for prop, prop_schema in resolved_schema["properties"].items():
-            resolved_schema["properties"][prop] = resolve_schema(
-                prop_schema, components
-            )
+        resolved_schema["properties"] = {
+            prop: resolve_schema(prop_schema, components, resolved_refs, resolving)
+            for prop, prop_schema in resolved_schema["properties"].items()
+        }
 
     if "items" in resolved_schema:
-        resolved_schema["items"] = resolve_schema(resolved_schema["items"], components)
+        resolved_schema["items"] = resolve_schema(
+            resolved_schema["items"], components, resolved_refs, resolving
+        )
 
     return resolved_schema
 
@@ -446,6 +473,7 @@ def convert_openapi_to_tool_payload(openapi_spec):
         list: A list of tool payloads.
     """
     tool_payload = []
+    resolved_refs = {}
 
     for path, methods in openapi_spec.get("paths", {}).items():
         for method, operation in methods.items():
@@ -492,7 +520,9 @@ def convert_openapi_to_tool_payload(openapi_spec):
                     json_schema = content.get("application/json", {}).get("schema")
                     if json_schema:
                         resolved_schema = resolve_schema(
-                            json_schema, openapi_spec.get("components", {})
+                            json_schema,
+                            openapi_spec.get("components", {}),
+                            resolved_refs,
                         )
 
                         if resolved_schema.get("properties"):
@@ -516,10 +546,166 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def set_tool_servers(request: Request):
+class ToolServerSpec:
+    """A parsed OpenAPI spec and its tool payloads, computed once per version."""
+
+    def __init__(
+        self,
+        spec: dict,
+        version: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.spec = spec
+        self.version = version
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = time.monotonic()
+        self._payload = None
+
+    @property
+    def payload(self) -> list[dict]:
+        if self._payload is None:
+            self._payload = convert_openapi_to_tool_payload(self.spec)
+        return self._payload
+
+
+def parse_tool_server_spec(text_content: str) -> dict:
+    try:
+        return json.loads(text_content)
+    except json.JSONDecodeError:
+        return yaml.safe_load(text_content)
+
+
+class ToolServerSpecCache:
+    """
+    Downloaded OpenAPI tool server specs, by spec url and token.
+
+    A spec is reused for `ttl` seconds, then revalidated with `If-None-Match` /
+    `If-Modified-Since`: unchanged specs (304, or an identical body) keep their
+    parsed spec and tool payloads. Concurrent fetches of the same spec share
+    one request, and when revalidation fails the last good spec is served.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: dict[tuple[str, str], ToolServerSpec] = {}
+        self.inline: dict[str, ToolServerSpec] = {}
+        self.pending: dict[tuple[str, str], asyncio.Task] = {}
+
+    def get_inline(self, text_content: str) -> ToolServerSpec:
+        """Parses a spec provided as text (e.g. pasted JSON), once per version."""
+        version = hashlib.sha256(text_content.encode()).hexdigest()
+        entry = self.inline.get(version)
+        if entry is None:
+            entry = ToolServerSpec(json.loads(text_content), version)
+            if len(self.inline) >= 100:
+                self.inline.pop(next(iter(self.inline)))
+            self.inline[version] = entry
+        return entry
+
+    async def get(
+        self,
+        token: Optional[str],
+        url: str,
+        max_age: Optional[float] = None,
+        stale_if_error: bool = True,
+    ) -> ToolServerSpec:
+        key = (url, hashlib.sha256((token or "").encode()).hexdigest())
+        max_age = self.ttl if max_age is None else max_age
+
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() - entry.checked_at < max_age:
+            return entry
+
+        task = self.pending.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self.fetch(key, token, url))
+            self.pending[key] = task
+            task.add_done_callback(
+                lambda done: (
+                    self.pending.pop(key, None)
+                    if self.pending.get(key) is done
+                    else None
+                )
+            )
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            entry = self.entries.get(key)
+            if entry is None or not stale_if_error:
+                raise
+            log.warning(f"Serving cached tool server spec for {url}")
+            return entry
+
+    async def fetch(self, key, token: Optional[str], url: str) -> ToolServerSpec:
+        entry = self.entries.get(key)
+
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        error = None
+        try:
+            session = Upstreams.get_session(url)
+            async with session.get(
+                url,
+                headers=headers,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+                timeout=aiohttp.ClientTimeout(
+                    total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA
+                ),
+            ) as response:
+                if response.status == 304 and entry is not None:
+                    entry.checked_at = time.monotonic()
+                    return entry
+
+                if response.status != 200:
+                    error_body = await response.json()
+                    raise Exception(error_body)
+
+                text_content = await response.text()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            version = hashlib.sha256(text_content.encode()).hexdigest()
+            if entry is not None and entry.version == version:
+                entry.etag, entry.last_modified = etag, last_modified
+                entry.checked_at = time.monotonic()
+                return entry
+
+            res = parse_tool_server_spec(text_content)
+        except Exception as err:
+            log.exception(f"Could not fetch tool server spec from {url}")
+            if isinstance(err, dict) and "detail" in err:
+                error = err["detail"]
+            else:
+                error = str(err)
+            raise Exception(error)
+
+        log.debug(f"Fetched data: {res}")
+        entry = ToolServerSpec(res, version, etag, last_modified)
+        self.entries[key] = entry
+        return entry
+
+
+tool_server_specs = ToolServerSpecCache(ttl=TOOL_SERVER_SPEC_CACHE_TTL)
+
+
+async def set_tool_servers(request: Request, max_age: Optional[float] = None):
     request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
+        request.app.state.config.TOOL_SERVER_CONNECTIONS, max_age=max_age
     )
+    request.app.state.TOOL_SERVERS_UPDATED_AT = time.monotonic()
 
     if request.app.state.redis is not None:
         await request.app.state.redis.set(
@@ -537,6 +723,13 @@ async def get_tool_servers(request: Request):
             request.app.state.TOOL_SERVERS = tool_servers
         except Exception as e:
             log.error(f"Error fetching tool_servers from Redis: {e}")
+    else:
+        updated_at = getattr(request.app.state, "TOOL_SERVERS_UPDATED_AT", None)
+        if updated_at is not None and (
+            TOOL_SERVER_SPEC_REFRESH_INTERVAL > 0
+            or time.monotonic() - updated_at < TOOL_SERVER_SPEC_CACHE_TTL
+        ):
+            tool_servers = request.app.state.TOOL_SERVERS
 
     if not tool_servers:
         tool_servers = await set_tool_servers(request)
@@ -544,55 +737,25 @@ async def get_tool_servers(request: Request):
     return tool_servers
 
 
-async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    error = None
-    try:
-        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                text_content = None
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    text_content = await response.text()
-
-                try:
-                    res = json.loads(text_content)
-                except json.JSONDecodeError:
-                    try:
-                        res = yaml.safe_load(text_content)
-                    except Exception as e:
-                        raise e
+async def periodic_tool_servers_refresh(request: Request):
+    """Keeps the tool server specs fresh so chats never wait on downloads."""
+    while True:
+        try:
+            await set_tool_servers(request, max_age=0)
+        except Exception as e:
+            log.warning(f"Error refreshing tool servers: {e}")
+        await asyncio.sleep(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
 
-    except Exception as err:
-        log.exception(f"Could not fetch tool server spec from {url}")
-        if isinstance(err, dict) and "detail" in err:
-            error = err["detail"]
-        else:
-            error = str(err)
-        raise Exception(error)
 
-    log.debug(f"Fetched data: {res}")
-    return res
+async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
+    """Fetches (revalidates) a tool server spec, raising if it is unreachable."""
+    entry = await tool_server_specs.get(token, url, max_age=0, stale_if_error=False)
+    return entry.spec
 
 
-async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def get_tool_servers_data(
+    servers: List[Dict[str, Any]], max_age: Optional[float] = None
+) -> List[Dict[str, Any]]:
     # Prepare list of enabled servers along with their original index
 
     tasks = []
@@ -627,19 +790,19 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 openapi_path = server.get("path", "openapi.json")
                 spec_url = get_tool_server_url(server_url, openapi_path)
                 # Fetch from URL
-                task = get_tool_server_data(token, spec_url)
+                task = tool_server_specs.get(token, spec_url, max_age=max_age)
             elif spec_type == "json" and server.get("spec", ""):
                 # Use provided JSON spec
-                spec_json = None
+                spec_entry = None
                 try:
-                    spec_json = json.loads(server.get("spec", ""))
+                    spec_entry = tool_server_specs.get_inline(server.get("spec", ""))
                 except Exception as e:
                     log.error(f"Error parsing JSON spec for tool server {id}: {e}")
 
-                if spec_json:
+                if spec_entry and spec_entry.spec:
                     task = asyncio.sleep(
                         0,
-                        result=spec_json,
+                        result=spec_entry,
                     )
 
             if task:
@@ -656,15 +819,22 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             log.error(f"Failed to connect to {url} OpenAPI tool server")
             continue
 
+        # The cached spec is shared: copy the part overridden below
+        openapi_data = response.spec
+        if isinstance(openapi_data, dict) and isinstance(
+            openapi_data.get("info"), dict
+        ):
+            openapi_data = {**openapi_data, "info": {**openapi_data["info"]}}
+
         response = {
-            "openapi": response,
-            "info": response.get("info", {}),
-            "specs": convert_openapi_to_tool_payload(response),
+            "openapi": openapi_data,
+            "info": openapi_data.get("info", {}),
+            "specs": response.payload,
         }
 
-        openapi_data = response.get("openapi", {})
         if info and isinstance(openapi_data, dict):
-            openapi_data["info"] = openapi_data.get("info", {})
+            if "info" not in openapi_data:
+                openapi_data = {**openapi_data, "info": {}}
 
             if "name" in info:
                 openapi_data["info"]["title"] = info.get("name", "Tool Server")
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_TIMEOUT,
+    MODELS_LAST_GOOD_TTL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+# Last successful model list per upstream url, served while that upstream fails
+# so one flaky backend does not drop its models from the catalog.
+last_good_model_lists = TTLCache("models:last_good", ttl=MODELS_LAST_GOOD_TTL)
+
+
+def get_upstream_key(url: str) -> str:
+    """Returns the `scheme://host[:port]` part of a URL, used to pick a pool."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class UpstreamMetrics:
+    def __init__(self):
+        self.created_at = int(time.time())
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.last_error: Optional[str] = None
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_request_exception(session, ctx, params):
+            self.errors += 1
+            self.last_error = str(params.exception) or type(params.exception).__name__
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.dns_cache_misses += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+
+class UpstreamSessions:
+    """
+    Registry of long-lived `aiohttp.ClientSession`s, one per upstream base URL,
+    so requests to the same Ollama or OpenAI compatible backend reuse pooled
+    keep-alive connections and cached DNS lookups instead of opening a new
+    session (and TCP/TLS handshake) per call.
+
+    Sessions are created lazily on the running event loop and closed by
+    `close()` at shutdown. They use a `DummyCookieJar`: cookies are forwarded
+    per request and must never leak between users through a shared jar.
+    Responses obtained from a pooled session must be released (not the session
+    closed) once consumed, which returns the connection to the pool.
+    """
+
+    def __init__(self):
+        self.sessions: dict[str, aiohttp.ClientSession] = {}
+        self.metrics: dict[str, UpstreamMetrics] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop they were created on; start over
+            # if the registry is used from a new loop (e.g. tests, reloads).
+            self.sessions = {}
+            self._loop = loop
+
+        key = get_upstream_key(url)
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            metrics = self.metrics.setdefault(key, UpstreamMetrics())
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=AIOHTTP_CLIENT_POOL_LIMIT,
+                    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+                    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=AIOHTTP_CLIENT_DNS_CACHE_TTL,
+                    use_dns_cache=True,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                trace_configs=[metrics.trace_config()],
+                trust_env=True,
+            )
+            self.sessions[key] = session
+            log.debug(f"Created connection pool for {key}")
+        return session
+
+    def get_metrics(self) -> dict[str, dict]:
+        result = {}
+        for key, metrics in self.metrics.items():
+            session = self.sessions.get(key)
+            connector = session.connector if session and not session.closed else None
+
+            active, idle = 0, 0
+            if connector is not None:
+                # aiohttp has no public accessors for the pool state
+                active = len(getattr(connector, "_acquired", ()))
+                idle = sum(
+                    len(conns) for conns in getattr(connector, "_conns", {}).values()
+                )
+
+            result[key] = {
+                "open": connector is not None,
+                "active_connections": active,
+                "idle_connections": idle,
+                "requests": metrics.requests,
+                "errors": metrics.errors,
+                "connections_created": metrics.connections_created,
+                "connections_reused": metrics.connections_reused,
+                "dns_cache_hits": metrics.dns_cache_hits,
+                "dns_cache_misses": metrics.dns_cache_misses,
+                "last_error": metrics.last_error,
+                "created_at": metrics.created_at,
+            }
+        return result
+
+    async def close(self):
+        sessions, self.sessions = self.sessions, {}
+        for key, session in sessions.items():
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Error closing connection pool for {key}: {e}")
+
+
+Upstreams = UpstreamSessions()
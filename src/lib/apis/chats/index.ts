@@ -112,7 +112,8 @@ export const importChat = async (
 export const getChatList = async (
 	token: string = '',
 	page: number | null = null,
-	include_folders: boolean = false
+	include_folders: boolean = false,
+	cursor: string | null = null
 ) => {
 	let error = null;
 	const searchParams = new URLSearchParams();
@@ -121,6 +122,11 @@ export const getChatList = async (
 		searchParams.append('page', `${page}`);
 	}
 
+	if (cursor !== null) {
+		// Continues after the given chat, "<updated_at>:<id>", without an OFFSET scan
+		searchParams.append('cursor', cursor);
+	}
+
 	if (include_folders) {
 		searchParams.append('include_folders', 'true');
 	}